@@ -0,0 +1,375 @@
+import asyncio
+import io
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import Headers, MultiDict
+from werkzeug.http import parse_options_header
+
+from adapters.inbound.async_services import is_blocking, iterate, run_blocking
+from adapters.inbound.bulk import READ_CHUNK_SIZE
+from adapters.inbound.common import (
+    DEFAULT_CONFIG,
+    JSON_MIMETYPE,
+    Reply,
+    RequestData,
+    bulk_add_products,
+    create_routes,
+    create_services,
+)
+from adapters.inbound.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    UNMATCHED_ROUTE,
+    HttpMetrics,
+)
+from adapters.inbound.serialization import dumps_bytes, loads
+
+# Adaptador de entrada ASGI: mesmas rotas, códigos de status e mensagens do
+# app Flask em api.py, sobre os mesmos serviços de core/services.py.
+# Uso: uvicorn adapters.inbound.asgi:app
+
+# Variáveis de ambiente ARTISAN_LINK_<CHAVE> sobrescrevem a configuração
+ENV_PREFIX = "ARTISAN_LINK_"
+# Threads para chamadas aos serviços quando o backend faz E/S bloqueante
+DEFAULT_SERVICE_THREADS = 16
+# Métodos cujo corpo é lido antes de chamar a rota
+BODY_METHODS = frozenset({"POST", "PUT"})
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+class Request:
+    def __init__(self, scope: dict, receive: Callable):
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.args = MultiDict(
+            parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+        )
+        self.headers = Headers(
+            [
+                (name.decode("latin-1"), value.decode("latin-1"))
+                for name, value in scope["headers"]
+            ]
+        )
+        self.mimetype = parse_options_header(self.headers.get("Content-Type", ""))[0]
+        self._receive = receive
+        self._body: Optional[bytes] = None
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        while True:
+            message = await self._receive()
+            if message["type"] == "http.disconnect":
+                raise ClientDisconnected()
+            chunk = message.get("body", b"")
+            if chunk:
+                yield chunk
+            if not message.get("more_body", False):
+                return
+
+    async def body(self) -> bytes:
+        if self._body is None:
+            self._body = b"".join([chunk async for chunk in self.stream()])
+        return self._body
+
+    def json(self):
+        # Mesmas regras de request.json no Flask: 415 sem Content-Type JSON.
+        # O corpo já foi lido pelo event loop (asgi_view)
+        is_json = self.mimetype == JSON_MIMETYPE or (
+            self.mimetype.startswith("application/") and self.mimetype.endswith("+json")
+        )
+        if not is_json:
+            raise HTTPError(415, "O corpo da requisição deve ser JSON.")
+        try:
+            return loads(self._body)
+        except ValueError:
+            raise HTTPError(400, "JSON inválido.")
+
+    def data(self) -> RequestData:
+        return RequestData(self.path, self.args, self.headers, self.json)
+
+
+class Response:
+    def __init__(
+        self,
+        body: Union[bytes, AsyncIterator[bytes]] = b"",
+        status: int = 200,
+        mimetype: Optional[str] = JSON_MIMETYPE,
+    ):
+        self.body = body
+        self.status = status
+        self.mimetype = mimetype
+        self.headers: Dict[str, str] = {}
+
+    @property
+    def is_streamed(self) -> bool:
+        return not isinstance(self.body, bytes)
+
+    async def send(self, send: Callable, head_only: bool = False):
+        headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in self.headers.items()
+        ]
+        if self.mimetype is not None:
+            headers.append((b"content-type", self.mimetype.encode("latin-1")))
+        if not self.is_streamed:
+            headers.append((b"content-length", str(len(self.body)).encode()))
+        await send(
+            {"type": "http.response.start", "status": self.status, "headers": headers}
+        )
+        if not self.is_streamed or head_only:
+            if self.is_streamed:
+                await self.body.aclose()
+            body = b"" if head_only else self.body
+            await send({"type": "http.response.body", "body": body})
+            return
+        async for chunk in self.body:
+            if chunk:
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+        await send({"type": "http.response.body", "body": b""})
+
+
+def json_response(obj, status: int = 200) -> Response:
+    return Response(dumps_bytes(obj), status)
+
+
+def error_response(message: str, status: int) -> Response:
+    return json_response({"error": message}, status)
+
+
+# Conversores de <tipo:nome> nas rotas, como os do Flask
+_CONVERTERS = {"int": (r"[0-9]+", int), "string": (r"[^/]+", str)}
+_PARAMETER = re.compile(r"<(?:(\w+):)?(\w+)>")
+
+
+def _compile_rule(rule: str) -> Tuple[re.Pattern, Dict[str, Callable]]:
+    converters = {}
+    pattern = []
+    position = 0
+    for match in _PARAMETER.finditer(rule):
+        kind, name = match.group(1) or "string", match.group(2)
+        regex, converters[name] = _CONVERTERS[kind]
+        pattern.append(re.escape(rule[position : match.start()]))
+        pattern.append(f"(?P<{name}>{regex})")
+        position = match.end()
+    pattern.append(re.escape(rule[position:]))
+    return re.compile("".join(pattern)), converters
+
+
+class Router:
+    def __init__(self):
+        self._routes: List[tuple] = []
+
+    def route(self, rule: str, methods: List[str]):
+        pattern, converters = _compile_rule(rule)
+
+        def decorator(view):
+            self._routes.append((rule, pattern, frozenset(methods), converters, view))
+            return view
+
+        return decorator
+
+    def match(self, method: str, path: str) -> Tuple[Callable, dict, str]:
+        """Devolve a view, os parâmetros convertidos e a regra que casou."""
+        path_matched = False
+        for rule, pattern, methods, converters, view in self._routes:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            if method in methods or (method == "HEAD" and "GET" in methods):
+                kwargs = {
+                    name: converters[name](value)
+                    for name, value in match.groupdict().items()
+                }
+                return view, kwargs, rule
+            path_matched = True
+        if path_matched:
+            raise HTTPError(405, "Método não permitido.")
+        raise HTTPError(404, "Rota não encontrada.")
+
+
+class _ReceiveStream(io.RawIOBase):
+    """Corpo da requisição lido de forma síncrona numa thread do pool.
+
+    Cada bloco é pedido ao event loop, então o parser de importação em lote
+    de bulk.py é reaproveitado sem carregar o corpo inteiro na memória.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop):
+        self._chunks = chunks
+        self._loop = loop
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    async def _next_chunk(self) -> bytes:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+    def readinto(self, buffer) -> int:
+        if not self._pending:
+            future = asyncio.run_coroutine_threadsafe(self._next_chunk(), self._loop)
+            self._pending = future.result()
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def _config_from_env(prefix: str) -> dict:
+    # Como app.config.from_prefixed_env(): valores JSON são decodificados
+    config = {}
+    for key, value in os.environ.items():
+        if key.startswith(prefix):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+            config[key[len(prefix) :]] = value
+    return config
+
+
+class ASGIApp:
+    def __init__(
+        self, router: Router, services, executor: Optional[ThreadPoolExecutor]
+    ):
+        self.router = router
+        self.services = services
+        self._executor = executor
+        self._metrics = None
+        if services.metrics is not None:
+            self._metrics = HttpMetrics(services.metrics)
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        request = Request(scope, receive)
+        if self._metrics is None:
+            await self._respond(request, send)
+            return
+        started = self._metrics.start()
+        outcome = [UNMATCHED_ROUTE, 500]
+        try:
+            await self._respond(request, send, outcome)
+        finally:
+            self._metrics.finish(request.method, *outcome, started)
+
+    async def _respond(self, request: Request, send: Callable, outcome=None):
+        # outcome recebe a regra da rota e o status enviado, para as métricas
+        try:
+            view, kwargs, rule = self.router.match(request.method, request.path)
+            if outcome is not None:
+                outcome[0] = rule
+            response = await view(request, **kwargs)
+        except HTTPError as e:
+            response = error_response(e.message, e.status)
+        except ClientDisconnected:
+            if outcome is not None:
+                # Convenção do nginx para cliente que desistiu antes da resposta
+                outcome[1] = 499
+            return
+        except Exception:
+            logger.exception("Erro em %s %s", request.method, request.path)
+            response = error_response("Erro interno do servidor.", 500)
+        if outcome is not None:
+            outcome[1] = response.status
+        await response.send(send, head_only=request.method == "HEAD")
+
+    async def _lifespan(self, receive: Callable, send: Callable):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def create_asgi_app(config=None) -> ASGIApp:
+    app_config = {**DEFAULT_CONFIG, "ASYNC_SERVICE_THREADS": DEFAULT_SERVICE_THREADS}
+    app_config.update(_config_from_env(ENV_PREFIX))
+    if config:
+        app_config.update(config)
+
+    services = create_services(app_config)
+    executor = None
+    if is_blocking(app_config):
+        executor = ThreadPoolExecutor(
+            app_config["ASYNC_SERVICE_THREADS"], thread_name_prefix="artisan-link"
+        )
+
+    def to_response(reply: Reply) -> Response:
+        body = reply.body
+        if reply.chunks is not None:
+            # Lotes em streaming consumidos no pool, como as rotas
+            body = iterate(executor, reply.chunks)
+        response = Response(body, reply.status, reply.mimetype)
+        response.headers.update(reply.headers)
+        return response
+
+    def asgi_view(handler):
+        async def view(request, **kwargs):
+            # O corpo chega pelo event loop; a rota roda no pool se o
+            # backend bloqueia
+            if request.method in BODY_METHODS:
+                await request.body()
+            reply = await run_blocking(executor, handler, request.data(), **kwargs)
+            return to_response(reply)
+
+        view.__name__ = handler.__name__
+        return view
+
+    router = Router()
+    for route in create_routes(services, app_config):
+        router.route(route.rule, route.methods)(asgi_view(route.handler))
+
+    @router.route("/products/bulk", methods=["POST"])
+    async def bulk_add(request):
+        # Corpo lido em streaming: o parser síncrono roda numa thread e pede
+        # cada bloco ao event loop
+        loop = asyncio.get_running_loop()
+        stream = io.BufferedReader(
+            _ReceiveStream(request.stream(), loop), READ_CHUNK_SIZE
+        )
+        reply = await loop.run_in_executor(
+            executor, bulk_add_products, services, stream, request.mimetype
+        )
+        return to_response(reply)
+
+    # --- Métricas ---
+    if services.metrics is not None:
+
+        @router.route("/metrics", methods=["GET"])
+        async def metrics(request):
+            body = services.metrics.render().encode("utf-8")
+            return Response(body, mimetype=METRICS_CONTENT_TYPE)
+
+    return ASGIApp(router, services, executor)
+
+
+app = create_asgi_app()
@@ -0,0 +1,42 @@
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+# Os serviços de core/services.py continuam síncronos: em vez de portas
+# assíncronas, o adaptador ASGI roda cada rota numa thread do pool quando o
+# backend bloqueia em E/S, e direto no event loop quando não bloqueia
+
+# Backends cujas chamadas fazem E/S e bloqueariam o event loop
+BLOCKING_BACKENDS = frozenset({"sqlite"})
+
+
+def is_blocking(config) -> bool:
+    # Com journal síncrono cada escrita espera o write()/fsync do grupo
+    if config["JOURNAL_DIR"] and config["JOURNAL_DURABILITY"] != "async":
+        return True
+    return config["REPOSITORY_BACKEND"] in BLOCKING_BACKENDS
+
+
+_DONE = object()
+
+
+async def run_blocking(
+    executor: Optional[Executor], function: Callable, *args, **kwargs
+):
+    """Chama function numa thread do pool; sem executor, chama direto."""
+    if executor is None:
+        return function(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(function, *args, **kwargs)
+    )
+
+
+async def iterate(executor: Optional[Executor], iterator: Iterator) -> AsyncIterator:
+    """Consome um iterador síncrono (ex.: lotes em streaming) item a item."""
+    while True:
+        item = await run_blocking(executor, next, iterator, _DONE)
+        if item is _DONE:
+            return
+        yield item
@@ -0,0 +1,132 @@
+import codecs
+import json
+from typing import Callable, Iterator, List, Tuple
+
+READ_CHUNK_SIZE = 64 * 1024
+BULK_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+_decoder = json.JSONDecoder()
+
+
+class BulkParseError(ValueError):
+    pass
+
+
+# Cada item é (número da linha/posição, objeto decodificado ou BulkParseError)
+def iter_ndjson(stream) -> Iterator[Tuple[int, object]]:
+    for line_number, raw in enumerate(stream, 1):
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, BulkParseError("JSON inválido.")
+
+
+def iter_json_array(stream) -> Iterator[Tuple[int, object]]:
+    # Decodifica um array JSON item a item, lendo o corpo em blocos
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer, position, eof = "", 0, False
+    expect = "["
+    index = 0
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        item = end = None
+        if position < len(buffer):
+            char = buffer[position]
+            if expect == "end":
+                # Depois do "]" só cabem espaços
+                yield index + 1, BulkParseError("Conteúdo após o fim do array JSON.")
+                return
+            if expect == "[":
+                if char != "[":
+                    yield index + 1, BulkParseError("O corpo deve ser um array JSON.")
+                    return
+                position += 1
+                expect = "first"
+                continue
+            if expect in ("first", "separator") and char == "]":
+                position += 1
+                expect = "end"
+                continue
+            if expect == "separator":
+                if char != ",":
+                    yield index + 1, BulkParseError("JSON inválido.")
+                    return
+                position += 1
+                expect = "item"
+                continue
+            try:
+                item, end = _decoder.raw_decode(buffer, position)
+            except ValueError:
+                pass
+            # Um número no fim do buffer pode continuar no próximo bloco
+            if end is not None and (end < len(buffer) or eof):
+                index += 1
+                position = end
+                expect = "separator"
+                yield index, item
+                continue
+        if eof:
+            if expect == "end":
+                return
+            if position == len(buffer):
+                message = "Array JSON não terminado."
+            else:
+                message = "JSON inválido."
+            if expect == "[":
+                message = "O corpo deve ser um array JSON."
+            yield index + 1, BulkParseError(message)
+            return
+        chunk = stream.read(READ_CHUNK_SIZE)
+        eof = not chunk
+        buffer = buffer[position:] + text.decode(chunk, final=eof)
+        position = 0
+
+
+def ingest(
+    records: Iterator[Tuple[int, object]],
+    build: Callable[[dict], object],
+    commit: Callable[[List[object]], None],
+    batch_size: int = BULK_BATCH_SIZE,
+) -> dict:
+    received = 0
+    created = 0
+    failed = 0
+    errors = []
+    batch = []
+    for line, record in records:
+        received += 1
+        try:
+            if isinstance(record, BulkParseError):
+                raise record
+            if not isinstance(record, dict):
+                raise ValueError("Cada item deve ser um objeto JSON.")
+            batch.append(build(record))
+        except KeyError as e:
+            failed += 1
+            _report(errors, line, f"Campo obrigatório ausente: {e.args[0]}.")
+        except (TypeError, ValueError) as e:
+            failed += 1
+            _report(errors, line, str(e))
+        if len(batch) >= batch_size:
+            commit(batch)
+            created += len(batch)
+            batch = []
+    if batch:
+        commit(batch)
+        created += len(batch)
+    return {
+        "received": received,
+        "created": created,
+        "failed": failed,
+        "errors": errors,
+    }
+
+
+def _report(errors: list, line: int, message: str):
+    if len(errors) < MAX_REPORTED_ERRORS:
+        errors.append({"line": line, "error": message})
@@ -0,0 +1,174 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, Optional, Set
+
+from core import events as ev
+
+# Tags que ligam entradas do cache às escritas que as invalidam
+PRODUCTS_LIST = "products"
+ARTISANS_LIST = "artisans"
+# Listagens de produtos que embutem o resumo das notas
+RATINGS = "ratings"
+# Rankings de vendas, alterados por qualquer escrita de pedido
+SALES = "sales"
+
+
+def product_tag(product_id) -> str:
+    return f"product:{product_id}"
+
+
+def artisan_products_tag(artisan_id) -> str:
+    return f"artisan-products:{artisan_id}"
+
+
+def rating_tag(product_id) -> str:
+    return f"rating:{product_id}"
+
+
+def order_tag(order_id) -> str:
+    return f"order:{order_id}"
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    body: bytes
+    mimetype: str
+    tags: tuple
+
+
+class ResponseCache:
+    """Cache LRU de respostas já codificadas, limitado pelo total de bytes."""
+
+    def __init__(self, max_bytes: int, max_entry_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes or max(max_bytes // 8, 1)
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        # Incrementado a cada invalidação; uma resposta calculada antes de uma
+        # escrita concorrente não é armazenada
+        self._generation = 0
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(
+        self,
+        key: Hashable,
+        entry: CachedResponse,
+        generation: int,
+    ) -> bool:
+        size = len(entry.body)
+        if size > self.max_entry_bytes:
+            return False
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._remove(key)
+            self._entries[key] = entry
+            self.size += size
+            for tag in entry.tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+
+    def invalidate(self, tags: Iterable[str]):
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in self._keys_by_tag.pop(tag, ()):
+                    if self._remove(key):
+                        self.invalidations += 1
+
+    def _remove(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.size -= len(entry.body)
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def subscribe(self, events: ev.EventBus):
+        """Liga a invalidação às escritas publicadas pelos serviços."""
+
+        def product_saved(product, previous):
+            tags = [PRODUCTS_LIST, product_tag(product.id)]
+            tags.append(artisan_products_tag(product.artisan_id))
+            if previous is not None and previous.artisan_id != product.artisan_id:
+                tags.append(artisan_products_tag(previous.artisan_id))
+            self.invalidate(tags)
+
+        def product_deleted(product):
+            self.invalidate(
+                [
+                    PRODUCTS_LIST,
+                    product_tag(product.id),
+                    rating_tag(product.id),
+                    artisan_products_tag(product.artisan_id),
+                ]
+            )
+
+        events.subscribe(ev.PRODUCT_SAVED, product_saved)
+        events.subscribe(ev.PRODUCT_DELETED, product_deleted)
+        events.subscribe(ev.ARTISAN_SAVED, lambda *_: self.invalidate([ARTISANS_LIST]))
+        events.subscribe(
+            ev.ARTISAN_DELETED, lambda *_: self.invalidate([ARTISANS_LIST])
+        )
+
+        def review_saved(review, previous):
+            tags = [RATINGS, rating_tag(review.product_id)]
+            if previous is not None and previous.product_id != review.product_id:
+                tags.append(rating_tag(previous.product_id))
+            self.invalidate(tags)
+
+        events.subscribe(ev.REVIEW_SAVED, review_saved)
+        events.subscribe(
+            ev.REVIEW_DELETED,
+            lambda review: self.invalidate([RATINGS, rating_tag(review.product_id)]),
+        )
+        events.subscribe(
+            ev.ORDER_SAVED,
+            lambda order, _: self.invalidate([order_tag(order.id), SALES]),
+        )
+        events.subscribe(
+            ev.ORDER_DELETED,
+            lambda order: self.invalidate([order_tag(order.id), SALES]),
+        )
@@ -0,0 +1,904 @@
+import atexit
+import math
+from dataclasses import dataclass, field, replace
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header, parse_etags, quote_etag
+
+from core.entities import Product, Review
+from core.events import EventBus
+from core.pagination import DEFAULT_PAGE_SIZE
+from core.services import (
+    ANALYTICS_DEFAULT_LIMIT,
+    SEARCH_DEFAULT_LIMIT,
+    TOP_DEFAULT_LIMIT,
+    AnalyticsService,
+    ArtisanService,
+    OrderBatchError,
+    OrderService,
+    ProductService,
+    RankingService,
+    ReviewService,
+)
+from adapters.inbound import cache as cache_tags
+from adapters.inbound.bulk import ingest, iter_json_array, iter_ndjson
+from adapters.inbound.cache import CachedResponse, ResponseCache
+from adapters.inbound.metrics import MetricsRegistry, instrument_repositories
+from adapters.inbound.serialization import (
+    artisan_to_dict,
+    dumps_bytes,
+    order_summary_to_dict,
+    order_to_dict,
+    product_to_dict,
+    rating_brief_to_dict,
+    rating_to_dict,
+    review_to_dict,
+)
+from adapters.outbound.repository import (
+    ArtisanRepository,
+    OrderRepository,
+    ProductRepository,
+    ReviewRepository,
+)
+
+# Peças comuns aos adaptadores de entrada (Flask e ASGI): configuração,
+# montagem dos serviços, leitura dos parâmetros de consulta e o tratamento
+# das rotas
+
+DEFAULT_CONFIG = {
+    "REPOSITORY_BACKEND": "memory",
+    "SQLITE_PATH": "artisan_link.db",
+    # Backend "mmap": catálogo somente leitura gerado por write_catalog_snapshot
+    "CATALOG_SNAPSHOT_PATH": "catalog.snap",
+    "RESPONSE_CACHE_MAX_BYTES": 64 * 1024 * 1024,
+    # Diretório do journal dos backends em memória; None desliga
+    "JOURNAL_DIR": None,
+    "JOURNAL_DURABILITY": "fsync",
+    "JOURNAL_SNAPSHOT_EVERY": 100_000,
+    # Contadores e histogramas por rota e por repositório em GET /metrics
+    "METRICS_ENABLED": True,
+    # Profiler de amostragem do app Flask: pilhas por rota em PROFILER_DIR
+    "PROFILER_ENABLED": False,
+    "PROFILER_DIR": "profiles",
+    # Perfila 1 a cada N requisições; 0 perfila só as com cabeçalho assinado
+    "PROFILER_SAMPLE_EVERY": 1000,
+    # Segredo do cabeçalho X-Profile-Request; None ignora o cabeçalho
+    "PROFILER_SECRET": None,
+    "PROFILER_INTERVAL": 0.005,
+    "PROFILER_MAX_FILE_BYTES": 10 * 1024 * 1024,
+    "PROFILER_MAX_FILES": 5,
+    # Pedidos aceitos num POST /orders/batch
+    "ORDER_BATCH_MAX_SIZE": 1000,
+}
+
+AUTH_HEADER = "Bearer meu-token-secreto"
+
+JSON_MIMETYPE = "application/json"
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+# Rota -> (dimensão do serviço, nome do campo da chave na resposta)
+REVENUE_DIMENSIONS = {
+    "artisans": ("artisan", "artisan_id"),
+    "products": ("product", "product_id"),
+    "customers": ("customer", "customer_id"),
+}
+
+
+# Parâmetros de paginação por cursor; None quando a listagem não é paginada
+def parse_page_params(args):
+    if "limit" not in args and "cursor" not in args:
+        return None
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("O parâmetro limit deve ser um número inteiro.")
+    return limit, args.get("cursor")
+
+
+# Filtro/ordenação por preço; None quando nenhum dos parâmetros foi enviado
+def parse_price_params(args):
+    if not any(name in args for name in ("min_price", "max_price", "sort")):
+        return None
+    return (
+        _price_arg(args, "min_price"),
+        _price_arg(args, "max_price"),
+        args.get("sort", "price_asc"),
+    )
+
+
+def _price_arg(args, name):
+    value = args.get(name)
+    if value is None:
+        return None
+    try:
+        price = float(value)
+    except ValueError:
+        price = math.nan
+    if math.isnan(price):
+        raise ValueError("Os parâmetros min_price e max_price devem ser números.")
+    return price
+
+
+# Tipos conferidos antes de qualquer escrita: um produto gravado com nome
+# numérico ou nulo derrubaria os assinantes de PRODUCT_SAVED (busca, cache)
+def product_from_json(data: dict) -> Product:
+    if not isinstance(data, dict):
+        raise ValueError("O produto deve ser um objeto JSON.")
+    for name in ("id", "artisan_id", "name", "description", "price"):
+        if name not in data:
+            raise ValueError(f"Campo obrigatório ausente: {name}.")
+    for name in ("id", "artisan_id"):
+        if not _is_int(data[name]):
+            raise ValueError(f"O campo {name} deve ser um número inteiro.")
+    for name in ("name", "description"):
+        if not isinstance(data[name], str):
+            raise ValueError(f"O campo {name} deve ser um texto.")
+    price = data["price"]
+    is_number = isinstance(price, (int, float)) and not isinstance(price, bool)
+    if not is_number or not math.isfinite(price):
+        raise ValueError("O preço do produto deve ser um número.")
+    return Product(
+        id=data["id"],
+        artisan_id=data["artisan_id"],
+        name=data["name"],
+        description=data["description"],
+        price=price,
+    )
+
+
+# Itens do pedido como (product_id, quantidade); nome, preço e total vindos
+# do cliente são ignorados: o preço é o do catálogo
+def order_items_from_json(items) -> List[Tuple[int, int]]:
+    if not isinstance(items, list):
+        raise ValueError("products deve ser uma lista de itens.")
+    parsed = []
+    for item in items:
+        if not isinstance(item, dict):
+            raise ValueError("Cada item deve ser um objeto com id e quantity.")
+        product_id = item.get("id", item.get("product_id"))
+        quantity = item.get("quantity", 1)
+        if not _is_int(product_id):
+            raise ValueError("O id de cada item deve ser um número inteiro.")
+        if not _is_int(quantity) or quantity < 1:
+            raise ValueError("A quantidade de cada item deve ser um inteiro positivo.")
+        parsed.append((product_id, quantity))
+    return parsed
+
+
+# Corpo de POST /orders: (customer_id, itens)
+def order_from_json(data) -> Tuple[int, List[Tuple[int, int]]]:
+    if not isinstance(data, dict):
+        raise ValueError("Cada pedido deve ser um objeto JSON.")
+    if not data.get("customer_id") or not data.get("products"):
+        raise ValueError("customer_id e products são obrigatórios.")
+    return _customer_id(data["customer_id"]), order_items_from_json(data["products"])
+
+
+# Corpo de PUT /orders/<id>: (customer_id, itens), None no que não muda
+def order_revision_from_json(
+    data,
+) -> Tuple[Optional[int], Optional[List[Tuple[int, int]]]]:
+    if not isinstance(data, dict):
+        raise ValueError("O corpo deve ser um objeto JSON.")
+    customer_id = data.get("customer_id")
+    if customer_id is not None:
+        customer_id = _customer_id(customer_id)
+    items = None
+    if "products" in data:
+        items = order_items_from_json(data["products"])
+    return customer_id, items
+
+
+def _customer_id(value) -> int:
+    if not _is_int(value):
+        raise ValueError("customer_id deve ser um número inteiro.")
+    return value
+
+
+# Corpo de POST /orders/batch: {"orders": [...]}. Os pedidos mal formados são
+# reunidos num OrderBatchError, como os recusados pelo serviço
+def order_batch_from_json(
+    data, max_size: int
+) -> List[Tuple[int, List[Tuple[int, int]]]]:
+    orders = data.get("orders") if isinstance(data, dict) else None
+    if not isinstance(orders, list) or not orders:
+        raise ValueError("orders deve ser uma lista não vazia de pedidos.")
+    if len(orders) > max_size:
+        raise ValueError(f"O lote aceita no máximo {max_size} pedidos.")
+    batch = []
+    errors = []
+    for index, order in enumerate(orders):
+        try:
+            batch.append(order_from_json(order))
+        except ValueError as e:
+            errors.append((index, str(e)))
+    if errors:
+        raise OrderBatchError(errors)
+    return batch
+
+
+def order_batch_errors(error: OrderBatchError) -> dict:
+    return {
+        "error": str(error),
+        "errors": [
+            {"index": index, "error": message} for index, message in error.errors
+        ],
+    }
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+# Escolhe o backend de persistência a partir da configuração do app
+def create_repositories(config):
+    backend = config["REPOSITORY_BACKEND"]
+    if backend == "sqlite":
+        from adapters.outbound.sqlite_repository import (
+            SQLiteArtisanRepository,
+            SQLiteDatabase,
+            SQLiteOrderRepository,
+            SQLiteProductRepository,
+            SQLiteReviewRepository,
+        )
+
+        if config["JOURNAL_DIR"]:
+            raise ValueError("O journal só se aplica aos backends em memória.")
+        database = SQLiteDatabase(config["SQLITE_PATH"])
+        return (
+            SQLiteProductRepository(database),
+            SQLiteArtisanRepository(database),
+            SQLiteOrderRepository(database),
+            SQLiteReviewRepository(database),
+        )
+    if backend == "memory":
+        product_repo = ProductRepository()
+    elif backend == "columnar":
+        from adapters.outbound.columnar_repository import ProductStore
+
+        product_repo = ProductStore()
+    elif backend == "mmap":
+        from adapters.outbound.catalog_snapshot import MappedProductRepository
+
+        product_repo = MappedProductRepository(config["CATALOG_SNAPSHOT_PATH"])
+    else:
+        raise ValueError(f"Backend de repositório desconhecido: {backend}")
+    repositories = (
+        product_repo,
+        ArtisanRepository(),
+        OrderRepository(),
+        ReviewRepository(),
+    )
+    if not config["JOURNAL_DIR"]:
+        return repositories
+
+    # Recupera o estado do disco e passa a registrar cada escrita no journal
+    from adapters.outbound.journal import JournaledStore
+
+    store = JournaledStore(
+        config["JOURNAL_DIR"],
+        *repositories,
+        durability=config["JOURNAL_DURABILITY"],
+        snapshot_every=config["JOURNAL_SNAPSHOT_EVERY"],
+    )
+    atexit.register(store.close)
+    return store.repositories()
+
+
+@dataclass
+class Services:
+    events: EventBus
+    products: ProductService
+    artisans: ArtisanService
+    orders: OrderService
+    reviews: ReviewService
+    rankings: RankingService
+    analytics: AnalyticsService
+    response_cache: Optional[ResponseCache]
+    metrics: Optional[MetricsRegistry]
+
+    # Listagens de produtos embutem o resumo das notas, lido dos agregados
+    def product_listing_dict(self, product: Product) -> Dict[str, Any]:
+        item = product_to_dict(product)
+        rating = self.reviews.get_product_rating(product.id)
+        item["rating"] = rating_brief_to_dict(rating)
+        return item
+
+    def product_listing_version(self) -> str:
+        return f"{self.products.products_version()}.{self.reviews.ratings_version()}"
+
+
+def create_services(config) -> Services:
+    repositories = create_repositories(config)
+    metrics = None
+    if config["METRICS_ENABLED"]:
+        metrics = MetricsRegistry()
+        repositories = instrument_repositories(
+            metrics,
+            dict(zip(("products", "artisans", "orders", "reviews"), repositories)),
+        )
+    product_repo, artisan_repo, order_repo, review_repo = repositories
+    events = EventBus()
+    # Catálogo mapeado: a partida não decodifica o catálogo inteiro para a
+    # busca; o índice é montado na primeira consulta
+    product_service = ProductService(
+        product_repo,
+        events,
+        lazy_search_index=config["REPOSITORY_BACKEND"] == "mmap",
+    )
+    artisan_service = ArtisanService(artisan_repo, events)
+    order_service = OrderService(order_repo, product_repo, events)
+    review_service = ReviewService(review_repo, events)
+    # Depois de ReviewService: os rankings leem os agregados já atualizados
+    ranking_service = RankingService(
+        product_repo, order_repo, review_service.ratings, events
+    )
+    analytics_service = AnalyticsService(order_repo, product_repo, events)
+
+    # Cache de respostas invalidado pelos eventos de escrita dos serviços
+    response_cache = None
+    if config["RESPONSE_CACHE_MAX_BYTES"]:
+        response_cache = ResponseCache(config["RESPONSE_CACHE_MAX_BYTES"])
+        response_cache.subscribe(events)
+
+    return Services(
+        events=events,
+        products=product_service,
+        artisans=artisan_service,
+        orders=order_service,
+        reviews=review_service,
+        rankings=ranking_service,
+        analytics=analytics_service,
+        response_cache=response_cache,
+        metrics=metrics,
+    )
+
+
+# --- Rotas ---
+#
+# O tratamento de cada rota é escrito uma vez, sobre RequestData e Reply; os
+# adaptadores só convertem a requisição e a resposta do seu framework e
+# registram as rotas de create_routes.
+
+
+@dataclass
+class RequestData:
+    """O que as rotas leem da requisição, preenchido por cada adaptador."""
+
+    path: str
+    args: Any
+    headers: Any
+    # Corpo JSON decodificado; o adaptador decide o erro de corpo inválido
+    json: Callable[[], Any]
+
+    def wants_ndjson(self) -> bool:
+        accept = parse_accept_header(self.headers.get("Accept"), MIMEAccept)
+        return accept.best_match([JSON_MIMETYPE, NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+@dataclass
+class Reply:
+    """Resposta já codificada; chunks substitui body nas respostas em streaming."""
+
+    status: int = 200
+    body: bytes = b""
+    mimetype: Optional[str] = JSON_MIMETYPE
+    chunks: Optional[Iterator[bytes]] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Route:
+    rule: str
+    methods: List[str]
+    handler: Callable[..., Reply]
+
+
+def json_reply(obj, status: int = 200) -> Reply:
+    return Reply(status, dumps_bytes(obj))
+
+
+def error_reply(message: str, status: int) -> Reply:
+    return json_reply({"error": message}, status)
+
+
+# Autenticação simples por token fixo
+def require_auth(request: RequestData) -> Optional[Reply]:
+    if request.headers.get("Authorization") != AUTH_HEADER:
+        return error_reply("Não autorizado.", 401)
+    return None
+
+
+# GET condicional: ETag forte derivado da versão da coleção
+def conditional(collection, version_of):
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(request: RequestData, **kwargs) -> Reply:
+            # A versão é lida antes dos dados: uma escrita concorrente só pode
+            # deixar o ETag mais antigo que o corpo, nunca o contrário
+            etag = f"{collection}-{version_of()}"
+            if request.wants_ndjson():
+                etag += "-ndjson"
+            if parse_etags(request.headers.get("If-None-Match")).contains(etag):
+                reply = Reply(status=304, mimetype=None)
+            else:
+                reply = handler(request, **kwargs)
+            if reply.status in (200, 304):
+                reply.headers["ETag"] = quote_etag(etag)
+            reply.headers["Vary"] = "Accept"
+            return reply
+
+        return wrapper
+
+    return decorator
+
+
+# Cache das respostas codificadas por (rota, query string, formato)
+def cached(cache, tags_of, auth=False):
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(request: RequestData, **kwargs) -> Reply:
+            if auth:
+                auth_error = require_auth(request)
+                if auth_error:
+                    return auth_error
+            if cache is None:
+                return handler(request, **kwargs)
+
+            key = (
+                request.path,
+                tuple(sorted(request.args.items(multi=True))),
+                request.wants_ndjson(),
+            )
+            entry = cache.get(key)
+            if entry is not None:
+                return Reply(body=entry.body, mimetype=entry.mimetype)
+
+            generation = cache.generation()
+            reply = handler(request, **kwargs)
+            if reply.status != 200:
+                return reply
+            tags = tuple(tags_of(**kwargs))
+            if reply.chunks is not None:
+                reply.chunks = _tee_into_cache(
+                    cache, key, reply.chunks, reply.mimetype, tags, generation
+                )
+            else:
+                cache.put(
+                    key, CachedResponse(reply.body, reply.mimetype, tags), generation
+                )
+            return reply
+
+        return wrapper
+
+    return decorator
+
+
+# Repassa os blocos ao cliente e guarda o corpo se couber no cache
+def _tee_into_cache(cache, key, chunks, mimetype, tags, generation):
+    parts = []
+    size = 0
+    for chunk in chunks:
+        if parts is not None:
+            size += len(chunk)
+            if size > cache.max_entry_bytes:
+                parts = None
+            else:
+                parts.append(chunk)
+        yield chunk
+    if parts is not None:
+        entry = CachedResponse(b"".join(parts), mimetype, tags)
+        cache.put(key, entry, generation)
+
+
+# Resposta em streaming: JSON array (ou NDJSON) escrito lote a lote
+def stream_listing(request: RequestData, batches, to_dict) -> Reply:
+    def generate_ndjson():
+        for batch in batches:
+            yield b"".join(dumps_bytes(to_dict(item)) + b"\n" for item in batch)
+
+    def generate_array():
+        separator = b"["
+        for batch in batches:
+            yield separator + b",".join(dumps_bytes(to_dict(item)) for item in batch)
+            separator = b","
+        yield b"]" if separator == b"," else b"[]"
+
+    if request.wants_ndjson():
+        return Reply(chunks=generate_ndjson(), mimetype=NDJSON_MIMETYPE)
+    return Reply(chunks=generate_array())
+
+
+# POST /products/bulk: o adaptador entrega o corpo como stream binário síncrono
+def bulk_add_products(services: Services, stream, mimetype: str) -> Reply:
+    if mimetype == NDJSON_MIMETYPE:
+        records = iter_ndjson(stream)
+    else:
+        records = iter_json_array(stream)
+    try:
+        report = ingest(records, product_from_json, services.products.add_products)
+    except ValueError as e:
+        # Recusa do serviço ou do repositório (ex.: catálogo somente leitura)
+        return error_reply(str(e), 400)
+    return json_reply(report, 201 if not report["failed"] else 200)
+
+
+def _scored_products(services: Services, results) -> list:
+    return [
+        {**services.product_listing_dict(product), "score": round(score, 4)}
+        for product, score in results
+    ]
+
+
+def create_routes(services: Services, config) -> List[Route]:
+    product_service = services.products
+    artisan_service = services.artisans
+    order_service = services.orders
+    review_service = services.reviews
+    ranking_service = services.rankings
+    analytics_service = services.analytics
+    response_cache = services.response_cache
+    product_listing_dict = services.product_listing_dict
+    routes: List[Route] = []
+
+    def route(rule, methods):
+        def decorator(handler):
+            routes.append(Route(rule, methods, handler))
+            return handler
+
+        return decorator
+
+    # --- Produtos ---
+    @route("/products", methods=["GET"])
+    @conditional("products", services.product_listing_version)
+    @cached(response_cache, lambda: [cache_tags.PRODUCTS_LIST, cache_tags.RATINGS])
+    def list_products(request):
+        try:
+            params = parse_page_params(request.args)
+            price = parse_price_params(request.args)
+            if params is not None:
+                if price is not None:
+                    page = product_service.list_products_by_price(*price, *params)
+                else:
+                    page = product_service.list_products_page(*params)
+                return json_reply(
+                    {
+                        "items": [product_listing_dict(p) for p in page.items],
+                        "next_cursor": page.next_cursor,
+                    }
+                )
+            if price is not None:
+                batches = product_service.iter_products_by_price_batches(*price)
+            else:
+                batches = product_service.iter_product_batches()
+        except ValueError as e:
+            return error_reply(str(e), 400)
+        return stream_listing(request, batches, product_listing_dict)
+
+    @route("/products", methods=["POST"])
+    def add_product(request):
+        data = request.json()
+        try:
+            product = product_from_json(data)
+            product_service.add_product(product)
+            return json_reply({"message": "Product added successfully"}, 201)
+        except ValueError as e:
+            return error_reply(str(e), 400)
+
+    @route("/products/search", methods=["GET"])
+    def search_products(request):
+        try:
+            limit = int(request.args.get("limit", SEARCH_DEFAULT_LIMIT))
+        except ValueError:
+            return error_reply("O parâmetro limit deve ser um número inteiro.", 400)
+        try:
+            results = product_service.search_products(request.args.get("q", ""), limit)
+        except ValueError as e:
+            return error_reply(str(e), 400)
+        return json_reply(_scored_products(services, results))
+
+    @route("/products/top", methods=["GET"])
+    @cached(
+        response_cache,
+        lambda: [cache_tags.PRODUCTS_LIST, cache_tags.RATINGS, cache_tags.SALES],
+    )
+    def top_products(request):
+        try:
+            limit = int(request.args.get("limit", TOP_DEFAULT_LIMIT))
+            artisan_id = request.args.get("artisan_id")
+            if artisan_id is not None:
+                artisan_id = int(artisan_id)
+        except ValueError:
+            return error_reply(
+                "Os parâmetros limit e artisan_id devem ser inteiros.", 400
+            )
+        try:
+            results = ranking_service.top_products(
+                request.args.get("by", "rating"), limit, artisan_id
+            )
+        except ValueError as e:
+            return error_reply(str(e), 400)
+        return json_reply(_scored_products(services, results))
+
+    @route("/products/<int:product_id>", methods=["GET"])
+    @conditional("products", product_service.products_version)
+    @cached(response_cache, lambda product_id: [cache_tags.product_tag(product_id)])
+    def get_product(request, product_id):
+        product = product_service.get_product(product_id)
+        if not product:
+            return error_reply("Produto não encontrado.", 404)
+        return json_reply(product_to_dict(product))
+
+    @route("/products/<int:product_id>/rating", methods=["GET"])
+    @conditional("ratings", review_service.ratings_version)
+    @cached(response_cache, lambda product_id: [cache_tags.rating_tag(product_id)])
+    def get_product_rating(request, product_id):
+        if not product_service.get_product(product_id):
+            return error_reply("Produto não encontrado.", 404)
+        return json_reply(rating_to_dict(review_service.get_product_rating(product_id)))
+
+    # --- Artesãos ---
+    @route("/artisans", methods=["POST"])
+    def create_artisan(request):
+        auth_error = require_auth(request)
+        if auth_error:
+            return auth_error
+
+        data = request.json()
+        if not data.get("name") or not data.get("email"):
+            return error_reply("Nome e email são obrigatórios.", 400)
+
+        try:
+            # O índice único de email do repositório rejeita duplicatas
+            artisan = artisan_service.create_artisan(data["name"], data["email"])
+            return json_reply(artisan_to_dict(artisan), 201)
+        except ValueError as e:
+            return error_reply(str(e), 400)
+
+    @route("/artisans/<int:artisan_id>", methods=["PUT"])
+    def update_artisan(request, artisan_id):
+        auth_error = require_auth(request)
+        if auth_error:
+            return auth_error
+
+        data = request.json()
+        try:
+            artisan = artisan_service.update_artisan(
+                artisan_id, name=data.get("name"), email=data.get("email")
+            )
+        except ValueError as e:
+            return error_reply(str(e), 400)
+        if not artisan:
+            return error_reply("Artesão não encontrado.", 404)
+
+        return json_reply(artisan_to_dict(artisan))
+
+    @route("/artisans/<int:artisan_id>", methods=["DELETE"])
+    def delete_artisan(request, artisan_id):
+        auth_error = require_auth(request)
+        if auth_error:
+            return auth_error
+
+        if not artisan_service.delete_artisan(artisan_id):
+            return error_reply("Artesão não encontrado.", 404)
+        return json_reply({"message": "Artesão removido com sucesso."})
+
+    @route("/artisans", methods=["GET"])
+    @conditional("artisans", artisan_service.artisans_version)
+    @cached(response_cache, lambda: [cache_tags.ARTISANS_LIST])
+    def list_artisans(request):
+        try:
+            params = parse_page_params(request.args)
+            if params is not None:
+                page = artisan_service.list_artisans_page(*params)
+                return json_reply(
+                    {
+                        "items": [artisan_to_dict(a) for a in page.items],
+                        "next_cursor": page.next_cursor,
+                    }
+                )
+        except ValueError as e:
+            return error_reply(str(e), 400)
+        return stream_listing(
+            request, artisan_service.iter_artisan_batches(), artisan_to_dict
+        )
+
+    @route("/artisans/<int:artisan_id>/products", methods=["GET"])
+    @conditional("products", services.product_listing_version)
+    @cached(
+        response_cache,
+        lambda artisan_id: [
+            cache_tags.artisan_products_tag(artisan_id),
+            cache_tags.RATINGS,
+        ],
+    )
+    def list_artisan_products(request, artisan_id):
+        products = product_service.list_products_by_artisan(artisan_id)
+        return json_reply([product_listing_dict(product) for product in products])
+
+    # --- Pedidos (Orders) ---
+    @route("/orders", methods=["POST"])
+    def create_order(request):
+        auth_error = require_auth(request)
+        if auth_error:
+            return auth_error
+
+        try:
+            order = order_service.place_order(*order_from_json(request.json()))
+            return json_reply(order_summary_to_dict(order), 201)
+        except ValueError as e:
+            return error_reply(str(e), 400)
+
+    @route("/orders/batch", methods=["POST"])
+    def create_orders(request):
+        auth_error = require_auth(request)
+        if auth_error:
+            return auth_error
+
+        # Valida todos os pedidos e grava todos ou nenhum
+        try:
+            batch = order_batch_from_json(
+                request.json(), config["ORDER_BATCH_MAX_SIZE"]
+            )
+            orders = order_service.place_orders(batch)
+        except OrderBatchError as e:
+            return json_reply(order_batch_errors(e), 400)
+        except ValueError as e:
+            return error_reply(str(e), 400)
+        return json_reply(
+            {
+                "created": len(orders),
+                "orders": [order_summary_to_dict(order) for order in orders],
+            },
+            201,
+        )
+
+    @route("/orders/<int:order_id>", methods=["PUT"])
+    def update_order(request, order_id):
+        auth_error = require_auth(request)
+        if auth_error:
+            return auth_error
+
+        try:
+            customer_id, items = order_revision_from_json(request.json())
+            order = order_service.revise_order(order_id, customer_id, items)
+        except ValueError as e:
+            return error_reply(str(e), 400)
+        if not order:
+            return error_reply("Pedido não encontrado.", 404)
+
+        return json_reply(order_summary_to_dict(order))
+
+    @route("/orders/<int:order_id>", methods=["DELETE"])
+    def delete_order(request, order_id):
+        auth_error = require_auth(request)
+        if auth_error:
+            return auth_error
+
+        if not order_service.delete_order(order_id):
+            return error_reply("Pedido não encontrado.", 404)
+        return json_reply({"message": "Pedido removido com sucesso."})
+
+    @route("/orders/<int:order_id>", methods=["GET"])
+    @cached(
+        response_cache,
+        # Os itens trazem os dados atuais do catálogo
+        lambda order_id: [cache_tags.order_tag(order_id), cache_tags.PRODUCTS_LIST],
+        auth=True,
+    )
+    def get_order(request, order_id):
+        order = order_service.get_order(order_id)
+        if not order:
+            return error_reply("Pedido não encontrado.", 404)
+
+        products = order_service.line_products(order)
+        return json_reply(order_to_dict(order, products))
+
+    # --- Avaliações (Reviews) ---
+    @route("/reviews", methods=["POST"])
+    def create_review(request):
+        auth_error = require_auth(request)
+        if auth_error:
+            return auth_error
+
+        data = request.json()
+        required_fields = ["product_id", "customer_id", "rating", "comment"]
+        if not all(field in data for field in required_fields):
+            return error_reply(
+                "Todos os campos são obrigatórios: product_id, customer_id, rating, comment.",
+                400,
+            )
+
+        try:
+            review = Review(
+                id=review_service.next_review_id(),
+                product_id=data["product_id"],
+                customer_id=data["customer_id"],
+                rating=data["rating"],
+                comment=data["comment"],
+            )
+            review_service.add_review(review)
+            return json_reply(review_to_dict(review), 201)
+        except ValueError as e:
+            return error_reply(str(e), 400)
+
+    @route("/reviews/<int:review_id>", methods=["PUT"])
+    def update_review(request, review_id):
+        auth_error = require_auth(request)
+        if auth_error:
+            return auth_error
+
+        review = review_service.get_review(review_id)
+        if not review:
+            return error_reply("Avaliação não encontrada.", 404)
+
+        data = request.json()
+        try:
+            # replace() refaz a validação da nota em __post_init__
+            review = replace(
+                review,
+                rating=data.get("rating", review.rating),
+                comment=data.get("comment", review.comment),
+            )
+        except ValueError as e:
+            return error_reply(str(e), 400)
+        review_service.update_review(review)
+
+        return json_reply(review_to_dict(review))
+
+    @route("/reviews/<int:review_id>", methods=["DELETE"])
+    def delete_review(request, review_id):
+        auth_error = require_auth(request)
+        if auth_error:
+            return auth_error
+
+        if not review_service.delete_review(review_id):
+            return error_reply("Avaliação não encontrada.", 404)
+        return json_reply({"message": "Avaliação removida com sucesso."})
+
+    # --- Análises de vendas ---
+    @route("/analytics/revenue/<group>", methods=["GET"])
+    @cached(response_cache, lambda group: [cache_tags.SALES], auth=True)
+    def revenue_by(request, group):
+        if group not in REVENUE_DIMENSIONS:
+            return error_reply("Agrupamento não encontrado.", 404)
+        dimension, key_field = REVENUE_DIMENSIONS[group]
+        try:
+            limit = int(request.args.get("limit", ANALYTICS_DEFAULT_LIMIT))
+        except ValueError:
+            return error_reply("O parâmetro limit deve ser um número inteiro.", 400)
+        try:
+            groups = analytics_service.revenue_by(dimension, limit)
+        except ValueError as e:
+            return error_reply(str(e), 400)
+        return json_reply(
+            [
+                {key_field: g.key, "revenue": round(g.revenue, 2), "units": g.units}
+                for g in groups
+            ]
+        )
+
+    @route("/analytics/orders/average-value", methods=["GET"])
+    @cached(response_cache, lambda: [cache_tags.SALES], auth=True)
+    def average_order_value(request):
+        summary = analytics_service.order_value()
+        return json_reply(
+            {
+                "orders": summary.orders,
+                "revenue": round(summary.revenue, 2),
+                "average_order_value": (
+                    None if summary.average is None else round(summary.average, 2)
+                ),
+            }
+        )
+
+    # --- Cache de respostas ---
+    @route("/cache/stats", methods=["GET"])
+    def cache_stats(request):
+        if response_cache is None:
+            return json_reply({"enabled": False})
+        return json_reply({"enabled": True, **response_cache.stats()})
+
+    return routes
@@ -0,0 +1,454 @@
+import math
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Métricas da aplicação no formato de texto do Prometheus (GET /metrics).
+#
+# Cada métrica guarda seus valores em células por thread: quem registra só
+# escreve nas células da própria thread, sem lock nem disputa entre threads;
+# o lock só é tomado ao criar as células de uma thread nova e na leitura,
+# que soma todas. É o que permite deixar as métricas ligadas em produção.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Limites superiores (segundos) dos buckets de latência; +Inf é implícito
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Rótulo de rota das requisições que não casaram com nenhuma rota (404/405);
+# usar o caminho cru deixaria a cardinalidade nas mãos do cliente
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class _ThreadOwner:
+    """Objeto guardado no threading.local: é coletado quando a thread acaba."""
+
+
+class _Shards:
+    """Células de contagem, uma lista por thread; base dos valores das métricas.
+
+    Quando uma thread termina, as células dela são somadas ao total das
+    threads encerradas e descartadas: servidores que criam uma thread por
+    requisição não acumulam células.
+    """
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live: Dict[int, List[float]] = {}
+        self._retired: List[float] = [0] * size
+
+    # Caminho rápido das subclasses: self._local.cells, com _register() só
+    # na primeira escrita de cada thread (AttributeError)
+    def _register(self) -> List[float]:
+        cells = [0] * self._size
+        owner = _ThreadOwner()
+        with self._lock:
+            self._live[id(cells)] = cells
+        self._local.cells = cells
+        self._local.owner = owner
+        weakref.finalize(owner, self._retire, cells)
+        return cells
+
+    def _retire(self, cells: List[float]):
+        with self._lock:
+            self._live.pop(id(cells), None)
+            for i, value in enumerate(cells):
+                self._retired[i] += value
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            totals = list(self._retired)
+            for cells in self._live.values():
+                for i, value in enumerate(cells):
+                    totals[i] += value
+        return totals
+
+
+class _CounterChild(_Shards):
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount: float = 1):
+        try:
+            self._local.cells[0] += amount
+        except AttributeError:
+            self._register()[0] += amount
+
+    def value(self) -> float:
+        return self.totals()[0]
+
+
+class _GaugeChild(_CounterChild):
+    def dec(self, amount: float = 1):
+        try:
+            self._local.cells[0] -= amount
+        except AttributeError:
+            self._register()[0] -= amount
+
+
+class _HistogramChild(_Shards):
+    def __init__(self, buckets: Tuple[float, ...]):
+        # Uma célula por bucket, mais +Inf e a soma das observações
+        super().__init__(len(buckets) + 2)
+        self._buckets = buckets
+
+    def observe(self, value: float):
+        try:
+            cells = self._local.cells
+        except AttributeError:
+            cells = self._register()
+        cells[bisect_left(self._buckets, value)] += 1
+        cells[-1] += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        """Contagens cumulativas por bucket (a última é +Inf) e a soma."""
+        totals = self.totals()
+        cumulative = []
+        count = 0
+        for value in totals[:-1]:
+            count += value
+            cumulative.append(count)
+        return cumulative, totals[-1]
+
+
+class _Family:
+    """Métrica com rótulos: um filho por combinação de valores."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(
+                    f"A métrica {self.name} espera os rótulos {self.label_names}."
+                )
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def _items(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for values, child in self._items():
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _labels(self, values: Tuple[str, ...], *extra: Tuple[str, str]) -> str:
+        pairs = list(zip(self.label_names, values)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs) + "}"
+
+    def _render_child(self, values: Tuple[str, ...], child) -> Iterable[str]:
+        yield f"{self.name}{self._labels(values)} {_format(child.value())}"
+
+
+class Counter(_Family):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+
+class Gauge(_Family):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+
+class Histogram(_Family):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Tuple[str, ...],
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def _render_child(
+        self, values: Tuple[str, ...], child: _HistogramChild
+    ) -> Iterable[str]:
+        cumulative, total = child.snapshot()
+        for bound, count in zip(self.buckets + (math.inf,), cumulative):
+            bucket_labels = self._labels(values, ("le", _format(bound)))
+            yield f"{self.name}_bucket{bucket_labels} {_format(count)}"
+        labels = self._labels(values)
+        yield f"{self.name}_sum{labels} {_format(total)}"
+        yield f"{self.name}_count{labels} {_format(cumulative[-1])}"
+
+
+class CountOf(_Family):
+    """Contador derivado: o _count de cada série de um histograma.
+
+    Evita registrar duas vezes o mesmo evento quando já existe um histograma
+    com os mesmos rótulos.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, histogram: Histogram):
+        super().__init__(name, documentation, histogram.label_names)
+        self._histogram = histogram
+
+    def labels(self, *values: str):
+        raise ValueError(f"A métrica {self.name} é derivada de {self._histogram.name}.")
+
+    def _items(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        return self._histogram._items()
+
+    def _render_child(
+        self, values: Tuple[str, ...], child: _HistogramChild
+    ) -> Iterable[str]:
+        cumulative, _ = child.snapshot()
+        yield f"{self.name}{self._labels(values)} {_format(cumulative[-1])}"
+
+
+class MetricsRegistry:
+    """Conjunto de métricas de um app, exposto por render()."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Family] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Family) -> _Family:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Métrica já registrada: {metric.name}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, label_names: Tuple[str, ...] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(
+        self, name: str, documentation: str, label_names: Tuple[str, ...] = ()
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def count_of(self, name: str, documentation: str, histogram: Histogram) -> CountOf:
+        return self._register(CountOf(name, documentation, histogram))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == int(value) and abs(value) < 2**53:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return _escape_help(value).replace('"', '\\"')
+
+
+class HttpMetrics:
+    """Métricas de requisição comuns aos adaptadores Flask e ASGI."""
+
+    def __init__(self, registry: MetricsRegistry):
+        labels = ("method", "route", "status")
+        self.duration = registry.histogram(
+            "http_request_duration_seconds",
+            "Duração das requisições HTTP até o fim do corpo da resposta.",
+            labels,
+        )
+        # Contado pelo próprio histograma: uma escrita a menos por requisição
+        self.requests = registry.count_of(
+            "http_requests_total", "Requisições HTTP respondidas.", self.duration
+        )
+        self.errors = registry.counter(
+            "http_request_errors_total",
+            "Requisições HTTP respondidas com erro do servidor (5xx).",
+            labels,
+        )
+        self.in_flight = registry.gauge(
+            "http_requests_in_flight", "Requisições HTTP em andamento."
+        ).labels()
+
+    def start(self) -> float:
+        self.in_flight.inc()
+        return time.perf_counter()
+
+    def finish(self, method: str, route: str, status: int, started: float):
+        elapsed = time.perf_counter() - started
+        self.in_flight.dec()
+        labels = (method, route, str(status))
+        self.duration.labels(*labels).observe(elapsed)
+        if status >= 500:
+            self.errors.labels(*labels).inc()
+
+
+# Chave do environ WSGI onde o app anota a regra da rota atendida
+ROUTE_ENVIRON_KEY = "artisan_link.route"
+
+
+class MetricsMiddleware:
+    """Middleware WSGI que mede cada requisição até o fechamento do corpo.
+
+    O tempo inclui respostas em streaming; exceções que escapam do app
+    contam como 500.
+    """
+
+    def __init__(self, app: Callable, metrics: HttpMetrics):
+        self.app = app
+        self._metrics = metrics
+
+    def __call__(self, environ: dict, start_response: Callable):
+        started = self._metrics.start()
+        status = [500]
+
+        def capture_status(status_line, headers, exc_info=None):
+            status[0] = int(status_line.split(" ", 1)[0])
+            return start_response(status_line, headers, exc_info)
+
+        def finish():
+            self._metrics.finish(
+                environ["REQUEST_METHOD"],
+                environ.get(ROUTE_ENVIRON_KEY, UNMATCHED_ROUTE),
+                status[0],
+                started,
+            )
+
+        try:
+            body = self.app(environ, capture_status)
+        except BaseException:
+            finish()
+            raise
+        return ClosingBody(body, finish)
+
+
+class ClosingBody:
+    """Repassa o corpo WSGI e chama on_close uma vez quando o servidor o fecha."""
+
+    def __init__(self, body: Iterable[bytes], on_close: Callable[[], None]):
+        self._body = body
+        self._on_close: Optional[Callable[[], None]] = on_close
+
+    def __iter__(self):
+        return iter(self._body)
+
+    def close(self):
+        try:
+            close = getattr(self._body, "close", None)
+            if close is not None:
+                close()
+        finally:
+            on_close, self._on_close = self._on_close, None
+            if on_close is not None:
+                on_close()
+
+
+class InstrumentedRepository:
+    """Mede a duração de cada chamada a um repositório.
+
+    Envolve qualquer implementação das portas de saída; o método medido é
+    criado no primeiro acesso e guardado na instância, então as chamadas
+    seguintes não passam mais por __getattr__.
+    """
+
+    def __init__(self, repository: Any, name: str, durations: Histogram):
+        self._repository = repository
+        self._name = name
+        self._durations = durations
+
+    def __getattr__(self, operation: str):
+        attribute = getattr(self._repository, operation)
+        if not callable(attribute):
+            return attribute
+        timer = self._durations.labels(self._name, operation)
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                timer.observe(time.perf_counter() - started)
+
+        timed.__name__ = operation
+        setattr(self, operation, timed)
+        return timed
+
+
+def instrument_repositories(
+    registry: MetricsRegistry, repositories: Dict[str, Any]
+) -> List[InstrumentedRepository]:
+    durations = registry.histogram(
+        "repository_operation_duration_seconds",
+        "Duração das operações dos repositórios.",
+        ("repository", "operation"),
+    )
+    return [
+        InstrumentedRepository(repository, name, durations)
+        for name, repository in repositories.items()
+    ]
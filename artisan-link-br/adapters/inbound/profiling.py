@@ -0,0 +1,231 @@
+import hashlib
+import hmac
+import itertools
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Optional
+
+from adapters.inbound.metrics import ROUTE_ENVIRON_KEY, UNMATCHED_ROUTE, ClosingBody
+
+# Profiler de amostragem para requisições de produção.
+#
+# Só uma fração das requisições é perfilada (1 a cada N, ou as que trazem o
+# cabeçalho de depuração assinado). Uma thread amostradora lê, a cada
+# intervalo, a pilha Python das threads dessas requisições via
+# sys._current_frames(); a requisição em si não é instrumentada, então o
+# custo fica na thread amostradora e só enquanto há requisições perfiladas.
+# As pilhas são agregadas por rota em arquivos no formato "collapsed"
+# (frame;frame;frame contagem), lido por flamegraph.pl e speedscope.
+
+# Cabeçalho "<expira em, epoch>.<HMAC-SHA256 hex>" que força o profile
+PROFILE_HEADER = "X-Profile-Request"
+_PROFILE_ENVIRON_KEY = "HTTP_" + PROFILE_HEADER.upper().replace("-", "_")
+
+COLLAPSED_SUFFIX = ".collapsed"
+
+
+def sign_profile_request(secret: str, expires: int) -> str:
+    """Valor do cabeçalho X-Profile-Request válido até o instante expires."""
+    digest = hmac.new(secret.encode(), str(expires).encode(), hashlib.sha256)
+    return f"{expires}.{digest.hexdigest()}"
+
+
+def verify_profile_request(secret: str, value: str, now: float) -> bool:
+    expires, _, signature = value.partition(".")
+    if not expires.isdigit() or int(expires) < now:
+        return False
+    expected = sign_profile_request(secret, int(expires)).partition(".")[2]
+    return hmac.compare_digest(expected, signature)
+
+
+class _Session:
+    __slots__ = ("thread_id", "samples")
+
+    def __init__(self, thread_id: int):
+        self.thread_id = thread_id
+        self.samples: Counter = Counter()
+
+
+class SamplingProfiler:
+    """Amostra a pilha das threads registradas e grava por rota em disco.
+
+    Cada rota tem um arquivo <método>_<rota>.collapsed; ao passar de
+    max_file_bytes ele é rotacionado para .1, .2, ... e só os max_files
+    arquivos antigos mais recentes são mantidos.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        interval: float = 0.005,
+        max_file_bytes: int = 10 * 1024 * 1024,
+        max_files: int = 5,
+    ):
+        if interval <= 0:
+            raise ValueError("O intervalo de amostragem deve ser positivo.")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.interval = interval
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self._sessions: Dict[int, _Session] = {}
+        self._frame_labels: Dict[object, str] = {}
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self) -> _Session:
+        """Passa a amostrar a thread atual até stop()."""
+        session = _Session(threading.get_ident())
+        with self._condition:
+            if self._sampler is None:
+                self._sampler = threading.Thread(
+                    target=self._run, name="artisan-link-profiler", daemon=True
+                )
+                self._sampler.start()
+            self._sessions[id(session)] = session
+            self._condition.notify()
+        return session
+
+    def stop(self, session: _Session, method: str, route: str):
+        with self._condition:
+            self._sessions.pop(id(session), None)
+            samples = Counter(session.samples)
+        if samples:
+            self._append(f"{method} {route}", samples)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._sessions and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+            time.sleep(self.interval)
+            with self._condition:
+                sessions = list(self._sessions.values())
+            frames = sys._current_frames()
+            stacks = []
+            for session in sessions:
+                frame = frames.get(session.thread_id)
+                if frame is not None:
+                    stacks.append((session, self._collapse(frame)))
+            del frames
+            # conta sob o lock e só para sessões ainda ativas: depois que
+            # stop() remove a sessão, samples não muda mais
+            with self._condition:
+                for session, stack in stacks:
+                    if id(session) in self._sessions:
+                        session.samples[stack] += 1
+
+    def _collapse(self, frame) -> str:
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._frame_labels.get(code)
+            if label is None:
+                label = self._frame_labels[code] = _frame_label(code)
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return ";".join(labels)
+
+    def path_for(self, key: str) -> str:
+        name = re.sub(r"[^A-Za-z0-9]+", "_", key).strip("_")
+        return os.path.join(self.directory, name + COLLAPSED_SUFFIX)
+
+    def _append(self, key: str, samples: Counter):
+        data = "".join(f"{stack} {count}\n" for stack, count in samples.items())
+        data = data.encode("utf-8", "backslashreplace")
+        path = self.path_for(key)
+        with self._write_lock:
+            try:
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                size = 0
+            if size and size + len(data) > self.max_file_bytes:
+                self._rotate(path)
+            with open(path, "ab") as f:
+                f.write(data)
+
+    def _rotate(self, path: str):
+        # path.N-1 -> path.N, ..., path -> path.1; o mais antigo é descartado
+        if self.max_files == 0:
+            os.remove(path)
+            return
+        for index in range(self.max_files - 1, 0, -1):
+            if os.path.exists(f"{path}.{index}"):
+                os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+        os.replace(path, f"{path}.1")
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    for prefix in sys.path:
+        if prefix and filename.startswith(prefix + os.sep):
+            filename = filename[len(prefix) + 1 :]
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class ProfilingMiddleware:
+    """Middleware WSGI que perfila 1 a cada sample_every requisições e as
+    que trazem um X-Profile-Request assinado com secret.
+
+    sample_every=0 desliga a amostragem periódica; sem secret o cabeçalho é
+    ignorado. A rota do arquivo é a regra anotada no environ pelo app.
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        profiler: SamplingProfiler,
+        sample_every: int = 0,
+        secret: Optional[str] = None,
+    ):
+        self.app = app
+        self.profiler = profiler
+        self._sample_every = sample_every
+        self._secret = secret
+        self._requests = itertools.count(1)
+
+    def _wanted(self, environ: dict) -> bool:
+        if self._sample_every and next(self._requests) % self._sample_every == 0:
+            return True
+        header = environ.get(_PROFILE_ENVIRON_KEY)
+        return bool(
+            header
+            and self._secret
+            and verify_profile_request(self._secret, header, time.time())
+        )
+
+    def __call__(self, environ: dict, start_response: Callable):
+        if not self._wanted(environ):
+            return self.app(environ, start_response)
+        session = self.profiler.start()
+
+        def finish():
+            self.profiler.stop(
+                session,
+                environ["REQUEST_METHOD"],
+                environ.get(ROUTE_ENVIRON_KEY, UNMATCHED_ROUTE),
+            )
+
+        try:
+            body = self.app(environ, start_response)
+        except BaseException:
+            finish()
+            raise
+        return ClosingBody(body, finish)
@@ -0,0 +1,117 @@
+import json
+from typing import Any, Dict
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+
+# --- Backend JSON: orjson quando instalado, senão a biblioteca padrão ---
+if orjson is not None:
+    JSON_BACKEND = "orjson"
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    loads = orjson.loads
+
+else:
+    JSON_BACKEND = "json"
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return _encoder.encode(obj).encode()
+
+    loads = json.loads
+
+
+# Dict literal por entidade: mais rápido que __dict__/asdict ou laços sobre
+# os campos a cada chamada
+
+
+def product_to_dict(product) -> Dict[str, Any]:
+    return {
+        "id": product.id,
+        "artisan_id": product.artisan_id,
+        "name": product.name,
+        "description": product.description,
+        "price": product.price,
+    }
+
+
+def artisan_to_dict(artisan) -> Dict[str, Any]:
+    return {"id": artisan.id, "name": artisan.name, "email": artisan.email}
+
+
+def review_to_dict(review) -> Dict[str, Any]:
+    return {
+        "id": review.id,
+        "product_id": review.product_id,
+        "customer_id": review.customer_id,
+        "rating": review.rating,
+        "comment": review.comment,
+    }
+
+
+def order_summary_to_dict(order) -> Dict[str, Any]:
+    return {"id": order.id, "customer_id": order.customer_id, "total": order.total}
+
+
+def order_line_to_dict(line) -> Dict[str, Any]:
+    return {
+        "product_id": line.product_id,
+        "quantity": line.quantity,
+        "unit_price": line.unit_price,
+    }
+
+
+def rating_to_dict(summary) -> Dict[str, Any]:
+    return {
+        "product_id": summary.product_id,
+        "count": summary.count,
+        "sum": summary.total,
+        "mean": summary.mean,
+        "histogram": {
+            str(rating): count for rating, count in enumerate(summary.histogram, 1)
+        },
+    }
+
+
+def rating_brief_to_dict(summary) -> Dict[str, Any]:
+    return {"count": summary.count, "mean": summary.mean}
+
+
+def order_to_dict(order, products: Dict[int, Any]) -> Dict[str, Any]:
+    # products: catálogo das linhas (OrderService.line_products); um item cujo
+    # produto saiu do catálogo sai com "product": null
+    lines = []
+    for line in order.lines:
+        item = order_line_to_dict(line)
+        product = products.get(line.product_id)
+        item["product"] = None if product is None else product_to_dict(product)
+        lines.append(item)
+    return {
+        "id": order.id,
+        "customer_id": order.customer_id,
+        "lines": lines,
+        "total": order.total,
+    }
+
+
+class FastJSONProvider(JSONProvider):
+    """Provider do Flask que usa o backend acima em jsonify e request.json."""
+
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps_bytes(obj).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
@@ -0,0 +1,261 @@
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional, Tuple
+from adapters.outbound.repository import price_window
+from core.entities import Product
+from ports.outbound import ProductRepositoryPort
+
+# Snapshot binário do catálogo, feito para ser aberto com mmap.
+#
+#   cabeçalho     mágico, versão do formato, versão do catálogo, contagem e
+#                 deslocamento de cada seção
+#   registros     um por produto, largura fixa, em ordem de id
+#   ids           int64 ordenados: índice primário (linha = posição)
+#   por preço     uint32 com as linhas ordenadas por (price, id)
+#   por artesão   uint32 com as linhas ordenadas por (artisan_id, id)
+#   heap          nome e descrição de cada produto em UTF-8, lado a lado
+#
+# Tudo em little-endian e alinhado em 8 bytes; as seções numéricas são lidas
+# como memoryview sobre o mapa, sem cópia nem decodificação na abertura.
+
+MAGIC = b"ALCS"
+FORMAT_VERSION = 1
+
+# magic, formato, versão do catálogo, produtos, registros, ids, por preço,
+# por artesão, heap, tamanho do heap
+_HEADER = struct.Struct("<4sIQQQQQQQQ")
+# id, artisan_id, price, início no heap, bytes do nome, bytes da descrição
+_RECORD = struct.Struct("<qqdQII")
+_RECORD_KEYS = struct.Struct("<qqd")
+
+READ_ONLY_ERROR = "O catálogo é somente leitura."
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_catalog_snapshot(
+    path: str, products: Iterable[Product], version: Optional[int] = None
+) -> int:
+    """Grava o catálogo no formato mapeável e devolve o número de produtos.
+
+    Ids repetidos ficam com o último produto. A versão do catálogo vira o
+    version() do repositório; por padrão é o instante da gravação, então
+    snapshots mais novos nunca repetem um ETag antigo.
+    """
+    by_id = {product.id: product for product in products}
+    ids = sorted(by_id)
+    count = len(ids)
+    records = bytearray(count * _RECORD.size)
+    heap = bytearray()
+    for row, product_id in enumerate(ids):
+        product = by_id[product_id]
+        name = product.name.encode("utf-8", "surrogatepass")
+        description = product.description.encode("utf-8", "surrogatepass")
+        _RECORD.pack_into(
+            records,
+            row * _RECORD.size,
+            product.id,
+            product.artisan_id,
+            float(product.price),
+            len(heap),
+            len(name),
+            len(description),
+        )
+        heap += name
+        heap += description
+
+    products_by_row = [by_id[product_id] for product_id in ids]
+    price_rows = array(
+        "I",
+        sorted(
+            range(count),
+            key=lambda row: (float(products_by_row[row].price), ids[row]),
+        ),
+    )
+    artisan_rows = array(
+        "I",
+        sorted(
+            range(count), key=lambda row: (products_by_row[row].artisan_id, ids[row])
+        ),
+    )
+
+    sections = [
+        bytes(records),
+        _little_endian(array("q", ids)),
+        _little_endian(price_rows),
+        _little_endian(artisan_rows),
+        bytes(heap),
+    ]
+    offsets = []
+    offset = _align(_HEADER.size)
+    for section in sections:
+        offsets.append(offset)
+        offset = _align(offset + len(section))
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        time.time_ns() if version is None else version,
+        count,
+        *offsets,
+        len(heap),
+    )
+
+    # Grava ao lado e renomeia: quem já mapeou o arquivo antigo não é afetado
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for section_offset, section in zip(offsets, sections):
+            f.write(b"\0" * (section_offset - f.tell()))
+            f.write(section)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return count
+
+
+class MappedProductRepository(ProductRepositoryPort):
+    """Catálogo somente leitura sobre um snapshot mapeado em memória.
+
+    Abrir custa o mesmo para qualquer tamanho de catálogo: só o cabeçalho é
+    lido, e as páginas do arquivo entram conforme são acessadas. Cada Product
+    é decodificado do registro e do heap quando pedido. Não há escrita, então
+    leituras de várias threads não precisam de lock.
+    """
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise ValueError("Snapshots de catálogo exigem uma máquina little-endian.")
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"Snapshot de catálogo inválido: {path}")
+        (
+            magic,
+            format_version,
+            self._version,
+            self._count,
+            self._records_offset,
+            ids_offset,
+            price_offset,
+            artisan_offset,
+            self._heap_offset,
+            heap_size,
+        ) = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Snapshot de catálogo inválido: {path}")
+        if format_version != FORMAT_VERSION:
+            raise ValueError(
+                f"Versão do snapshot de catálogo não suportada: {format_version}"
+            )
+        if len(self._map) < self._heap_offset + heap_size:
+            raise ValueError(f"Snapshot de catálogo truncado: {path}")
+        view = memoryview(self._map)
+        self._ids = view[ids_offset : ids_offset + 8 * self._count].cast("q")
+        self._price_rows = view[price_offset : price_offset + 4 * self._count].cast("I")
+        self._artisan_rows = view[
+            artisan_offset : artisan_offset + 4 * self._count
+        ].cast("I")
+
+    def close(self):
+        for index in (self._ids, self._price_rows, self._artisan_rows):
+            index.release()
+        self._map.close()
+
+    def _product(self, row: int) -> Product:
+        product_id, artisan_id, price, text, name_size, description_size = (
+            _RECORD.unpack_from(self._map, self._records_offset + row * _RECORD.size)
+        )
+        start = self._heap_offset + text
+        middle = start + name_size
+        return Product(
+            id=product_id,
+            artisan_id=artisan_id,
+            name=str(self._map[start:middle], "utf-8", "surrogatepass"),
+            description=str(
+                self._map[middle : middle + description_size], "utf-8", "surrogatepass"
+            ),
+            price=price,
+        )
+
+    def _price_key(self, row: int) -> Tuple[float, int]:
+        product_id, _, price = _RECORD_KEYS.unpack_from(
+            self._map, self._records_offset + row * _RECORD.size
+        )
+        return (price, product_id)
+
+    def _artisan_id(self, row: int) -> int:
+        return _RECORD_KEYS.unpack_from(
+            self._map, self._records_offset + row * _RECORD.size
+        )[1]
+
+    def _row(self, product_id: int) -> Optional[int]:
+        row = bisect_left(self._ids, product_id)
+        if row < self._count and self._ids[row] == product_id:
+            return row
+        return None
+
+    def save(self, product: Product):
+        raise ValueError(READ_ONLY_ERROR)
+
+    def save_many(self, products: Iterable[Product]):
+        raise ValueError(READ_ONLY_ERROR)
+
+    def update(self, product: Product) -> bool:
+        raise ValueError(READ_ONLY_ERROR)
+
+    def delete(self, product_id: int) -> bool:
+        raise ValueError(READ_ONLY_ERROR)
+
+    def list_all(self) -> List[Product]:
+        return [self._product(row) for row in range(self._count)]
+
+    def get_by_id(self, product_id: int) -> Optional[Product]:
+        row = self._row(product_id)
+        return None if row is None else self._product(row)
+
+    def get_many(self, product_ids: Iterable[int]) -> List[Product]:
+        rows = (self._row(product_id) for product_id in product_ids)
+        return [self._product(row) for row in rows if row is not None]
+
+    def list_by_artisan(self, artisan_id: int) -> List[Product]:
+        rows = self._artisan_rows
+        lo = bisect_left(rows, artisan_id, key=self._artisan_id)
+        hi = bisect_right(rows, artisan_id, lo=lo, key=self._artisan_id)
+        return [self._product(rows[i]) for i in range(lo, hi)]
+
+    def list_page(self, after_id: Optional[int], limit: int) -> List[Product]:
+        start = 0 if after_id is None else bisect_right(self._ids, after_id)
+        return [
+            self._product(row) for row in range(start, min(start + limit, self._count))
+        ]
+
+    def list_by_price(
+        self,
+        min_price: float,
+        max_price: float,
+        descending: bool,
+        after: Optional[Tuple[float, int]],
+        limit: int,
+    ) -> List[Product]:
+        rows = self._price_rows
+        window = price_window(
+            rows, min_price, max_price, descending, after, limit, key=self._price_key
+        )
+        return [self._product(rows[i]) for i in window]
+
+    def version(self) -> int:
+        return self._version
@@ -0,0 +1,200 @@
+import functools
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+from adapters.outbound.concurrency import merge_sorted
+from adapters.outbound.repository import price_window
+from core.entities import Product
+from ports.outbound import ProductRepositoryPort
+
+
+def _locked(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class ProductStore(ProductRepositoryPort):
+    """Catálogo em colunas: arrays tipados para números e strings internadas.
+
+    Cada produto ocupa uma linha; os objetos Product só são criados na
+    leitura. Linhas removidas entram numa lista livre e são reaproveitadas.
+    Como as linhas são reescritas no lugar, leituras e escritas passam pelo
+    mesmo lock: um leitor nunca monta um produto com colunas misturadas.
+    """
+
+    def __init__(self):
+        self._ids = array("q")
+        self._artisan_ids = array("q")
+        self._prices = array("d")
+        self._names: List[Optional[str]] = []
+        self._descriptions: List[Optional[str]] = []
+        self._free_rows: List[int] = []
+        self._rows: Dict[int, int] = {}
+        # artisan_id -> linhas do artesão, em ordem de inserção
+        self._artisan_rows: Dict[int, array] = {}
+        self._sorted_ids = array("q")
+        # Linhas ordenadas por (price, id): índice secundário de 8 bytes/produto
+        self._price_rows = array("q")
+        self._version = 0
+        self._lock = threading.RLock()
+
+    def _price_key(self, row: int) -> Tuple[float, int]:
+        return (self._prices[row], self._ids[row])
+
+    def _link_price(self, row: int):
+        insort(self._price_rows, row, key=self._price_key)
+
+    def _unlink_price(self, row: int):
+        index = bisect_left(self._price_rows, self._price_key(row), key=self._price_key)
+        del self._price_rows[index]
+
+    def _product(self, row: int) -> Product:
+        return Product(
+            id=self._ids[row],
+            artisan_id=self._artisan_ids[row],
+            name=self._names[row],
+            description=self._descriptions[row],
+            price=self._prices[row],
+        )
+
+    def _write(self, row: int, product: Product):
+        self._artisan_ids[row] = product.artisan_id
+        self._prices[row] = product.price
+        self._names[row] = sys.intern(product.name)
+        self._descriptions[row] = sys.intern(product.description)
+        rows = self._artisan_rows.get(product.artisan_id)
+        if rows is None:
+            rows = self._artisan_rows[product.artisan_id] = array("q")
+        rows.append(row)
+
+    def _unlink_artisan(self, row: int):
+        artisan_id = self._artisan_ids[row]
+        rows = self._artisan_rows[artisan_id]
+        rows.remove(row)
+        if not rows:
+            del self._artisan_rows[artisan_id]
+
+    def _insert(self, product: Product):
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._ids[row] = product.id
+        else:
+            row = len(self._ids)
+            self._ids.append(product.id)
+            self._artisan_ids.append(0)
+            self._prices.append(0.0)
+            self._names.append(None)
+            self._descriptions.append(None)
+        self._rows[product.id] = row
+        self._write(row, product)
+
+    @_locked
+    def save(self, product: Product):
+        row = self._rows.get(product.id)
+        if row is not None:
+            self._unlink_artisan(row)
+            self._unlink_price(row)
+            self._write(row, product)
+        else:
+            self._insert(product)
+            row = self._rows[product.id]
+            insort(self._sorted_ids, product.id)
+        self._link_price(row)
+        self._version += 1
+
+    @_locked
+    def save_many(self, products: Iterable[Product]):
+        new_ids = []
+        # Linhas escritas neste lote; entram no índice de preço só no final
+        pending = set()
+        for product in products:
+            row = self._rows.get(product.id)
+            if row is not None:
+                self._unlink_artisan(row)
+                if row not in pending:
+                    self._unlink_price(row)
+                self._write(row, product)
+            else:
+                self._insert(product)
+                row = self._rows[product.id]
+                new_ids.append(product.id)
+            pending.add(row)
+        # Só as chaves do lote são ordenadas e intercaladas nos índices
+        if new_ids:
+            self._sorted_ids = merge_sorted(self._sorted_ids, sorted(new_ids))
+        if pending:
+            rows = sorted(pending, key=self._price_key)
+            self._price_rows = merge_sorted(self._price_rows, rows, key=self._price_key)
+        self._version += 1
+
+    @_locked
+    def list_all(self) -> List[Product]:
+        return [self._product(row) for row in self._rows.values()]
+
+    @_locked
+    def get_by_id(self, product_id: int) -> Optional[Product]:
+        row = self._rows.get(product_id)
+        return None if row is None else self._product(row)
+
+    @_locked
+    def get_many(self, product_ids: Iterable[int]) -> List[Product]:
+        rows = self._rows
+        return [self._product(rows[pid]) for pid in product_ids if pid in rows]
+
+    @_locked
+    def list_by_artisan(self, artisan_id: int) -> List[Product]:
+        return [self._product(row) for row in self._artisan_rows.get(artisan_id, ())]
+
+    @_locked
+    def update(self, product: Product) -> bool:
+        if product.id not in self._rows:
+            return False
+        self.save(product)
+        return True
+
+    @_locked
+    def delete(self, product_id: int) -> bool:
+        row = self._rows.pop(product_id, None)
+        if row is None:
+            return False
+        self._unlink_artisan(row)
+        self._unlink_price(row)
+        self._names[row] = None
+        self._descriptions[row] = None
+        self._free_rows.append(row)
+        del self._sorted_ids[bisect_left(self._sorted_ids, product_id)]
+        self._version += 1
+        return True
+
+    @_locked
+    def list_page(self, after_id: Optional[int], limit: int) -> List[Product]:
+        start = 0 if after_id is None else bisect_right(self._sorted_ids, after_id)
+        rows = self._rows
+        return [
+            self._product(rows[product_id])
+            for product_id in self._sorted_ids[start : start + limit]
+        ]
+
+    @_locked
+    def list_by_price(
+        self,
+        min_price: float,
+        max_price: float,
+        descending: bool,
+        after: Optional[Tuple[float, int]],
+        limit: int,
+    ) -> List[Product]:
+        rows = self._price_rows
+        window = price_window(
+            rows, min_price, max_price, descending, after, limit, key=self._price_key
+        )
+        return [self._product(rows[i]) for i in window]
+
+    def version(self) -> int:
+        return self._version
@@ -0,0 +1,203 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from typing import Callable, Hashable, Iterable, Iterator, List, Optional, Sequence
+
+DEFAULT_STRIPES = 64
+# Chaves extras lidas além da borda numa varredura decrescente
+SCAN_SLACK = 8
+
+
+def merge_sorted(keys: Sequence, batch: Sequence, key: Optional[Callable] = None):
+    """Nova sequência (do mesmo tipo de keys) com os itens de batch, já
+    ordenado, intercalados nas posições certas.
+
+    Cada item custa uma busca binária em keys e o resto é cópia de fatias:
+    um lote de k itens sobre um índice de n chaves sai em O(k log n)
+    comparações e O(n + k) cópias, sem reordenar o índice inteiro.
+    """
+    merged = keys[:0]
+    start = 0
+    for item in batch:
+        position = bisect_right(keys, item if key is None else key(item), key=key)
+        merged.extend(keys[start:position])
+        merged.append(item)
+        start = position
+    merged.extend(keys[start:])
+    return merged
+
+
+class IdSequence:
+    """Sequência monotônica de ids: nunca devolve um id já usado, mesmo
+    depois de remoções ou de gravações com id explícito."""
+
+    def __init__(self, start: int = 0):
+        self._last = start
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        with self._lock:
+            self._last += 1
+            return self._last
+
+    def reserve(self, count: int) -> range:
+        # Bloco contíguo: nenhum next() concorrente cai no meio dele
+        with self._lock:
+            start = self._last + 1
+            self._last += count
+            return range(start, self._last + 1)
+
+    def current(self) -> int:
+        return self._last
+
+    def observe(self, used_id: int):
+        # Gravações com id escolhido pelo chamador empurram a sequência adiante
+        if used_id > self._last:
+            with self._lock:
+                self._last = max(self._last, used_id)
+
+
+class StripedLock:
+    """Locks de escrita distribuídos por hash da chave.
+
+    Escritas em chaves diferentes raramente disputam o mesmo lock; várias
+    chaves são travadas sempre na mesma ordem para evitar deadlock.
+    """
+
+    def __init__(self, stripes: int = DEFAULT_STRIPES):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    @contextmanager
+    def hold(self, *keys: Hashable) -> Iterator[None]:
+        stripes = sorted({hash(key) % len(self._locks) for key in keys})
+        for stripe in stripes:
+            self._locks[stripe].acquire()
+        try:
+            yield
+        finally:
+            for stripe in reversed(stripes):
+                self._locks[stripe].release()
+
+
+class SortedIndex:
+    """Chaves ordenadas lidas sem lock.
+
+    Escritores inserem na própria lista e marcam remoções como lápides; a
+    compactação monta uma lista nova e a publica trocando a referência
+    (copy-on-write). Leitores copiam trechos com uma fatia, que é atômica,
+    e continuam sempre a partir da última chave vista, nunca de um índice:
+    assim uma escrita concorrente não faz a varredura pular nem repetir
+    chaves. Lápides são puladas e cada chave ainda é validada com is_live
+    contra o mapa de entidades, que é a fonte da verdade.
+    """
+
+    def __init__(self):
+        self._keys: list = []
+        self._dead: set = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys) - len(self._dead)
+
+    def _contains(self, key) -> bool:
+        keys = self._keys
+        i = bisect_left(keys, key)
+        return i < len(keys) and keys[i] == key
+
+    def add(self, key):
+        with self._lock:
+            if key in self._dead:
+                self._dead.discard(key)
+            elif not self._contains(key):
+                insort(self._keys, key)
+
+    def add_many(self, keys: Iterable):
+        # Só o lote é ordenado; ele é intercalado numa cópia da lista, que é
+        # publicada de uma vez. Se as chaves não se comparam, nada muda
+        batch = sorted(set(keys))
+        with self._lock:
+            revived = [key for key in batch if key in self._dead]
+            fresh = [
+                key
+                for key in batch
+                if key not in self._dead and not self._contains(key)
+            ]
+            if fresh:
+                self._keys = merge_sorted(self._keys, fresh)
+            self._dead.difference_update(revived)
+
+    def discard(self, key):
+        with self._lock:
+            if not self._contains(key):
+                return
+            self._dead.add(key)
+            if len(self._dead) * 2 > len(self._keys):
+                self._keys = [k for k in self._keys if k not in self._dead]
+                self._dead = set()
+
+    def scan(
+        self,
+        is_live: Callable[[object], bool],
+        limit: int,
+        low=None,
+        high=None,
+        after=None,
+        descending: bool = False,
+    ) -> List:
+        """Até limit chaves vivas em [low, high], depois de after na direção
+        pedida."""
+        result: List = []
+        bound = after
+        chunk = limit + 8
+        while len(result) < limit:
+            keys = self._keys
+            if descending:
+                stop = len(keys) if bound is None else bisect_left(keys, bound)
+                if high is not None:
+                    stop = min(stop, bisect_right(keys, high))
+                start = max(0 if low is None else bisect_left(keys, low), stop - chunk)
+                if start >= stop:
+                    break
+                # Inserções entre o bisect e a fatia empurram chaves para
+                # depois de stop: a folga as mantém na fatia
+                batch = keys[start : stop + SCAN_SLACK]
+                if len(batch) == stop + SCAN_SLACK - start and not _past_edge(
+                    batch[-1], bound, high
+                ):
+                    continue
+                batch.reverse()
+            else:
+                start = 0 if bound is None else bisect_right(keys, bound)
+                if low is not None:
+                    start = max(start, bisect_left(keys, low))
+                stop = len(keys) if high is None else bisect_right(keys, high)
+                batch = keys[start : min(stop, start + chunk)]
+            if not batch:
+                break
+            for key in batch:
+                if descending:
+                    if low is not None and key < low:
+                        return result
+                    if _past_edge(key, bound, high):
+                        continue
+                else:
+                    if high is not None and key > high:
+                        return result
+                    # Inserções concorrentes podem puxar chaves anteriores à fatia
+                    if (bound is not None and key <= bound) or (
+                        low is not None and key < low
+                    ):
+                        continue
+                if key not in self._dead and is_live(key):
+                    result.append(key)
+                    if len(result) == limit:
+                        return result
+            last = batch[-1]
+            if bound is None or (last < bound if descending else last > bound):
+                bound = last
+            chunk *= 2
+        return result
+
+
+def _past_edge(key, bound, high) -> bool:
+    return (bound is not None and key >= bound) or (high is not None and key > high)
@@ -0,0 +1,866 @@
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from dataclasses import fields
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from adapters.outbound.concurrency import StripedLock
+from core.entities import Artisan, Order, OrderLine, Product, Review
+from ports.outbound import (
+    ArtisanRepositoryPort,
+    OrderRepositoryPort,
+    ProductRepositoryPort,
+    ReviewRepositoryPort,
+)
+
+logger = logging.getLogger(__name__)
+
+# Journal binário append-only para os repositórios em memória.
+#
+# Cada escrita é aplicada ao repositório e registrada no journal sob o mesmo
+# lock da chave, então a ordem dos registros de uma entidade é a ordem em que
+# as escritas aconteceram. Um registro guarda o estado completo da entidade
+# (ou o id removido); na recuperação vale o último registro de cada chave.
+# Por isso um snapshot tirado com escritas em andamento, somado aos
+# segmentos a partir do LSN em que ele começou, reconstrói o estado final.
+#
+# Arquivos no diretório do journal:
+#   journal-<lsn>.log    segmento cujo primeiro registro tem esse LSN
+#   snapshot-<lsn>.snap  estado com todos os registros anteriores a <lsn>
+# Ambos têm um cabeçalho mágico seguido de quadros (tamanho, crc32, payload).
+# Um quadro incompleto ou corrompido encerra o arquivo: no fim do último
+# segmento é o resto de uma queda e é truncado. Lotes que precisam ser
+# atômicos (save_many de pedidos) vão num único registro, e portanto num
+# único quadro: após uma queda ou o lote inteiro volta, ou nada dele.
+
+# Quando uma escrita é confirmada ao serviço
+DURABILITY_FSYNC = "fsync"  # após o fsync do grupo: sobrevive a queda de energia
+DURABILITY_WRITE = "write"  # após o write(): sobrevive à queda do processo
+DURABILITY_ASYNC = "async"  # na hora; a gravação segue em segundo plano
+DURABILITY_LEVELS = (DURABILITY_FSYNC, DURABILITY_WRITE, DURABILITY_ASYNC)
+
+# Registros no journal entre dois snapshots automáticos; 0 desliga
+DEFAULT_SNAPSHOT_EVERY = 100_000
+SNAPSHOT_BATCH_SIZE = 10_000
+
+# Versão 2: pedidos com OrderLine no lugar de cópias de Product
+SEGMENT_MAGIC = b"ALJ2"
+SNAPSHOT_MAGIC = b"ALS2"
+SEGMENT_PREFIX, SEGMENT_SUFFIX = "journal-", ".log"
+SNAPSHOT_PREFIX, SNAPSHOT_SUFFIX = "snapshot-", ".snap"
+TMP_SUFFIX = ".tmp"
+
+OP_SAVE = 1
+OP_DELETE = 2
+OP_SEQUENCE = 3
+OP_SAVE_MANY = 4
+
+KIND_PRODUCT = 1
+KIND_ARTISAN = 2
+KIND_ORDER = 3
+KIND_REVIEW = 4
+
+_ENTITIES = {
+    KIND_PRODUCT: Product,
+    KIND_ARTISAN: Artisan,
+    KIND_ORDER: Order,
+    KIND_REVIEW: Review,
+}
+_FIELDS = {
+    cls: tuple(f.name for f in fields(cls)) for cls in (*_ENTITIES.values(), OrderLine)
+}
+# Coleções com sequência de ids (next_id); produtos têm id escolhido pelo cliente
+_SEQUENCED = (KIND_ARTISAN, KIND_ORDER, KIND_REVIEW)
+
+# Valores são gravados com uma etiqueta de tipo: os serviços aceitam o que
+# vier no JSON, e o estado recuperado precisa ser idêntico ao gravado
+_T_NONE = 0
+_T_FALSE = 1
+_T_TRUE = 2
+_T_INT = 3
+_T_FLOAT = 4
+_T_STR = 5
+_T_LIST = 6
+_T_PRODUCT = 7
+_T_JSON = 8
+_T_PACKED_PRODUCT = 9
+_T_LINE = 10
+_T_PACKED_LINE = 11
+_INT = struct.Struct("<Bq")
+_FLOAT = struct.Struct("<Bd")
+_SIZED = struct.Struct("<BI")
+_HEAD = struct.Struct("<BB")
+_FRAME = struct.Struct("<II")
+# Produto com ids inteiros e preço float (o caso comum) num único struct
+_PACKED_PRODUCT = struct.Struct("<BqqdII")
+# Item de pedido com id e quantidade inteiros e preço float
+_PACKED_LINE = struct.Struct("<Bqqd")
+_INT_MIN, _INT_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _pack(buf: bytearray, value):
+    kind = type(value)
+    if kind is int and _INT_MIN <= value <= _INT_MAX:
+        buf += _INT.pack(_T_INT, value)
+    elif kind is str:
+        data = value.encode("utf-8", "surrogatepass")
+        buf += _SIZED.pack(_T_STR, len(data))
+        buf += data
+    elif kind is float:
+        buf += _FLOAT.pack(_T_FLOAT, value)
+    elif value is None:
+        buf.append(_T_NONE)
+    elif kind is bool:
+        buf.append(_T_TRUE if value else _T_FALSE)
+    elif kind is list:
+        buf += _SIZED.pack(_T_LIST, len(value))
+        for item in value:
+            _pack(buf, item)
+    elif kind is OrderLine:
+        _pack_line(buf, value)
+    elif kind is Product:
+        _pack_product(buf, value)
+    else:
+        # Objetos e inteiros fora de 64 bits: raros, vão como JSON
+        data = json.dumps(value).encode()
+        buf += _SIZED.pack(_T_JSON, len(data))
+        buf += data
+
+
+def _pack_fields(buf: bytearray, entity):
+    for name in _FIELDS[type(entity)]:
+        _pack(buf, getattr(entity, name))
+
+
+def _pack_product(buf: bytearray, product: Product):
+    if (
+        type(product.id) is int
+        and type(product.artisan_id) is int
+        and type(product.price) is float
+        and type(product.name) is str
+        and type(product.description) is str
+    ):
+        name = product.name.encode("utf-8", "surrogatepass")
+        description = product.description.encode("utf-8", "surrogatepass")
+        try:
+            head = _PACKED_PRODUCT.pack(
+                _T_PACKED_PRODUCT,
+                product.id,
+                product.artisan_id,
+                product.price,
+                len(name),
+                len(description),
+            )
+        except struct.error:
+            pass  # ids fora de 64 bits
+        else:
+            buf += head
+            buf += name
+            buf += description
+            return
+    buf.append(_T_PRODUCT)
+    _pack_fields(buf, product)
+
+
+def _pack_line(buf: bytearray, line: OrderLine):
+    if (
+        type(line.product_id) is int
+        and type(line.quantity) is int
+        and type(line.unit_price) is float
+    ):
+        try:
+            buf += _PACKED_LINE.pack(
+                _T_PACKED_LINE, line.product_id, line.quantity, line.unit_price
+            )
+            return
+        except struct.error:
+            pass  # ids fora de 64 bits
+    buf.append(_T_LINE)
+    _pack_fields(buf, line)
+
+
+def _unpack(data, offset: int) -> Tuple[object, int]:
+    tag = data[offset]
+    if tag == _T_PACKED_LINE:
+        _, product_id, quantity, unit_price = _PACKED_LINE.unpack_from(data, offset)
+        return OrderLine(product_id, quantity, unit_price), offset + _PACKED_LINE.size
+    if tag == _T_PACKED_PRODUCT:
+        _, product_id, artisan_id, price, name_size, description_size = (
+            _PACKED_PRODUCT.unpack_from(data, offset)
+        )
+        start = offset + _PACKED_PRODUCT.size
+        middle = start + name_size
+        end = middle + description_size
+        product = Product(
+            product_id,
+            artisan_id,
+            str(data[start:middle], "utf-8", "surrogatepass"),
+            str(data[middle:end], "utf-8", "surrogatepass"),
+            price,
+        )
+        return product, end
+    if tag == _T_INT:
+        return _INT.unpack_from(data, offset)[1], offset + _INT.size
+    if tag == _T_STR:
+        start = offset + _SIZED.size
+        end = start + _SIZED.unpack_from(data, offset)[1]
+        return str(data[start:end], "utf-8", "surrogatepass"), end
+    if tag == _T_FLOAT:
+        return _FLOAT.unpack_from(data, offset)[1], offset + _FLOAT.size
+    if tag == _T_PRODUCT:
+        return _unpack_entity(Product, data, offset + 1)
+    if tag == _T_LINE:
+        return _unpack_entity(OrderLine, data, offset + 1)
+    if tag == _T_LIST:
+        count = _SIZED.unpack_from(data, offset)[1]
+        offset += _SIZED.size
+        items = []
+        for _ in range(count):
+            item, offset = _unpack(data, offset)
+            items.append(item)
+        return items, offset
+    if tag == _T_NONE:
+        return None, offset + 1
+    if tag == _T_FALSE or tag == _T_TRUE:
+        return tag == _T_TRUE, offset + 1
+    if tag == _T_JSON:
+        start = offset + _SIZED.size
+        end = start + _SIZED.unpack_from(data, offset)[1]
+        return json.loads(bytes(data[start:end])), end
+    raise ValueError(f"Etiqueta de tipo desconhecida no journal: {tag}")
+
+
+def _unpack_entity(cls, data, offset: int):
+    values = []
+    for _ in _FIELDS[cls]:
+        value, offset = _unpack(data, offset)
+        values.append(value)
+    return cls(*values), offset
+
+
+def _pack_entity(buf: bytearray, kind: int, entity):
+    if kind == KIND_PRODUCT:
+        _pack_product(buf, entity)
+    else:
+        _pack_fields(buf, entity)
+
+
+def _unpack_kind(kind: int, data, offset: int) -> Tuple[object, int]:
+    if kind == KIND_PRODUCT:
+        return _unpack(data, offset)
+    return _unpack_entity(_ENTITIES[kind], data, offset)
+
+
+def encode_save(kind: int, entity) -> bytes:
+    buf = bytearray(_HEAD.pack(OP_SAVE, kind))
+    _pack_entity(buf, kind, entity)
+    return bytes(buf)
+
+
+def encode_save_many(kind: int, entities: List[object]) -> bytes:
+    buf = bytearray(_HEAD.pack(OP_SAVE_MANY, kind))
+    _pack(buf, len(entities))
+    for entity in entities:
+        _pack_entity(buf, kind, entity)
+    return bytes(buf)
+
+
+def encode_delete(kind: int, entity_id) -> bytes:
+    buf = bytearray(_HEAD.pack(OP_DELETE, kind))
+    _pack(buf, entity_id)
+    return bytes(buf)
+
+
+def encode_sequence(kind: int, last_id: int) -> bytes:
+    buf = bytearray(_HEAD.pack(OP_SEQUENCE, kind))
+    _pack(buf, last_id)
+    return bytes(buf)
+
+
+def decode_record(data, offset: int = 0) -> Tuple[int, int, object]:
+    """(operação, coleção, entidade | lista de entidades | id | último id
+    da sequência)."""
+    op, kind = _HEAD.unpack_from(data, offset)
+    offset += _HEAD.size
+    if op == OP_SAVE:
+        value, _ = _unpack_kind(kind, data, offset)
+    elif op == OP_SAVE_MANY:
+        count, offset = _unpack(data, offset)
+        value = []
+        for _ in range(count):
+            entity, offset = _unpack_kind(kind, data, offset)
+            value.append(entity)
+    else:
+        value, _ = _unpack(data, offset)
+    return op, kind, value
+
+
+def _frame(payload: bytes) -> bytes:
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _frames(data: bytes, offset: int) -> Iterator[Tuple[int, int]]:
+    # (início, fim) de cada payload íntegro; para no primeiro quadro ruim
+    view = memoryview(data)
+    size = len(data)
+    while offset + _FRAME.size <= size:
+        length, crc = _FRAME.unpack_from(data, offset)
+        start = offset + _FRAME.size
+        end = start + length
+        if end > size or zlib.crc32(view[start:end]) != crc:
+            return
+        yield start, end
+        offset = end
+
+
+def _file_name(prefix: str, lsn: int, suffix: str) -> str:
+    return f"{prefix}{lsn:020d}{suffix}"
+
+
+def _list_files(directory: str, prefix: str, suffix: str) -> List[Tuple[int, str]]:
+    found = []
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith(suffix):
+            number = name[len(prefix) : -len(suffix)]
+            if number.isdigit():
+                found.append((int(number), os.path.join(directory, name)))
+    return sorted(found)
+
+
+def _fsync_directory(directory: str):
+    # Torna visíveis após uma queda os arquivos criados, renomeados ou removidos
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _open_segment(directory: str, lsn: int) -> int:
+    path = os.path.join(directory, _file_name(SEGMENT_PREFIX, lsn, SEGMENT_SUFFIX))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    _write_all(fd, SEGMENT_MAGIC)
+    os.fsync(fd)
+    _fsync_directory(directory)
+    return fd
+
+
+class Journal:
+    """Segmentos append-only com group commit.
+
+    Quem escreve só enfileira o quadro e recebe o LSN; uma thread grava tudo
+    o que se acumulou desde a volta anterior com um write() e um fsync, então
+    N escritas concorrentes pagam um fsync em vez de N.
+    """
+
+    def __init__(
+        self, directory: str, next_lsn: int, durability: str = DURABILITY_FSYNC
+    ):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Nível de durabilidade desconhecido: {durability}")
+        self.directory = directory
+        self.durability = durability
+        self._cond = threading.Condition()
+        # Quadros a gravar, intercalados com o LSN de cada segmento novo
+        self._pending: list = []
+        self._next_lsn = next_lsn
+        self._confirmed_lsn = next_lsn - 1
+        self._segment_lsn = next_lsn
+        self._requested_segment_lsn = next_lsn
+        self._error: Optional[OSError] = None
+        self._closed = False
+        self._fd = _open_segment(directory, next_lsn)
+        self._writer = threading.Thread(
+            target=self._run, name="journal-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _check(self):
+        # Chamado com _cond travado
+        if self._error is not None:
+            raise OSError("Falha ao gravar o journal.") from self._error
+
+    def append(self, payloads: Iterable[bytes]) -> int:
+        """Enfileira registros em ordem e devolve o LSN do último."""
+        frames = [_frame(payload) for payload in payloads]
+        with self._cond:
+            self._check()
+            if self._closed:
+                raise RuntimeError("Journal fechado.")
+            self._pending.extend(frames)
+            self._next_lsn += len(frames)
+            self._cond.notify_all()
+            return self._next_lsn - 1
+
+    def commit(self, lsn: int):
+        """Espera o registro lsn atingir o nível de durabilidade configurado."""
+        if self.durability == DURABILITY_ASYNC:
+            return
+        with self._cond:
+            while self._confirmed_lsn < lsn:
+                self._check()
+                self._cond.wait()
+
+    def rotate(self) -> int:
+        """Começa um segmento novo no próximo LSN e o devolve quando todos os
+        registros anteriores já estão gravados nos segmentos antigos."""
+        with self._cond:
+            lsn = self._next_lsn
+            if lsn != self._requested_segment_lsn:
+                self._requested_segment_lsn = lsn
+                self._pending.append(lsn)
+                self._cond.notify_all()
+            while self._segment_lsn < lsn:
+                self._check()
+                self._cond.wait()
+        return lsn
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+        if self._error is None:
+            os.fsync(self._fd)
+        os.close(self._fd)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, []
+                last_lsn = self._next_lsn - 1
+            try:
+                self._write(batch)
+            except OSError as e:
+                logger.exception("Falha ao gravar o journal em %s", self.directory)
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._confirmed_lsn = last_lsn
+                self._cond.notify_all()
+
+    def _write(self, batch: list):
+        chunk: List[bytes] = []
+        for item in batch:
+            if type(item) is not int:
+                chunk.append(item)
+                continue
+            # Fecha o segmento atual com tudo o que veio antes da rotação
+            _write_all(self._fd, b"".join(chunk))
+            chunk = []
+            os.fsync(self._fd)
+            os.close(self._fd)
+            self._fd = _open_segment(self.directory, item)
+            with self._cond:
+                self._segment_lsn = item
+                self._cond.notify_all()
+        _write_all(self._fd, b"".join(chunk))
+        if self.durability != DURABILITY_WRITE:
+            os.fsync(self._fd)
+
+
+class _RecoveredState:
+    """Último estado de cada chave visto nos snapshots e segmentos."""
+
+    def __init__(self):
+        self.entities: Dict[int, dict] = {kind: {} for kind in _ENTITIES}
+        self.sequences: Dict[int, int] = {kind: 0 for kind in _SEQUENCED}
+
+    def apply(self, op: int, kind: int, value):
+        if op == OP_SAVE:
+            self.entities[kind][value.id] = value
+            if kind in self.sequences:
+                self.sequences[kind] = max(self.sequences[kind], value.id)
+        elif op == OP_SAVE_MANY:
+            for entity in value:
+                self.apply(OP_SAVE, kind, entity)
+        elif op == OP_DELETE:
+            self.entities[kind].pop(value, None)
+        else:
+            self.sequences[kind] = max(self.sequences[kind], value)
+
+    def load_file(self, path: str, magic: bytes) -> Tuple[int, int, int]:
+        """Aplica os quadros íntegros; devolve (registros, fim válido, tamanho)."""
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(magic):
+            # Segmento criado sem cabeçalho numa queda: não tem registros
+            if len(data) < len(magic) and magic.startswith(data):
+                return 0, 0, len(data)
+            raise ValueError(f"Arquivo de journal inválido: {path}")
+        count = 0
+        end = len(magic)
+        for start, end in _frames(data, end):
+            self.apply(*decode_record(data, start))
+            count += 1
+        return count, end, len(data)
+
+
+class JournaledStore:
+    """Repositórios em memória com journal e snapshots num diretório.
+
+    Na criação carrega o snapshot mais recente e reaplica só os segmentos a
+    partir dele; depois expõe os repositórios embrulhados, que registram cada
+    escrita no journal antes de devolver o controle ao serviço. A cada
+    snapshot_every registros um snapshot é gravado em segundo plano e os
+    segmentos que ele cobre são apagados.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        product_repo: ProductRepositoryPort,
+        artisan_repo: ArtisanRepositoryPort,
+        order_repo: OrderRepositoryPort,
+        review_repo: ReviewRepositoryPort,
+        durability: str = DURABILITY_FSYNC,
+        snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+    ):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Nível de durabilidade desconhecido: {durability}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._repos = {
+            KIND_PRODUCT: product_repo,
+            KIND_ARTISAN: artisan_repo,
+            KIND_ORDER: order_repo,
+            KIND_REVIEW: review_repo,
+        }
+        self._snapshot_every = snapshot_every
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._snapshot_lsn, next_lsn = self._recover()
+        self._journal = Journal(directory, next_lsn, durability)
+
+        self.products = JournaledProductRepository(product_repo, self)
+        self.artisans = JournaledArtisanRepository(artisan_repo, self)
+        self.orders = JournaledOrderRepository(order_repo, self)
+        self.reviews = JournaledReviewRepository(review_repo, self)
+
+    def repositories(self) -> tuple:
+        return self.products, self.artisans, self.orders, self.reviews
+
+    def _recover(self) -> Tuple[int, int]:
+        state = _RecoveredState()
+        base = 0
+        snapshots = _list_files(self.directory, SNAPSHOT_PREFIX, SNAPSHOT_SUFFIX)
+        if snapshots:
+            base, path = snapshots[-1]
+            _, end, size = state.load_file(path, SNAPSHOT_MAGIC)
+            if end < size:
+                raise ValueError(f"Snapshot corrompido: {path}")
+        next_lsn = base
+        for start, path in _list_files(self.directory, SEGMENT_PREFIX, SEGMENT_SUFFIX):
+            if start < base:
+                continue
+            count, end, size = state.load_file(path, SEGMENT_MAGIC)
+            if end < size:
+                os.truncate(path, end)
+            next_lsn = start + count
+        self._load(state)
+        self._discard_before(base)
+        return base, next_lsn
+
+    def _load(self, state: _RecoveredState):
+        # Em ordem de id: inserções no fim dos índices ordenados são baratas
+        products = state.entities[KIND_PRODUCT]
+        if products:
+            self._repos[KIND_PRODUCT].save_many(
+                products[key] for key in sorted(products)
+            )
+        for kind in _SEQUENCED:
+            repo = self._repos[kind]
+            entities = state.entities[kind]
+            for key in sorted(entities):
+                repo.save(entities[key])
+            repo.observe_id(state.sequences[kind])
+
+    def _discard_before(self, lsn: int):
+        # Segmentos e snapshots cobertos pelo snapshot lsn, e sobras de queda
+        for start, path in _list_files(self.directory, SEGMENT_PREFIX, SEGMENT_SUFFIX):
+            if start < lsn:
+                os.remove(path)
+        for start, path in _list_files(
+            self.directory, SNAPSHOT_PREFIX, SNAPSHOT_SUFFIX
+        ):
+            if start < lsn:
+                os.remove(path)
+        for name in os.listdir(self.directory):
+            if name.endswith(TMP_SUFFIX):
+                os.remove(os.path.join(self.directory, name))
+        _fsync_directory(self.directory)
+
+    def append(self, payloads: Iterable[bytes]) -> int:
+        return self._journal.append(payloads)
+
+    def commit(self, lsn: int):
+        self._journal.commit(lsn)
+        if (
+            self._snapshot_every
+            and lsn + 1 - self._snapshot_lsn >= self._snapshot_every
+        ):
+            self._snapshot_in_background()
+
+    def _snapshot_in_background(self):
+        with self._thread_lock:
+            if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+                return
+            self._snapshot_thread = threading.Thread(
+                target=self._background_snapshot, name="journal-snapshot", daemon=True
+            )
+            self._snapshot_thread.start()
+
+    def _background_snapshot(self):
+        try:
+            self.snapshot()
+        except Exception:
+            logger.exception("Falha ao gravar snapshot em %s", self.directory)
+
+    def snapshot(self) -> int:
+        """Grava um snapshot, apaga os segmentos cobertos e devolve seu LSN."""
+        with self._snapshot_lock:
+            # Tudo o que foi registrado antes de lsn já está nos repositórios
+            lsn = self._journal.rotate()
+            path = os.path.join(
+                self.directory, _file_name(SNAPSHOT_PREFIX, lsn, SNAPSHOT_SUFFIX)
+            )
+            with open(path + TMP_SUFFIX, "wb") as f:
+                f.write(SNAPSHOT_MAGIC)
+                for frames in self._snapshot_frames():
+                    f.write(b"".join(frames))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path + TMP_SUFFIX, path)
+            self._snapshot_lsn = lsn
+            self._discard_before(lsn)
+            return lsn
+
+    def _snapshot_frames(self) -> Iterator[List[bytes]]:
+        yield [
+            _frame(encode_sequence(kind, self._repos[kind].last_id()))
+            for kind in _SEQUENCED
+        ]
+        for kind, repo in self._repos.items():
+            after = None
+            while True:
+                batch = repo.list_page(after, SNAPSHOT_BATCH_SIZE)
+                if not batch:
+                    break
+                yield [_frame(encode_save(kind, entity)) for entity in batch]
+                after = batch[-1].id
+
+    def close(self):
+        with self._thread_lock:
+            thread = self._snapshot_thread
+        if thread is not None:
+            thread.join()
+        self._journal.close()
+
+
+class _JournaledRepository:
+    """Aplica a escrita no repositório embrulhado e a registra no journal,
+    tudo sob o lock da chave até a durabilidade ser confirmada.
+
+    Se o journal falhar, a escrita é desfeita em memória antes de propagar o
+    erro, para que os leitores não vejam nada que uma reexecução do journal
+    não reconstruiria. Aplicar antes de registrar mantém as validações do
+    repositório (como o email único) antes de qualquer registro.
+    """
+
+    kind: int
+
+    def __init__(self, repo, store: JournaledStore):
+        self._repo = repo
+        self._store = store
+        self._locks = StripedLock()
+
+    def _write(self, ids: Iterable, payloads: List[bytes], apply) -> bool:
+        with self._locks.hold(*ids):
+            previous = {key: self._repo.get_by_id(key) for key in ids}
+            if apply() is False:
+                return False
+            try:
+                self._store.commit(self._store.append(payloads))
+            except BaseException:
+                self._rollback(previous)
+                raise
+        return True
+
+    def _rollback(self, previous: dict):
+        for key, entity in previous.items():
+            if entity is None:
+                self._repo.delete(key)
+            else:
+                self._repo.save(entity)
+
+    def _save(self, entity):
+        payload = encode_save(self.kind, entity)
+        self._write((entity.id,), [payload], lambda: self._repo.save(entity))
+
+    def _update(self, entity) -> bool:
+        payload = encode_save(self.kind, entity)
+        return self._write((entity.id,), [payload], lambda: self._repo.update(entity))
+
+    def _delete(self, entity_id) -> bool:
+        payload = encode_delete(self.kind, entity_id)
+        return self._write(
+            (entity_id,), [payload], lambda: self._repo.delete(entity_id)
+        )
+
+
+class JournaledProductRepository(_JournaledRepository, ProductRepositoryPort):
+    kind = KIND_PRODUCT
+
+    def save(self, product: Product):
+        self._save(product)
+
+    def save_many(self, products: Iterable[Product]):
+        products = list(products)
+        payloads = [encode_save(KIND_PRODUCT, product) for product in products]
+        ids = {product.id for product in products}
+        self._write(ids, payloads, lambda: self._repo.save_many(products))
+
+    def update(self, product: Product) -> bool:
+        return self._update(product)
+
+    def delete(self, product_id: int) -> bool:
+        return self._delete(product_id)
+
+    def list_all(self) -> List[Product]:
+        return self._repo.list_all()
+
+    def get_by_id(self, product_id: int) -> Optional[Product]:
+        return self._repo.get_by_id(product_id)
+
+    def get_many(self, product_ids: Iterable[int]) -> List[Product]:
+        return self._repo.get_many(product_ids)
+
+    def list_by_artisan(self, artisan_id: int) -> List[Product]:
+        return self._repo.list_by_artisan(artisan_id)
+
+    def list_page(self, after_id: Optional[int], limit: int) -> List[Product]:
+        return self._repo.list_page(after_id, limit)
+
+    def list_by_price(
+        self,
+        min_price: float,
+        max_price: float,
+        descending: bool,
+        after: Optional[Tuple[float, int]],
+        limit: int,
+    ) -> List[Product]:
+        return self._repo.list_by_price(min_price, max_price, descending, after, limit)
+
+    def version(self) -> int:
+        return self._repo.version()
+
+
+class JournaledArtisanRepository(_JournaledRepository, ArtisanRepositoryPort):
+    kind = KIND_ARTISAN
+
+    def next_id(self) -> int:
+        return self._repo.next_id()
+
+    def save(self, artisan: Artisan):
+        self._save(artisan)
+
+    def update(self, artisan: Artisan) -> bool:
+        return self._update(artisan)
+
+    def delete(self, artisan_id: int) -> bool:
+        return self._delete(artisan_id)
+
+    def get_by_id(self, artisan_id: int) -> Optional[Artisan]:
+        return self._repo.get_by_id(artisan_id)
+
+    def get_by_email(self, email: str) -> Optional[Artisan]:
+        return self._repo.get_by_email(email)
+
+    def list_all(self) -> List[Artisan]:
+        return self._repo.list_all()
+
+    def list_page(self, after_id: Optional[int], limit: int) -> List[Artisan]:
+        return self._repo.list_page(after_id, limit)
+
+    def version(self) -> int:
+        return self._repo.version()
+
+    def count(self) -> int:
+        return self._repo.count()
+
+
+class JournaledOrderRepository(_JournaledRepository, OrderRepositoryPort):
+    kind = KIND_ORDER
+
+    def next_id(self) -> int:
+        return self._repo.next_id()
+
+    def next_ids(self, count: int) -> range:
+        return self._repo.next_ids(count)
+
+    def save(self, order: Order):
+        self._save(order)
+
+    def save_many(self, orders: Iterable[Order]):
+        orders = list(orders)
+        payload = encode_save_many(KIND_ORDER, orders)
+        ids = {order.id for order in orders}
+        self._write(ids, [payload], lambda: self._repo.save_many(orders))
+
+    def update(self, order: Order) -> bool:
+        return self._update(order)
+
+    def delete(self, order_id: int) -> bool:
+        return self._delete(order_id)
+
+    def get_by_id(self, order_id: int) -> Optional[Order]:
+        return self._repo.get_by_id(order_id)
+
+    def count(self) -> int:
+        return self._repo.count()
+
+    def list_page(self, after_id: Optional[int], limit: int) -> List[Order]:
+        return self._repo.list_page(after_id, limit)
+
+
+class JournaledReviewRepository(_JournaledRepository, ReviewRepositoryPort):
+    kind = KIND_REVIEW
+
+    def next_id(self) -> int:
+        return self._repo.next_id()
+
+    def save(self, review: Review):
+        self._save(review)
+
+    def update(self, review: Review) -> bool:
+        return self._update(review)
+
+    def delete(self, review_id: int) -> bool:
+        return self._delete(review_id)
+
+    def get_by_id(self, review_id: int) -> Optional[Review]:
+        return self._repo.get_by_id(review_id)
+
+    def count(self) -> int:
+        return self._repo.count()
+
+    def list_page(self, after_id: Optional[int], limit: int) -> List[Review]:
+        return self._repo.list_page(after_id, limit)
@@ -1,34 +1,402 @@
-from typing import List
-from core.entities import Product, Order, Review
+import math
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from adapters.outbound.concurrency import IdSequence, SortedIndex, StripedLock
+from core.entities import Artisan, Product, Order, Review
 from ports.outbound import (
+    ArtisanRepositoryPort,
     ProductRepositoryPort,
     OrderRepositoryPort,
     ReviewRepositoryPort,
 )
 
+# Repositórios em memória seguros entre threads: escritas na mesma chave são
+# serializadas por locks listrados e leituras nunca travam. Entidades
+# guardadas não são alteradas no lugar; cada escrita publica um objeto novo,
+# então um leitor vê a versão antiga ou a nova, nunca uma mistura.
+
+
+def _page(items: Dict[int, object], ids: SortedIndex, after_id, limit) -> list:
+    found: Dict[int, object] = {}
+
+    def is_live(item_id: int) -> bool:
+        item = items.get(item_id)
+        if item is None:
+            return False
+        found[item_id] = item
+        return True
+
+    return [found[item_id] for item_id in ids.scan(is_live, limit, after=after_id)]
+
+
+def price_window(
+    keys,
+    min_price: float,
+    max_price: float,
+    descending: bool,
+    after: Optional[Tuple[float, int]],
+    limit: int,
+    key: Optional[Callable] = None,
+) -> range:
+    # Posições de uma sequência ordenada por (price, id): O(log n) para achar
+    # as bordas da faixa e do cursor, O(k) para percorrer a página
+    lo = bisect_left(keys, (min_price, -math.inf), key=key)
+    hi = bisect_right(keys, (max_price, math.inf), key=key)
+    if descending:
+        if after is not None:
+            hi = min(hi, bisect_left(keys, tuple(after), key=key))
+        return range(hi - 1, max(lo, hi - limit) - 1, -1)
+    if after is not None:
+        lo = max(lo, bisect_right(keys, tuple(after), key=key))
+    return range(lo, min(hi, lo + limit))
+
 
 class ProductRepository(ProductRepositoryPort):
     def __init__(self):
-        self._products = []
+        # Índices hash: id -> produto e artisan_id -> {id: produto}
+        self._products: Dict[int, Product] = {}
+        self._by_artisan: Dict[int, Dict[int, Product]] = {}
+        # Ids ordenados para paginação por cursor (keyset)
+        self._ids = SortedIndex()
+        # Índice secundário ordenado por (price, id) para faixas de preço
+        self._by_price = SortedIndex()
+        self._locks = StripedLock()
+        # Travado sempre depois de _locks, nunca antes
+        self._artisan_locks = StripedLock()
+        self._versions = IdSequence()
+
+    def _link_artisan(self, product: Product):
+        with self._artisan_locks.hold(product.artisan_id):
+            self._link(product)
+
+    def _unlink_artisan(self, product: Product):
+        with self._artisan_locks.hold(product.artisan_id):
+            self._unlink(product)
+
+    # _link/_unlink: chamados com o lock do artesão já travado
+    def _link(self, product: Product):
+        self._by_artisan.setdefault(product.artisan_id, {})[product.id] = product
+
+    def _unlink(self, product: Product):
+        artisan_products = self._by_artisan.get(product.artisan_id)
+        if artisan_products is not None:
+            artisan_products.pop(product.id, None)
+            if not artisan_products:
+                del self._by_artisan[product.artisan_id]
+
+    def _write(self, product: Product) -> Optional[Product]:
+        # Chamado com o lock de product.id já travado. As inserções nos
+        # índices ordenados podem falhar (chave que não se compara às demais)
+        # e vêm antes de qualquer outra mudança; leitores ignoram chaves de
+        # produtos ainda ausentes ou com outro preço
+        previous = self._products.get(product.id)
+        price_changed = previous is None or previous.price != product.price
+        if previous is None:
+            self._ids.add(product.id)
+        if price_changed:
+            self._by_price.add((product.price, product.id))
+        self._products[product.id] = product
+        if previous is not None and price_changed:
+            self._by_price.discard((previous.price, previous.id))
+        if previous is not None and previous.artisan_id != product.artisan_id:
+            self._unlink_artisan(previous)
+        self._link_artisan(product)
+        return previous
 
     def save(self, product: Product):
-        self._products.append(product)
+        with self._locks.hold(product.id):
+            self._write(product)
+        self._versions.next()
+
+    def save_many(self, products: Iterable[Product]):
+        products = list(products)
+        with self._locks.hold(*(product.id for product in products)):
+            previous = {
+                product.id: product
+                for product in self.get_many(product.id for product in products)
+            }
+            new_ids = [product.id for product in products if product.id not in previous]
+            # Chaves de preço finais do lote (o último produto de cada id vence)
+            price_keys = {
+                product.id: (product.price, product.id) for product in products
+            }
+            # Índices primeiro: se a ordenação falhar (ex.: ids de tipos
+            # misturados) o mapa de produtos continua como estava. Uma única
+            # ordenação e publicação por índice em vez de N inserções
+            self._ids.add_many(new_ids)
+            self._by_price.add_many(price_keys.values())
+            # Os artesãos do lote e os anteriores travados uma vez, não por item
+            artisan_ids = {product.artisan_id for product in products}
+            artisan_ids.update(product.artisan_id for product in previous.values())
+            with self._artisan_locks.hold(*artisan_ids):
+                for product in products:
+                    old = self._products.get(product.id)
+                    self._products[product.id] = product
+                    if old is not None and old.artisan_id != product.artisan_id:
+                        self._unlink(old)
+                    self._link(product)
+            for product in previous.values():
+                if price_keys[product.id] != (product.price, product.id):
+                    self._by_price.discard((product.price, product.id))
+        self._versions.next()
 
     def list_all(self) -> List[Product]:
-        return self._products
+        return list(self._products.values())
+
+    def get_by_id(self, product_id: int) -> Optional[Product]:
+        return self._products.get(product_id)
+
+    def get_many(self, product_ids: Iterable[int]) -> List[Product]:
+        products = self._products
+        return [
+            product for product in map(products.get, product_ids) if product is not None
+        ]
+
+    def list_by_artisan(self, artisan_id: int) -> List[Product]:
+        return list(self._by_artisan.get(artisan_id, {}).values())
 
+    def update(self, product: Product) -> bool:
+        with self._locks.hold(product.id):
+            if product.id not in self._products:
+                return False
+            self._write(product)
+        self._versions.next()
+        return True
 
-class OrderRepository(OrderRepositoryPort):
+    def delete(self, product_id: int) -> bool:
+        with self._locks.hold(product_id):
+            product = self._products.pop(product_id, None)
+            if product is None:
+                return False
+            self._ids.discard(product_id)
+            self._by_price.discard((product.price, product.id))
+            self._unlink_artisan(product)
+        self._versions.next()
+        return True
+
+    def list_page(self, after_id: Optional[int], limit: int) -> List[Product]:
+        return _page(self._products, self._ids, after_id, limit)
+
+    def list_by_price(
+        self,
+        min_price: float,
+        max_price: float,
+        descending: bool,
+        after: Optional[Tuple[float, int]],
+        limit: int,
+    ) -> List[Product]:
+        products = self._products
+        found: Dict[Tuple[float, int], Product] = {}
+
+        def is_live(key: Tuple[float, int]) -> bool:
+            # Descarta chaves de produtos removidos ou com preço já alterado
+            product = products.get(key[1])
+            if product is None or product.price != key[0]:
+                return False
+            found[key] = product
+            return True
+
+        keys = self._by_price.scan(
+            is_live,
+            limit,
+            low=(min_price, -math.inf),
+            high=(max_price, math.inf),
+            after=None if after is None else tuple(after),
+            descending=descending,
+        )
+        return [found[key] for key in keys]
+
+    def version(self) -> int:
+        return self._versions.current()
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().casefold()
+
+
+class ArtisanRepository(ArtisanRepositoryPort):
     def __init__(self):
-        self._orders = []
+        self._artisans: Dict[int, Artisan] = {}
+        # Índice único: email normalizado -> id do artesão
+        self._email_index: Dict[str, int] = {}
+        self._ids = SortedIndex()
+        self._sequence = IdSequence()
+        self._locks = StripedLock()
+        # Travado sempre depois de _locks, nunca antes
+        self._email_locks = StripedLock()
+        self._versions = IdSequence()
 
-    def save(self, order: Order):
-        self._orders.append(order)
+    def next_id(self) -> int:
+        return self._sequence.next()
+
+    def next_ids(self, count: int) -> range:
+        return self._sequence.reserve(count)
+
+    def last_id(self) -> int:
+        return self._sequence.current()
+
+    def observe_id(self, used_id: int):
+        # Restaura a sequência sem gravar entidade (ex.: a partir de snapshot)
+        self._sequence.observe(used_id)
+
+    def save(self, artisan: Artisan):
+        self._write(artisan, must_exist=False)
+
+    def _write(self, artisan: Artisan, must_exist: bool) -> bool:
+        # A checagem de existência e a gravação sob o mesmo lock: uma remoção
+        # concorrente não é desfeita por um update que já tinha passado dela
+        key = normalize_email(artisan.email)
+        with self._locks.hold(artisan.id):
+            previous = self._artisans.get(artisan.id)
+            if previous is None and must_exist:
+                return False
+            previous_key = None if previous is None else normalize_email(previous.email)
+            with self._email_locks.hold(key, previous_key):
+                owner = self._email_index.get(key)
+                if owner is not None and owner != artisan.id:
+                    raise ValueError("Email já cadastrado.")
+                self._artisans[artisan.id] = artisan
+                self._email_index[key] = artisan.id
+                if previous_key is not None and previous_key != key:
+                    del self._email_index[previous_key]
+            if previous is None:
+                self._ids.add(artisan.id)
+        self._sequence.observe(artisan.id)
+        self._versions.next()
+        return True
+
+    def get_by_id(self, artisan_id: int) -> Optional[Artisan]:
+        return self._artisans.get(artisan_id)
 
+    def get_by_email(self, email: str) -> Optional[Artisan]:
+        artisan_id = self._email_index.get(normalize_email(email))
+        if artisan_id is None:
+            return None
+        return self._artisans.get(artisan_id)
+
+    def list_all(self) -> List[Artisan]:
+        return list(self._artisans.values())
+
+    def update(self, artisan: Artisan) -> bool:
+        return self._write(artisan, must_exist=True)
+
+    def delete(self, artisan_id: int) -> bool:
+        with self._locks.hold(artisan_id):
+            artisan = self._artisans.get(artisan_id)
+            if artisan is None:
+                return False
+            key = normalize_email(artisan.email)
+            with self._email_locks.hold(key):
+                del self._artisans[artisan_id]
+                del self._email_index[key]
+            self._ids.discard(artisan_id)
+        self._versions.next()
+        return True
+
+    def count(self) -> int:
+        return len(self._artisans)
+
+    def list_page(self, after_id: Optional[int], limit: int) -> List[Artisan]:
+        return _page(self._artisans, self._ids, after_id, limit)
+
+    def version(self) -> int:
+        return self._versions.current()
+
+
+class _EntityStore:
+    """Coleção id -> entidade com sequência de ids e paginação por cursor."""
 
-class ReviewRepository(ReviewRepositoryPort):
     def __init__(self):
-        self._reviews = []
+        self._items: Dict[int, object] = {}
+        self._ids = SortedIndex()
+        self._sequence = IdSequence()
+        self._locks = StripedLock()
+
+    def next_id(self) -> int:
+        return self._sequence.next()
+
+    def next_ids(self, count: int) -> range:
+        return self._sequence.reserve(count)
+
+    def last_id(self) -> int:
+        return self._sequence.current()
+
+    def observe_id(self, used_id: int):
+        self._sequence.observe(used_id)
+
+    def _save(self, item):
+        with self._locks.hold(item.id):
+            is_new = item.id not in self._items
+            self._items[item.id] = item
+            if is_new:
+                self._ids.add(item.id)
+        self._sequence.observe(item.id)
+
+    def _save_many(self, items: list):
+        if not items:
+            return
+        # Só atribuições no dicionário: não há falha no meio do lote
+        with self._locks.hold(*(item.id for item in items)):
+            for item in items:
+                is_new = item.id not in self._items
+                self._items[item.id] = item
+                if is_new:
+                    self._ids.add(item.id)
+        self._sequence.observe(max(item.id for item in items))
+
+    def _update(self, item) -> bool:
+        with self._locks.hold(item.id):
+            if item.id not in self._items:
+                return False
+            self._items[item.id] = item
+            return True
+
+    def _delete(self, item_id: int) -> bool:
+        with self._locks.hold(item_id):
+            if self._items.pop(item_id, None) is None:
+                return False
+            self._ids.discard(item_id)
+            return True
 
+    def count(self) -> int:
+        return len(self._items)
+
+    def _list_page(self, after_id: Optional[int], limit: int) -> list:
+        return _page(self._items, self._ids, after_id, limit)
+
+
+class OrderRepository(_EntityStore, OrderRepositoryPort):
+    def save(self, order: Order):
+        self._save(order)
+
+    def save_many(self, orders: Iterable[Order]):
+        self._save_many(list(orders))
+
+    def get_by_id(self, order_id: int) -> Optional[Order]:
+        return self._items.get(order_id)
+
+    def update(self, order: Order) -> bool:
+        return self._update(order)
+
+    def delete(self, order_id: int) -> bool:
+        return self._delete(order_id)
+
+    def list_page(self, after_id: Optional[int], limit: int) -> List[Order]:
+        return self._list_page(after_id, limit)
+
+
+class ReviewRepository(_EntityStore, ReviewRepositoryPort):
     def save(self, review: Review):
-        self._reviews.append(review)
+        self._save(review)
+
+    def get_by_id(self, review_id: int) -> Optional[Review]:
+        return self._items.get(review_id)
+
+    def update(self, review: Review) -> bool:
+        return self._update(review)
+
+    def delete(self, review_id: int) -> bool:
+        return self._delete(review_id)
+
+    def list_page(self, after_id: Optional[int], limit: int) -> List[Review]:
+        return self._list_page(after_id, limit)
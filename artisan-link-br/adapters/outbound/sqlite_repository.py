@@ -0,0 +1,571 @@
+import itertools
+import math
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+from core.entities import Artisan, Product, Order, OrderLine, Review
+from ports.outbound import (
+    ArtisanRepositoryPort,
+    ProductRepositoryPort,
+    OrderRepositoryPort,
+    ReviewRepositoryPort,
+)
+from adapters.outbound.repository import normalize_email
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    artisan_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    price REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_products_artisan ON products (artisan_id, id);
+CREATE INDEX IF NOT EXISTS idx_products_price ON products (price, id);
+
+CREATE TABLE IF NOT EXISTS artisans (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    email_key TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY,
+    customer_id INTEGER NOT NULL,
+    total REAL NOT NULL
+);
+
+-- Itens referenciam o catálogo; só o preço unitário da compra é copiado
+CREATE TABLE IF NOT EXISTS order_lines (
+    order_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    product_id INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    unit_price REAL NOT NULL,
+    PRIMARY KEY (order_id, position)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY,
+    product_id INTEGER NOT NULL,
+    customer_id INTEGER NOT NULL,
+    rating INTEGER NOT NULL,
+    comment TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_product ON reviews (product_id);
+
+-- Versão de cada coleção, incrementada por triggers em toda escrita
+CREATE TABLE IF NOT EXISTS collection_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO collection_versions VALUES ('products', 0), ('artisans', 0);
+
+-- Último id reservado por coleção; ids nunca são reaproveitados
+CREATE TABLE IF NOT EXISTS id_sequences (
+    name TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+SEQUENCE_SETUP = """
+INSERT OR IGNORE INTO id_sequences SELECT '{table}', COALESCE(MAX(id), 0) FROM {table};
+-- Inserções com id explícito empurram a sequência adiante
+CREATE TRIGGER IF NOT EXISTS {table}_sequence AFTER INSERT ON {table}
+BEGIN
+    UPDATE id_sequences SET last_id = MAX(last_id, NEW.id) WHERE name = '{table}';
+END;
+"""
+
+SEQUENCE_TABLES = ("artisans", "orders", "reviews")
+
+VERSION_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS {table}_version_{event} AFTER {event} ON {table}
+BEGIN
+    UPDATE collection_versions SET version = version + 1 WHERE name = '{table}';
+END;
+"""
+
+# sqlite3 guarda as instruções preparadas em cache por conexão
+STATEMENT_CACHE_SIZE = 256
+
+# Menor id possível, usado como início da paginação por keyset
+MIN_ID = -(2**63)
+MAX_ID = 2**63 - 1
+
+_memory_ids = itertools.count(1)
+
+
+class SQLiteDatabase:
+    """Uma conexão por thread sobre o mesmo arquivo, em modo WAL."""
+
+    def __init__(self, path: str):
+        self._uri = False
+        self._keeper = None
+        if path == ":memory:":
+            # Banco em memória compartilhado entre as conexões das threads
+            path = f"file:artisan-link-{next(_memory_ids)}?mode=memory&cache=shared"
+            self._uri = True
+        self.path = path
+        self._local = threading.local()
+        conn = self.connection()
+        if self._uri:
+            self._keeper = conn
+        conn.executescript(SCHEMA)
+        for table in ("products", "artisans"):
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                conn.executescript(VERSION_TRIGGER.format(table=table, event=event))
+        for table in SEQUENCE_TABLES:
+            conn.executescript(SEQUENCE_SETUP.format(table=table))
+
+    def version(self, name: str) -> int:
+        return (
+            self.connection()
+            .execute("SELECT version FROM collection_versions WHERE name = ?", (name,))
+            .fetchone()[0]
+        )
+
+    def next_id(self, name: str) -> int:
+        return self.next_ids(name, 1).start
+
+    def next_ids(self, name: str, count: int) -> range:
+        # UPDATE ... RETURNING numa transação IMMEDIATE: incremento atômico
+        # mesmo entre processos que compartilham o arquivo
+        with self.transaction() as conn:
+            last = conn.execute(
+                "UPDATE id_sequences SET last_id = last_id + ? WHERE name = ? "
+                "RETURNING last_id",
+                (count, name),
+            ).fetchone()[0]
+        return range(last - count + 1, last + 1)
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                uri=self._uri,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def _product(row) -> Product:
+    return Product(
+        id=row[0], artisan_id=row[1], name=row[2], description=row[3], price=row[4]
+    )
+
+
+PRODUCT_COLUMNS = "id, artisan_id, name, description, price"
+
+
+class SQLiteProductRepository(ProductRepositoryPort):
+    def __init__(self, database: SQLiteDatabase):
+        self._db = database
+
+    def save(self, product: Product):
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?)",
+                (
+                    product.id,
+                    product.artisan_id,
+                    product.name,
+                    product.description,
+                    product.price,
+                ),
+            )
+
+    def save_many(self, products: Iterable[Product]):
+        # Um único executemany dentro de uma transação
+        with self._db.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?)",
+                [
+                    (p.id, p.artisan_id, p.name, p.description, p.price)
+                    for p in products
+                ],
+            )
+
+    def list_all(self) -> List[Product]:
+        rows = self._db.connection().execute(
+            f"SELECT {PRODUCT_COLUMNS} FROM products ORDER BY id"
+        )
+        return [_product(row) for row in rows]
+
+    def get_by_id(self, product_id: int) -> Optional[Product]:
+        row = (
+            self._db.connection()
+            .execute(
+                f"SELECT {PRODUCT_COLUMNS} FROM products WHERE id = ?", (product_id,)
+            )
+            .fetchone()
+        )
+        return _product(row) if row else None
+
+    def get_many(self, product_ids: Iterable[int]) -> List[Product]:
+        product_ids = list(product_ids)
+        if not product_ids:
+            return []
+        # Uma única consulta com json_each em vez de N buscas por id
+        rows = self._db.connection().execute(
+            f"SELECT {PRODUCT_COLUMNS} FROM products WHERE id IN "
+            "(SELECT value FROM json_each(?))",
+            (_json_ids(product_ids),),
+        )
+        found = {row[0]: _product(row) for row in rows}
+        return [found[pid] for pid in product_ids if pid in found]
+
+    def list_by_artisan(self, artisan_id: int) -> List[Product]:
+        rows = self._db.connection().execute(
+            f"SELECT {PRODUCT_COLUMNS} FROM products WHERE artisan_id = ? ORDER BY id",
+            (artisan_id,),
+        )
+        return [_product(row) for row in rows]
+
+    def update(self, product: Product) -> bool:
+        with self._db.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE products SET artisan_id = ?, name = ?, description = ?, "
+                "price = ? WHERE id = ?",
+                (
+                    product.artisan_id,
+                    product.name,
+                    product.description,
+                    product.price,
+                    product.id,
+                ),
+            )
+        return cursor.rowcount > 0
+
+    def delete(self, product_id: int) -> bool:
+        with self._db.transaction() as conn:
+            cursor = conn.execute("DELETE FROM products WHERE id = ?", (product_id,))
+        return cursor.rowcount > 0
+
+    def list_page(self, after_id: Optional[int], limit: int) -> List[Product]:
+        rows = self._db.connection().execute(
+            f"SELECT {PRODUCT_COLUMNS} FROM products WHERE id > ? ORDER BY id LIMIT ?",
+            (MIN_ID if after_id is None else after_id, limit),
+        )
+        return [_product(row) for row in rows]
+
+    def list_by_price(
+        self,
+        min_price: float,
+        max_price: float,
+        descending: bool,
+        after: Optional[Tuple[float, int]],
+        limit: int,
+    ) -> List[Product]:
+        # Keyset sobre o índice (price, id), percorrido na direção pedida
+        if descending:
+            query = (
+                f"SELECT {PRODUCT_COLUMNS} FROM products "
+                "WHERE price BETWEEN ? AND ? AND (price, id) < (?, ?) "
+                "ORDER BY price DESC, id DESC LIMIT ?"
+            )
+            start = (math.inf, MAX_ID) if after is None else after
+        else:
+            query = (
+                f"SELECT {PRODUCT_COLUMNS} FROM products "
+                "WHERE price BETWEEN ? AND ? AND (price, id) > (?, ?) "
+                "ORDER BY price, id LIMIT ?"
+            )
+            start = (-math.inf, MIN_ID) if after is None else after
+        rows = self._db.connection().execute(
+            query, (min_price, max_price, *start, limit)
+        )
+        return [_product(row) for row in rows]
+
+    def version(self) -> int:
+        return self._db.version("products")
+
+
+def _json_ids(ids: List[int]) -> str:
+    return "[" + ",".join(str(int(i)) for i in ids) + "]"
+
+
+def _artisan(row) -> Artisan:
+    return Artisan(id=row[0], name=row[1], email=row[2])
+
+
+class SQLiteArtisanRepository(ArtisanRepositoryPort):
+    def __init__(self, database: SQLiteDatabase):
+        self._db = database
+
+    def next_id(self) -> int:
+        return self._db.next_id("artisans")
+
+    def save(self, artisan: Artisan):
+        try:
+            with self._db.transaction() as conn:
+                conn.execute(
+                    "INSERT INTO artisans (id, name, email, email_key) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET "
+                    "name = excluded.name, email = excluded.email, "
+                    "email_key = excluded.email_key",
+                    (
+                        artisan.id,
+                        artisan.name,
+                        artisan.email,
+                        normalize_email(artisan.email),
+                    ),
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError("Email já cadastrado.")
+
+    def get_by_id(self, artisan_id: int) -> Optional[Artisan]:
+        row = (
+            self._db.connection()
+            .execute("SELECT id, name, email FROM artisans WHERE id = ?", (artisan_id,))
+            .fetchone()
+        )
+        return _artisan(row) if row else None
+
+    def get_by_email(self, email: str) -> Optional[Artisan]:
+        row = (
+            self._db.connection()
+            .execute(
+                "SELECT id, name, email FROM artisans WHERE email_key = ?",
+                (normalize_email(email),),
+            )
+            .fetchone()
+        )
+        return _artisan(row) if row else None
+
+    def list_all(self) -> List[Artisan]:
+        rows = self._db.connection().execute(
+            "SELECT id, name, email FROM artisans ORDER BY id"
+        )
+        return [_artisan(row) for row in rows]
+
+    def update(self, artisan: Artisan) -> bool:
+        try:
+            with self._db.transaction() as conn:
+                cursor = conn.execute(
+                    "UPDATE artisans SET name = ?, email = ?, email_key = ? WHERE id = ?",
+                    (
+                        artisan.name,
+                        artisan.email,
+                        normalize_email(artisan.email),
+                        artisan.id,
+                    ),
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError("Email já cadastrado.")
+        return cursor.rowcount > 0
+
+    def delete(self, artisan_id: int) -> bool:
+        with self._db.transaction() as conn:
+            cursor = conn.execute("DELETE FROM artisans WHERE id = ?", (artisan_id,))
+        return cursor.rowcount > 0
+
+    def count(self) -> int:
+        return (
+            self._db.connection().execute("SELECT COUNT(*) FROM artisans").fetchone()[0]
+        )
+
+    def list_page(self, after_id: Optional[int], limit: int) -> List[Artisan]:
+        rows = self._db.connection().execute(
+            "SELECT id, name, email FROM artisans WHERE id > ? ORDER BY id LIMIT ?",
+            (MIN_ID if after_id is None else after_id, limit),
+        )
+        return [_artisan(row) for row in rows]
+
+    def version(self) -> int:
+        return self._db.version("artisans")
+
+
+class SQLiteOrderRepository(OrderRepositoryPort):
+    def __init__(self, database: SQLiteDatabase):
+        self._db = database
+
+    def next_id(self) -> int:
+        return self._db.next_id("orders")
+
+    def next_ids(self, count: int) -> range:
+        return self._db.next_ids("orders", count)
+
+    def _write(self, conn, orders: List[Order]):
+        conn.executemany(
+            "INSERT OR REPLACE INTO orders VALUES (?, ?, ?)",
+            [(order.id, order.customer_id, order.total) for order in orders],
+        )
+        conn.executemany(
+            "DELETE FROM order_lines WHERE order_id = ?",
+            [(order.id,) for order in orders],
+        )
+        # Itens de todos os pedidos gravados em lote
+        conn.executemany(
+            "INSERT INTO order_lines VALUES (?, ?, ?, ?, ?)",
+            [
+                (order.id, position, line.product_id, line.quantity, line.unit_price)
+                for order in orders
+                for position, line in enumerate(order.lines)
+            ],
+        )
+
+    def save(self, order: Order):
+        with self._db.transaction() as conn:
+            self._write(conn, [order])
+
+    def save_many(self, orders: Iterable[Order]):
+        # Uma transação para o lote inteiro: um erro desfaz todos
+        with self._db.transaction() as conn:
+            self._write(conn, list(orders))
+
+    def get_by_id(self, order_id: int) -> Optional[Order]:
+        conn = self._db.connection()
+        row = conn.execute(
+            "SELECT id, customer_id, total FROM orders WHERE id = ?", (order_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        lines = conn.execute(
+            "SELECT product_id, quantity, unit_price "
+            "FROM order_lines WHERE order_id = ? ORDER BY position",
+            (order_id,),
+        )
+        return Order(
+            id=row[0],
+            customer_id=row[1],
+            lines=[OrderLine(*line) for line in lines],
+            total=row[2],
+        )
+
+    def update(self, order: Order) -> bool:
+        with self._db.transaction() as conn:
+            exists = conn.execute(
+                "SELECT 1 FROM orders WHERE id = ?", (order.id,)
+            ).fetchone()
+            if exists is None:
+                return False
+            self._write(conn, [order])
+        return True
+
+    def delete(self, order_id: int) -> bool:
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM order_lines WHERE order_id = ?", (order_id,))
+            cursor = conn.execute("DELETE FROM orders WHERE id = ?", (order_id,))
+        return cursor.rowcount > 0
+
+    def count(self) -> int:
+        return (
+            self._db.connection().execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+        )
+
+    def list_page(self, after_id: Optional[int], limit: int) -> List[Order]:
+        conn = self._db.connection()
+        rows = conn.execute(
+            "SELECT id, customer_id, total FROM orders WHERE id > ? ORDER BY id LIMIT ?",
+            (MIN_ID if after_id is None else after_id, limit),
+        ).fetchall()
+        if not rows:
+            return []
+        # Itens da página inteira numa só consulta, pela faixa de ids
+        lines: Dict[int, List[OrderLine]] = {row[0]: [] for row in rows}
+        for item in conn.execute(
+            "SELECT order_id, product_id, quantity, unit_price "
+            "FROM order_lines WHERE order_id BETWEEN ? AND ? "
+            "ORDER BY order_id, position",
+            (rows[0][0], rows[-1][0]),
+        ):
+            order_lines = lines.get(item[0])
+            if order_lines is not None:
+                order_lines.append(OrderLine(*item[1:]))
+        return [
+            Order(id=row[0], customer_id=row[1], lines=lines[row[0]], total=row[2])
+            for row in rows
+        ]
+
+
+def _review(row) -> Review:
+    return Review(
+        id=row[0], product_id=row[1], customer_id=row[2], rating=row[3], comment=row[4]
+    )
+
+
+class SQLiteReviewRepository(ReviewRepositoryPort):
+    def __init__(self, database: SQLiteDatabase):
+        self._db = database
+
+    def next_id(self) -> int:
+        return self._db.next_id("reviews")
+
+    def save(self, review: Review):
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO reviews VALUES (?, ?, ?, ?, ?)",
+                (
+                    review.id,
+                    review.product_id,
+                    review.customer_id,
+                    review.rating,
+                    review.comment,
+                ),
+            )
+
+    def get_by_id(self, review_id: int) -> Optional[Review]:
+        row = (
+            self._db.connection()
+            .execute(
+                "SELECT id, product_id, customer_id, rating, comment "
+                "FROM reviews WHERE id = ?",
+                (review_id,),
+            )
+            .fetchone()
+        )
+        return _review(row) if row else None
+
+    def update(self, review: Review) -> bool:
+        with self._db.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE reviews SET product_id = ?, customer_id = ?, rating = ?, "
+                "comment = ? WHERE id = ?",
+                (
+                    review.product_id,
+                    review.customer_id,
+                    review.rating,
+                    review.comment,
+                    review.id,
+                ),
+            )
+        return cursor.rowcount > 0
+
+    def delete(self, review_id: int) -> bool:
+        with self._db.transaction() as conn:
+            cursor = conn.execute("DELETE FROM reviews WHERE id = ?", (review_id,))
+        return cursor.rowcount > 0
+
+    def count(self) -> int:
+        return (
+            self._db.connection().execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+        )
+
+    def list_page(self, after_id: Optional[int], limit: int) -> List[Review]:
+        rows = self._db.connection().execute(
+            "SELECT id, product_id, customer_id, rating, comment FROM reviews "
+            "WHERE id > ? ORDER BY id LIMIT ?",
+            (MIN_ID if after_id is None else after_id, limit),
+        )
+        return [_review(row) for row in rows]
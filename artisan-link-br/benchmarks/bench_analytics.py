@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Análises de vendas: SalesLedger colunar (NumPy) vs laços Python sobre Order
+
+Uso: python3 -m benchmarks.bench_analytics [--lines N] [--baseline-lines N]
+"""
+
+import argparse
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from core.analytics import DIMENSIONS, SalesLedger
+from core.entities import Order, OrderLine
+
+LINES_PER_ORDER = 4
+PRODUCTS = 100_000
+ARTISANS = 5_000
+CUSTOMERS = 500_000
+LOAD_CHUNK = 1_000_000
+
+
+def synthetic_lines(count, seed=42):
+    rng = np.random.default_rng(seed)
+    order_ids = np.arange(count, dtype=np.int64) // LINES_PER_ORDER + 1
+    product_ids = rng.integers(1, PRODUCTS + 1, count)
+    return (
+        order_ids,
+        (order_ids * 7919) % CUSTOMERS + 1,
+        product_ids,
+        product_ids % ARTISANS + 1,
+        np.round(rng.uniform(5, 500, count), 2),
+        rng.integers(1, 4, count),
+    )
+
+
+def timed(function, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def artisan_of(product_ids):
+    # Mesmo mapeamento produto -> artesão de synthetic_lines
+    return [product_id % ARTISANS + 1 for product_id in product_ids]
+
+
+def python_revenue_by_artisan(orders, artisans):
+    revenue = defaultdict(float)
+    for order in orders:
+        for line in order.lines:
+            revenue[artisans[line.product_id]] += line.unit_price * line.quantity
+    return sorted(revenue.items(), key=lambda item: -item[1])[:10]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=10_000_000)
+    parser.add_argument("--baseline-lines", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    ledger = SalesLedger(artisan_of)
+    start = time.perf_counter()
+    for offset in range(0, args.lines, LOAD_CHUNK):
+        columns = synthetic_lines(min(LOAD_CHUNK, args.lines - offset), seed=offset)
+        columns[0][:] += offset // LINES_PER_ORDER
+        ledger.append_lines(*columns)
+    print(f"carga de {len(ledger):,} linhas: {time.perf_counter() - start:.1f}s")
+
+    for dimension in DIMENSIONS:
+        elapsed = timed(lambda: ledger.revenue_by(dimension, 10))
+        print(f"  receita por {dimension:<9} (top 10): {elapsed:8.1f} ms")
+    print(f"  ticket médio:                   {timed(ledger.order_value):8.1f} ms")
+
+    # Escritas incrementais: atualização de pedidos já existentes
+    sample = min(10_000, len(ledger) // LINES_PER_ORDER)
+    updates = [
+        Order(
+            id=order_id,
+            customer_id=1,
+            lines=[OrderLine(product_id=1, quantity=1, unit_price=9.9)],
+            total=9.9,
+        )
+        for order_id in range(1, sample + 1)
+    ]
+    start = time.perf_counter()
+    for order in updates:
+        ledger.saved(order)
+    elapsed = (time.perf_counter() - start) / sample * 1e6
+    print(f"  atualização de pedido:          {elapsed:8.1f} µs/pedido")
+
+    # Referência: laço Python sobre objetos Order numa amostra menor
+    columns = synthetic_lines(args.baseline_lines)
+    orders = []
+    for start in range(0, args.baseline_lines, LINES_PER_ORDER):
+        stop = start + LINES_PER_ORDER
+        orders.append(
+            Order(
+                id=int(columns[0][start]),
+                customer_id=int(columns[1][start]),
+                lines=[
+                    OrderLine(product_id=int(p), quantity=int(q), unit_price=float(v))
+                    for p, v, q in zip(
+                        columns[2][start:stop],
+                        columns[4][start:stop],
+                        columns[5][start:stop],
+                    )
+                ],
+                total=0.0,
+            )
+        )
+    artisans = dict(zip(columns[2].tolist(), columns[3].tolist()))
+    elapsed = timed(lambda: python_revenue_by_artisan(orders, artisans), repeat=3)
+    print(
+        f"laço Python, {args.baseline_lines:,} linhas: receita por artisan "
+        f"{elapsed:.1f} ms (~{elapsed * args.lines / args.baseline_lines:.0f} ms "
+        f"estimados para {args.lines:,})"
+    )
+
+
+if __name__ == "__main__":
+    main()
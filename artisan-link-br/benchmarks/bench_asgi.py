@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Flask (pool de threads) vs ASGI (uvicorn) com clientes lentos
+
+Clientes lentos enviam o corpo de um POST /products byte a byte enquanto
+clientes rápidos fazem GET /products/<id>; mede vazão e latência dos
+rápidos em cada adaptador. O Flask roda num servidor WSGI com número fixo
+de threads, como um gunicorn --threads N.
+
+Uso: python3 -m benchmarks.bench_asgi [--slow N] [--fast N] [--threads N]
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+from adapters.inbound.api import create_app
+from adapters.inbound.asgi import create_asgi_app
+
+try:
+    import uvicorn
+except ImportError:  # pragma: no cover - depende do ambiente
+    uvicorn = None
+
+HOST = "127.0.0.1"
+CATALOG_SIZE = 1000
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Servidor WSGI com um pool fixo de threads por conexão."""
+
+    def __init__(self, port, app, threads):
+        super().__init__(HOST, port, app, handler=_QuietHandler)
+        self._pool = ThreadPoolExecutor(threads)
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_listening(port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Servidor não respondeu na porta {port}")
+
+
+def product_body(product_id):
+    return json.dumps(
+        {
+            "id": product_id,
+            "artisan_id": product_id % 50 + 1,
+            "name": f"Produto {product_id}",
+            "description": "Peça artesanal feita à mão",
+            "price": float(product_id % 100),
+        }
+    ).encode()
+
+
+async def request(port, method, path, body=b"", trickle=0.0):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    head = (
+        f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\nConnection: close\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode()
+    writer.write(head)
+    if trickle:
+        for i in range(len(body)):
+            writer.write(body[i : i + 1])
+            await writer.drain()
+            await asyncio.sleep(trickle)
+    else:
+        writer.write(body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split(b" ", 2)[1])
+
+
+async def load(port, slow, fast, duration):
+    # Catálogo inicial para as leituras dos clientes rápidos
+    for product_id in range(1, CATALOG_SIZE + 1):
+        await request(port, "POST", "/products", product_body(product_id))
+
+    body = product_body(CATALOG_SIZE + 1)
+    trickle = duration / len(body)
+    slow_tasks = [
+        asyncio.create_task(
+            request(port, "POST", "/products", product_body(CATALOG_SIZE + i), trickle)
+        )
+        for i in range(1, slow + 1)
+    ]
+    await asyncio.sleep(0.2)
+
+    latencies = []
+    errors = 0
+    deadline = asyncio.get_running_loop().time() + duration * 0.8
+
+    async def fast_client(seed):
+        nonlocal errors
+        product_id = seed
+        while asyncio.get_running_loop().time() < deadline:
+            product_id = product_id * 7 % CATALOG_SIZE + 1
+            started = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(
+                    request(port, "GET", f"/products/{product_id}"), duration
+                )
+            except (asyncio.TimeoutError, OSError):
+                errors += 1
+                continue
+            if status != 200:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(fast_client(i) for i in range(1, fast + 1)))
+    elapsed = time.perf_counter() - started
+    statuses = await asyncio.gather(*slow_tasks, return_exceptions=True)
+    slow_ok = sum(1 for status in statuses if status == 201)
+    return latencies, errors, elapsed, slow_ok
+
+
+def report(label, latencies, errors, elapsed, slow_ok, slow):
+    print(label)
+    print(f"  requisições rápidas  {len(latencies):>10,}  ({errors} erros/timeouts)")
+    if latencies:
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"  vazão                {len(latencies) / elapsed:>10,.0f} req/s")
+        print(f"  latência p50         {statistics.median(latencies) * 1000:>10.1f} ms")
+        print(f"  latência p99         {p99 * 1000:>10.1f} ms")
+    print(f"  uploads lentos ok    {slow_ok:>10}/{slow}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slow", type=int, default=64, help="clientes lentos")
+    parser.add_argument("--fast", type=int, default=16, help="clientes rápidos")
+    parser.add_argument("--threads", type=int, default=16, help="threads do Flask")
+    parser.add_argument("--duration", type=float, default=3.0, help="segundos")
+    args = parser.parse_args()
+
+    config = {"RESPONSE_CACHE_MAX_BYTES": 0}
+
+    port = free_port()
+    server = PooledWSGIServer(port, create_app(config), args.threads)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    wait_until_listening(port)
+    results = asyncio.run(load(port, args.slow, args.fast, args.duration))
+    server.shutdown()
+    report(f"Flask ({args.threads} threads)", *results, args.slow)
+
+    if uvicorn is None:
+        print("ASGI: instale uvicorn para comparar (pip install uvicorn)")
+        return
+    port = free_port()
+    asgi_server = uvicorn.Server(
+        uvicorn.Config(
+            create_asgi_app(config), host=HOST, port=port, log_level="warning"
+        )
+    )
+    threading.Thread(target=asgi_server.run, daemon=True).start()
+    wait_until_listening(port)
+    results = asyncio.run(load(port, args.slow, args.fast, args.duration))
+    asgi_server.should_exit = True
+    report("ASGI (uvicorn, 1 event loop)", *results, args.slow)
+
+
+if __name__ == "__main__":
+    main()
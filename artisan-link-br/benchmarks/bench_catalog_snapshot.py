@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Partida a frio do catálogo: abrir o snapshot mapeado vs reconstruir o
+repositório em memória a partir de NDJSON ou do SQLite, e o custo das
+leituras decodificadas sob demanda
+
+Uso: python3 -m benchmarks.bench_catalog_snapshot [--products N] [--path DIR]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from adapters.inbound.common import DEFAULT_CONFIG, create_services
+from adapters.outbound.catalog_snapshot import (
+    MappedProductRepository,
+    write_catalog_snapshot,
+)
+from adapters.outbound.repository import ProductRepository
+from adapters.outbound.sqlite_repository import SQLiteDatabase, SQLiteProductRepository
+from core.entities import Product
+
+LOOKUPS = 100_000
+BATCH_SIZE = 100_000
+
+
+def make_product(product_id):
+    return Product(
+        id=product_id,
+        artisan_id=product_id % 5000 + 1,
+        name=f"Produto {product_id}",
+        description="Peça artesanal feita à mão",
+        price=float(product_id * 7919 % 1000),
+    )
+
+
+def timed(label, function):
+    started = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - started
+    unit, scale = ("ms", 1e3) if elapsed < 1 else ("s", 1)
+    print(f"  {label:<34} {elapsed * scale:>10.2f} {unit}")
+    return result
+
+
+def open_mapped(path, probe_id):
+    repo = MappedProductRepository(path)
+    repo.get_by_id(probe_id)
+    return repo
+
+
+def from_ndjson(path):
+    repo = ProductRepository()
+    with open(path, encoding="utf-8") as f:
+        batch = []
+        for line in f:
+            batch.append(Product(**json.loads(line)))
+            if len(batch) == BATCH_SIZE:
+                repo.save_many(batch)
+                batch = []
+        repo.save_many(batch)
+    return repo
+
+
+def from_sqlite(path):
+    repo = ProductRepository()
+    repo.save_many(SQLiteProductRepository(SQLiteDatabase(path)).list_all())
+    return repo
+
+
+def lookups(repo, count):
+    rng = random.Random(1)
+    ids = [rng.randint(1, count) for _ in range(LOOKUPS)]
+    started = time.perf_counter()
+    for product_id in ids:
+        repo.get_by_id(product_id)
+    point = (time.perf_counter() - started) / LOOKUPS
+    started = time.perf_counter()
+    for i in range(1000):
+        low = float(i % 900)
+        repo.list_by_price(low, low + 100, i % 2 == 1, None, 20)
+    page = (time.perf_counter() - started) / 1000
+    return point, page
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--path", help="diretório de trabalho (padrão: temporário)")
+    args = parser.parse_args()
+    count = args.products
+
+    directory = args.path or tempfile.mkdtemp()
+    snapshot_path = os.path.join(directory, "catalog.snap")
+    ndjson_path = os.path.join(directory, "catalog.ndjson")
+    sqlite_path = os.path.join(directory, "catalog.db")
+    try:
+        products = [make_product(i) for i in range(1, count + 1)]
+        print(f"Preparação com {count:,} produtos")
+        timed(
+            "snapshot mapeável", lambda: write_catalog_snapshot(snapshot_path, products)
+        )
+        with open(ndjson_path, "w", encoding="utf-8") as f:
+            for product in products:
+                f.write(
+                    json.dumps(
+                        {
+                            "id": product.id,
+                            "artisan_id": product.artisan_id,
+                            "name": product.name,
+                            "description": product.description,
+                            "price": product.price,
+                        }
+                    )
+                    + "\n"
+                )
+        sqlite_repo = SQLiteProductRepository(SQLiteDatabase(sqlite_path))
+        for start in range(0, count, BATCH_SIZE):
+            sqlite_repo.save_many(products[start : start + BATCH_SIZE])
+        size = os.path.getsize(snapshot_path) / 2**20
+        print(f"  {'tamanho do snapshot':<34} {size:>10.1f} MiB")
+        del products
+
+        print("Partida a frio (repositório pronto + primeira leitura)")
+        mapped = timed("snapshot mmap", lambda: open_mapped(snapshot_path, count // 2))
+        memory = timed("NDJSON -> memória", lambda: from_ndjson(ndjson_path))
+        timed("SQLite -> memória", lambda: from_sqlite(sqlite_path))
+
+        print("Leituras (get_by_id / página por preço)")
+        for label, repo in (("mmap", mapped), ("memória", memory)):
+            point, page = lookups(repo, count)
+            print(
+                f"  {label:<10} {point * 1e6:>8.2f} µs/get  {page * 1e6:>8.1f} µs/página"
+            )
+
+        print("Serviços completos sobre o snapshot (partida e primeira busca)")
+        config = {
+            **DEFAULT_CONFIG,
+            "REPOSITORY_BACKEND": "mmap",
+            "CATALOG_SNAPSHOT_PATH": snapshot_path,
+        }
+        services = timed("create_services", lambda: create_services(config))
+        # O índice de busca do catálogo mapeado é montado na primeira consulta
+        timed(
+            "primeira busca", lambda: services.products.search_products("produto", 10)
+        )
+    finally:
+        if args.path is None:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Vazão dos repositórios com várias threads: criações com id da sequência,
+atualizações e leituras misturadas, de 1 a 16 threads
+
+Uso: python3 -m benchmarks.bench_concurrency [--operations N] [--path ARQUIVO]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from adapters.outbound.repository import OrderRepository, ProductRepository
+from adapters.outbound.sqlite_repository import (
+    SQLiteDatabase,
+    SQLiteOrderRepository,
+    SQLiteProductRepository,
+)
+from core.entities import Order, Product
+
+THREAD_COUNTS = (1, 2, 4, 8, 16)
+CATALOG_SIZE = 10_000
+# Fração de leituras na carga mista
+READ_RATIO = 0.8
+
+
+def make_product(product_id, rng):
+    return Product(
+        id=product_id,
+        artisan_id=product_id % 500 + 1,
+        name=f"Produto {product_id}",
+        description="Peça artesanal feita à mão",
+        price=float(rng.randrange(1000)),
+    )
+
+
+def workload(product_repo, order_repo, operations, seed):
+    rng = random.Random(seed)
+    for _ in range(operations):
+        roll = rng.random()
+        if roll < READ_RATIO / 2:
+            product_repo.get_by_id(rng.randint(1, CATALOG_SIZE))
+        elif roll < READ_RATIO:
+            low = float(rng.randrange(900))
+            product_repo.list_by_price(low, low + 100, False, None, 20)
+        elif roll < 0.9:
+            product_repo.save(make_product(rng.randint(1, CATALOG_SIZE), rng))
+        else:
+            order_repo.save(
+                Order(
+                    id=order_repo.next_id(),
+                    customer_id=rng.randint(1, 1000),
+                    lines=[],
+                    total=0.0,
+                )
+            )
+
+
+def run(label, make_repositories, operations):
+    print(label)
+    baseline = None
+    for threads in THREAD_COUNTS:
+        product_repo, order_repo = make_repositories()
+        rng = random.Random(42)
+        product_repo.save_many(make_product(i, rng) for i in range(1, CATALOG_SIZE + 1))
+        orders_before = order_repo.count()
+        per_thread = operations // threads
+        workers = [
+            threading.Thread(
+                target=workload, args=(product_repo, order_repo, per_thread, seed)
+            )
+            for seed in range(threads)
+        ]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        throughput = per_thread * threads / elapsed
+        baseline = baseline or throughput
+        created = order_repo.count() - orders_before
+        print(
+            f"  {threads:>2} threads {throughput:>14,.0f} ops/s"
+            f"  ({throughput / baseline:.2f}x, {created:,} pedidos criados)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=200_000)
+    parser.add_argument(
+        "--path", help="diretório dos bancos SQLite (padrão: temporário)"
+    )
+    args = parser.parse_args()
+
+    run(
+        "Em memória",
+        lambda: (ProductRepository(), OrderRepository()),
+        args.operations,
+    )
+
+    directory = args.path or tempfile.mkdtemp()
+    databases = iter(range(len(THREAD_COUNTS)))
+
+    def sqlite_repositories():
+        path = os.path.join(directory, f"bench-{next(databases)}.db")
+        database = SQLiteDatabase(path)
+        return SQLiteProductRepository(database), SQLiteOrderRepository(database)
+
+    # SQLite serializa escritas no arquivo: menos operações para não demorar
+    run("SQLite (WAL)", sqlite_repositories, args.operations // 10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Memória por produto: dataclass com __dict__, dataclass com __slots__ e ProductStore;
+memória por pedido: cópias de Product embutidas vs itens OrderLine
+
+Uso: python3 -m benchmarks.bench_entity_memory [--products N] [--orders N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+import json
+from dataclasses import dataclass
+from typing import List
+
+from adapters.outbound.columnar_repository import ProductStore
+from adapters.outbound.repository import OrderRepository, ProductRepository
+from core.entities import Order, OrderLine, Product
+
+
+# Mesma forma de Product antes da troca para __slots__, só para comparação
+@dataclass
+class DictProduct:
+    id: int
+    artisan_id: int
+    name: str
+    description: str
+    price: float = 0.0
+
+
+# Mesma forma de Order antes dos itens normalizados, só para comparação
+@dataclass(slots=True)
+class EmbeddedOrder:
+    id: int
+    customer_id: int
+    products: List[Product]
+    total: float
+
+
+LINES_PER_ORDER = 3
+
+DESCRIPTIONS = [
+    "Vaso de cerâmica feito à mão",
+    "Cesto de palha trançada",
+    "Rede de algodão tingida",
+    "Colar de sementes nativas",
+]
+
+
+def fields(i):
+    return dict(
+        id=i,
+        artisan_id=i % 500 + 1,
+        name=f"Produto {i}",
+        description=DESCRIPTIONS[i % len(DESCRIPTIONS)],
+        price=float(i % 1000) + 0.5,
+    )
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    holder = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del holder
+    return size
+
+
+def orders(count):
+    def payload(i):
+        # Como chegava em POST /orders: cada pedido com cópias decodificadas
+        # do JSON, sem compartilhar strings com o catálogo
+        items = [fields(i * LINES_PER_ORDER + n) for n in range(LINES_PER_ORDER)]
+        return json.loads(json.dumps(items))
+
+    def embedded_products():
+        repo = OrderRepository()
+        for i in range(1, count + 1):
+            products = [Product(**item) for item in payload(i)]
+            repo.save(EmbeddedOrder(i, i % 1000, products, 0.0))
+        return repo
+
+    def order_lines():
+        repo = OrderRepository()
+        for i in range(1, count + 1):
+            lines = [OrderLine(item["id"], 1, item["price"]) for item in payload(i)]
+            repo.save(Order(i, i % 1000, lines, 0.0))
+        return repo
+
+    print(f"{count:,} pedidos de {LINES_PER_ORDER} itens")
+    results = []
+    for label, build in [
+        ("cópias de Product", embedded_products),
+        ("itens OrderLine", order_lines),
+    ]:
+        results.append(measure(build))
+        print(f"  {label:<26} {results[-1] / count:>8.1f} bytes/pedido")
+    print(f"  redução: {results[0] / results[1]:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=200_000)
+    parser.add_argument("--orders", type=int, default=100_000)
+    args = parser.parse_args()
+    count = args.products
+
+    def dict_repository():
+        repo = ProductRepository()
+        for i in range(1, count + 1):
+            # ProductRepository só lê atributos, então aceita a variante com __dict__
+            repo.save(DictProduct(**fields(i)))
+        return repo
+
+    def slotted_repository():
+        repo = ProductRepository()
+        for i in range(1, count + 1):
+            repo.save(Product(**fields(i)))
+        return repo
+
+    def columnar_store():
+        store = ProductStore()
+        store.save_many(Product(**fields(i)) for i in range(1, count + 1))
+        return store
+
+    print(f"{count:,} produtos (inclui índices por id e por artesão)")
+    for label, build in [
+        ("dataclass com __dict__", dict_repository),
+        ("dataclass com __slots__", slotted_repository),
+        ("ProductStore colunar", columnar_store),
+    ]:
+        size = measure(build)
+        print(f"  {label:<26} {size / count:>8.1f} bytes/produto")
+    orders(args.orders)
+
+
+if __name__ == "__main__":
+    main()
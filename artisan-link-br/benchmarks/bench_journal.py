@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Custo do journal: latência de escrita por nível de durabilidade e tempo de
+recuperação com 1M entidades (só journal vs snapshot + cauda)
+
+Uso: python3 -m benchmarks.bench_journal [--writes N] [--entities N] [--path DIR]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+from adapters.outbound.journal import DURABILITY_LEVELS, JournaledStore
+from adapters.outbound.repository import (
+    ArtisanRepository,
+    OrderRepository,
+    ProductRepository,
+    ReviewRepository,
+)
+from core.entities import Product
+from core.services import ProductService
+
+THREAD_COUNTS = (1, 16)
+BATCH_SIZE = 100_000
+TAIL_SIZE = 10_000
+
+
+def make_product(product_id, version=0):
+    return Product(
+        id=product_id,
+        artisan_id=product_id % 500 + 1,
+        name=f"Produto {product_id}",
+        description="Peça artesanal feita à mão",
+        price=float((product_id + version) % 1000),
+    )
+
+
+def open_store(directory, **kwargs):
+    return JournaledStore(
+        directory,
+        ProductRepository(),
+        ArtisanRepository(),
+        OrderRepository(),
+        ReviewRepository(),
+        **kwargs,
+    )
+
+
+def measure_writes(product_repo, writes, threads):
+    service = ProductService(product_repo)
+    per_thread = writes // threads
+    latencies = [[] for _ in range(threads)]
+
+    def writer(index):
+        samples = latencies[index]
+        for i in range(per_thread):
+            product = make_product(index * per_thread + i + 1)
+            started = time.perf_counter()
+            service.add_product(product)
+            samples.append(time.perf_counter() - started)
+
+    workers = [threading.Thread(target=writer, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    samples = sorted(sample for chunk in latencies for sample in chunk)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return len(samples) / elapsed, statistics.median(samples), p99
+
+
+def write_latency(directory, writes):
+    print("Latência de escrita (ProductService.add_product)")
+    for threads in THREAD_COUNTS:
+        configurations = [("sem journal", None)] + [
+            (f"journal {level}", level) for level in DURABILITY_LEVELS
+        ]
+        for label, durability in configurations:
+            store = None
+            product_repo = ProductRepository()
+            if durability is not None:
+                path = os.path.join(directory, f"latency-{durability}-{threads}")
+                store = open_store(path, durability=durability, snapshot_every=0)
+                product_repo = store.products
+            throughput, p50, p99 = measure_writes(product_repo, writes, threads)
+            if store is not None:
+                store.close()
+            print(
+                f"  {threads:>2} threads  {label:<15} {throughput:>10,.0f} escritas/s"
+                f"  p50 {p50 * 1e6:>8.1f} µs  p99 {p99 * 1e6:>8.1f} µs"
+            )
+
+
+def directory_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path))
+
+
+def timed_recovery(path):
+    started = time.perf_counter()
+    store = open_store(path, snapshot_every=0)
+    elapsed = time.perf_counter() - started
+    return store, elapsed
+
+
+def recovery(directory, entities):
+    print(f"Recuperação com {entities:,} produtos")
+    path = os.path.join(directory, "recovery")
+    store = open_store(path, durability="async", snapshot_every=0)
+    started = time.perf_counter()
+    # Cada produto gravado duas vezes: o journal tem 2N registros, o snapshot N
+    for version in range(2):
+        for start in range(1, entities + 1, BATCH_SIZE):
+            stop = min(start + BATCH_SIZE, entities + 1)
+            store.products.save_many(
+                make_product(i, version) for i in range(start, stop)
+            )
+    store.close()
+    print(
+        f"  carga via journal        {time.perf_counter() - started:>8.2f} s"
+        f"  ({2 * entities:,} registros, {directory_size(path) / 2**20:,.0f} MiB)"
+    )
+
+    store, elapsed = timed_recovery(path)
+    print(f"  recuperação só journal   {elapsed:>8.2f} s")
+
+    started = time.perf_counter()
+    store.snapshot()
+    print(
+        f"  snapshot                 {time.perf_counter() - started:>8.2f} s"
+        f"  ({directory_size(path) / 2**20:,.0f} MiB)"
+    )
+    for i in range(TAIL_SIZE):
+        store.products.update(make_product(i + 1, 2))
+    store.close()
+
+    store, elapsed = timed_recovery(path)
+    print(f"  snapshot + {TAIL_SIZE:,} na cauda {elapsed:>6.2f} s")
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writes", type=int, default=20_000)
+    parser.add_argument("--entities", type=int, default=1_000_000)
+    parser.add_argument("--path", help="diretório de trabalho (padrão: temporário)")
+    args = parser.parse_args()
+
+    directory = args.path or tempfile.mkdtemp()
+    try:
+        write_latency(directory, args.writes)
+        recovery(directory, args.entities)
+    finally:
+        if args.path is None:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
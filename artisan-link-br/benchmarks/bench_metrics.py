@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Custo das métricas: operações dos contadores por thread vs um contador com
+lock, e requisições WSGI com e sem METRICS_ENABLED, de 1 a 8 threads
+
+Uso: python3 -m benchmarks.bench_metrics [--operations N] [--requests N]
+"""
+
+import argparse
+import threading
+import time
+
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+from adapters.inbound.api import create_app
+from adapters.inbound.metrics import MetricsRegistry
+
+THREAD_COUNTS = (1, 8)
+CATALOG_SIZE = 1000
+ROUNDS = 20
+
+
+class LockedCounter:
+    """Referência: um único valor protegido por lock."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self):
+        with self._lock:
+            self._value += 1
+
+
+def run_threads(target, threads):
+    workers = [threading.Thread(target=target, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - started
+
+
+def primitives(operations):
+    print("Operações (ns por operação, somando todas as threads)")
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total", "Bench.").labels()
+    histogram = registry.histogram("bench_seconds", "Bench.").labels()
+    locked = LockedCounter()
+    cases = [
+        ("contador por thread", lambda: counter.inc()),
+        ("histograma por thread", lambda: histogram.observe(0.003)),
+        ("contador com lock", lambda: locked.inc()),
+    ]
+    for threads in THREAD_COUNTS:
+        per_thread = operations // threads
+        for label, operation in cases:
+
+            def work(_, operation=operation):
+                for _ in range(per_thread):
+                    operation()
+
+            elapsed = run_threads(work, threads)
+            print(
+                f"  {threads} threads  {label:<22}"
+                f" {elapsed / (per_thread * threads) * 1e9:>8.0f} ns"
+            )
+
+
+def build_app(metrics_enabled):
+    app = create_app({"METRICS_ENABLED": metrics_enabled})
+    client = app.test_client()
+    for product_id in range(1, CATALOG_SIZE + 1):
+        client.post(
+            "/products",
+            json={
+                "id": product_id,
+                "artisan_id": product_id % 50 + 1,
+                "name": f"Produto {product_id}",
+                "description": "Peça artesanal feita à mão",
+                "price": float(product_id % 300),
+            },
+        )
+    return app
+
+
+def measure_requests(app, environs, per_thread, threads):
+    def work(index):
+        for i in range(per_thread):
+            environ = dict(environs[(index * per_thread + i) % CATALOG_SIZE])
+            run_wsgi_app(app, environ, buffered=True)
+
+    return run_threads(work, threads) / (per_thread * threads)
+
+
+def requests(total):
+    print(f"GET /products/<id> via WSGI (melhor de {ROUNDS} rodadas alternadas)")
+    environs = [
+        EnvironBuilder(path=f"/products/{product_id}").get_environ()
+        for product_id in range(1, CATALOG_SIZE + 1)
+    ]
+    apps = [("sem métricas", build_app(False)), ("com métricas", build_app(True))]
+    for threads in THREAD_COUNTS:
+        per_thread = total // threads
+        # Rodadas alternadas entre os dois apps: ruído da máquina afeta ambos
+        best = [float("inf")] * len(apps)
+        for _ in range(ROUNDS):
+            for i, (_, app) in enumerate(apps):
+                elapsed = measure_requests(app, environs, per_thread, threads)
+                best[i] = min(best[i], elapsed)
+        for (label, _), per_request in zip(apps, best):
+            overhead = per_request / best[0] - 1
+            print(
+                f"  {threads} threads  {label:<14} {per_request * 1e6:>8.1f} µs"
+                f"  {1 / per_request:>10,.0f} req/s  ({overhead * 100:+.1f}%)"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=1_000_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    args = parser.parse_args()
+    primitives(args.operations)
+    requests(args.requests)
+
+
+if __name__ == "__main__":
+    main()
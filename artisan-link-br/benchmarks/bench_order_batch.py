@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Vazão de criação de pedidos: um POST /orders por pedido vs POST /orders/batch
+com lotes de vários tamanhos, nos backends em memória, com journal (fsync) e
+SQLite
+
+Uso: python3 -m benchmarks.bench_order_batch [--orders N] [--catalog N]
+        [--backends memory,journal,sqlite]
+"""
+
+import argparse
+import json
+import random
+import shutil
+import tempfile
+import time
+
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+from adapters.inbound.api import create_app
+from adapters.inbound.common import AUTH_HEADER
+from core.entities import Product
+
+BATCH_SIZES = (10, 100, 1000)
+BACKENDS = ("memory", "journal", "sqlite")
+SEED = 42
+
+
+def backend_config(backend, directory):
+    if backend == "journal":
+        return {"JOURNAL_DIR": directory, "JOURNAL_DURABILITY": "fsync"}
+    if backend == "sqlite":
+        return {"REPOSITORY_BACKEND": "sqlite", "SQLITE_PATH": f"{directory}/bench.db"}
+    return {}
+
+
+def build_app(backend, directory, catalog):
+    app = create_app({**backend_config(backend, directory), "METRICS_ENABLED": False})
+    app.extensions["artisan_link"].products.add_products(
+        [
+            Product(
+                id=product_id,
+                artisan_id=product_id % 50 + 1,
+                name=f"Produto {product_id}",
+                description="Peça artesanal feita à mão",
+                price=float(product_id % 300) + 0.9,
+            )
+            for product_id in range(1, catalog + 1)
+        ]
+    )
+    return app
+
+
+def make_orders(count, catalog):
+    rng = random.Random(SEED)
+    return [
+        {
+            "customer_id": rng.randint(1, 10_000),
+            "products": [
+                {"id": rng.randint(1, catalog), "quantity": rng.randint(1, 3)}
+                for _ in range(rng.randint(1, 4))
+            ],
+        }
+        for _ in range(count)
+    ]
+
+
+def post_environ(path, payload):
+    return EnvironBuilder(
+        path=path,
+        method="POST",
+        data=json.dumps(payload),
+        content_type="application/json",
+        headers={"Authorization": AUTH_HEADER},
+    ).get_environ()
+
+
+def measure(app, environs):
+    # Corpos montados antes: só o tratamento da requisição entra na medição
+    started = time.perf_counter()
+    for environ in environs:
+        _, status, _ = run_wsgi_app(app, environ, buffered=True)
+        if not status.startswith("201"):
+            raise RuntimeError(f"Resposta inesperada: {status}")
+    return time.perf_counter() - started
+
+
+def run(backend, orders, catalog):
+    print(f"{backend}")
+    cases = [("POST /orders", 1)] + [
+        (f"POST /orders/batch ({size})", size) for size in BATCH_SIZES
+    ]
+    single = None
+    for label, size in cases:
+        directory = tempfile.mkdtemp(prefix="bench-order-batch-")
+        try:
+            app = build_app(backend, directory, catalog)
+            if size == 1:
+                environs = [post_environ("/orders", order) for order in orders]
+            else:
+                environs = [
+                    post_environ("/orders/batch", {"orders": orders[i : i + size]})
+                    for i in range(0, len(orders), size)
+                ]
+            elapsed = measure(app, environs)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        rate = len(orders) / elapsed
+        single = single or rate
+        print(
+            f"  {label:<26} {rate:>10,.0f} pedidos/s"
+            f"  {elapsed / len(orders) * 1e6:>8.1f} µs/pedido  ({rate / single:.1f}x)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--catalog", type=int, default=1000)
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    args = parser.parse_args()
+    orders = make_orders(args.orders, args.catalog)
+    for backend in args.backends.split(","):
+        run(backend, orders, args.catalog)
+
+
+if __name__ == "__main__":
+    main()
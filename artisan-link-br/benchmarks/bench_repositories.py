@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark de leitura e escrita: repositórios em memória vs SQLite
+
+Uso: python3 -m benchmarks.bench_repositories [--products N] [--path ARQUIVO]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from adapters.outbound.repository import ProductRepository
+from adapters.outbound.sqlite_repository import SQLiteDatabase, SQLiteProductRepository
+from core.entities import Product
+
+
+def make_products(count):
+    return [
+        Product(
+            id=i,
+            artisan_id=i % 500 + 1,
+            name=f"Produto {i}",
+            description="Peça artesanal feita à mão",
+            price=float(i % 1000),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def timed(label, operations, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {operations / elapsed:>14,.0f} ops/s")
+
+
+def run(repo, products, lookups):
+    ids = [random.randint(1, len(products)) for _ in range(lookups)]
+
+    def write():
+        for product in products:
+            repo.save(product)
+
+    def read_by_id():
+        for product_id in ids:
+            repo.get_by_id(product_id)
+
+    def read_by_artisan():
+        for artisan_id in range(1, 501):
+            repo.list_by_artisan(artisan_id)
+
+    def read_pages():
+        after_id = None
+        while True:
+            page = repo.list_page(after_id, 100)
+            if not page:
+                break
+            after_id = page[-1].id
+
+    timed("save", len(products), write)
+    timed("get_by_id", lookups, read_by_id)
+    timed("list_by_artisan", 500, read_by_artisan)
+    timed("list_page (100 itens)", len(products) // 100, read_pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=50_000)
+    parser.add_argument("--path", help="arquivo SQLite (padrão: temporário)")
+    args = parser.parse_args()
+
+    random.seed(42)
+    products = make_products(args.products)
+
+    print(f"Em memória ({args.products:,} produtos)")
+    run(ProductRepository(), products, args.lookups)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path or os.path.join(tmp, "bench.db")
+        print(f"SQLite WAL ({args.products:,} produtos, {path})")
+        run(SQLiteProductRepository(SQLiteDatabase(path)), products, args.lookups)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Busca textual: construção do índice invertido e latência das consultas BM25
+
+Uso: python3 -m benchmarks.bench_search [--products N] [--queries N]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from core.entities import Product
+from core.search import ProductSearchIndex
+
+NOUNS = [
+    "vaso",
+    "cesto",
+    "rede",
+    "colar",
+    "prato",
+    "tapete",
+    "boneca",
+    "panela",
+    "luminária",
+    "bolsa",
+    "brinco",
+    "quadro",
+    "caneca",
+    "almofada",
+    "sabonete",
+]
+MATERIALS = [
+    "cerâmica",
+    "palha",
+    "algodão",
+    "sementes",
+    "barro",
+    "madeira",
+    "couro",
+    "renda",
+    "bambu",
+    "capim dourado",
+    "vidro",
+    "prata",
+    "linho",
+    "juta",
+]
+ADJECTIVES = [
+    "artesanal",
+    "pintado",
+    "trançado",
+    "bordado",
+    "rústico",
+    "colorido",
+    "tingido",
+    "entalhado",
+    "tradicional",
+    "sustentável",
+    "pequeno",
+    "grande",
+]
+
+
+def build_product(i, rng):
+    noun, material = rng.choice(NOUNS), rng.choice(MATERIALS)
+    description = " ".join(rng.sample(ADJECTIVES, 3)) + f" de {rng.choice(MATERIALS)}"
+    return Product(
+        id=i,
+        artisan_id=i % 5000 + 1,
+        name=f"{noun} de {material} {i}",
+        description=description,
+        price=float(i % 1000) + 0.5,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    index = ProductSearchIndex()
+    start = time.perf_counter()
+    for i in range(1, args.products + 1):
+        index.add(build_product(i, rng))
+    print(f"índice com {len(index):,} produtos em {time.perf_counter() - start:.1f}s")
+
+    queries = [
+        f"{rng.choice(NOUNS)}s de {rng.choice(MATERIALS)} {rng.choice(ADJECTIVES)}"
+        for _ in range(args.queries)
+    ]
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, args.limit)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(
+        f"{args.queries} consultas (top-{args.limit}): "
+        f"p50 {statistics.median(timings):.1f} ms, "
+        f"p99 {timings[int(len(timings) * 0.99) - 1]:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
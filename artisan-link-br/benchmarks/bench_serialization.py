@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Custo de codificação JSON por produto e por pedido
+
+Compara o caminho antigo (__dict__/asdict + json.dumps) com os encoders de
+dict literal de adapters.inbound.serialization e o backend ativo.
+
+Uso: python3 -m benchmarks.bench_serialization [--iterations N]
+"""
+
+import argparse
+import json
+import timeit
+from dataclasses import asdict
+
+from adapters.inbound.serialization import (
+    JSON_BACKEND,
+    dumps_bytes,
+    order_to_dict,
+    product_to_dict,
+)
+from core.entities import Order, OrderLine, Product
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    product = Product(
+        id=1,
+        artisan_id=7,
+        name="Vaso de Cerâmica",
+        description="Vaso artesanal feito à mão",
+        price=50.0,
+    )
+    order = Order(
+        id=1,
+        customer_id=3,
+        lines=[OrderLine(product_id=i, quantity=1, unit_price=50.0) for i in range(5)],
+        total=250.0,
+    )
+    # Itens hidratados com o mesmo produto, como em GET /orders/<id>
+    catalog = {i: product for i in range(5)}
+
+    cases = [
+        ("produto: asdict + json.dumps", lambda: json.dumps(asdict(product))),
+        (
+            f"produto: encoder + {JSON_BACKEND}",
+            lambda: dumps_bytes(product_to_dict(product)),
+        ),
+        ("pedido (5 itens): asdict + json.dumps", lambda: json.dumps(asdict(order))),
+        (
+            f"pedido (5 itens): encoder + {JSON_BACKEND}",
+            lambda: dumps_bytes(order_to_dict(order, catalog)),
+        ),
+    ]
+    for label, fn in cases:
+        elapsed = min(timeit.repeat(fn, number=args.iterations, repeat=3))
+        print(f"  {label:<40} {elapsed / args.iterations * 1e9:>8.0f} ns/op")
+
+
+if __name__ == "__main__":
+    main()
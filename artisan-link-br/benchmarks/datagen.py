@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Gerador de dados sintéticos: artesãos, produtos, clientes, pedidos e
+avaliações com cara de artesanato brasileiro, carregados pelos serviços
+
+A popularidade segue uma distribuição de Zipf: poucos produtos concentram a
+maior parte dos pedidos e avaliações, poucos artesãos concentram boa parte
+do catálogo e alguns clientes compram muito mais que os outros. Com a mesma
+semente, o ranking de popularidade é o mesmo usado por benchmarks.loadtest.
+
+Uso: python3 -m benchmarks.datagen [--size 1k|100k|1m] [--artisans N]
+        [--customers N] [--orders N] [--reviews N] [--zipf S] [--seed N]
+        [--backend memory|columnar|sqlite] [--sqlite-path ARQUIVO]
+        [--journal-dir DIR] [--serve] [--host HOST] [--port PORTA]
+
+O backend em memória não persiste: use --serve para atender com o app já
+carregado. Nos backends persistentes (sqlite ou --journal-dir), suba depois a
+instância com a mesma configuração, por exemplo
+    ARTISAN_LINK_REPOSITORY_BACKEND=sqlite uvicorn adapters.inbound.asgi:app
+"""
+
+import argparse
+import itertools
+import logging
+import math
+import random
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Callable, List
+
+from adapters.inbound.api import create_app
+from benchmarks.suite import parse_size
+from core.entities import Product, Review
+
+DEFAULT_ZIPF = 1.1
+DEFAULT_SEED = 42
+PRODUCT_BATCH_SIZE = 10_000
+
+FIRST_NAMES = [
+    "Maria",
+    "Ana",
+    "Francisca",
+    "Antônia",
+    "Josefa",
+    "Raimunda",
+    "Luzia",
+    "Benedita",
+    "Conceição",
+    "Zuleide",
+    "José",
+    "João",
+    "Antônio",
+    "Sebastião",
+    "Cícero",
+    "Expedito",
+    "Severino",
+    "Damião",
+]
+SURNAMES = [
+    "da Silva",
+    "dos Santos",
+    "de Oliveira",
+    "Souza",
+    "Pereira",
+    "Lima",
+    "Carvalho",
+    "Ferreira",
+    "Rodrigues",
+    "Alves",
+    "Nascimento",
+    "Gomes",
+    "Barbosa",
+    "Araújo",
+    "do Carmo",
+    "Bezerra",
+]
+EMAIL_DOMAINS = ["gmail.com", "hotmail.com", "uol.com.br", "bol.com.br"]
+REGIONS = [
+    "do Vale do Jequitinhonha",
+    "de Caruaru",
+    "do Jalapão",
+    "da Ilha de Marajó",
+    "do Cariri",
+    "do Seridó",
+    "de Tracunhaém",
+    "de Ouro Preto",
+    "de Goiabeiras",
+    "de Divina Pastora",
+    "de São João del-Rei",
+    "de Icoaraci",
+]
+# Peça, material e faixa de preço em reais
+CRAFTS = [
+    ("Vaso", "cerâmica", (40, 400)),
+    ("Moringa", "barro", (30, 180)),
+    ("Boneca", "barro", (25, 250)),
+    ("Cesto", "palha de carnaúba", (20, 150)),
+    ("Bolsa", "capim dourado", (80, 600)),
+    ("Mandala", "capim dourado", (60, 400)),
+    ("Rede", "algodão", (120, 900)),
+    ("Toalha", "renda de bilro", (90, 700)),
+    ("Caminho de mesa", "renda renascença", (70, 500)),
+    ("Colar", "sementes de açaí", (15, 90)),
+    ("Carranca", "madeira", (150, 2000)),
+    ("Gamela", "madeira", (50, 350)),
+    ("Tapete", "fibra de bananeira", (60, 450)),
+    ("Panela", "pedra-sabão", (90, 500)),
+    ("Xilogravura", "papel", (40, 300)),
+    ("Luminária", "cabaça", (50, 280)),
+]
+FINISHES = [
+    "pintada à mão",
+    "trançada",
+    "rústica",
+    "bordada",
+    "entalhada",
+    "tradicional",
+    "colorida",
+    "em miniatura",
+]
+# Notas puxadas para cima, como nas lojas de verdade
+RATING_WEIGHTS = [3, 4, 10, 28, 55]
+COMMENTS = {
+    1: ["Chegou quebrado.", "Bem diferente da foto."],
+    2: ["Demorou demais para chegar.", "Acabamento deixou a desejar."],
+    3: ["Bonito, mas menor do que eu esperava.", "Ok pelo preço."],
+    4: ["Muito bonito, recomendo.", "Chegou bem embalado."],
+    5: ["Peça linda, acabamento caprichado!", "Perfeito, já quero outro."],
+}
+# Itens por pedido: 1 a 4, quase sempre 1 ou 2; quantidade de 1 a 3 por item
+ORDER_SIZE_WEIGHTS = [50, 30, 15, 5]
+QUANTITY_WEIGHTS = [80, 15, 5]
+
+
+@dataclass
+class DataSpec:
+    products: int
+    artisans: int
+    customers: int
+    orders: int
+    reviews: int
+    zipf: float = DEFAULT_ZIPF
+    seed: int = DEFAULT_SEED
+
+    @classmethod
+    def for_size(cls, products: int, **overrides) -> "DataSpec":
+        """Proporções padrão a partir do tamanho do catálogo."""
+        spec = cls(
+            products=products,
+            artisans=max(1, products // 20),
+            customers=max(1, products // 2),
+            orders=products,
+            reviews=products // 2,
+        )
+        for name, value in overrides.items():
+            if value is not None:
+                setattr(spec, name, value)
+        return spec
+
+
+def ranked_ids(count: int, seed: int, stream: str) -> List[int]:
+    """Ids 1..count em ordem de popularidade, embaralhados pela semente.
+
+    Cada stream ("products", "customers", ...) tem o seu ranking, o mesmo
+    em toda execução com a mesma semente.
+    """
+    ids = list(range(1, count + 1))
+    random.Random(f"{seed}:{stream}").shuffle(ids)
+    return ids
+
+
+class Zipf:
+    """Sorteia itens com P(k-ésimo) proporcional a 1 / k**s."""
+
+    def __init__(self, items: List[int], s: float, rng: random.Random):
+        if not items:
+            raise ValueError("A distribuição de Zipf precisa de ao menos um item.")
+        self.items = items
+        self._rng = rng
+        self._cumulative = list(
+            itertools.accumulate(1 / k**s for k in range(1, len(items) + 1))
+        )
+
+    def sample(self, k: int = 1) -> List[int]:
+        return self._rng.choices(self.items, cum_weights=self._cumulative, k=k)
+
+    def one(self) -> int:
+        return self.sample()[0]
+
+
+def _slug(text: str) -> str:
+    ascii_text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore")
+    return ".".join(ascii_text.decode().lower().replace("-", " ").split())
+
+
+def _price(rng: random.Random, low: int, high: int) -> float:
+    # Log-uniforme na faixa da peça, terminando em ,90
+    return float(int(math.exp(rng.uniform(math.log(low), math.log(high))))) + 0.9
+
+
+class Generator:
+    def __init__(self, spec: DataSpec):
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.artisan_regions: List[str] = []
+
+    def artisan(self, index: int):
+        name = f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(SURNAMES)}"
+        email = f"{_slug(name)}{index}@{self.rng.choice(EMAIL_DOMAINS)}"
+        self.artisan_regions.append(self.rng.choice(REGIONS))
+        return name, email
+
+    def product(self, product_id: int, artisan_id: int, region: str) -> Product:
+        piece, material, (low, high) = self.rng.choice(CRAFTS)
+        finish = self.rng.choice(FINISHES)
+        return Product(
+            id=product_id,
+            artisan_id=artisan_id,
+            name=f"{piece} de {material} {region}",
+            description=f"Peça {finish} em {material}, feita por artesãos {region}.",
+            price=_price(self.rng, low, high),
+        )
+
+    def review(self, review_id: int, product_id: int, customer_id: int) -> Review:
+        rating = self.rng.choices(range(1, 6), weights=RATING_WEIGHTS)[0]
+        return Review(
+            id=review_id,
+            product_id=product_id,
+            customer_id=customer_id,
+            rating=rating,
+            comment=self.rng.choice(COMMENTS[rating]),
+        )
+
+
+def load(services, spec: DataSpec, log: Callable[[str], None] = print) -> dict:
+    """Gera os dados de spec e os grava pelos serviços; devolve as contagens.
+
+    Os produtos recebem os ids 1..spec.products (sobrescrevendo os
+    existentes); artesãos, pedidos e avaliações recebem ids novos.
+    """
+    gen = Generator(spec)
+    counts = {}
+
+    def timed(label: str, count: int, work: Callable[[], None]):
+        started = time.perf_counter()
+        work()
+        counts[label] = count
+        log(f"  {count:>10,} {label:<10} {time.perf_counter() - started:>7.1f} s")
+
+    artisan_ids = []
+
+    def artisans():
+        for index in range(1, spec.artisans + 1):
+            artisan = services.artisans.create_artisan(*gen.artisan(index))
+            artisan_ids.append(artisan.id)
+
+    def products():
+        # Poucos artesãos concentram boa parte do catálogo
+        owners = Zipf(list(range(len(artisan_ids))), spec.zipf, gen.rng)
+        for start in range(1, spec.products + 1, PRODUCT_BATCH_SIZE):
+            batch = []
+            for product_id in range(
+                start, min(start + PRODUCT_BATCH_SIZE, spec.products + 1)
+            ):
+                owner = owners.one()
+                product = gen.product(
+                    product_id, artisan_ids[owner], gen.artisan_regions[owner]
+                )
+                batch.append(product)
+            services.products.add_products(batch)
+
+    popular_products = Zipf(
+        ranked_ids(spec.products, spec.seed, "products"), spec.zipf, gen.rng
+    )
+    loyal_customers = Zipf(
+        ranked_ids(spec.customers, spec.seed, "customers"), spec.zipf, gen.rng
+    )
+
+    def orders():
+        for _ in range(spec.orders):
+            size = gen.rng.choices(range(1, 5), weights=ORDER_SIZE_WEIGHTS)[0]
+            items = [
+                (product_id, gen.rng.choices(range(1, 4), weights=QUANTITY_WEIGHTS)[0])
+                for product_id in popular_products.sample(size)
+            ]
+            services.orders.place_order(loyal_customers.one(), items)
+
+    def reviews():
+        for _ in range(spec.reviews):
+            services.reviews.add_review(
+                gen.review(
+                    services.reviews.next_review_id(),
+                    popular_products.one(),
+                    loyal_customers.one(),
+                )
+            )
+
+    log(f"Gerando dados (zipf s={spec.zipf}, semente {spec.seed})")
+    timed("artesãos", spec.artisans, artisans)
+    timed("produtos", spec.products, products)
+    timed("pedidos", spec.orders, orders)
+    timed("avaliações", spec.reviews, reviews)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--size", type=parse_size, default="1k", help="produtos: 1k, 100k, 1m ou N"
+    )
+    for name in ("artisans", "customers", "orders", "reviews"):
+        parser.add_argument(f"--{name}", type=int)
+    parser.add_argument("--zipf", type=float, default=DEFAULT_ZIPF)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--backend", default="memory")
+    parser.add_argument("--sqlite-path")
+    parser.add_argument("--journal-dir")
+    parser.add_argument("--serve", action="store_true", help="atende após carregar")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    args = parser.parse_args(argv)
+    if args.artisans is not None and args.artisans < 1:
+        parser.error("--artisans deve ser ao menos 1")
+
+    config = {"REPOSITORY_BACKEND": args.backend}
+    if args.sqlite_path:
+        config["SQLITE_PATH"] = args.sqlite_path
+    if args.journal_dir:
+        config["JOURNAL_DIR"] = args.journal_dir
+    app = create_app(config)
+    spec = DataSpec.for_size(
+        args.size,
+        artisans=args.artisans,
+        customers=args.customers,
+        orders=args.orders,
+        reviews=args.reviews,
+        zipf=args.zipf,
+        seed=args.seed,
+    )
+    load(app.extensions["artisan_link"], spec)
+
+    if args.serve:
+        from werkzeug.serving import run_simple
+
+        # Sem o log de cada requisição, que pesaria na medição
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        run_simple(args.host, args.port, app, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Replay de tráfego contra uma instância rodando: N workers concorrentes
+sorteiam operações de uma mistura de leituras e escritas e o relatório traz
+vazão e latências p50/p90/p99 por operação
+
+Os ids seguem a mesma popularidade de Zipf de benchmarks.datagen: com os
+mesmos --size, --zipf e --seed da carga, os produtos mais pedidos e os
+clientes mais fiéis são os mesmos.
+
+Uso: python3 -m benchmarks.loadtest [--url URL] [--workers N]
+        [--duration S | --requests N] [--mix operação=peso,...]
+        [--size 1k|100k|1m] [--orders N] [--zipf S] [--seed N] [--json ARQUIVO]
+
+Exemplo:
+    python3 -m benchmarks.datagen --size 100k --serve --port 5000 &
+    python3 -m benchmarks.loadtest --size 100k --workers 16 --duration 30
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+from adapters.inbound.common import AUTH_HEADER
+from benchmarks.datagen import (
+    COMMENTS,
+    DEFAULT_SEED,
+    DEFAULT_ZIPF,
+    DataSpec,
+    Zipf,
+    ranked_ids,
+)
+from benchmarks.suite import parse_size
+
+DEFAULT_MIX = (
+    "product=35,rating=10,listing=10,price_range=5,search=10,top=5,"
+    "artisan_products=5,order_read=5,order=10,review=5"
+)
+SEARCH_TERMS = [
+    "vaso",
+    "cesto",
+    "capim dourado",
+    "renda",
+    "rede algodão",
+    "carranca",
+    "jequitinhonha",
+    "caruaru",
+    "cerâmica",
+    "pedra-sabão",
+    "xilogravura",
+]
+PAGE_SIZE = 50
+TIMEOUT_SECONDS = 30
+
+# (método, caminho, corpo JSON ou None, exige autenticação)
+Call = Tuple[str, str, Optional[dict], bool]
+
+
+class Picker:
+    """Sorteia ids com a popularidade do gerador; um por worker."""
+
+    def __init__(self, spec: DataSpec, seed: int):
+        self.spec = spec
+        self.rng = random.Random(seed)
+        self.products = Zipf(
+            ranked_ids(spec.products, spec.seed, "products"), spec.zipf, self.rng
+        )
+        self.customers = Zipf(
+            ranked_ids(spec.customers, spec.seed, "customers"), spec.zipf, self.rng
+        )
+
+
+def _product(p: Picker) -> Call:
+    return "GET", f"/products/{p.products.one()}", None, False
+
+
+def _rating(p: Picker) -> Call:
+    return "GET", f"/products/{p.products.one()}/rating", None, False
+
+
+def _listing(p: Picker) -> Call:
+    return "GET", f"/products?limit={PAGE_SIZE}", None, False
+
+
+def _price_range(p: Picker) -> Call:
+    low = p.rng.randrange(10, 500)
+    path = f"/products?min_price={low}&max_price={low * 2}&sort=price_asc"
+    return "GET", f"{path}&limit={PAGE_SIZE}", None, False
+
+
+def _search(p: Picker) -> Call:
+    return "GET", f"/products/search?q={quote(p.rng.choice(SEARCH_TERMS))}", None, False
+
+
+def _top(p: Picker) -> Call:
+    return "GET", f"/products/top?by={p.rng.choice(('rating', 'sales'))}", None, False
+
+
+def _artisan_products(p: Picker) -> Call:
+    artisan_id = p.rng.randint(1, p.spec.artisans)
+    return "GET", f"/artisans/{artisan_id}/products", None, False
+
+
+def _order_read(p: Picker) -> Call:
+    return "GET", f"/orders/{p.rng.randint(1, max(1, p.spec.orders))}", None, True
+
+
+def _order(p: Picker) -> Call:
+    product_ids = p.products.sample(p.rng.randint(1, 3))
+    body = {
+        "customer_id": p.customers.one(),
+        "products": [
+            {"id": product_id, "quantity": p.rng.randint(1, 3)}
+            for product_id in product_ids
+        ],
+    }
+    return "POST", "/orders", body, True
+
+
+def _review(p: Picker) -> Call:
+    rating = p.rng.randint(1, 5)
+    body = {
+        "product_id": p.products.one(),
+        "customer_id": p.customers.one(),
+        "rating": rating,
+        "comment": p.rng.choice(COMMENTS[rating]),
+    }
+    return "POST", "/reviews", body, True
+
+
+OPERATIONS: Dict[str, Callable[[Picker], Call]] = {
+    "product": _product,
+    "rating": _rating,
+    "listing": _listing,
+    "price_range": _price_range,
+    "search": _search,
+    "top": _top,
+    "artisan_products": _artisan_products,
+    "order_read": _order_read,
+    "order": _order,
+    "review": _review,
+}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Lê a mistura "operação=peso,...", por exemplo "product=35,order=10"."""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(
+                f"Operação desconhecida: {name} (use {', '.join(OPERATIONS)})"
+            )
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise ValueError(f"Peso inválido para {name}: {weight!r}")
+        if mix[name] < 0:
+            raise ValueError(f"Peso inválido para {name}: {weight!r}")
+    if not any(mix.values()):
+        raise ValueError("A mistura precisa de ao menos um peso positivo.")
+    return mix
+
+
+@dataclass
+class WorkerResult:
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: Dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+
+
+class Worker:
+    """Uma conexão HTTP/1.1 persistente; reconecta após falhas."""
+
+    def __init__(self, url: str, spec: DataSpec, mix: Dict[str, float], seed: int):
+        parts = urlsplit(url)
+        self._host = parts.hostname
+        self._port = parts.port or 80
+        self._prefix = parts.path.rstrip("/")
+        self._picker = Picker(spec, seed)
+        self._names = list(mix)
+        self._weights = list(mix.values())
+        self._connection: Optional[http.client.HTTPConnection] = None
+        self.result = WorkerResult()
+
+    def _send(self, method: str, path: str, body: Optional[dict], auth: bool) -> int:
+        if self._connection is None:
+            self._connection = http.client.HTTPConnection(
+                self._host, self._port, timeout=TIMEOUT_SECONDS
+            )
+        headers = {"Authorization": AUTH_HEADER} if auth else {}
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        self._connection.request(method, self._prefix + path, data, headers)
+        response = self._connection.getresponse()
+        response.read()
+        if response.will_close:
+            self.close()
+        return response.status
+
+    def step(self):
+        name = self._picker.rng.choices(self._names, weights=self._weights)[0]
+        call = OPERATIONS[name](self._picker)
+        started = time.perf_counter()
+        try:
+            status = self._send(*call)
+        except (OSError, http.client.HTTPException):
+            self.close()
+            status = 0
+        self.result.latencies[name].append(time.perf_counter() - started)
+        self.result.statuses[name][status] += 1
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def replay(
+    url: str,
+    spec: DataSpec,
+    mix: Dict[str, float],
+    workers: int,
+    duration: Optional[float] = None,
+    requests: Optional[int] = None,
+    seed: int = DEFAULT_SEED,
+) -> dict:
+    """Dispara a mistura com workers threads até acabar o tempo (duration) ou
+    as requisições (requests) e devolve o relatório."""
+    if (duration is None) == (requests is None):
+        raise ValueError("Informe duration ou requests.")
+    pool = [Worker(url, spec, mix, seed * 1000 + i) for i in range(workers)]
+    tickets = itertools.count()
+    deadline = None
+
+    def run(worker: Worker):
+        while True:
+            if requests is not None and next(tickets) >= requests:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            worker.step()
+        worker.close()
+
+    threads = [threading.Thread(target=run, args=(worker,)) for worker in pool]
+    started = time.perf_counter()
+    if duration is not None:
+        deadline = started + duration
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return report([worker.result for worker in pool], time.perf_counter() - started)
+
+
+def _summary(latencies: List[float], statuses: Counter, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "per_second": round(len(ordered) / elapsed, 1),
+        "p50_ms": round(percentile(ordered, 0.50) * 1e3, 2),
+        "p90_ms": round(percentile(ordered, 0.90) * 1e3, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1e3, 2),
+        "max_ms": round(ordered[-1] * 1e3, 2),
+        # 0 é falha de conexão
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "errors": sum(c for s, c in statuses.items() if s == 0 or s >= 500),
+    }
+
+
+def report(results: List[WorkerResult], elapsed: float) -> dict:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    for result in results:
+        for name, values in result.latencies.items():
+            latencies[name].extend(values)
+            statuses[name].update(result.statuses[name])
+    operations = {
+        name: _summary(latencies[name], statuses[name], elapsed)
+        for name in sorted(latencies)
+    }
+    total = None
+    if latencies:
+        total = _summary(
+            list(itertools.chain.from_iterable(latencies.values())),
+            sum(statuses.values(), Counter()),
+            elapsed,
+        )
+    return {"seconds": round(elapsed, 2), "total": total, "operations": operations}
+
+
+def print_report(result: dict):
+    print(
+        f"  {'operação':<18} {'req':>8} {'req/s':>9} {'p50 ms':>8} {'p90 ms':>8}"
+        f" {'p99 ms':>8} {'máx ms':>8}  status"
+    )
+    rows = list(result["operations"].items())
+    if result["total"] is not None:
+        rows.append(("total", result["total"]))
+    for name, summary in rows:
+        statuses = " ".join(f"{s}:{c}" for s, c in summary["statuses"].items())
+        print(
+            f"  {name:<18} {summary['requests']:>8,} {summary['per_second']:>9,.1f}"
+            f" {summary['p50_ms']:>8.2f} {summary['p90_ms']:>8.2f}"
+            f" {summary['p99_ms']:>8.2f} {summary['max_ms']:>8.2f}  {statuses}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--workers", type=int, default=8)
+    limit = parser.add_mutually_exclusive_group()
+    limit.add_argument("--duration", type=float, help="segundos (padrão: 10)")
+    limit.add_argument("--requests", type=int)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operação=peso,...")
+    parser.add_argument(
+        "--size", type=parse_size, default="1k", help="produtos carregados"
+    )
+    for name in ("artisans", "customers", "orders"):
+        parser.add_argument(f"--{name}", type=int)
+    parser.add_argument("--zipf", type=float, default=DEFAULT_ZIPF)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--json", help="grava o relatório neste arquivo")
+    args = parser.parse_args(argv)
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    spec = DataSpec.for_size(
+        args.size,
+        artisans=args.artisans,
+        customers=args.customers,
+        orders=args.orders,
+        zipf=args.zipf,
+        seed=args.seed,
+    )
+    duration = args.duration
+    if duration is None and args.requests is None:
+        duration = 10.0
+
+    print(f"{args.workers} workers contra {args.url}")
+    result = replay(
+        args.url, spec, mix, args.workers, duration, args.requests, args.seed
+    )
+    print(f"{result['seconds']:.1f} s")
+    print_report(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+    return 1 if result["total"] and result["total"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,700 @@
+#!/usr/bin/env python3
+"""
+Suíte de desempenho com gate de regressão
+
+Semeia dados sintéticos (N produtos, artesãos, pedidos e avaliações) e mede
+vazão e latência p50/p99 de cada rota do app Flask pela camada WSGI, além de
+operações dos serviços e dos repositórios. O resultado é comparado com um
+baseline em JSON (benchmarks/baselines/<size>.json, gravado com
+--update-baseline): a execução falha quando p50 ou vazão pioram além do
+limite e a piora se repete ao medir o caso de novo. Sem baseline a execução
+falha.
+
+Uso: python3 -m benchmarks.suite [--size 1k|100k|1m] [--seconds S] [--rounds N]
+        [--threshold F] [--baseline ARQUIVO] [--update-baseline] [--only TEXTO]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Collection, Dict, List, Optional, Tuple
+
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+from adapters.inbound.api import create_app
+from adapters.inbound.common import AUTH_HEADER, NDJSON_MIMETYPE
+from core.entities import Order, Product, Review
+
+# Tamanhos como "1k", "100k", "1m" ou um número
+SIZE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+# Piora relativa tolerada no p50 e na vazão antes de reprovar, somada à
+# oscilação do próprio caso entre as rodadas do baseline (até MAX_SPREAD)
+DEFAULT_THRESHOLD = 0.25
+MAX_SPREAD = 0.5
+# Piora absoluta mínima no p50: casos de poucos µs oscilam mais que o limite
+MIN_P50_DELTA_US = 5.0
+DEFAULT_SECONDS = 0.3
+DEFAULT_ROUNDS = 5
+# Rodadas da nova medição dos casos reprovados
+CONFIRM_ROUNDS = 5
+EXIT_REGRESSION = 1
+EXIT_NO_BASELINE = 2
+REFERENCE_REPEATS = 20
+# Amostras por caso: o mínimo vale mesmo se o tempo acabar (listagens
+# completas com 1M itens), o máximo limita casos muito rápidos
+MIN_SAMPLES = 5
+MAX_SAMPLES = 20_000
+SEED_BATCH_SIZE = 100_000
+BULK_SIZE = 100
+PAGE_SIZE = 50
+
+PIECES = ["Vaso", "Cesto", "Tapete", "Colar", "Bolsa", "Rede", "Moringa", "Luminária"]
+MATERIALS = ["cerâmica", "palha", "algodão", "capim dourado", "madeira", "renda"]
+REGIONS = ["Jequitinhonha", "Caruaru", "Jalapão", "Marajó", "Cariri", "Seridó"]
+QUERIES = ["vaso", "cesto palha", "capim dourado", "renda", "caruaru", "madeira"]
+
+
+@dataclass
+class Dataset:
+    size: int
+    app: object
+    services: object
+    rng: random.Random
+    next_product_id: int
+    next_customer_id: int
+    seed_seconds: float = 0.0
+
+
+def product_name(rng: random.Random) -> str:
+    return f"{rng.choice(PIECES)} de {rng.choice(MATERIALS)} do {rng.choice(REGIONS)}"
+
+
+def make_product(product_id: int, artisans: int, rng: random.Random) -> Product:
+    return Product(
+        id=product_id,
+        artisan_id=rng.randint(1, artisans),
+        name=product_name(rng),
+        description=f"Peça artesanal feita à mão, lote {product_id % 97}",
+        price=float(rng.randrange(5, 2000)),
+    )
+
+
+def order_items(size: int, rng: random.Random) -> List[Tuple[int, int]]:
+    return [(rng.randint(1, size), rng.randint(1, 3)) for _ in range(rng.randint(1, 3))]
+
+
+def place_order(services, size: int, rng: random.Random) -> Order:
+    return services.orders.place_order(rng.randint(1, size), order_items(size, rng))
+
+
+def make_review(services, size: int, rng: random.Random) -> Review:
+    return Review(
+        id=services.reviews.next_review_id(),
+        product_id=rng.randint(1, size),
+        customer_id=rng.randint(1, size),
+        rating=rng.randint(1, 5),
+        comment="Chegou bem embalado, acabamento caprichado.",
+    )
+
+
+def seed(size: int, config: Optional[dict] = None) -> Dataset:
+    """App com N artesãos, produtos, pedidos e avaliações, carregados pelos
+    serviços; o cache de respostas fica desligado para medir as rotas."""
+    started = time.perf_counter()
+    app = create_app({"RESPONSE_CACHE_MAX_BYTES": 0, **(config or {})})
+    services = app.extensions["artisan_link"]
+    rng = random.Random(size)
+    for i in range(1, size + 1):
+        services.artisans.create_artisan(f"Artesã {i}", f"artesa{i}@exemplo.com.br")
+    for start in range(1, size + 1, SEED_BATCH_SIZE):
+        stop = min(start + SEED_BATCH_SIZE, size + 1)
+        services.products.add_products(
+            [make_product(i, size, rng) for i in range(start, stop)]
+        )
+    for _ in range(size):
+        place_order(services, size, rng)
+    for _ in range(size):
+        services.reviews.add_review(make_review(services, size, rng))
+    return Dataset(
+        size=size,
+        app=app,
+        services=services,
+        rng=rng,
+        next_product_id=size + 1,
+        next_customer_id=size + 1,
+        seed_seconds=time.perf_counter() - started,
+    )
+
+
+# --- Casos ---
+#
+# Cada caso prepara uma operação fora da medição e devolve a função medida
+# (None quando não há mais o que medir).
+
+
+@dataclass
+class Case:
+    name: str
+    prepare: Callable[[Dataset], Optional[Callable[[], None]]]
+
+
+@dataclass
+class Result:
+    samples: List[float] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return {
+            "ops_per_sec": round(len(ordered) / sum(ordered), 1),
+            "p50_us": round(statistics.median(ordered) * 1e6, 1),
+            "p99_us": round(p99 * 1e6, 1),
+            "samples": len(ordered),
+        }
+
+
+def wsgi_call(app, environ: dict, expected: tuple, name: str) -> Callable[[], None]:
+    def call():
+        _, status, _ = run_wsgi_app(app, environ, buffered=True)
+        if int(status[:3]) not in expected:
+            raise AssertionError(f"{name}: status inesperado {status}")
+
+    return call
+
+
+def route(
+    name: str,
+    method: str,
+    path: Callable[[Dataset], str],
+    body: Optional[Callable[[Dataset], object]] = None,
+    auth: bool = False,
+    expected: tuple = (200,),
+    content_type: str = "application/json",
+) -> Case:
+    def prepare(dataset: Dataset):
+        headers = {"Authorization": AUTH_HEADER} if auth else {}
+        kwargs = {}
+        if body is not None:
+            data = body(dataset)
+            if isinstance(data, str):
+                kwargs["data"] = data
+                headers["Content-Type"] = content_type
+            else:
+                kwargs["json"] = data
+        builder = EnvironBuilder(
+            path=path(dataset), method=method, headers=headers, **kwargs
+        )
+        try:
+            environ = builder.get_environ()
+        finally:
+            builder.close()
+        return wsgi_call(dataset.app, environ, expected, name)
+
+    return Case(f"route {name}", prepare)
+
+
+def _any_id(dataset: Dataset) -> int:
+    return dataset.rng.randint(1, dataset.size)
+
+
+def _new_product(dataset: Dataset) -> Product:
+    product = make_product(dataset.next_product_id, dataset.size, dataset.rng)
+    dataset.next_product_id += 1
+    return product
+
+
+def _product_json(dataset: Dataset) -> dict:
+    product = _new_product(dataset)
+    return {
+        "id": product.id,
+        "artisan_id": product.artisan_id,
+        "name": product.name,
+        "description": product.description,
+        "price": product.price,
+    }
+
+
+def _bulk_ndjson(dataset: Dataset) -> str:
+    return "".join(json.dumps(_product_json(dataset)) + "\n" for _ in range(BULK_SIZE))
+
+
+def _new_email(dataset: Dataset) -> str:
+    dataset.next_customer_id += 1
+    return f"nova{dataset.next_customer_id}@exemplo.com.br"
+
+
+def _order_lines_json(dataset: Dataset) -> list:
+    return [
+        {"id": product_id, "quantity": quantity}
+        for product_id, quantity in order_items(dataset.size, dataset.rng)
+    ]
+
+
+def _order_json(dataset: Dataset) -> dict:
+    return {"customer_id": _any_id(dataset), "products": _order_lines_json(dataset)}
+
+
+def _order_batch_json(dataset: Dataset) -> dict:
+    return {"orders": [_order_json(dataset) for _ in range(BULK_SIZE)]}
+
+
+def _review_json(dataset: Dataset) -> dict:
+    return {
+        "product_id": _any_id(dataset),
+        "customer_id": _any_id(dataset),
+        "rating": dataset.rng.randint(1, 5),
+        "comment": "Muito bonito.",
+    }
+
+
+# Vítimas de DELETE criadas fora da medição, sem encolher o conjunto semeado
+def _victim_artisan(dataset: Dataset) -> str:
+    artisan = dataset.services.artisans.create_artisan("Vítima", _new_email(dataset))
+    return f"/artisans/{artisan.id}"
+
+
+def _victim_order(dataset: Dataset) -> str:
+    order = place_order(dataset.services, dataset.size, dataset.rng)
+    return f"/orders/{order.id}"
+
+
+def _victim_review(dataset: Dataset) -> str:
+    review = make_review(dataset.services, dataset.size, dataset.rng)
+    dataset.services.reviews.add_review(review)
+    return f"/reviews/{review.id}"
+
+
+def _price_window(dataset: Dataset) -> str:
+    low = dataset.rng.randrange(5, 1900)
+    return f"/products?min_price={low}&max_price={low + 100}&limit={PAGE_SIZE}"
+
+
+ROUTE_CASES = [
+    route("GET /products?limit", "GET", lambda d: f"/products?limit={PAGE_SIZE}"),
+    route("GET /products?min_price&max_price", "GET", _price_window),
+    route("GET /products (stream)", "GET", lambda d: "/products"),
+    route(
+        "POST /products", "POST", lambda d: "/products", _product_json, expected=(201,)
+    ),
+    route(
+        "POST /products/bulk",
+        "POST",
+        lambda d: "/products/bulk",
+        _bulk_ndjson,
+        expected=(201,),
+        content_type=NDJSON_MIMETYPE,
+    ),
+    route(
+        "GET /products/search",
+        "GET",
+        lambda d: f"/products/search?q={d.rng.choice(QUERIES)}",
+    ),
+    route("GET /products/top?by=rating", "GET", lambda d: "/products/top?by=rating"),
+    route("GET /products/top?by=sales", "GET", lambda d: "/products/top?by=sales"),
+    route("GET /products/<id>", "GET", lambda d: f"/products/{_any_id(d)}"),
+    route(
+        "GET /products/<id>/rating", "GET", lambda d: f"/products/{_any_id(d)}/rating"
+    ),
+    route(
+        "POST /artisans",
+        "POST",
+        lambda d: "/artisans",
+        lambda d: {"name": "Nova Artesã", "email": _new_email(d)},
+        auth=True,
+        expected=(201,),
+    ),
+    route(
+        "PUT /artisans/<id>",
+        "PUT",
+        lambda d: f"/artisans/{_any_id(d)}",
+        lambda d: {"name": f"Artesã {d.rng.randrange(10**6)}"},
+        auth=True,
+    ),
+    route("DELETE /artisans/<id>", "DELETE", _victim_artisan, auth=True),
+    route("GET /artisans?limit", "GET", lambda d: f"/artisans?limit={PAGE_SIZE}"),
+    route("GET /artisans (stream)", "GET", lambda d: "/artisans"),
+    route(
+        "GET /artisans/<id>/products",
+        "GET",
+        lambda d: f"/artisans/{_any_id(d)}/products",
+    ),
+    route(
+        "POST /orders",
+        "POST",
+        lambda d: "/orders",
+        _order_json,
+        auth=True,
+        expected=(201,),
+    ),
+    route(
+        "POST /orders/batch",
+        "POST",
+        lambda d: "/orders/batch",
+        _order_batch_json,
+        auth=True,
+        expected=(201,),
+    ),
+    route(
+        "PUT /orders/<id>",
+        "PUT",
+        lambda d: f"/orders/{_any_id(d)}",
+        lambda d: {"products": _order_lines_json(d)},
+        auth=True,
+    ),
+    route("DELETE /orders/<id>", "DELETE", _victim_order, auth=True),
+    route("GET /orders/<id>", "GET", lambda d: f"/orders/{_any_id(d)}", auth=True),
+    route(
+        "POST /reviews",
+        "POST",
+        lambda d: "/reviews",
+        _review_json,
+        auth=True,
+        expected=(201,),
+    ),
+    route(
+        "PUT /reviews/<id>",
+        "PUT",
+        lambda d: f"/reviews/{_any_id(d)}",
+        lambda d: {"rating": d.rng.randint(1, 5)},
+        auth=True,
+    ),
+    route("DELETE /reviews/<id>", "DELETE", _victim_review, auth=True),
+    route(
+        "GET /analytics/revenue/products",
+        "GET",
+        lambda d: "/analytics/revenue/products",
+        auth=True,
+    ),
+    route(
+        "GET /analytics/orders/average-value",
+        "GET",
+        lambda d: "/analytics/orders/average-value",
+        auth=True,
+    ),
+    route("GET /cache/stats", "GET", lambda d: "/cache/stats"),
+    route("GET /metrics", "GET", lambda d: "/metrics"),
+]
+
+
+def _service_cases() -> List[Case]:
+    def products(d):
+        return d.services.products
+
+    return [
+        Case(
+            "service ProductService.get_product",
+            lambda d: lambda pid=_any_id(d): products(d).get_product(pid),
+        ),
+        Case(
+            "service ProductService.search_products",
+            lambda d: lambda q=d.rng.choice(QUERIES): products(d).search_products(q),
+        ),
+        Case(
+            "service ProductService.list_products_by_price",
+            lambda d: lambda low=float(d.rng.randrange(5, 1900)): (
+                products(d).list_products_by_price(
+                    low, low + 100, "price_asc", PAGE_SIZE
+                )
+            ),
+        ),
+        Case(
+            "service ProductService.add_product",
+            lambda d: lambda p=_new_product(d): products(d).add_product(p),
+        ),
+        Case(
+            "service OrderService.place_order",
+            lambda d: lambda c=_any_id(d), items=order_items(d.size, d.rng): (
+                d.services.orders.place_order(c, items)
+            ),
+        ),
+        Case(
+            "service ReviewService.add_review",
+            lambda d: lambda r=make_review(d.services, d.size, d.rng): (
+                d.services.reviews.add_review(r)
+            ),
+        ),
+        Case(
+            "service RankingService.top_products",
+            lambda d: lambda: d.services.rankings.top_products("sales"),
+        ),
+        Case(
+            "service AnalyticsService.revenue_by",
+            lambda d: lambda: d.services.analytics.revenue_by("artisan"),
+        ),
+    ]
+
+
+def _repository_cases() -> List[Case]:
+    # Os repositórios como os serviços os veem (com a instrumentação de métricas)
+    def products(d):
+        return d.services.products.product_repo
+
+    return [
+        Case(
+            "repository products.get_by_id",
+            lambda d: lambda pid=_any_id(d): products(d).get_by_id(pid),
+        ),
+        Case(
+            "repository products.list_by_price",
+            lambda d: lambda low=float(d.rng.randrange(5, 1900)): (
+                products(d).list_by_price(low, low + 100, False, None, PAGE_SIZE)
+            ),
+        ),
+        Case(
+            "repository products.list_page",
+            lambda d: lambda after=_any_id(d): products(d).list_page(after, PAGE_SIZE),
+        ),
+        Case(
+            "repository products.save",
+            lambda d: lambda p=_new_product(d): products(d).save(p),
+        ),
+        Case(
+            "repository artisans.get_by_email",
+            lambda d: lambda email=f"artesa{_any_id(d)}@exemplo.com.br": (
+                d.services.artisans.artisan_repo.get_by_email(email)
+            ),
+        ),
+        Case(
+            "repository orders.get_by_id",
+            lambda d: lambda oid=_any_id(d): d.services.orders.order_repo.get_by_id(
+                oid
+            ),
+        ),
+        Case(
+            "repository reviews.list_page",
+            lambda d: lambda after=_any_id(d): (
+                d.services.reviews.review_repo.list_page(after, PAGE_SIZE)
+            ),
+        ),
+    ]
+
+
+CASES = ROUTE_CASES + _service_cases() + _repository_cases()
+
+
+# --- Execução e comparação ---
+
+
+def _reference_workload() -> int:
+    table = {}
+    for i in range(2000):
+        table[i] = str(i)
+    return sum(len(value) for value in table.values())
+
+
+def reference_seconds() -> float:
+    """Melhor tempo de uma carga fixa de Python puro.
+
+    Os tempos são comparados com o baseline divididos por ela: numa máquina
+    (ou num momento) mais lenta no geral, a referência também fica mais
+    lenta e a diferença não aparece como regressão.
+    """
+    best = float("inf")
+    for _ in range(REFERENCE_REPEATS):
+        started = time.perf_counter()
+        _reference_workload()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def measure(case: Case, dataset: Dataset, seconds: float) -> Optional[dict]:
+    result = Result()
+    deadline = time.perf_counter() + seconds
+    while len(result.samples) < MAX_SAMPLES and (
+        len(result.samples) < MIN_SAMPLES or time.perf_counter() < deadline
+    ):
+        call = case.prepare(dataset)
+        if call is None:
+            break
+        started = time.perf_counter()
+        call()
+        result.samples.append(time.perf_counter() - started)
+    return result.summary() if result.samples else None
+
+
+def run(
+    dataset: Dataset,
+    seconds: float,
+    rounds: int = 1,
+    only: Optional[str] = None,
+    names: Optional[Collection[str]] = None,
+) -> dict:
+    """Mede cada caso em várias rodadas e fica com a de menor p50.
+
+    As rodadas percorrem a suíte inteira em sequência: uma rajada de ruído da
+    máquina atinge uma rodada de cada caso, não todas. A referência é medida
+    antes de cada caso e vale a mediana: acompanha a lentidão da máquina
+    durante a execução toda, não só nos seus melhores momentos. p50_spread
+    é a distância entre os dois menores p50 das rodadas: a incerteza do
+    melhor p50, sem contar a deriva de casos que crescem com as escritas.
+    """
+    cases = [
+        case
+        for case in CASES
+        if (not only or only in case.name) and (names is None or case.name in names)
+    ]
+    best = {}
+    p50s: Dict[str, List[float]] = {}
+    references = []
+    for _ in range(rounds):
+        for case in cases:
+            references.append(reference_seconds())
+            summary = measure(case, dataset, seconds)
+            if summary is None:
+                continue
+            p50s.setdefault(case.name, []).append(summary["p50_us"])
+            previous = best.get(case.name)
+            if previous is None or summary["p50_us"] < previous["p50_us"]:
+                best[case.name] = summary
+    for name, summary in best.items():
+        values = sorted(p50s[name])
+        spread = values[1] / max(values[0], 1e-3) - 1 if len(values) > 1 else 0.0
+        summary["p50_spread"] = round(spread, 3)
+    for name, summary in best.items():
+        print(
+            f"  {name:<52} {summary['ops_per_sec']:>10,.0f} op/s"
+            f"  p50 {summary['p50_us']:>9,.1f} µs  p99 {summary['p99_us']:>9,.1f} µs"
+        )
+    reference = statistics.median(references) if references else 0.0
+    return {"reference_us": round(reference * 1e6, 2), "metrics": best}
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> Dict[str, str]:
+    """Casos cujo p50 subiu ou cuja vazão caiu além do limite, com os tempos
+    do baseline escalados pela razão entre as referências das execuções.
+
+    O limite de cada caso soma a oscilação do p50 entre as rodadas do
+    baseline (até MAX_SPREAD), e o p50 precisa piorar ao menos
+    MIN_P50_DELTA_US. A escala só relaxa a comparação: uma referência mais
+    rápida que a do baseline é ruído dela, não uma máquina mais rápida.
+    """
+    scale = max(1.0, current["reference_us"] / baseline["reference_us"])
+    regressions = {}
+    for name, before in baseline["metrics"].items():
+        after = current["metrics"].get(name)
+        if after is None:
+            continue
+        tolerance = threshold + min(before.get("p50_spread", 0.0), MAX_SPREAD)
+        expected_p50 = before["p50_us"] * scale
+        p50 = after["p50_us"] / expected_p50 - 1
+        throughput = after["ops_per_sec"] * scale / before["ops_per_sec"] - 1
+        if p50 > tolerance and after["p50_us"] - expected_p50 > MIN_P50_DELTA_US:
+            regressions[name] = (
+                f"{name}: p50 {before['p50_us']:,.1f} -> {after['p50_us']:,.1f} µs"
+                f" ({p50:+.0%} ajustado, limite {tolerance:.0%})"
+            )
+        elif throughput < -tolerance:
+            regressions[name] = (
+                f"{name}: vazão {before['ops_per_sec']:,.0f} -> "
+                f"{after['ops_per_sec']:,.0f} op/s ({throughput:+.0%} ajustado,"
+                f" limite {tolerance:.0%})"
+            )
+    return regressions
+
+
+def confirm(
+    size: int,
+    baseline: dict,
+    regressions: Dict[str, str],
+    seconds: float,
+    threshold: float,
+) -> Dict[str, str]:
+    """Mede de novo só os casos reprovados; ficam os que pioram outra vez.
+
+    Os casos de escrita fizeram o conjunto crescer durante a suíte: a nova
+    medição parte de um conjunto semeado de novo, como a primeira rodada.
+    """
+    print(f"Medindo de novo {len(regressions)} caso(s) reprovado(s)")
+    retry = run(seed(size), seconds, CONFIRM_ROUNDS, names=set(regressions))
+    repeated = compare(baseline, retry, threshold)
+    return {name: message for name, message in repeated.items() if name in regressions}
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def parse_size(value: str) -> int:
+    text = value.strip().lower()
+    multiplier = SIZE_SUFFIXES.get(text[-1:], 1)
+    if multiplier != 1:
+        text = text[:-1]
+    try:
+        size = int(text) * multiplier
+    except ValueError:
+        size = -1
+    if size < 0:
+        raise argparse.ArgumentTypeError(
+            f"tamanho inválido: {value} (use, por exemplo, 1k, 100k, 1m ou 250)"
+        )
+    return size
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", default="1k", help="1k, 100k, 1m ou um número")
+    parser.add_argument("--seconds", type=float, default=DEFAULT_SECONDS)
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--baseline", help="padrão: benchmarks/baselines/<size>.json")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--only", help="mede só os casos cujo nome contém o texto")
+    args = parser.parse_args(argv)
+    size = parse_size(args.size)
+    baseline_path = args.baseline or os.path.join(
+        BASELINE_DIR, f"{args.size.lower()}.json"
+    )
+    if not args.update_baseline and not os.path.exists(baseline_path):
+        print(
+            f"Baseline {baseline_path} não encontrado; grave um com --update-baseline",
+            file=sys.stderr,
+        )
+        return EXIT_NO_BASELINE
+
+    print(f"Semeando {size:,} produtos, artesãos, pedidos e avaliações")
+    dataset = seed(size)
+    print(f"  {dataset.seed_seconds:.1f} s")
+    current = {
+        "size": size,
+        "environment": environment(),
+        **run(dataset, args.seconds, args.rounds, args.only),
+    }
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(baseline_path) or ".", exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Baseline gravado em {baseline_path}")
+        return 0
+
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("environment") != current["environment"]:
+        print("Aviso: baseline gravado em outro ambiente; compare com cautela")
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        regressions = confirm(size, baseline, regressions, args.seconds, args.threshold)
+    if regressions:
+        print(f"Regressões acima de {args.threshold:.0%}:")
+        for regression in regressions.values():
+            print(f"  {regression}")
+        return EXIT_REGRESSION
+    print(f"Sem regressões acima de {args.threshold:.0%} em relação a {baseline_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
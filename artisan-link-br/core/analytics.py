@@ -0,0 +1,286 @@
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core import events as ev
+from core.entities import Order
+
+# Dimensões agregáveis: coluna de chaves codificadas de cada uma
+DIMENSIONS = ("artisan", "product", "customer")
+
+INITIAL_CAPACITY = 1024
+
+# Artesão de cada produto, na ordem dos ids pedidos (0 se fora do catálogo)
+ArtisanLookup = Callable[[List[int]], List[int]]
+
+
+def _no_artisans(product_ids: List[int]) -> List[int]:
+    return [0] * len(product_ids)
+
+
+@dataclass(slots=True)
+class GroupRevenue:
+    key: int
+    revenue: float
+    units: int
+
+
+@dataclass(slots=True)
+class OrderValueSummary:
+    orders: int
+    revenue: float
+    average: Optional[float]
+
+
+class _KeyCodes:
+    """Ids arbitrários -> códigos densos 0..n-1, para usar np.bincount."""
+
+    def __init__(self):
+        self._codes: Dict[int, int] = {}
+        self.keys: List[int] = []
+
+    def encode(self, key: int) -> int:
+        code = self._codes.get(key)
+        if code is None:
+            code = self._codes[key] = len(self.keys)
+            self.keys.append(key)
+        return code
+
+    def encode_many(self, keys: np.ndarray) -> np.ndarray:
+        # Só as chaves distintas passam pelo dicionário
+        unique, inverse = np.unique(keys, return_inverse=True)
+        codes = np.fromiter(
+            (self.encode(key) for key in unique.tolist()),
+            dtype=np.int64,
+            count=len(unique),
+        )
+        return codes[inverse]
+
+
+class SalesLedger:
+    """Linhas de pedido em colunas NumPy, anexadas a cada escrita de pedido.
+
+    Uma atualização marca as linhas antigas do pedido como mortas e anexa as
+    novas; quando metade do buffer está morta ele é compactado. As linhas só
+    referenciam o produto: o artesão é resolvido por artisan_of ao anexar.
+    """
+
+    def __init__(self, artisan_of: ArtisanLookup = _no_artisans):
+        self._artisan_of = artisan_of
+        self._order_ids = np.empty(INITIAL_CAPACITY, dtype=np.int64)
+        self._codes = {dimension: _KeyCodes() for dimension in DIMENSIONS}
+        self._columns = {
+            dimension: np.empty(INITIAL_CAPACITY, dtype=np.int64)
+            for dimension in DIMENSIONS
+        }
+        self._prices = np.empty(INITIAL_CAPACITY, dtype=np.float64)
+        self._quantities = np.empty(INITIAL_CAPACITY, dtype=np.int64)
+        self._live = np.zeros(INITIAL_CAPACITY, dtype=bool)
+        self._size = 0
+        self._dead = 0
+        # order_id -> (início, fim) das linhas vivas do pedido no buffer
+        self._orders: Dict[int, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size - self._dead
+
+    def _grow(self, needed: int):
+        capacity = len(self._prices)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self._order_ids = _resized(self._order_ids, capacity, self._size)
+        for dimension in DIMENSIONS:
+            self._columns[dimension] = _resized(
+                self._columns[dimension], capacity, self._size
+            )
+        self._prices = _resized(self._prices, capacity, self._size)
+        self._quantities = _resized(self._quantities, capacity, self._size)
+        self._live = _resized(self._live, capacity, self._size, fill=False)
+
+    def _append(self, order: Order, artisan_ids: List[int]):
+        lines = order.lines
+        start, stop = self._size, self._size + len(lines)
+        self._grow(stop)
+        self._order_ids[start:stop] = order.id
+        artisans = self._codes["artisan"]
+        products = self._codes["product"]
+        self._columns["artisan"][start:stop] = [
+            artisans.encode(artisan_id) for artisan_id in artisan_ids
+        ]
+        self._columns["product"][start:stop] = [
+            products.encode(line.product_id) for line in lines
+        ]
+        self._columns["customer"][start:stop] = self._codes["customer"].encode(
+            order.customer_id
+        )
+        self._prices[start:stop] = [line.unit_price for line in lines]
+        self._quantities[start:stop] = [line.quantity for line in lines]
+        self._live[start:stop] = True
+        self._size = stop
+        self._orders[order.id] = (start, stop)
+
+    def _drop(self, order_id: int):
+        rows = self._orders.pop(order_id, None)
+        if rows is None:
+            return
+        start, stop = rows
+        self._live[start:stop] = False
+        self._dead += stop - start
+
+    def _compact(self):
+        live = self._live[: self._size]
+        index = np.flatnonzero(live)
+        self._order_ids[: len(index)] = self._order_ids[index]
+        for dimension in DIMENSIONS:
+            column = self._columns[dimension]
+            column[: len(index)] = column[index]
+        self._prices[: len(index)] = self._prices[index]
+        self._quantities[: len(index)] = self._quantities[index]
+        self._live[: len(index)] = True
+        self._live[len(index) : self._size] = False
+        self._size = len(index)
+        self._dead = 0
+        # Linhas de um mesmo pedido continuam contíguas depois da compactação
+        orders = {
+            order_id: (0, 0)
+            for order_id, (start, stop) in self._orders.items()
+            if start == stop
+        }
+        order_ids = self._order_ids[: self._size]
+        if self._size:
+            boundaries = np.flatnonzero(order_ids[1:] != order_ids[:-1]) + 1
+            starts = np.concatenate(([0], boundaries))
+            stops = np.concatenate((boundaries, [self._size]))
+            for start, stop in zip(starts.tolist(), stops.tolist()):
+                orders[int(order_ids[start])] = (start, stop)
+        self._orders = orders
+
+    def saved(self, order: Order, previous: Optional[Order] = None):
+        # Consulta ao catálogo fora do lock
+        artisan_ids = self._artisan_of([line.product_id for line in order.lines])
+        with self._lock:
+            self._drop(order.id)
+            self._append(order, artisan_ids)
+            if self._dead > self._size // 2:
+                self._compact()
+
+    def deleted(self, order: Order):
+        with self._lock:
+            self._drop(order.id)
+            if self._dead > self._size // 2:
+                self._compact()
+
+    def append_lines(
+        self,
+        order_ids: np.ndarray,
+        customer_ids: np.ndarray,
+        product_ids: np.ndarray,
+        artisan_ids: np.ndarray,
+        prices: np.ndarray,
+        quantities: np.ndarray,
+    ):
+        """Carga em lote de linhas já em colunas, contíguas por pedido."""
+        count = len(order_ids)
+        if not count:
+            return
+        boundaries = np.flatnonzero(order_ids[1:] != order_ids[:-1]) + 1
+        starts = np.concatenate(([0], boundaries)).tolist()
+        stops = np.concatenate((boundaries, [count])).tolist()
+        with self._lock:
+            for start in starts:
+                self._drop(int(order_ids[start]))
+            offset = self._size
+            self._grow(offset + count)
+            rows = slice(offset, offset + count)
+            self._order_ids[rows] = order_ids
+            self._columns["customer"][rows] = self._codes["customer"].encode_many(
+                customer_ids
+            )
+            self._columns["product"][rows] = self._codes["product"].encode_many(
+                product_ids
+            )
+            self._columns["artisan"][rows] = self._codes["artisan"].encode_many(
+                artisan_ids
+            )
+            self._prices[rows] = prices
+            self._quantities[rows] = quantities
+            self._live[rows] = True
+            self._size += count
+            for start, stop in zip(starts, stops):
+                self._orders[int(order_ids[start])] = (offset + start, offset + stop)
+            if self._dead > self._size // 2:
+                self._compact()
+
+    def _live_columns(self, *columns: np.ndarray) -> List[np.ndarray]:
+        # Sem linhas mortas as colunas são usadas como views, sem cópia
+        size = self._size
+        if not self._dead:
+            return [column[:size] for column in columns]
+        live = self._live[:size]
+        return [column[:size][live] for column in columns]
+
+    def rebuild(self, batches: Iterable[List[Order]]):
+        for batch in batches:
+            # Uma consulta de artesãos por lote, não por pedido
+            artisan_ids = iter(
+                self._artisan_of(
+                    [line.product_id for order in batch for line in order.lines]
+                )
+            )
+            with self._lock:
+                for order in batch:
+                    self._drop(order.id)
+                    self._append(order, [next(artisan_ids) for _ in order.lines])
+                if self._dead > self._size // 2:
+                    self._compact()
+
+    def revenue_by(self, dimension: str, limit: int) -> List[GroupRevenue]:
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Dimensão desconhecida: {dimension}.")
+        with self._lock:
+            codes, prices, quantities = self._live_columns(
+                self._columns[dimension], self._prices, self._quantities
+            )
+            revenue = prices * quantities
+            keys = self._codes[dimension].keys
+            groups = len(keys)
+            # Agregação em O(n) sobre os códigos densos, sem laço em Python
+            totals = np.bincount(codes, weights=revenue, minlength=groups)
+            units = np.bincount(codes, weights=quantities, minlength=groups)
+            present = np.flatnonzero(units)
+            if len(present) > limit:
+                # Seleção parcial O(n): só os grupos com receita >= k-ésima
+                # maior (incluindo empates) são ordenados
+                values = totals[present]
+                cut = len(values) - limit
+                present = present[values >= np.partition(values, cut)[cut]]
+            # Maior receita primeiro; empate pela menor chave
+            order = np.lexsort(
+                (np.array([keys[code] for code in present]), -totals[present])
+            )
+            return [
+                GroupRevenue(keys[code], float(totals[code]), int(units[code]))
+                for code in present[order][:limit]
+            ]
+
+    def order_value(self) -> OrderValueSummary:
+        with self._lock:
+            prices, quantities = self._live_columns(self._prices, self._quantities)
+            revenue = float(np.dot(prices, quantities))
+            orders = len(self._orders)
+        return OrderValueSummary(orders, revenue, revenue / orders if orders else None)
+
+    def subscribe(self, events: ev.EventBus):
+        events.subscribe(ev.ORDER_SAVED, self.saved)
+        events.subscribe(ev.ORDER_DELETED, self.deleted)
+
+
+def _resized(column: np.ndarray, capacity: int, size: int, fill=0) -> np.ndarray:
+    resized = np.full(capacity, fill, dtype=column.dtype)
+    resized[:size] = column[:size]
+    return resized
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import List
 
 
-@dataclass
+@dataclass(slots=True)
 class Artisan:
     id: int
     name: str
@@ -13,7 +13,7 @@ from dataclasses import dataclass, field
 from typing import List
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     id: int
     artisan_id: int
@@ -26,15 +26,29 @@ class Product:
             raise ValueError("O preço do produto deve ser positivo.")
 
 
-@dataclass
+# Item do pedido: referência ao catálogo e o preço unitário no momento da compra
+@dataclass(slots=True)
+class OrderLine:
+    product_id: int
+    quantity: int = field(default=1)
+    unit_price: float = field(default=0.0)
+
+    def __post_init__(self):
+        if self.quantity < 1:
+            raise ValueError("A quantidade de cada item deve ser ao menos 1.")
+        if self.unit_price < 0:
+            raise ValueError("O preço unitário deve ser positivo.")
+
+
+@dataclass(slots=True)
 class Order:
     id: int
     customer_id: int
-    products: List[Product]
+    lines: List[OrderLine]
     total: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Review:
     id: int
     product_id: int
@@ -43,5 +57,8 @@ class Review:
     comment: str
 
     def __post_init__(self):
+        # bool é subclasse de int, mas true/false não são notas
+        if not isinstance(self.rating, int) or isinstance(self.rating, bool):
+            raise ValueError("A nota deve ser um número inteiro.")
         if not (1 <= self.rating <= 5):
             raise ValueError("A nota deve estar entre 1 e 5.")
@@ -0,0 +1,34 @@
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+# Eventos publicados pelos serviços após cada escrita bem-sucedida.
+# *_saved recebe (entity, previous); previous é None em criações.
+# *_deleted recebe (entity) com o estado removido.
+PRODUCT_SAVED = "product_saved"
+PRODUCT_DELETED = "product_deleted"
+ARTISAN_SAVED = "artisan_saved"
+ARTISAN_DELETED = "artisan_deleted"
+ORDER_SAVED = "order_saved"
+ORDER_DELETED = "order_deleted"
+REVIEW_SAVED = "review_saved"
+REVIEW_DELETED = "review_deleted"
+
+logger = logging.getLogger(__name__)
+
+
+class EventBus:
+    def __init__(self):
+        self._handlers: Dict[str, List[Callable[..., Any]]] = defaultdict(list)
+
+    def subscribe(self, event: str, handler: Callable[..., Any]):
+        self._handlers[event].append(handler)
+
+    def publish(self, event: str, *args: Any):
+        # A escrita já aconteceu: a falha de um assinante é registrada e não
+        # impede os seguintes, como a invalidação do cache de respostas
+        for handler in self._handlers.get(event, ()):
+            try:
+                handler(*args)
+            except Exception:
+                logger.exception("Falha no assinante %r do evento %s", handler, event)
@@ -0,0 +1,202 @@
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core import events as ev
+from core.entities import Order, Product
+from core.ratings import RatingAggregates, RatingSummary
+
+# Nota bayesiana: cada produto começa com PRIOR_WEIGHT avaliações fictícias
+# de nota PRIOR_MEAN, então poucas notas altas não dominam o ranking
+PRIOR_MEAN = 3.0
+PRIOR_WEIGHT = 5
+
+RANKINGS = ("rating", "sales")
+
+# product_ids -> {product_id: artisan_id} dos que existem no catálogo
+CatalogArtisans = Callable[[List[int]], Dict[int, int]]
+
+
+def bayesian_rating(summary: RatingSummary) -> float:
+    return (PRIOR_WEIGHT * PRIOR_MEAN + summary.total) / (PRIOR_WEIGHT + summary.count)
+
+
+def order_units(order: Order) -> Counter:
+    units = Counter()
+    for line in order.lines:
+        units[line.product_id] += line.quantity
+    return units
+
+
+class Leaderboard:
+    """Produtos ordenados por placar, no geral e por artesão.
+
+    Só entram no ranking produtos que existem no catálogo e têm placar;
+    cada mudança custa uma busca binária e uma inserção na lista ordenada.
+    """
+
+    def __init__(self):
+        self._scores: Dict[int, float] = {}
+        # product_id -> artisan_id dos produtos do catálogo
+        self._artisans: Dict[int, int] = {}
+        # (-placar, product_id): maior placar primeiro, empate pelo menor id
+        self._ranking: List[Tuple[float, int]] = []
+        self._by_artisan: Dict[int, List[Tuple[float, int]]] = {}
+
+    def _link(self, product_id: int):
+        score = self._scores.get(product_id)
+        artisan_id = self._artisans.get(product_id)
+        if score is None or artisan_id is None:
+            return
+        key = (-score, product_id)
+        insort(self._ranking, key)
+        insort(self._by_artisan.setdefault(artisan_id, []), key)
+
+    def _unlink(self, product_id: int):
+        score = self._scores.get(product_id)
+        artisan_id = self._artisans.get(product_id)
+        if score is None or artisan_id is None:
+            return
+        key = (-score, product_id)
+        del self._ranking[bisect_left(self._ranking, key)]
+        entries = self._by_artisan[artisan_id]
+        del entries[bisect_left(entries, key)]
+        if not entries:
+            del self._by_artisan[artisan_id]
+
+    def set_score(self, product_id: int, score: Optional[float]):
+        self._unlink(product_id)
+        if score is None:
+            self._scores.pop(product_id, None)
+        else:
+            self._scores[product_id] = score
+        self._link(product_id)
+
+    def set_product(self, product_id: int, artisan_id: int):
+        self._unlink(product_id)
+        self._artisans[product_id] = artisan_id
+        self._link(product_id)
+
+    def remove_product(self, product_id: int):
+        self._unlink(product_id)
+        self._artisans.pop(product_id, None)
+
+    def top(
+        self, limit: int, artisan_id: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        if artisan_id is None:
+            entries = self._ranking
+        else:
+            entries = self._by_artisan.get(artisan_id, [])
+        return [(product_id, -score) for score, product_id in entries[:limit]]
+
+
+class ProductRankings:
+    """Rankings por nota bayesiana e por vendas, mantidos pelos eventos.
+
+    O artesão de um produto é buscado com artisan_of só quando ele ganha
+    placar; montar os rankings custa o número de pedidos e avaliações, não o
+    tamanho do catálogo.
+    """
+
+    def __init__(self, ratings: RatingAggregates, artisan_of: CatalogArtisans):
+        self.ratings = ratings
+        self.artisan_of = artisan_of
+        self._boards = {"rating": Leaderboard(), "sales": Leaderboard()}
+        self._sales: Counter = Counter()
+        # product_id -> artisan_id dos produtos do catálogo já vistos
+        self._artisans: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _learn(self, product_ids: Iterable[int]):
+        # Com _lock travado: a busca não cruza com um product_deleted
+        missing = [pid for pid in product_ids if pid not in self._artisans]
+        if not missing:
+            return
+        for product_id, artisan_id in self.artisan_of(missing).items():
+            self._set_product(product_id, artisan_id)
+
+    def _set_product(self, product_id: int, artisan_id: int):
+        self._artisans[product_id] = artisan_id
+        for board in self._boards.values():
+            board.set_product(product_id, artisan_id)
+
+    def product_saved(self, product: Product, previous: Optional[Product] = None):
+        with self._lock:
+            self._set_product(product.id, product.artisan_id)
+
+    def product_deleted(self, product: Product):
+        with self._lock:
+            self._artisans.pop(product.id, None)
+            for board in self._boards.values():
+                board.remove_product(product.id)
+
+    def rating_changed(self, product_id: int):
+        summary = self.ratings.get(product_id)
+        score = bayesian_rating(summary) if summary.count else None
+        with self._lock:
+            if score is not None:
+                self._learn((product_id,))
+            self._boards["rating"].set_score(product_id, score)
+
+    def order_saved(self, order: Order, previous: Optional[Order] = None):
+        delta = order_units(order)
+        if previous is not None:
+            delta.subtract(order_units(previous))
+        self._apply_sales(delta)
+
+    def order_deleted(self, order: Order):
+        delta = Counter()
+        delta.subtract(order_units(order))
+        self._apply_sales(delta)
+
+    def _apply_sales(self, delta: Counter):
+        with self._lock:
+            self._learn(product_id for product_id, units in delta.items() if units)
+            board = self._boards["sales"]
+            for product_id, units in delta.items():
+                if not units:
+                    continue
+                total = self._sales[product_id] + units
+                if total > 0:
+                    self._sales[product_id] = total
+                    board.set_score(product_id, float(total))
+                else:
+                    del self._sales[product_id]
+                    board.set_score(product_id, None)
+
+    def rebuild(self, orders: Iterable[List[Order]]):
+        # Vendas somadas antes: uma busca de artesãos para todos os produtos
+        sales: Counter = Counter()
+        for batch in orders:
+            for order in batch:
+                sales.update(order_units(order))
+        rated = [summary.product_id for summary in self.ratings.summaries()]
+        with self._lock:
+            self._learn([*sales, *rated])
+        for product_id in rated:
+            self.rating_changed(product_id)
+        self._apply_sales(sales)
+
+    def top(
+        self, by: str, limit: int, artisan_id: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        with self._lock:
+            return self._boards[by].top(limit, artisan_id)
+
+    def subscribe(self, events: ev.EventBus):
+        # Deve ser inscrito depois de RatingAggregates para ler a nota já atualizada
+        def review_saved(review, previous):
+            self.rating_changed(review.product_id)
+            if previous is not None and previous.product_id != review.product_id:
+                self.rating_changed(previous.product_id)
+
+        events.subscribe(ev.PRODUCT_SAVED, self.product_saved)
+        events.subscribe(ev.PRODUCT_DELETED, self.product_deleted)
+        events.subscribe(ev.REVIEW_SAVED, review_saved)
+        events.subscribe(
+            ev.REVIEW_DELETED, lambda review: self.rating_changed(review.product_id)
+        )
+        events.subscribe(ev.ORDER_SAVED, self.order_saved)
+        events.subscribe(ev.ORDER_DELETED, self.order_deleted)
@@ -0,0 +1,38 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(key: Tuple) -> str:
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise ValueError("Cursor inválido.")
+    if not isinstance(key, list) or not key:
+        raise ValueError("Cursor inválido.")
+    return tuple(key)
+
+
+def check_page_size(limit: int) -> int:
+    if not (1 <= limit <= MAX_PAGE_SIZE):
+        raise ValueError(f"O parâmetro limit deve estar entre 1 e {MAX_PAGE_SIZE}.")
+    return limit
@@ -0,0 +1,92 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core import events as ev
+from core.entities import Review
+
+MIN_RATING = 1
+MAX_RATING = 5
+
+
+@dataclass(slots=True)
+class RatingSummary:
+    product_id: int
+    count: int
+    total: int
+    # histogram[0] conta as notas 1, histogram[4] as notas 5
+    histogram: List[int]
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+class RatingAggregates:
+    """Contagem, soma e histograma de notas por produto, atualizados em O(1)."""
+
+    def __init__(self):
+        # product_id -> [count, total, nota 1, ..., nota 5]
+        self._aggregates: Dict[int, List[int]] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def _apply(self, *changes: Tuple[Review, int]):
+        # Os novos agregados são calculados em cópias e gravados só no fim:
+        # uma nota que não indexa o histograma deixa tudo como estava
+        updated: Dict[int, List[int]] = {}
+        for review, sign in changes:
+            aggregate = updated.get(review.product_id)
+            if aggregate is None:
+                aggregate = self._aggregates.get(review.product_id)
+                if aggregate is None:
+                    aggregate = [0] * (2 + MAX_RATING - MIN_RATING + 1)
+                aggregate = updated[review.product_id] = list(aggregate)
+            aggregate[0] += sign
+            aggregate[1] += sign * review.rating
+            aggregate[2 + review.rating - MIN_RATING] += sign
+        for product_id, aggregate in updated.items():
+            if aggregate[0]:
+                self._aggregates[product_id] = aggregate
+            else:
+                self._aggregates.pop(product_id, None)
+
+    def saved(self, review: Review, previous: Optional[Review] = None):
+        with self._lock:
+            if previous is not None:
+                self._apply((previous, -1), (review, 1))
+            else:
+                self._apply((review, 1))
+            self._version += 1
+
+    def deleted(self, review: Review):
+        with self._lock:
+            self._apply((review, -1))
+            self._version += 1
+
+    def rebuild(self, batches: Iterable[List[Review]]):
+        for batch in batches:
+            for review in batch:
+                self.saved(review)
+
+    def get(self, product_id: int) -> RatingSummary:
+        with self._lock:
+            aggregate = self._aggregates.get(product_id)
+            if aggregate is None:
+                histogram = [0] * (MAX_RATING - MIN_RATING + 1)
+                return RatingSummary(product_id, 0, 0, histogram)
+            return RatingSummary(product_id, aggregate[0], aggregate[1], aggregate[2:])
+
+    def summaries(self) -> List[RatingSummary]:
+        with self._lock:
+            return [
+                RatingSummary(product_id, a[0], a[1], a[2:])
+                for product_id, a in self._aggregates.items()
+            ]
+
+    def version(self) -> int:
+        return self._version
+
+    def subscribe(self, events: ev.EventBus):
+        events.subscribe(ev.REVIEW_SAVED, self.saved)
+        events.subscribe(ev.REVIEW_DELETED, self.deleted)
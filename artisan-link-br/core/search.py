@@ -0,0 +1,286 @@
+import math
+import re
+import threading
+import unicodedata
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core import events as ev
+from core.entities import Product
+
+# Peso dos termos do nome em relação aos da descrição (BM25F simplificado)
+NAME_WEIGHT = 2
+BM25_K1 = 1.2
+BM25_B = 0.75
+MIN_STEM_LENGTH = 3
+INITIAL_CAPACITY = 1024
+
+STOPWORDS = frozenset("""
+    a o e as os um uma uns umas de da do das dos em na no nas nos por para
+    com sem sob que se ao aos pela pelo pelas pelos ou mais muito feito feita
+    """.split())
+
+# Sufixos removidos uma única vez, do mais longo para o mais curto:
+# plural, grau (diminutivo/aumentativo) e gênero. Texto já sem acentos.
+SUFFIX_RULES = (
+    ("zinhos", ""),
+    ("zinhas", ""),
+    ("inhos", ""),
+    ("inhas", ""),
+    ("zinho", ""),
+    ("zinha", ""),
+    ("inho", ""),
+    ("inha", ""),
+    ("oes", "ao"),
+    ("aes", "ao"),
+    ("ais", "al"),
+    ("eis", "el"),
+    ("ois", "ol"),
+    ("res", "r"),
+    ("ns", "m"),
+    # Mantém "ao" para que "coração" e "corações" caiam no mesmo radical
+    ("ao", "ao"),
+    ("as", ""),
+    ("os", ""),
+    ("es", ""),
+    ("s", ""),
+    ("a", ""),
+    ("o", ""),
+    ("e", ""),
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Minúsculas e sem acentos: "Cerâmica" -> "ceramica"."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def stem(token: str) -> str:
+    for suffix, replacement in SUFFIX_RULES:
+        if token.endswith(suffix):
+            stemmed = token[: len(token) - len(suffix)] + replacement
+            if len(stemmed) >= MIN_STEM_LENGTH:
+                return stemmed
+    return token
+
+
+def analyze(text: str) -> List[str]:
+    return [
+        stem(token) for token in _TOKEN.findall(fold(text)) if token not in STOPWORDS
+    ]
+
+
+class _Postings:
+    """Lista de ocorrências de um termo: posições de documento e frequências."""
+
+    __slots__ = ("slots", "frequencies", "size")
+
+    def __init__(self):
+        self.slots = np.empty(16, dtype=np.int64)
+        self.frequencies = np.empty(16, dtype=np.float32)
+        self.size = 0
+
+    def append(self, slot: int, frequency: int):
+        if self.size == len(self.slots):
+            self.slots = _resized(self.slots, self.size * 2, self.size)
+            self.frequencies = _resized(self.frequencies, self.size * 2, self.size)
+        self.slots[self.size] = slot
+        self.frequencies[self.size] = frequency
+        self.size += 1
+
+    def remap(self, slots: np.ndarray):
+        # slots: posição antiga -> nova, -1 para documentos removidos
+        moved = slots[self.slots[: self.size]]
+        kept = moved >= 0
+        self.size = int(kept.sum())
+        self.slots[: self.size] = moved[kept]
+        self.frequencies[: self.size] = self.frequencies[: len(kept)][kept]
+
+
+class ProductSearchIndex:
+    """Índice invertido com ranking BM25 sobre nome e descrição.
+
+    Cada documento ocupa uma posição nas colunas NumPy e as ocorrências de um
+    termo guardam essas posições: a consulta pontua todas as ocorrências de
+    cada termo de uma vez, sem laço Python por documento. Remover ou
+    substituir um produto só marca a posição antiga como morta; quando metade
+    das posições está morta as colunas e as ocorrências são compactadas.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, _Postings] = {}
+        # termo -> documentos vivos que o contêm (o df do BM25)
+        self._frequencies: Dict[str, int] = {}
+        # product_id -> (posição, termos do documento)
+        self._documents: Dict[int, Tuple[int, Tuple[str, ...]]] = {}
+        self._ids = np.empty(INITIAL_CAPACITY, dtype=np.int64)
+        # Tamanho ponderado do documento em cada posição; infinito nas mortas
+        # zera a pontuação das ocorrências que ainda apontam para elas
+        self._lengths = np.zeros(INITIAL_CAPACITY, dtype=np.float32)
+        self._live = np.zeros(INITIAL_CAPACITY, dtype=bool)
+        self._size = 0
+        self._dead = 0
+        self._total_length = 0
+        self._lock = threading.RLock()
+        # Fonte do catálogo ainda não indexada (rebuild_lazily)
+        self._pending: Optional[Callable[[], Iterable[List[Product]]]] = None
+
+    def __len__(self) -> int:
+        self.ensure_built()
+        return len(self._documents)
+
+    def add(self, product: Product):
+        self.ensure_built()
+        frequencies: Dict[str, int] = {}
+        for term in analyze(product.name):
+            frequencies[term] = frequencies.get(term, 0) + NAME_WEIGHT
+        for term in analyze(product.description):
+            frequencies[term] = frequencies.get(term, 0) + 1
+        length = sum(frequencies.values())
+        with self._lock:
+            self._remove(product.id)
+            slot = self._size
+            self._grow(slot + 1)
+            self._ids[slot] = product.id
+            self._lengths[slot] = length
+            self._live[slot] = True
+            self._size += 1
+            for term, frequency in frequencies.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = _Postings()
+                postings.append(slot, frequency)
+                self._frequencies[term] = self._frequencies.get(term, 0) + 1
+            self._documents[product.id] = (slot, tuple(frequencies))
+            self._total_length += length
+
+    def remove(self, product_id: int):
+        self.ensure_built()
+        with self._lock:
+            self._remove(product_id)
+
+    def _remove(self, product_id: int):
+        document = self._documents.pop(product_id, None)
+        if document is None:
+            return
+        slot, terms = document
+        for term in terms:
+            remaining = self._frequencies[term] - 1
+            if remaining:
+                self._frequencies[term] = remaining
+            else:
+                # Só restam ocorrências mortas
+                del self._frequencies[term]
+                del self._postings[term]
+        self._total_length -= int(self._lengths[slot])
+        self._lengths[slot] = np.inf
+        self._live[slot] = False
+        self._dead += 1
+        if self._dead > INITIAL_CAPACITY and self._dead > self._size // 2:
+            self._compact()
+
+    def _grow(self, needed: int):
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self._ids = _resized(self._ids, capacity, self._size)
+        self._lengths = _resized(self._lengths, capacity, self._size)
+        self._live = _resized(self._live, capacity, self._size, fill=False)
+
+    def _compact(self):
+        live = np.flatnonzero(self._live[: self._size])
+        slots = np.full(self._size, -1, dtype=np.int64)
+        slots[live] = np.arange(len(live))
+        for postings in self._postings.values():
+            postings.remap(slots)
+        self._ids[: len(live)] = self._ids[live]
+        self._lengths[: len(live)] = self._lengths[live]
+        self._live[: len(live)] = True
+        self._live[len(live) : self._size] = False
+        self._size = len(live)
+        self._dead = 0
+        for slot, product_id in enumerate(self._ids[: self._size].tolist()):
+            self._documents[product_id] = (slot, self._documents[product_id][1])
+
+    def rebuild(self, batches: Iterable[List[Product]]):
+        for batch in batches:
+            for product in batch:
+                self.add(product)
+
+    def rebuild_lazily(self, batches: Callable[[], Iterable[List[Product]]]):
+        """Adia a indexação do catálogo para o primeiro uso do índice.
+
+        Seguro porque add e remove são idempotentes: escritas que chegam
+        antes da carga já estão no catálogo lido por ela.
+        """
+        with self._lock:
+            self._pending = batches
+
+    def ensure_built(self):
+        if self._pending is None:
+            return
+        # Quem chega durante a carga espera pelo lock antes de ler o índice
+        with self._lock:
+            pending, self._pending = self._pending, None
+            if pending is not None:
+                self.rebuild(pending())
+
+    def search(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        terms = set(analyze(query))
+        self.ensure_built()
+        with self._lock:
+            count = len(self._documents)
+            # Sem termos indexados (catálogo vazio ou só stopwords) não há
+            # tamanho médio de documento para o BM25
+            if not terms or not self._total_length:
+                return []
+            k1_norm = BM25_K1 * (1 - BM25_B)
+            k1_len = BM25_K1 * BM25_B * count / self._total_length
+            # float32: metade do tráfego de memória, precisão de sobra para ordenar
+            scores = np.zeros(self._size, dtype=np.float32)
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                frequency = self._frequencies[term]
+                idf = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+                slots = postings.slots[: postings.size]
+                tf = postings.frequencies[: postings.size]
+                # Posições são únicas dentro de um termo: += não perde somas
+                scores[slots] += (
+                    idf
+                    * (BM25_K1 + 1)
+                    * tf
+                    / (tf + k1_norm + k1_len * self._lengths[slots])
+                )
+            if limit < len(scores):
+                # Top-k com np.partition: O(n) em vez de ordenar os candidatos;
+                # entram todos os empatados com o k-ésimo placar
+                kth = np.partition(scores, -limit)[-limit]
+                candidates = (
+                    np.flatnonzero(scores >= kth) if kth else np.flatnonzero(scores)
+                )
+            else:
+                candidates = np.flatnonzero(scores)
+            # Empates pela ordem de inserção, como um sort estável
+            candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+            candidates = candidates[:limit]
+            return list(
+                zip(self._ids[candidates].tolist(), scores[candidates].tolist())
+            )
+
+    def subscribe(self, events: ev.EventBus):
+        events.subscribe(ev.PRODUCT_SAVED, lambda product, _: self.add(product))
+        events.subscribe(ev.PRODUCT_DELETED, lambda product: self.remove(product.id))
+
+
+def _resized(column: np.ndarray, capacity: int, size: int, fill=0) -> np.ndarray:
+    resized = np.full(capacity, fill, dtype=column.dtype)
+    resized[:size] = column[:size]
+    return resized
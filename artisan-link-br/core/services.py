@@ -1,34 +1,602 @@
-from typing import List
-from core.entities import Product, Order, Review
+import math
+from dataclasses import replace
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from core.entities import Artisan, Product, Order, OrderLine, Review
+from core import events as ev
+from core.events import EventBus
+from core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    Page,
+    check_page_size,
+    decode_cursor,
+    encode_cursor,
+)
+from core.analytics import (
+    DIMENSIONS,
+    GroupRevenue,
+    OrderValueSummary,
+    SalesLedger,
+)
+from core.leaderboards import RANKINGS, ProductRankings
+from core.ratings import RatingAggregates, RatingSummary
+from core.search import ProductSearchIndex
 from ports.outbound import (
+    ArtisanRepositoryPort,
     ProductRepositoryPort,
     OrderRepositoryPort,
     ReviewRepositoryPort,
 )
 
 
+def _paginate(list_page, limit: int, cursor: Optional[str]) -> Page:
+    after_id = None
+    if cursor is not None:
+        (after_id,) = _cursor_key(cursor)
+    check_page_size(limit)
+    # Busca um item a mais para saber se existe próxima página
+    items = list_page(after_id, limit + 1)
+    if len(items) <= limit:
+        return Page(items=items)
+    items = items[:limit]
+    return Page(items=items, next_cursor=encode_cursor((items[-1].id,)))
+
+
+def _cursor_key(cursor: str) -> tuple:
+    key = decode_cursor(cursor)
+    if len(key) != 1 or not isinstance(key[0], int):
+        raise ValueError("Cursor inválido.")
+    return key
+
+
+def _price_cursor_key(cursor: str) -> Tuple[float, int]:
+    key = decode_cursor(cursor)
+    if (
+        len(key) != 2
+        or not isinstance(key[0], (int, float))
+        or isinstance(key[0], bool)
+        or not isinstance(key[1], int)
+    ):
+        raise ValueError("Cursor inválido.")
+    return float(key[0]), key[1]
+
+
+PRICE_SORTS = {"price_asc": False, "price_desc": True}
+
+
+def _price_filter(
+    min_price: Optional[float], max_price: Optional[float], sort: str
+) -> Tuple[float, float, bool]:
+    if sort not in PRICE_SORTS:
+        raise ValueError("O parâmetro sort deve ser price_asc ou price_desc.")
+    low = -math.inf if min_price is None else min_price
+    high = math.inf if max_price is None else max_price
+    if low > high:
+        raise ValueError("min_price não pode ser maior que max_price.")
+    return low, high, PRICE_SORTS[sort]
+
+
+STREAM_BATCH_SIZE = 500
+
+
+def _iter_batches(
+    list_page: Callable, batch_size: int, key: Callable = lambda item: item.id
+) -> Iterator[List]:
+    # Percorre a coleção por keyset sem materializar a lista completa
+    after = None
+    while True:
+        batch = list_page(after, batch_size)
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        after = key(batch[-1])
+
+
+def _price_key(product: Product) -> Tuple[float, int]:
+    return (product.price, product.id)
+
+
+SEARCH_DEFAULT_LIMIT = 10
+
+
 class ProductService:
-    def __init__(self, product_repo: ProductRepositoryPort):
+    def __init__(
+        self,
+        product_repo: ProductRepositoryPort,
+        events: Optional[EventBus] = None,
+        search_index: Optional[ProductSearchIndex] = None,
+        lazy_search_index: bool = False,
+    ):
         self.product_repo = product_repo
+        self.events = events or EventBus()
+        # O índice parte do catálogo atual e acompanha as escritas pelos
+        # eventos; lazy_search_index adia a carga para a primeira busca
+        self.search_index = search_index or ProductSearchIndex()
+        if lazy_search_index:
+            self.search_index.rebuild_lazily(self.iter_product_batches)
+        else:
+            self.search_index.rebuild(self.iter_product_batches())
+        self.search_index.subscribe(self.events)
 
     def list_products(self) -> List[Product]:
         return self.product_repo.list_all()
 
+    def list_products_page(
+        self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None
+    ) -> Page[Product]:
+        return _paginate(self.product_repo.list_page, limit, cursor)
+
+    def iter_product_batches(
+        self, batch_size: int = STREAM_BATCH_SIZE
+    ) -> Iterator[List[Product]]:
+        return _iter_batches(self.product_repo.list_page, batch_size)
+
+    def list_products_by_price(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        sort: str = "price_asc",
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Page[Product]:
+        low, high, descending = _price_filter(min_price, max_price, sort)
+        after = None if cursor is None else _price_cursor_key(cursor)
+        check_page_size(limit)
+        items = self.product_repo.list_by_price(low, high, descending, after, limit + 1)
+        if len(items) <= limit:
+            return Page(items=items)
+        items = items[:limit]
+        return Page(items=items, next_cursor=encode_cursor(_price_key(items[-1])))
+
+    def iter_products_by_price_batches(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        sort: str = "price_asc",
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[List[Product]]:
+        low, high, descending = _price_filter(min_price, max_price, sort)
+        return _iter_batches(
+            lambda after, limit: self.product_repo.list_by_price(
+                low, high, descending, after, limit
+            ),
+            batch_size,
+            _price_key,
+        )
+
+    def products_version(self) -> int:
+        return self.product_repo.version()
+
     def add_product(self, product: Product):
+        previous = self.product_repo.get_by_id(product.id)
         self.product_repo.save(product)
+        self.events.publish(ev.PRODUCT_SAVED, product, previous)
+
+    def add_products(self, products: List[Product]):
+        previous = {p.id: p for p in self.product_repo.get_many(p.id for p in products)}
+        self.product_repo.save_many(products)
+        for product in products:
+            self.events.publish(ev.PRODUCT_SAVED, product, previous.get(product.id))
+            # Ids repetidos no mesmo lote: o próximo vê este como anterior
+            previous[product.id] = product
+
+    def get_product(self, product_id: int) -> Optional[Product]:
+        return self.product_repo.get_by_id(product_id)
+
+    def get_products(self, product_ids: Iterable[int]) -> List[Product]:
+        return self.product_repo.get_many(product_ids)
+
+    def list_products_by_artisan(self, artisan_id: int) -> List[Product]:
+        return self.product_repo.list_by_artisan(artisan_id)
+
+    def search_products(
+        self, query: str, limit: int = SEARCH_DEFAULT_LIMIT
+    ) -> List[Tuple[Product, float]]:
+        if not query or not query.strip():
+            raise ValueError("O parâmetro q é obrigatório.")
+        check_page_size(limit)
+        hits = self.search_index.search(query, limit)
+        products = {p.id: p for p in self.product_repo.get_many(pid for pid, _ in hits)}
+        return [(products[pid], score) for pid, score in hits if pid in products]
+
+    def update_product(self, product: Product) -> bool:
+        previous = self.product_repo.get_by_id(product.id)
+        if previous is None or not self.product_repo.update(product):
+            return False
+        self.events.publish(ev.PRODUCT_SAVED, product, previous)
+        return True
+
+    def delete_product(self, product_id: int) -> bool:
+        product = self.product_repo.get_by_id(product_id)
+        if product is None or not self.product_repo.delete(product_id):
+            return False
+        self.events.publish(ev.PRODUCT_DELETED, product)
+        return True
+
+
+class ArtisanService:
+    def __init__(
+        self, artisan_repo: ArtisanRepositoryPort, events: Optional[EventBus] = None
+    ):
+        self.artisan_repo = artisan_repo
+        self.events = events or EventBus()
+
+    def list_artisans(self) -> List[Artisan]:
+        return self.artisan_repo.list_all()
+
+    def list_artisans_page(
+        self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None
+    ) -> Page[Artisan]:
+        return _paginate(self.artisan_repo.list_page, limit, cursor)
+
+    def iter_artisan_batches(
+        self, batch_size: int = STREAM_BATCH_SIZE
+    ) -> Iterator[List[Artisan]]:
+        return _iter_batches(self.artisan_repo.list_page, batch_size)
+
+    def artisans_version(self) -> int:
+        return self.artisan_repo.version()
+
+    def get_artisan(self, artisan_id: int) -> Optional[Artisan]:
+        return self.artisan_repo.get_by_id(artisan_id)
+
+    def create_artisan(self, name: str, email: str) -> Artisan:
+        # Validado antes de reservar o id: o índice de email normaliza textos
+        _check_text_fields(name=name, email=email)
+        artisan = Artisan(id=self.artisan_repo.next_id(), name=name, email=email)
+        self.artisan_repo.save(artisan)
+        self.events.publish(ev.ARTISAN_SAVED, artisan, None)
+        return artisan
+
+    def update_artisan(
+        self, artisan_id: int, name: Optional[str] = None, email: Optional[str] = None
+    ) -> Optional[Artisan]:
+        _check_text_fields(name=name, email=email)
+        current = self.artisan_repo.get_by_id(artisan_id)
+        if current is None:
+            return None
+        artisan = Artisan(
+            id=current.id,
+            name=current.name if name is None else name,
+            email=current.email if email is None else email,
+        )
+        # Removido entre a leitura e a gravação: a rota responde 404
+        if not self.artisan_repo.update(artisan):
+            return None
+        self.events.publish(ev.ARTISAN_SAVED, artisan, current)
+        return artisan
+
+    def delete_artisan(self, artisan_id: int) -> bool:
+        artisan = self.artisan_repo.get_by_id(artisan_id)
+        if artisan is None or not self.artisan_repo.delete(artisan_id):
+            return False
+        self.events.publish(ev.ARTISAN_DELETED, artisan)
+        return True
+
+
+def order_total(lines: Iterable[OrderLine]) -> float:
+    return round(sum(line.quantity * line.unit_price for line in lines), 2)
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+# None significa "não informado" (atualizações parciais)
+def _check_text_fields(**fields):
+    for name, value in fields.items():
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f"O campo {name} deve ser um texto.")
+
+
+def _check_customer_id(customer_id):
+    # Validado antes de gravar: os assinantes de ORDER_SAVED indexam por ele
+    if not _is_int(customer_id):
+        raise ValueError("customer_id deve ser um número inteiro.")
+
+
+def _order_quantities(items: Iterable[Tuple[int, int]]) -> Dict[int, int]:
+    """Quantidade total por produto; itens repetidos são somados."""
+    quantities: Dict[int, int] = {}
+    for product_id, quantity in items:
+        if not _is_int(product_id):
+            raise ValueError("O id de cada item deve ser um número inteiro.")
+        if not _is_int(quantity) or quantity < 1:
+            raise ValueError("A quantidade de cada item deve ser um inteiro positivo.")
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+    if not quantities:
+        raise ValueError("O pedido deve ter ao menos um item.")
+    return quantities
+
+
+class OrderBatchError(ValueError):
+    """Lote recusado; errors traz (posição no lote, mensagem) de cada pedido
+    inválido."""
+
+    def __init__(self, errors: List[Tuple[int, str]]):
+        super().__init__("Nenhum pedido foi criado: o lote tem pedidos inválidos.")
+        self.errors = errors
 
 
 class OrderService:
-    def __init__(self, order_repo: OrderRepositoryPort):
+    def __init__(
+        self,
+        order_repo: OrderRepositoryPort,
+        product_repo: ProductRepositoryPort,
+        events: Optional[EventBus] = None,
+    ):
         self.order_repo = order_repo
+        self.product_repo = product_repo
+        self.events = events or EventBus()
+
+    def next_order_id(self) -> int:
+        return self.order_repo.next_id()
 
     def create_order(self, order: Order):
+        previous = self.order_repo.get_by_id(order.id)
         self.order_repo.save(order)
+        self.events.publish(ev.ORDER_SAVED, order, previous)
+
+    def get_order(self, order_id: int) -> Optional[Order]:
+        return self.order_repo.get_by_id(order_id)
+
+    def price_lines(
+        self,
+        items: Iterable[Tuple[int, int]],
+        snapshot: Optional[Dict[int, float]] = None,
+    ) -> List[OrderLine]:
+        """Linhas de (product_id, quantidade) com o preço unitário de cada uma.
+
+        Itens repetidos viram uma linha só; produtos em snapshot mantêm o
+        preço dele e os demais são buscados no catálogo numa única consulta.
+        """
+        return self._price(_order_quantities(items), snapshot or {})
+
+    def _price(
+        self, quantities: Dict[int, int], prices: Dict[int, float]
+    ) -> List[OrderLine]:
+        missing = [product_id for product_id in quantities if product_id not in prices]
+        if missing:
+            prices = dict(prices)
+            for product in self.product_repo.get_many(missing):
+                prices[product.id] = product.price
+            unknown = [product_id for product_id in missing if product_id not in prices]
+            if unknown:
+                raise ValueError(
+                    f"Produtos não encontrados: {', '.join(map(str, unknown))}."
+                )
+        return [
+            OrderLine(product_id, quantity, prices[product_id])
+            for product_id, quantity in quantities.items()
+        ]
+
+    def place_order(self, customer_id: int, items: Iterable[Tuple[int, int]]) -> Order:
+        """Cria o pedido com os preços atuais do catálogo e o total calculado."""
+        _check_customer_id(customer_id)
+        lines = self.price_lines(items)
+        order = Order(
+            id=self.next_order_id(),
+            customer_id=customer_id,
+            lines=lines,
+            total=order_total(lines),
+        )
+        self.create_order(order)
+        return order
+
+    def place_orders(
+        self, batch: Iterable[Tuple[int, Iterable[Tuple[int, int]]]]
+    ) -> List[Order]:
+        """Cria vários pedidos de (customer_id, itens) de uma vez: todos ou
+        nenhum.
+
+        Todos os campos são validados e o lote inteiro é precificado numa
+        única consulta ao catálogo antes de reservar ids; os pedidos recebem
+        um bloco contíguo deles. Se algum pedido é inválido, nada é gravado e
+        OrderBatchError lista o erro de cada um.
+        """
+        batch = list(batch)
+        if not batch:
+            raise ValueError("O lote deve ter ao menos um pedido.")
+        errors = []
+        checked = []
+        for index, (customer_id, items) in enumerate(batch):
+            try:
+                _check_customer_id(customer_id)
+                checked.append((index, customer_id, _order_quantities(items)))
+            except ValueError as e:
+                errors.append((index, str(e)))
+        wanted = {
+            product_id for _, _, quantities in checked for product_id in quantities
+        }
+        prices = {
+            product.id: product.price for product in self.product_repo.get_many(wanted)
+        }
+        priced = []
+        for index, customer_id, quantities in checked:
+            try:
+                # Produtos fora de prices não existem: _price só os busca de
+                # novo para montar a mensagem de erro
+                priced.append((customer_id, self._price(quantities, prices)))
+            except ValueError as e:
+                errors.append((index, str(e)))
+        if errors:
+            raise OrderBatchError(sorted(errors))
+
+        ids = self.order_repo.next_ids(len(priced))
+        orders = [
+            Order(
+                id=order_id,
+                customer_id=customer_id,
+                lines=lines,
+                total=order_total(lines),
+            )
+            for order_id, (customer_id, lines) in zip(ids, priced)
+        ]
+        self.order_repo.save_many(orders)
+        for order in orders:
+            self.events.publish(ev.ORDER_SAVED, order, None)
+        return orders
+
+    def revise_order(
+        self,
+        order_id: int,
+        customer_id: Optional[int] = None,
+        items: Optional[Iterable[Tuple[int, int]]] = None,
+    ) -> Optional[Order]:
+        """Troca o cliente e/ou os itens; produtos que já estavam no pedido
+        mantêm o preço da compra. None se o pedido não existe."""
+        order = self.order_repo.get_by_id(order_id)
+        if order is None:
+            return None
+        if items is not None:
+            snapshot = {line.product_id: line.unit_price for line in order.lines}
+            lines = self.price_lines(items, snapshot)
+            order = replace(order, lines=lines, total=order_total(lines))
+        if customer_id is not None:
+            _check_customer_id(customer_id)
+            order = replace(order, customer_id=customer_id)
+        return order if self.update_order(order) else None
+
+    def line_products(self, order: Order) -> Dict[int, Product]:
+        """Produtos das linhas do pedido, numa só busca; os que saíram do
+        catálogo ficam de fora."""
+        products = self.product_repo.get_many(line.product_id for line in order.lines)
+        return {product.id: product for product in products}
+
+    def update_order(self, order: Order) -> bool:
+        previous = self.order_repo.get_by_id(order.id)
+        if previous is None or not self.order_repo.update(order):
+            return False
+        self.events.publish(ev.ORDER_SAVED, order, previous)
+        return True
+
+    def delete_order(self, order_id: int) -> bool:
+        order = self.order_repo.get_by_id(order_id)
+        if order is None or not self.order_repo.delete(order_id):
+            return False
+        self.events.publish(ev.ORDER_DELETED, order)
+        return True
 
 
 class ReviewService:
-    def __init__(self, review_repo: ReviewRepositoryPort):
+    def __init__(
+        self,
+        review_repo: ReviewRepositoryPort,
+        events: Optional[EventBus] = None,
+        ratings: Optional[RatingAggregates] = None,
+    ):
         self.review_repo = review_repo
+        self.events = events or EventBus()
+        # Agregados por produto, reconstruídos uma vez e mantidos pelos eventos
+        self.ratings = ratings or RatingAggregates()
+        self.ratings.rebuild(_iter_batches(review_repo.list_page, STREAM_BATCH_SIZE))
+        self.ratings.subscribe(self.events)
+
+    def next_review_id(self) -> int:
+        return self.review_repo.next_id()
 
     def add_review(self, review: Review):
+        previous = self.review_repo.get_by_id(review.id)
         self.review_repo.save(review)
+        self.events.publish(ev.REVIEW_SAVED, review, previous)
+
+    def get_review(self, review_id: int) -> Optional[Review]:
+        return self.review_repo.get_by_id(review_id)
+
+    def update_review(self, review: Review) -> bool:
+        previous = self.review_repo.get_by_id(review.id)
+        if previous is None or not self.review_repo.update(review):
+            return False
+        self.events.publish(ev.REVIEW_SAVED, review, previous)
+        return True
+
+    def delete_review(self, review_id: int) -> bool:
+        review = self.review_repo.get_by_id(review_id)
+        if review is None or not self.review_repo.delete(review_id):
+            return False
+        self.events.publish(ev.REVIEW_DELETED, review)
+        return True
+
+    def get_product_rating(self, product_id: int) -> RatingSummary:
+        return self.ratings.get(product_id)
+
+    def ratings_version(self) -> int:
+        return self.ratings.version()
+
+
+TOP_DEFAULT_LIMIT = 10
+
+
+def _catalog_artisans(product_repo: ProductRepositoryPort):
+    def artisan_of(product_ids: List[int]) -> Dict[int, int]:
+        products = product_repo.get_many(product_ids)
+        return {product.id: product.artisan_id for product in products}
+
+    return artisan_of
+
+
+class RankingService:
+    def __init__(
+        self,
+        product_repo: ProductRepositoryPort,
+        order_repo: OrderRepositoryPort,
+        ratings: RatingAggregates,
+        events: Optional[EventBus] = None,
+    ):
+        self.product_repo = product_repo
+        self.events = events or EventBus()
+        self.rankings = ProductRankings(ratings, _catalog_artisans(product_repo))
+        self.rankings.rebuild(_iter_batches(order_repo.list_page, STREAM_BATCH_SIZE))
+        self.rankings.subscribe(self.events)
+
+    def top_products(
+        self,
+        by: str = "rating",
+        limit: int = TOP_DEFAULT_LIMIT,
+        artisan_id: Optional[int] = None,
+    ) -> List[Tuple[Product, float]]:
+        if by not in RANKINGS:
+            raise ValueError("O parâmetro by deve ser rating ou sales.")
+        check_page_size(limit)
+        hits = self.rankings.top(by, limit, artisan_id)
+        products = {p.id: p for p in self.product_repo.get_many(pid for pid, _ in hits)}
+        return [(products[pid], score) for pid, score in hits if pid in products]
+
+
+ANALYTICS_DEFAULT_LIMIT = 10
+
+
+def _artisan_lookup(product_repo: ProductRepositoryPort):
+    def artisan_of(product_ids: List[int]) -> List[int]:
+        products = product_repo.get_many(set(product_ids))
+        artisans = {product.id: product.artisan_id for product in products}
+        return [artisans.get(product_id, 0) for product_id in product_ids]
+
+    return artisan_of
+
+
+class AnalyticsService:
+    def __init__(
+        self,
+        order_repo: OrderRepositoryPort,
+        product_repo: ProductRepositoryPort,
+        events: Optional[EventBus] = None,
+        ledger: Optional[SalesLedger] = None,
+    ):
+        self.events = events or EventBus()
+        # Receita por artesão: o artesão atual do produto quando o pedido entra
+        self.ledger = ledger or SalesLedger(_artisan_lookup(product_repo))
+        self.ledger.rebuild(_iter_batches(order_repo.list_page, STREAM_BATCH_SIZE))
+        self.ledger.subscribe(self.events)
+
+    def revenue_by(
+        self, dimension: str, limit: int = ANALYTICS_DEFAULT_LIMIT
+    ) -> List[GroupRevenue]:
+        if dimension not in DIMENSIONS:
+            raise ValueError("A dimensão deve ser artisan, product ou customer.")
+        check_page_size(limit)
+        return self.ledger.revenue_by(dimension, limit)
+
+    def order_value(self) -> OrderValueSummary:
+        return self.ledger.order_value()
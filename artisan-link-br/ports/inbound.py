@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List
-from core.entities import Product, Order, Review
+from typing import Iterable, Iterator, List, Optional, Tuple
+from core.entities import Artisan, Product, Order, Review
+from core.analytics import GroupRevenue, OrderValueSummary
+from core.pagination import DEFAULT_PAGE_SIZE, Page
+from core.ratings import RatingSummary
 
 
 class ProductServicePort(ABC):
@@ -8,18 +11,169 @@ class ProductServicePort(ABC):
     def list_products(self) -> List[Product]:
         pass
 
+    @abstractmethod
+    def list_products_page(
+        self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None
+    ) -> Page[Product]:
+        pass
+
+    @abstractmethod
+    def iter_product_batches(self, batch_size: int) -> Iterator[List[Product]]:
+        pass
+
+    @abstractmethod
+    def list_products_by_price(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        sort: str = "price_asc",
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Page[Product]:
+        pass
+
+    @abstractmethod
+    def iter_products_by_price_batches(
+        self,
+        min_price: Optional[float],
+        max_price: Optional[float],
+        sort: str,
+        batch_size: int,
+    ) -> Iterator[List[Product]]:
+        pass
+
+    @abstractmethod
+    def products_version(self) -> int:
+        pass
+
     @abstractmethod
     def add_product(self, product: Product):
         pass
 
+    @abstractmethod
+    def add_products(self, products: List[Product]):
+        pass
+
+    @abstractmethod
+    def get_product(self, product_id: int) -> Optional[Product]:
+        pass
+
+    @abstractmethod
+    def get_products(self, product_ids: Iterable[int]) -> List[Product]:
+        pass
+
+    @abstractmethod
+    def list_products_by_artisan(self, artisan_id: int) -> List[Product]:
+        pass
+
+    @abstractmethod
+    def search_products(self, query: str, limit: int) -> List[Tuple[Product, float]]:
+        pass
+
+    @abstractmethod
+    def update_product(self, product: Product) -> bool:
+        pass
+
+    @abstractmethod
+    def delete_product(self, product_id: int) -> bool:
+        pass
+
+
+class ArtisanServicePort(ABC):
+    @abstractmethod
+    def list_artisans(self) -> List[Artisan]:
+        pass
+
+    @abstractmethod
+    def list_artisans_page(
+        self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None
+    ) -> Page[Artisan]:
+        pass
+
+    @abstractmethod
+    def iter_artisan_batches(self, batch_size: int) -> Iterator[List[Artisan]]:
+        pass
+
+    @abstractmethod
+    def artisans_version(self) -> int:
+        pass
+
+    @abstractmethod
+    def get_artisan(self, artisan_id: int) -> Optional[Artisan]:
+        pass
+
+    @abstractmethod
+    def create_artisan(self, name: str, email: str) -> Artisan:
+        pass
+
+    @abstractmethod
+    def update_artisan(
+        self, artisan_id: int, name: Optional[str] = None, email: Optional[str] = None
+    ) -> Optional[Artisan]:
+        pass
+
+    @abstractmethod
+    def delete_artisan(self, artisan_id: int) -> bool:
+        pass
+
 
 class OrderServicePort(ABC):
     @abstractmethod
     def create_order(self, order: Order):
         pass
 
+    @abstractmethod
+    def get_order(self, order_id: int) -> Optional[Order]:
+        pass
+
+    @abstractmethod
+    def update_order(self, order: Order) -> bool:
+        pass
+
+    @abstractmethod
+    def delete_order(self, order_id: int) -> bool:
+        pass
+
 
 class ReviewServicePort(ABC):
     @abstractmethod
     def add_review(self, review: Review):
         pass
+
+    @abstractmethod
+    def get_review(self, review_id: int) -> Optional[Review]:
+        pass
+
+    @abstractmethod
+    def update_review(self, review: Review) -> bool:
+        pass
+
+    @abstractmethod
+    def delete_review(self, review_id: int) -> bool:
+        pass
+
+    @abstractmethod
+    def get_product_rating(self, product_id: int) -> RatingSummary:
+        pass
+
+    @abstractmethod
+    def ratings_version(self) -> int:
+        pass
+
+
+class RankingServicePort(ABC):
+    @abstractmethod
+    def top_products(
+        self, by: str, limit: int, artisan_id: Optional[int] = None
+    ) -> List[Tuple[Product, float]]:
+        pass
+
+
+class AnalyticsServicePort(ABC):
+    @abstractmethod
+    def revenue_by(self, dimension: str, limit: int) -> List[GroupRevenue]:
+        pass
+
+    @abstractmethod
+    def order_value(self) -> OrderValueSummary:
+        pass
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from core.entities import Product, Order, Review
+from typing import Iterable, Optional, Tuple
+from core.entities import Artisan, Product, Order, Review
 
 
 class ProductRepositoryPort(ABC):
@@ -11,14 +12,169 @@ class ProductRepositoryPort(ABC):
     def list_all(self) -> list[Product]:
         pass
 
+    def save_many(self, products: Iterable[Product]):
+        # Implementação padrão; backends podem sobrescrever com escrita em lote
+        for product in products:
+            self.save(product)
+
+    @abstractmethod
+    def get_by_id(self, product_id: int) -> Optional[Product]:
+        pass
+
+    @abstractmethod
+    def get_many(self, product_ids: Iterable[int]) -> list[Product]:
+        pass
+
+    @abstractmethod
+    def list_by_artisan(self, artisan_id: int) -> list[Product]:
+        pass
+
+    @abstractmethod
+    def update(self, product: Product) -> bool:
+        pass
+
+    @abstractmethod
+    def delete(self, product_id: int) -> bool:
+        pass
+
+    @abstractmethod
+    def list_page(self, after_id: Optional[int], limit: int) -> list[Product]:
+        """Itens com id > after_id em ordem crescente de id."""
+        pass
+
+    @abstractmethod
+    def list_by_price(
+        self,
+        min_price: float,
+        max_price: float,
+        descending: bool,
+        after: Optional[Tuple[float, int]],
+        limit: int,
+    ) -> list[Product]:
+        """Itens com preço em [min_price, max_price] ordenados por (price, id),
+        começando depois da chave after na direção pedida."""
+        pass
+
+    @abstractmethod
+    def version(self) -> int:
+        """Contador monotônico incrementado a cada escrita na coleção."""
+        pass
+
+
+class ArtisanRepositoryPort(ABC):
+    @abstractmethod
+    def next_id(self) -> int:
+        """Reserva um id novo; atômico e nunca repetido, mesmo após remoções."""
+        pass
+
+    @abstractmethod
+    def save(self, artisan: Artisan):
+        pass
+
+    @abstractmethod
+    def get_by_id(self, artisan_id: int) -> Optional[Artisan]:
+        pass
+
+    @abstractmethod
+    def get_by_email(self, email: str) -> Optional[Artisan]:
+        pass
+
+    @abstractmethod
+    def list_all(self) -> list[Artisan]:
+        pass
+
+    @abstractmethod
+    def update(self, artisan: Artisan) -> bool:
+        pass
+
+    @abstractmethod
+    def delete(self, artisan_id: int) -> bool:
+        pass
+
+    @abstractmethod
+    def list_page(self, after_id: Optional[int], limit: int) -> list[Artisan]:
+        """Itens com id > after_id em ordem crescente de id."""
+        pass
+
+    @abstractmethod
+    def version(self) -> int:
+        """Contador monotônico incrementado a cada escrita na coleção."""
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        pass
+
 
 class OrderRepositoryPort(ABC):
+    @abstractmethod
+    def next_id(self) -> int:
+        """Reserva um id novo; atômico e nunca repetido, mesmo após remoções."""
+        pass
+
+    @abstractmethod
+    def next_ids(self, count: int) -> range:
+        """Reserva count ids consecutivos numa só operação atômica."""
+        pass
+
     @abstractmethod
     def save(self, order: Order):
         pass
 
+    @abstractmethod
+    def save_many(self, orders: Iterable[Order]):
+        """Grava todos os pedidos ou nenhum."""
+        pass
+
+    @abstractmethod
+    def get_by_id(self, order_id: int) -> Optional[Order]:
+        pass
+
+    @abstractmethod
+    def update(self, order: Order) -> bool:
+        pass
+
+    @abstractmethod
+    def delete(self, order_id: int) -> bool:
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        pass
+
+    @abstractmethod
+    def list_page(self, after_id: Optional[int], limit: int) -> list[Order]:
+        """Itens com id > after_id em ordem crescente de id."""
+        pass
+
 
 class ReviewRepositoryPort(ABC):
+    @abstractmethod
+    def next_id(self) -> int:
+        """Reserva um id novo; atômico e nunca repetido, mesmo após remoções."""
+        pass
+
     @abstractmethod
     def save(self, review: Review):
         pass
+
+    @abstractmethod
+    def get_by_id(self, review_id: int) -> Optional[Review]:
+        pass
+
+    @abstractmethod
+    def update(self, review: Review) -> bool:
+        pass
+
+    @abstractmethod
+    def delete(self, review_id: int) -> bool:
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        pass
+
+    @abstractmethod
+    def list_page(self, after_id: Optional[int], limit: int) -> list[Review]:
+        """Itens com id > after_id em ordem crescente de id."""
+        pass
@@ -2,6 +2,8 @@
 """
 Script para executar os testes seguindo TDD
 """
+
+import argparse
 import subprocess
 import sys
 
@@ -39,5 +41,32 @@ def run_tests():
         sys.exit(1)
 
 
+def run_benchmarks(args):
+    """Execute a suíte de benchmarks e falhe se houver regressão"""
+    command = ["python3", "-m", "benchmarks.suite", "--size", args.size]
+    if args.threshold is not None:
+        command += ["--threshold", str(args.threshold)]
+    if args.update_baseline:
+        command.append("--update-baseline")
+    result = subprocess.run(command)
+    if result.returncode != 0:
+        print(f"\n❌ Regressão de desempenho (código de saída: {result.returncode})")
+        sys.exit(1)
+    print("\n✅ Nenhuma regressão de desempenho!")
+
+
 if __name__ == "__main__":
-    run_tests()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--bench", action="store_true", help="roda a suíte de benchmarks"
+    )
+    parser.add_argument(
+        "--size", default="1k", help="tamanho do dataset (1k, 100k, 1m)"
+    )
+    parser.add_argument("--threshold", type=float, help="piora tolerada (0.25 = 25%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+    if args.bench:
+        run_benchmarks(args)
+    else:
+        run_tests()
@@ -1,11 +1,15 @@
 import pytest
-from adapters.outbound.repository import ProductRepository, OrderRepository, ReviewRepository
-from core.services import ProductService, OrderService, ReviewService
+from adapters.outbound.repository import ArtisanRepository, ProductRepository, OrderRepository, ReviewRepository
+from core.services import ArtisanService, ProductService, OrderService, ReviewService
 
 @pytest.fixture
 def product_repository():
     return ProductRepository()
 
+@pytest.fixture
+def artisan_repository():
+    return ArtisanRepository()
+
 @pytest.fixture
 def order_repository():
     return OrderRepository()
@@ -19,8 +23,12 @@ def product_service(product_repository):
     return ProductService(product_repository)
 
 @pytest.fixture
-def order_service(order_repository):
-    return OrderService(order_repository)
+def artisan_service(artisan_repository):
+    return ArtisanService(artisan_repository)
+
+@pytest.fixture
+def order_service(order_repository, product_repository):
+    return OrderService(order_repository, product_repository)
 
 @pytest.fixture
 def review_service(review_repository):
@@ -0,0 +1,151 @@
+import pytest
+import json
+import numpy as np
+from core.analytics import SalesLedger
+from core.entities import Order, OrderLine, Product
+from core.services import AnalyticsService
+from adapters.inbound.api import create_app
+from adapters.outbound.repository import OrderRepository, ProductRepository
+
+
+AUTH_TOKEN = "Bearer meu-token-secreto"
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+# Artesão de cada produto no catálogo dos testes do ledger
+ARTISANS = {1: 100, 2: 200, 3: 300}
+
+
+def artisan_of(product_ids):
+    return [ARTISANS.get(product_id, 0) for product_id in product_ids]
+
+
+def line(product_id, price, quantity=1):
+    return OrderLine(product_id=product_id, quantity=quantity, unit_price=price)
+
+
+def order(order_id, customer_id, *lines):
+    return Order(id=order_id, customer_id=customer_id, lines=list(lines), total=0.0)
+
+
+class TestSalesLedger:
+    def test_grouped_revenue(self):
+        """Test revenue and units per artisan, product and customer"""
+        ledger = SalesLedger(artisan_of)
+        ledger.saved(order(1, 10, line(1, 20.0), line(2, 5.0)))
+        ledger.saved(order(2, 11, line(1, 20.0)))
+
+        by_artisan = [(g.key, g.revenue, g.units) for g in ledger.revenue_by("artisan", 10)]
+        assert by_artisan == [(100, 40.0, 2), (200, 5.0, 1)]
+        assert [g.key for g in ledger.revenue_by("customer", 1)] == [10]
+        summary = ledger.order_value()
+        assert (summary.orders, summary.revenue, summary.average) == (2, 45.0, 22.5)
+
+    def test_update_and_delete_replace_lines(self):
+        """Test that rewritten and deleted orders stop counting, across compaction"""
+        ledger = SalesLedger(artisan_of)
+        ledger.saved(order(1, 10, line(1, 20.0)))
+        for _ in range(5):
+            ledger.saved(order(1, 10, line(2, 7.0, quantity=2)))
+        ledger.saved(order(2, 11, line(3, 1.0)))
+        ledger.deleted(order(2, 11, line(3, 1.0)))
+
+        assert len(ledger) == 1
+        assert [(g.key, g.revenue, g.units) for g in ledger.revenue_by("product", 10)] == [(2, 14.0, 2)]
+        assert [g.key for g in ledger.revenue_by("artisan", 10)] == [200]
+        assert ledger.order_value().orders == 1
+
+    def test_append_lines_in_bulk(self):
+        """Test columnar bulk loading, including replacing an existing order"""
+        ledger = SalesLedger(artisan_of)
+        ledger.saved(order(1, 10, line(1, 99.0)))
+
+        ledger.append_lines(
+            np.array([1, 1, 2]),
+            np.array([10, 10, 11]),
+            np.array([1, 2, 1]),
+            np.array([100, 200, 100]),
+            np.array([5.0, 3.0, 5.0]),
+            np.array([2, 1, 1]),
+        )
+
+        assert [(g.key, g.revenue, g.units) for g in ledger.revenue_by("artisan", 10)] == [
+            (100, 15.0, 3),
+            (200, 3.0, 1),
+        ]
+        assert ledger.order_value().orders == 2
+
+    def test_grows_past_initial_capacity(self):
+        """Test appends beyond the first buffer size"""
+        ledger = SalesLedger()
+        for order_id in range(1, 3001):
+            ledger.saved(order(order_id, order_id % 7, line(order_id % 13, 1.0)))
+
+        assert len(ledger) == 3000
+        assert ledger.order_value().revenue == 3000.0
+
+
+class TestAnalyticsService:
+    def test_rebuilds_and_validates(self):
+        """Test startup rebuild from the repository and argument checks"""
+        repo = OrderRepository()
+        repo.save(order(1, 10, line(1, 20.0)))
+        products = ProductRepository()
+        products.save(Product(id=1, artisan_id=100, name="P", description="P", price=20.0))
+        service = AnalyticsService(repo, products)
+
+        assert [g.key for g in service.revenue_by("artisan")] == [100]
+        with pytest.raises(ValueError):
+            service.revenue_by("region")
+        with pytest.raises(ValueError):
+            service.revenue_by("artisan", limit=0)
+
+
+class TestAnalyticsAPI:
+    def _create_order(self, client, customer_id, products):
+        response = client.post(
+            "/orders",
+            data=json.dumps({"customer_id": customer_id, "products": products}),
+            content_type="application/json",
+            headers={"Authorization": AUTH_TOKEN},
+        )
+        assert response.status_code == 201
+
+    def test_revenue_endpoints(self, client):
+        """Test GET /analytics/revenue/<group> and average order value"""
+        for product_id, artisan_id, price in [(1, 5, 30.0), (2, 6, 10.0), (3, 7, 20.0)]:
+            client.post(
+                "/products",
+                json={"id": product_id, "artisan_id": artisan_id, "name": "P", "description": "P", "price": price},
+            )
+        self._create_order(client, 1, [{"id": 1}])
+        self._create_order(client, 2, [{"id": 2}, {"id": 1}])
+        headers = {"Authorization": AUTH_TOKEN}
+
+        response = client.get("/analytics/revenue/artisans", headers=headers)
+        assert response.status_code == 200
+        assert json.loads(response.data) == [
+            {"artisan_id": 5, "revenue": 60.0, "units": 2},
+            {"artisan_id": 6, "revenue": 10.0, "units": 1},
+        ]
+        data = json.loads(client.get("/analytics/revenue/customers?limit=1", headers=headers).data)
+        assert data == [{"customer_id": 2, "revenue": 40.0, "units": 2}]
+
+        self._create_order(client, 3, [{"id": 3}])
+        data = json.loads(client.get("/analytics/orders/average-value", headers=headers).data)
+        assert data == {"orders": 3, "revenue": 90.0, "average_order_value": 30.0}
+
+    def test_analytics_errors(self, client):
+        """Test auth, unknown groups and bad limits"""
+        headers = {"Authorization": AUTH_TOKEN}
+
+        assert client.get("/analytics/revenue/artisans").status_code == 401
+        assert client.get("/analytics/revenue/regions", headers=headers).status_code == 404
+        assert client.get("/analytics/revenue/products?limit=x", headers=headers).status_code == 400
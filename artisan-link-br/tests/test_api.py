@@ -61,6 +61,124 @@ class TestProductAPI:
         assert len(data) == 1
         assert data[0]["name"] == "Vaso de Cerâmica"
 
+    def test_get_product_by_id(self, client):
+        """Test GET /products/<id>"""
+        product_data = {
+            "id": 3,
+            "artisan_id": 1,
+            "name": "Vaso de Cerâmica",
+            "description": "Vaso artesanal feito à mão",
+            "price": 50.0,
+        }
+        client.post(
+            "/products", data=json.dumps(product_data), content_type="application/json"
+        )
+
+        response = client.get("/products/3")
+        assert response.status_code == 200
+        assert json.loads(response.data)["name"] == "Vaso de Cerâmica"
+
+        response = client.get("/products/4")
+        assert response.status_code == 404
+        assert "error" in json.loads(response.data)
+
+    def test_get_artisan_products(self, client):
+        """Test GET /artisans/<id>/products"""
+        for product_id, artisan_id in [(1, 1), (2, 2), (3, 1)]:
+            product_data = {
+                "id": product_id,
+                "artisan_id": artisan_id,
+                "name": f"Produto {product_id}",
+                "description": "Feito à mão",
+                "price": 10.0,
+            }
+            client.post(
+                "/products",
+                data=json.dumps(product_data),
+                content_type="application/json",
+            )
+
+        response = client.get("/artisans/1/products")
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [p["id"] for p in data] == [1, 3]
+
+    def test_get_products_paginated(self, client):
+        """Test GET /products with limit and cursor"""
+        for product_id in range(1, 4):
+            product_data = {
+                "id": product_id,
+                "artisan_id": 1,
+                "name": f"Produto {product_id}",
+                "description": "Feito à mão",
+                "price": 10.0,
+            }
+            client.post(
+                "/products",
+                data=json.dumps(product_data),
+                content_type="application/json",
+            )
+
+        response = client.get("/products?limit=2")
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [p["id"] for p in data["items"]] == [1, 2]
+        assert data["next_cursor"]
+
+        response = client.get(f"/products?limit=2&cursor={data['next_cursor']}")
+        data = json.loads(response.data)
+        assert [p["id"] for p in data["items"]] == [3]
+        assert data["next_cursor"] is None
+
+    def test_get_products_streamed(self, client):
+        """Test that the full listing is streamed as a JSON array"""
+        for product_id in range(1, 4):
+            product_data = {
+                "id": product_id,
+                "artisan_id": 1,
+                "name": f"Produto {product_id}",
+                "description": "Feito à mão",
+                "price": 10.0,
+            }
+            client.post(
+                "/products",
+                data=json.dumps(product_data),
+                content_type="application/json",
+            )
+
+        response = client.get("/products")
+        assert response.is_streamed
+        assert response.mimetype == "application/json"
+        assert [p["id"] for p in json.loads(response.data)] == [1, 2, 3]
+
+    def test_get_products_ndjson(self, client):
+        """Test GET /products with Accept: application/x-ndjson"""
+        for product_id in range(1, 3):
+            product_data = {
+                "id": product_id,
+                "artisan_id": 1,
+                "name": f"Produto {product_id}",
+                "description": "Feito à mão",
+                "price": 10.0,
+            }
+            client.post(
+                "/products",
+                data=json.dumps(product_data),
+                content_type="application/json",
+            )
+
+        response = client.get("/products", headers={"Accept": "application/x-ndjson"})
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        lines = response.data.decode().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [1, 2]
+
+    def test_get_products_invalid_pagination(self, client):
+        """Test GET /products with a malformed cursor or limit"""
+        assert client.get("/products?cursor=xyz").status_code == 400
+        assert client.get("/products?limit=abc").status_code == 400
+        assert client.get("/products?limit=1000").status_code == 400
+
     def test_post_product_invalid_data(self, client):
         """Test POST /products with invalid data"""
         # Este teste vai falhar inicialmente - precisamos implementar validação
@@ -79,3 +197,243 @@ class TestProductAPI:
         # Por enquanto vai retornar 201, mas deveria retornar 400
         # Implementaremos validação depois - TDD approach
         assert response.status_code in [400, 201]  # Aceita ambos por enquanto
+
+
+    def test_post_product_wrong_types(self, client):
+        """Test that POST /products rejects mistyped fields before storing anything"""
+        valid = {"id": 1, "artisan_id": 1, "name": "Vaso", "description": "V", "price": 10.0}
+        for field, value in [
+            ("name", 123),
+            ("description", None),
+            ("id", "1"),
+            ("artisan_id", 1.5),
+            ("price", "10"),
+            ("price", True),
+        ]:
+            response = client.post(
+                "/products",
+                data=json.dumps({**valid, field: value}),
+                content_type="application/json",
+            )
+            assert response.status_code == 400, field
+
+        assert json.loads(client.get("/products").data) == []
+        assert client.get("/products/1").status_code == 404
+        assert json.loads(client.get("/products/search?q=vaso").data) == []
+
+    def test_post_product_missing_field(self, client):
+        """Test that POST /products without a required field returns 400"""
+        response = client.post(
+            "/products",
+            data=json.dumps({"id": 1, "artisan_id": 1, "name": "Vaso", "price": 1.0}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 400
+        assert "description" in json.loads(response.data)["error"]
+
+
+class TestBulkProductAPI:
+    def test_bulk_ndjson(self, client):
+        """Test POST /products/bulk with an NDJSON body and a per-line report"""
+        lines = [
+            json.dumps({"id": 1, "artisan_id": 1, "name": "Vaso", "description": "V", "price": 50.0}),
+            "",
+            "{nao e json",
+            json.dumps({"id": 2, "artisan_id": 1, "name": "Prato", "description": "P", "price": -1}),
+            json.dumps({"id": 3, "artisan_id": 1, "name": "Cesto"}),
+            json.dumps({"id": 4, "artisan_id": 2, "name": "Rede", "description": "R", "price": 80.0}),
+        ]
+        response = client.post(
+            "/products/bulk",
+            data="\n".join(lines),
+            content_type="application/x-ndjson",
+        )
+
+        assert response.status_code == 200
+        report = json.loads(response.data)
+        assert report["received"] == 5
+        assert report["created"] == 2
+        assert [e["line"] for e in report["errors"]] == [3, 4, 5]
+        assert "description" in report["errors"][2]["error"]
+
+        data = json.loads(client.get("/products").data)
+        assert [p["id"] for p in data] == [1, 4]
+
+    def test_bulk_mistyped_line(self, client):
+        """Test that a line with a string id is reported without failing the upload"""
+        lines = [
+            json.dumps({"id": 1, "artisan_id": 1, "name": "Vaso", "description": "V", "price": 5.0}),
+            json.dumps({"id": "2", "artisan_id": 1, "name": "Prato", "description": "P", "price": 5.0}),
+            json.dumps({"id": 3, "artisan_id": 1, "name": None, "description": "C", "price": 5.0}),
+            json.dumps({"id": 4, "artisan_id": 1, "name": "Rede", "description": "R", "price": 5.0}),
+        ]
+        response = client.post(
+            "/products/bulk", data="\n".join(lines), content_type="application/x-ndjson"
+        )
+
+        assert response.status_code == 200
+        report = json.loads(response.data)
+        assert report["created"] == 2
+        assert [e["line"] for e in report["errors"]] == [2, 3]
+        data = json.loads(client.get("/products?limit=10").data)
+        assert [p["id"] for p in data["items"]] == [1, 4]
+        assert client.get("/products/4").status_code == 200
+
+    def test_bulk_json_array(self, client):
+        """Test POST /products/bulk with a JSON array body"""
+        products = [
+            {"id": i, "artisan_id": 1, "name": f"Produto {i}", "description": "P", "price": 1.0}
+            for i in range(1, 2501)
+        ]
+        response = client.post(
+            "/products/bulk", data=json.dumps(products), content_type="application/json"
+        )
+
+        assert response.status_code == 201
+        report = json.loads(response.data)
+        assert report["created"] == 2500
+        assert report["errors"] == []
+        assert len(json.loads(client.get("/artisans/1/products").data)) == 2500
+
+    def test_bulk_not_an_array(self, client):
+        """Test POST /products/bulk with a body that is not an array"""
+        response = client.post(
+            "/products/bulk", data=json.dumps({"id": 1}), content_type="application/json"
+        )
+
+        report = json.loads(response.data)
+        assert report["created"] == 0
+        assert report["errors"][0]["error"] == "O corpo deve ser um array JSON."
+
+    def test_bulk_content_after_array(self, client):
+        """Test that bytes after the closing bracket are reported, while trailing whitespace is accepted"""
+        product = {"id": 1, "artisan_id": 1, "name": "Vaso", "description": "V", "price": 5.0}
+        response = client.post(
+            "/products/bulk",
+            data=json.dumps([product]) + ' {"id": 2}',
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        report = json.loads(response.data)
+        assert report["created"] == 1
+        assert report["errors"] == [{"line": 2, "error": "Conteúdo após o fim do array JSON."}]
+
+        response = client.post(
+            "/products/bulk",
+            data=json.dumps([{**product, "id": 3}]) + " \n",
+            content_type="application/json",
+        )
+        assert response.status_code == 201
+        assert json.loads(response.data)["errors"] == []
+
+
+class TestConditionalGet:
+    def _add_product(self, client, product_id):
+        product_data = {
+            "id": product_id,
+            "artisan_id": 1,
+            "name": f"Produto {product_id}",
+            "description": "Feito à mão",
+            "price": 10.0,
+        }
+        client.post(
+            "/products", data=json.dumps(product_data), content_type="application/json"
+        )
+
+    def test_list_not_modified(self, client):
+        """Test GET /products answers If-None-Match with 304 until a write"""
+        self._add_product(client, 1)
+        response = client.get("/products")
+        etag = response.headers["ETag"]
+        assert not etag.startswith("W/")
+
+        response = client.get("/products", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+        assert response.headers["ETag"] == etag
+
+        self._add_product(client, 2)
+        response = client.get("/products", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_item_not_modified(self, client):
+        """Test GET /products/<id> with a matching ETag"""
+        self._add_product(client, 1)
+        etag = client.get("/products/1").headers["ETag"]
+
+        response = client.get("/products/1", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert "ETag" not in client.get("/products/9").headers
+
+    def test_ndjson_has_its_own_etag(self, client):
+        """Test that JSON and NDJSON representations do not share an ETag"""
+        json_etag = client.get("/products").headers["ETag"]
+        response = client.get(
+            "/products",
+            headers={"Accept": "application/x-ndjson", "If-None-Match": json_etag},
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != json_etag
+
+    def test_artisans_not_modified(self, client):
+        """Test GET /artisans conditional requests"""
+        etag = client.get("/artisans").headers["ETag"]
+        response = client.get("/artisans", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        client.post(
+            "/artisans",
+            data=json.dumps({"name": "João", "email": "joao@email.com"}),
+            content_type="application/json",
+            headers={"Authorization": "Bearer meu-token-secreto"},
+        )
+        response = client.get("/artisans", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+
+class TestPriceFilterAPI:
+    def _seed(self, client):
+        for product_id, price in [(1, 50.0), (2, 10.0), (3, 30.0), (4, 30.0)]:
+            product_data = {
+                "id": product_id,
+                "artisan_id": 1,
+                "name": f"Produto {product_id}",
+                "description": "Feito à mão",
+                "price": price,
+            }
+            client.post(
+                "/products", data=json.dumps(product_data), content_type="application/json"
+            )
+
+    def test_price_range_unpaginated(self, client):
+        """Test GET /products with min_price/max_price returns a price-ordered list"""
+        self._seed(client)
+
+        response = client.get("/products?min_price=20&max_price=50")
+
+        assert response.status_code == 200
+        assert [p["id"] for p in json.loads(response.data)] == [3, 4, 1]
+
+    def test_price_sort_with_pagination(self, client):
+        """Test sort=price_desc combined with limit and cursor"""
+        self._seed(client)
+
+        data = json.loads(client.get("/products?sort=price_desc&limit=2").data)
+        assert [p["id"] for p in data["items"]] == [1, 4]
+
+        data = json.loads(
+            client.get(f"/products?sort=price_desc&limit=2&cursor={data['next_cursor']}").data
+        )
+        assert [p["id"] for p in data["items"]] == [3, 2]
+        assert data["next_cursor"] is None
+
+    def test_invalid_price_params(self, client):
+        """Test that bad prices, ranges and sorts return 400"""
+        for query in ["min_price=abc", "min_price=9&max_price=1", "sort=name"]:
+            response = client.get(f"/products?{query}")
+
+            assert response.status_code == 400
+            assert "error" in json.loads(response.data)
@@ -42,6 +42,34 @@ class TestArtisanAPI:
         data = json.loads(response.data)
         assert "error" in data
 
+    def test_create_artisan_non_string_email(self, client):
+        """Test that a numeric email returns 400 without consuming an artisan id"""
+        response = client.post(
+            "/artisans",
+            data=json.dumps({"name": "João Silva", "email": 123}),
+            content_type="application/json",
+            headers={"Authorization": AUTH_TOKEN},
+        )
+        assert response.status_code == 400
+        assert "email" in json.loads(response.data)["error"]
+
+        response = client.post(
+            "/artisans",
+            data=json.dumps({"name": "João Silva", "email": "joao@email.com"}),
+            content_type="application/json",
+            headers={"Authorization": AUTH_TOKEN},
+        )
+        artisan_id = json.loads(response.data)["id"]
+        assert artisan_id == 1
+
+        response = client.put(
+            f"/artisans/{artisan_id}",
+            data=json.dumps({"email": 42}),
+            content_type="application/json",
+            headers={"Authorization": AUTH_TOKEN},
+        )
+        assert response.status_code == 400
+
     def test_create_artisan_unauthorized(self, client):
         """Test creating an artisan without authorization"""
         artisan_data = {"name": "João Silva", "email": "joao@email.com"}
@@ -100,3 +128,70 @@ class TestArtisanAPI:
         assert response.status_code == 200
         data = json.loads(response.data)
         assert "message" in data
+
+    def test_create_artisan_duplicate_email(self, client):
+        """Test that emails are unique regardless of case"""
+        artisan_data = {"name": "João Silva", "email": "joao@email.com"}
+        client.post(
+            "/artisans",
+            data=json.dumps(artisan_data),
+            content_type="application/json",
+            headers={"Authorization": AUTH_TOKEN},
+        )
+
+        duplicate = {"name": "Outro João", "email": "JOAO@email.com"}
+        response = client.post(
+            "/artisans",
+            data=json.dumps(duplicate),
+            content_type="application/json",
+            headers={"Authorization": AUTH_TOKEN},
+        )
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert data["error"] == "Email já cadastrado."
+
+    def test_update_artisan_duplicate_email(self, client):
+        """Test updating an artisan to an email that is already taken"""
+        for artisan_data in [
+            {"name": "João Silva", "email": "joao@email.com"},
+            {"name": "Maria Silva", "email": "maria@email.com"},
+        ]:
+            client.post(
+                "/artisans",
+                data=json.dumps(artisan_data),
+                content_type="application/json",
+                headers={"Authorization": AUTH_TOKEN},
+            )
+
+        response = client.put(
+            "/artisans/2",
+            data=json.dumps({"email": "joao@email.com"}),
+            content_type="application/json",
+            headers={"Authorization": AUTH_TOKEN},
+        )
+        assert response.status_code == 400
+
+        response = client.get("/artisans")
+        emails = [a["email"] for a in json.loads(response.data)]
+        assert emails == ["joao@email.com", "maria@email.com"]
+
+    def test_list_artisans_paginated(self, client):
+        """Test GET /artisans with limit and cursor"""
+        for i in range(3):
+            artisan_data = {"name": f"Artesão {i}", "email": f"artesao{i}@email.com"}
+            client.post(
+                "/artisans",
+                data=json.dumps(artisan_data),
+                content_type="application/json",
+                headers={"Authorization": AUTH_TOKEN},
+            )
+
+        response = client.get("/artisans?limit=2")
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [a["id"] for a in data["items"]] == [1, 2]
+
+        response = client.get(f"/artisans?cursor={data['next_cursor']}")
+        data = json.loads(response.data)
+        assert [a["id"] for a in data["items"]] == [3]
+        assert data["next_cursor"] is None
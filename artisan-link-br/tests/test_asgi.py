@@ -0,0 +1,272 @@
+import asyncio
+import pytest
+import json
+from adapters.inbound.api import create_app
+from adapters.inbound.asgi import create_asgi_app
+
+
+AUTH = {"Authorization": "Bearer meu-token-secreto"}
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+
+
+async def call(app, method, path, body=b"", headers=None, chunks=None, delay=0.0):
+    """Send one HTTP request through the ASGI interface and collect the response"""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [
+            (name.lower().encode(), value.encode())
+            for name, value in (headers or {}).items()
+        ],
+    }
+    pending = list(chunks) if chunks is not None else [body]
+    started = {}
+    parts = []
+
+    async def receive():
+        if delay:
+            await asyncio.sleep(delay)
+        chunk = pending.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(pending)}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            started.update(message)
+        else:
+            parts.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    response_headers = {
+        name.decode(): value.decode() for name, value in started["headers"]
+    }
+    return started["status"], response_headers, b"".join(parts)
+
+
+def asgi(app, method, path, **kwargs):
+    return asyncio.run(call(app, method, path, **kwargs))
+
+
+# Same sequence of requests against both adapters: (method, path, json body, headers)
+SCENARIO = [
+    ("POST", "/artisans", {"name": "João", "email": "joao@email.com"}, {}),
+    ("POST", "/artisans", {"name": "João", "email": "joao@email.com"}, AUTH),
+    ("POST", "/artisans", {"name": "Maria", "email": "JOAO@email.com"}, AUTH),
+    ("POST", "/artisans", {"name": "Maria"}, AUTH),
+    ("POST", "/artisans", {"name": "Maria", "email": "maria@email.com"}, AUTH),
+    ("PUT", "/artisans/2", {"name": "Maria Silva"}, AUTH),
+    ("PUT", "/artisans/9", {"name": "Ninguém"}, AUTH),
+    ("GET", "/artisans", None, {}),
+    ("GET", "/artisans?limit=1", None, {}),
+    ("GET", "/artisans?limit=abc", None, {}),
+    ("GET", "/artisans?cursor=xyz", None, {}),
+    (
+        "POST",
+        "/products",
+        {"id": 1, "artisan_id": 1, "name": "Vaso de Cerâmica", "description": "Vaso", "price": 50.0},
+        {},
+    ),
+    (
+        "POST",
+        "/products",
+        {"id": 2, "artisan_id": 2, "name": "Cesto de Palha", "description": "Cesto", "price": 30.0},
+        {},
+    ),
+    (
+        "POST",
+        "/products",
+        {"id": 3, "artisan_id": 1, "name": "Vaso", "description": "Vaso", "price": -1},
+        {},
+    ),
+    ("GET", "/products", None, {}),
+    ("GET", "/products", None, {"Accept": NDJSON}),
+    ("GET", "/products?limit=1", None, {}),
+    ("GET", "/products?min_price=40", None, {}),
+    ("GET", "/products?sort=price_desc&limit=5", None, {}),
+    ("GET", "/products?min_price=abc", None, {}),
+    ("GET", "/products?min_price=60&max_price=10", None, {}),
+    ("GET", "/products?sort=name", None, {}),
+    ("GET", "/products/1", None, {}),
+    ("GET", "/products/99", None, {}),
+    ("GET", "/products/search?q=ceramica", None, {}),
+    ("GET", "/products/search?q=vaso&limit=x", None, {}),
+    ("GET", "/artisans/1/products", None, {}),
+    ("POST", "/reviews", {"product_id": 1, "customer_id": 1, "rating": 5, "comment": "Ótimo"}, AUTH),
+    ("POST", "/reviews", {"product_id": 1, "customer_id": 1, "rating": 9, "comment": "?"}, AUTH),
+    ("POST", "/reviews", {"product_id": 1}, AUTH),
+    ("PUT", "/reviews/1", {"rating": 4}, AUTH),
+    ("PUT", "/reviews/1", {"rating": 0}, AUTH),
+    ("GET", "/products/1/rating", None, {}),
+    ("GET", "/products/99/rating", None, {}),
+    (
+        "POST",
+        "/orders",
+        {"customer_id": 7, "products": [{"id": 1, "artisan_id": 1, "price": 50.0}], "total": 50.0},
+        AUTH,
+    ),
+    ("POST", "/orders", {"customer_id": 7}, AUTH),
+    ("POST", "/orders", {"customer_id": [7], "products": [{"id": 1}]}, AUTH),
+    ("PUT", "/orders/1", {"customer_id": {"a": 1}}, AUTH),
+    ("GET", "/orders/1", None, AUTH),
+    ("GET", "/orders/1", None, {}),
+    ("PUT", "/orders/1", {"total": 60.0}, AUTH),
+    ("GET", "/orders/2", None, AUTH),
+    (
+        "POST",
+        "/orders/batch",
+        {"orders": [{"customer_id": 8, "products": [{"id": 1, "quantity": 2}]}, {"customer_id": 9, "products": [{"id": 2}]}]},
+        AUTH,
+    ),
+    ("POST", "/orders/batch", {"orders": [{"customer_id": 8, "products": [{"id": 99}]}, {"customer_id": 9}]}, AUTH),
+    ("POST", "/orders/batch", {"orders": []}, AUTH),
+    ("POST", "/orders/batch", {"orders": [{"customer_id": 8, "products": [{"id": 1}]}]}, {}),
+    ("GET", "/orders/3", None, AUTH),
+    ("GET", "/products/top?by=sales", None, {}),
+    ("GET", "/products/top?by=price", None, {}),
+    ("GET", "/products/top?limit=z", None, {}),
+    ("GET", "/analytics/revenue/artisans", None, AUTH),
+    ("GET", "/analytics/revenue/colors", None, AUTH),
+    ("GET", "/analytics/revenue/products?limit=0", None, AUTH),
+    ("GET", "/analytics/orders/average-value", None, AUTH),
+    ("DELETE", "/orders/1", None, AUTH),
+    ("DELETE", "/orders/1", None, AUTH),
+    ("DELETE", "/reviews/1", None, AUTH),
+    ("DELETE", "/artisans/1", None, AUTH),
+    ("DELETE", "/artisans/1", None, AUTH),
+    ("GET", "/cache/stats", None, {}),
+]
+
+
+class TestParityWithFlask:
+    def test_scenario_matches_flask(self):
+        """Test that both adapters answer every request with the same status and body"""
+        flask_client = create_app().test_client()
+        app = create_asgi_app()
+        for method, path, payload, headers in SCENARIO:
+            body = b"" if payload is None else json.dumps(payload).encode()
+            request_headers = dict(headers)
+            if payload is not None:
+                request_headers["Content-Type"] = JSON
+            expected = flask_client.open(
+                path, method=method, data=body, headers=request_headers
+            )
+            status, response_headers, data = asgi(
+                app, method, path, body=body, headers=request_headers
+            )
+            step = f"{method} {path}"
+            assert status == expected.status_code, step
+            assert response_headers.get("content-type") == expected.mimetype, step
+            assert data == expected.data, step
+
+    def test_conditional_get(self):
+        """Test ETag and 304 handling on listings"""
+        app = create_asgi_app()
+        status, headers, _ = asgi(app, "GET", "/products")
+        assert status == 200
+        assert headers["vary"] == "Accept"
+        status, _, data = asgi(
+            app, "GET", "/products", headers={"If-None-Match": headers["etag"]}
+        )
+        assert status == 304
+        assert data == b""
+
+    def test_unknown_route_and_method(self):
+        """Test JSON 404/405 errors and a 415 for non-JSON bodies"""
+        app = create_asgi_app()
+        status, _, data = asgi(app, "GET", "/nada")
+        assert status == 404
+        assert json.loads(data) == {"error": "Rota não encontrada."}
+        assert asgi(app, "PATCH", "/products")[0] == 405
+        assert asgi(app, "POST", "/products", body=b"x", headers={"Content-Type": "text/plain"})[0] == 415
+
+    def test_head_has_no_body(self):
+        """Test that HEAD is served by the GET route without a body"""
+        app = create_asgi_app()
+        status, headers, data = asgi(app, "HEAD", "/products/search?q=vaso")
+        assert status == 200
+        assert headers["content-length"] == "2"
+        assert data == b""
+
+
+class TestStreamingBodies:
+    def test_bulk_ndjson_in_chunks(self):
+        """Test that a bulk upload split across many receive() messages is parsed"""
+        app = create_asgi_app()
+        lines = b"".join(
+            json.dumps(
+                {"id": i, "artisan_id": 1, "name": f"P{i}", "description": "P", "price": 1.0}
+            ).encode()
+            + b"\n"
+            for i in range(1, 301)
+        )
+        lines += b"{quebrado\n"
+        chunks = [lines[i : i + 7] for i in range(0, len(lines), 7)]
+        status, _, data = asgi(
+            app,
+            "POST",
+            "/products/bulk",
+            chunks=chunks,
+            headers={"Content-Type": NDJSON},
+        )
+        report = json.loads(data)
+        assert status == 200
+        assert report["created"] == 300
+        assert report["errors"] == [{"line": 301, "error": "JSON inválido."}]
+        _, _, data = asgi(app, "GET", "/products")
+        assert [p["id"] for p in json.loads(data)] == list(range(1, 301))
+
+    def test_sqlite_backend_runs_in_threads(self, tmp_path):
+        """Test the thread-pool path used for blocking backends"""
+        app = create_asgi_app(
+            {"REPOSITORY_BACKEND": "sqlite", "SQLITE_PATH": str(tmp_path / "asgi.db")}
+        )
+        body = json.dumps({"name": "Ana", "email": "ana@email.com"}).encode()
+        status, _, data = asgi(
+            app, "POST", "/artisans", body=body, headers={**AUTH, "Content-Type": JSON}
+        )
+        assert status == 201
+        assert json.loads(data)["id"] == 1
+        status, _, data = asgi(app, "GET", "/artisans", headers={"Accept": NDJSON})
+        assert data == b'{"id":1,"name":"Ana","email":"ana@email.com"}\n'
+
+
+class TestSlowClients:
+    def test_slow_uploads_do_not_block_other_requests(self):
+        """Test that fast requests finish while slow clients are still sending"""
+        app = create_asgi_app()
+        product = json.dumps(
+            {"id": 1, "artisan_id": 1, "name": "Vaso", "description": "Vaso", "price": 1.0}
+        ).encode()
+
+        async def scenario():
+            slow = [
+                asyncio.create_task(
+                    call(
+                        app,
+                        "POST",
+                        "/products",
+                        chunks=[product[:5], product[5:]],
+                        headers={"Content-Type": JSON},
+                        delay=0.5,
+                    )
+                )
+                for _ in range(50)
+            ]
+            await asyncio.sleep(0.05)
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            fast = await asyncio.gather(
+                *(call(app, "GET", "/products/search?q=vaso") for _ in range(50))
+            )
+            elapsed = loop.time() - started
+            assert not any(task.done() for task in slow)
+            await asyncio.gather(*slow)
+            return elapsed, fast, [task.result() for task in slow]
+
+        elapsed, fast, slow = asyncio.run(scenario())
+        assert elapsed < 0.5
+        assert all(status == 200 for status, _, _ in fast)
+        assert all(status == 201 for status, _, _ in slow)
@@ -0,0 +1,68 @@
+from benchmarks.suite import CASES, EXIT_NO_BASELINE, compare, main, parse_size, run, seed
+
+
+def report(reference_us, spread=0.0, **metrics):
+    return {
+        "reference_us": reference_us,
+        "metrics": {
+            name: {"p50_us": p50, "ops_per_sec": ops, "p50_spread": spread}
+            for name, (p50, ops) in metrics.items()
+        },
+    }
+
+
+class TestCompare:
+    def test_regressions_past_threshold(self):
+        """Test that only p50 increases or throughput drops past the threshold fail"""
+        baseline = report(100.0, a=(100.0, 1000.0), b=(100.0, 1000.0), c=(100.0, 1000.0))
+        current = report(100.0, a=(120.0, 900.0), b=(140.0, 1000.0), c=(100.0, 600.0))
+        regressions = compare(baseline, current, 0.25)
+        assert list(regressions) == ["b", "c"]
+
+    def test_slower_machine_is_not_a_regression(self):
+        """Test that times are scaled by the reference workload of each run"""
+        baseline = report(100.0, a=(10.0, 1000.0))
+        assert compare(baseline, report(200.0, a=(19.0, 520.0)), 0.25) == {}
+        assert compare(baseline, report(100.0, a=(19.0, 520.0)), 0.25) != {}
+
+    def test_faster_reference_is_not_a_regression(self):
+        """Test that a reference faster than the baseline's does not tighten the comparison"""
+        baseline = report(100.0, a=(100.0, 1000.0))
+        assert compare(baseline, report(70.0, a=(100.0, 1000.0)), 0.25) == {}
+        assert compare(baseline, report(70.0, a=(140.0, 700.0)), 0.25) != {}
+
+    def test_new_and_removed_cases_are_ignored(self):
+        """Test that cases missing from either side are skipped"""
+        assert compare(report(100.0, a=(10.0, 1.0)), report(100.0, b=(99.0, 1.0)), 0.25) == {}
+
+    def test_noisy_cases_get_a_wider_tolerance(self):
+        """Test that the baseline spread between rounds widens the case threshold, up to a cap"""
+        current = report(100.0, a=(160.0, 1000.0))
+        assert compare(report(100.0, a=(100.0, 1000.0)), current, 0.25) != {}
+        assert compare(report(100.0, 0.4, a=(100.0, 1000.0)), current, 0.25) == {}
+        assert compare(report(100.0, 9.0, a=(100.0, 1000.0)), report(100.0, a=(200.0, 1000.0)), 0.25) != {}
+
+    def test_tiny_absolute_changes_are_ignored(self):
+        """Test that a p50 increase below the absolute floor is not a regression"""
+        assert compare(report(100.0, a=(2.0, 1000.0)), report(100.0, a=(4.0, 1000.0)), 0.25) == {}
+
+
+class TestSuite:
+    def test_every_case_runs_on_a_small_dataset(self):
+        """Test that all cases succeed against a freshly seeded dataset"""
+        dataset = seed(30)
+        result = run(dataset, seconds=0)
+        assert set(result["metrics"]) == {case.name for case in CASES}
+        assert result["reference_us"] > 0
+
+    def test_missing_baseline_fails(self, tmp_path):
+        """Test that the gate fails instead of recording a baseline when none exists"""
+        path = tmp_path / "missing.json"
+        assert main(["--size", "10", "--baseline", str(path)]) == EXIT_NO_BASELINE
+        assert not path.exists()
+
+    def test_parse_size(self):
+        """Test named and numeric dataset sizes"""
+        assert parse_size("100k") == 100_000
+        assert parse_size("1M") == 1_000_000
+        assert parse_size("250") == 250
@@ -0,0 +1,197 @@
+import pytest
+import json
+from core.entities import Product
+from core.events import EventBus, PRODUCT_DELETED, PRODUCT_SAVED
+from core.search import ProductSearchIndex
+from adapters.inbound.api import create_app
+from adapters.inbound.cache import CachedResponse, ResponseCache
+
+
+AUTH_TOKEN = "Bearer meu-token-secreto"
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def entry(size, *tags):
+    return CachedResponse(b"x" * size, "application/json", tags)
+
+
+class TestResponseCache:
+    def test_lru_eviction_by_bytes(self):
+        """Test that the least recently used entries go first when over budget"""
+        cache = ResponseCache(max_bytes=100, max_entry_bytes=100)
+        cache.put("a", entry(40), cache.generation())
+        cache.put("b", entry(40), cache.generation())
+        cache.get("a")
+        cache.put("c", entry(40), cache.generation())
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats()["bytes"] == 80
+        assert cache.stats()["evictions"] == 1
+
+    def test_entry_larger_than_limit_is_skipped(self):
+        """Test that oversized bodies are never stored"""
+        cache = ResponseCache(max_bytes=100, max_entry_bytes=10)
+
+        assert cache.put("a", entry(11), cache.generation()) is False
+        assert cache.stats()["entries"] == 0
+
+    def test_invalidate_only_tagged_keys(self):
+        """Test that invalidation removes exactly the entries with the tag"""
+        cache = ResponseCache(max_bytes=1000)
+        cache.put("p1", entry(10, "product:1"), cache.generation())
+        cache.put("p2", entry(10, "product:2"), cache.generation())
+
+        cache.invalidate(["product:1"])
+
+        assert cache.get("p1") is None
+        assert cache.get("p2") is not None
+
+    def test_stale_generation_is_not_stored(self):
+        """Test that a response computed before a write is discarded"""
+        cache = ResponseCache(max_bytes=1000)
+        generation = cache.generation()
+        cache.invalidate(["products"])
+
+        assert cache.put("a", entry(10, "products"), generation) is False
+
+    def test_subscribe_to_service_events(self):
+        """Test that product events invalidate the old and new artisan listings"""
+        cache = ResponseCache(max_bytes=1000)
+        events = EventBus()
+        cache.subscribe(events)
+        cache.put("a1", entry(10, "artisan-products:1"), cache.generation())
+        cache.put("a2", entry(10, "artisan-products:2"), cache.generation())
+        cache.put("a3", entry(10, "artisan-products:3"), cache.generation())
+
+        previous = Product(id=1, artisan_id=1, name="P", description="P", price=1.0)
+        moved = Product(id=1, artisan_id=2, name="P", description="P", price=1.0)
+        events.publish(PRODUCT_SAVED, moved, previous)
+
+        assert cache.get("a1") is None
+        assert cache.get("a2") is None
+        assert cache.get("a3") is not None
+
+    def test_product_deletion_invalidates_its_rating(self):
+        """Test that deleting a product drops its cached rating"""
+        cache = ResponseCache(max_bytes=1000)
+        events = EventBus()
+        cache.subscribe(events)
+        cache.put("r1", entry(10, "rating:1"), cache.generation())
+        cache.put("r2", entry(10, "rating:2"), cache.generation())
+
+        product = Product(id=1, artisan_id=1, name="P", description="P", price=1.0)
+        events.publish(PRODUCT_DELETED, product)
+
+        assert cache.get("r1") is None
+        assert cache.get("r2") is not None
+
+
+class TestResponseCacheAPI:
+    def _add_product(self, client, product_id, artisan_id=1):
+        product_data = {
+            "id": product_id,
+            "artisan_id": artisan_id,
+            "name": f"Produto {product_id}",
+            "description": "Feito à mão",
+            "price": 10.0,
+        }
+        client.post(
+            "/products", data=json.dumps(product_data), content_type="application/json"
+        )
+
+    def test_list_hit_and_invalidation(self, client):
+        """Test that GET /products is served from cache until a product write"""
+        self._add_product(client, 1)
+        first = client.get("/products").data
+        second = client.get("/products").data
+        stats = json.loads(client.get("/cache/stats").data)
+
+        assert first == second
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+        self._add_product(client, 2)
+        data = json.loads(client.get("/products").data)
+        assert [p["id"] for p in data] == [1, 2]
+
+    def test_failing_subscriber_still_invalidates(self, client, monkeypatch):
+        """Test that a subscriber raising before the cache does not leave stale lists"""
+        self._add_product(client, 1)
+        client.get("/products")
+
+        def broken(self, product):
+            raise RuntimeError("falha")
+
+        monkeypatch.setattr(ProductSearchIndex, "add", broken)
+        self._add_product(client, 2)
+
+        data = json.loads(client.get("/products").data)
+        assert [p["id"] for p in data] == [1, 2]
+
+    def test_write_keeps_unrelated_entries(self, client):
+        """Test that writing product 1 does not evict product 2"""
+        self._add_product(client, 1)
+        self._add_product(client, 2, artisan_id=2)
+        client.get("/products/2")
+        client.get("/artisans/2/products")
+
+        self._add_product(client, 1)
+        client.get("/products/2")
+        client.get("/artisans/2/products")
+
+        assert json.loads(client.get("/cache/stats").data)["hits"] == 2
+
+    def test_deleted_product_rating_is_not_served_from_cache(self, client):
+        """Test that GET /products/<id>/rating returns 404 after the product is deleted"""
+        self._add_product(client, 1)
+        assert client.get("/products/1/rating").status_code == 200
+        assert client.get("/products/1/rating").status_code == 200
+
+        client.application.extensions["artisan_link"].products.delete_product(1)
+
+        assert client.get("/products/1/rating").status_code == 404
+
+    def test_cached_order_still_requires_auth(self, client):
+        """Test that a cached GET /orders/<id> is not served without a token"""
+        product_data = {"id": 1, "artisan_id": 1, "name": "Vaso", "description": "Vaso", "price": 10.0}
+        client.post(
+            "/products",
+            data=json.dumps(product_data),
+            content_type="application/json",
+            headers={"Authorization": AUTH_TOKEN},
+        )
+        order_data = {"customer_id": 1, "products": [{"id": 1}]}
+        client.post(
+            "/orders",
+            data=json.dumps(order_data),
+            content_type="application/json",
+            headers={"Authorization": AUTH_TOKEN},
+        )
+        client.get("/orders/1", headers={"Authorization": AUTH_TOKEN})
+
+        assert client.get("/orders/1").status_code == 401
+
+        client.put(
+            "/orders/1",
+            data=json.dumps({"products": [{"id": 1, "quantity": 2}]}),
+            content_type="application/json",
+            headers={"Authorization": AUTH_TOKEN},
+        )
+        response = client.get("/orders/1", headers={"Authorization": AUTH_TOKEN})
+        assert json.loads(response.data)["total"] == 20.0
+
+    def test_cache_disabled(self):
+        """Test RESPONSE_CACHE_MAX_BYTES=0 turns the cache off"""
+        client = create_app({"RESPONSE_CACHE_MAX_BYTES": 0}).test_client()
+
+        assert client.get("/products").status_code == 200
+        assert json.loads(client.get("/cache/stats").data) == {"enabled": False}
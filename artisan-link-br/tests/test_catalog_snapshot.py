@@ -0,0 +1,172 @@
+import random
+import struct
+import pytest
+import json
+from core.entities import Product
+from adapters.inbound.api import create_app
+from adapters.inbound.asgi import create_asgi_app
+from adapters.outbound.catalog_snapshot import (
+    MappedProductRepository,
+    write_catalog_snapshot,
+)
+from adapters.outbound.repository import ProductRepository
+from tests.test_asgi import asgi
+
+
+def make_catalog(count=300, seed=7):
+    rng = random.Random(seed)
+    return [
+        Product(
+            id=product_id,
+            artisan_id=rng.randint(1, 12),
+            name=f"Produto {product_id} ç",
+            description="" if product_id % 5 == 0 else f"Peça {product_id} feita à mão",
+            price=float(rng.randrange(50)),
+        )
+        for product_id in rng.sample(range(1, 10_000), count)
+    ]
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    products = make_catalog()
+    path = str(tmp_path / "catalog.snap")
+    write_catalog_snapshot(path, products, version=42)
+    reference = ProductRepository()
+    reference.save_many(products)
+    repo = MappedProductRepository(path)
+    yield repo, reference
+    repo.close()
+
+
+class TestMappedProductRepository:
+    def test_lookups_match_memory_repository(self, catalog):
+        """Test point lookups, listing order and artisan index against the in-memory repository"""
+        repo, reference = catalog
+        ids = [p.id for p in reference.list_all()]
+        for product_id in ids[:50] + [0, -1, 10_001]:
+            assert repo.get_by_id(product_id) == reference.get_by_id(product_id)
+        assert repo.get_many([ids[3], 0, ids[1]]) == reference.get_many([ids[3], 0, ids[1]])
+        assert repo.list_all() == sorted(reference.list_all(), key=lambda p: p.id)
+        for artisan_id in range(0, 14):
+            expected = sorted(reference.list_by_artisan(artisan_id), key=lambda p: p.id)
+            assert repo.list_by_artisan(artisan_id) == expected
+        assert repo.version() == 42
+
+    def test_pagination_matches_memory_repository(self, catalog):
+        """Test keyset pages by id and by price in both directions"""
+        repo, reference = catalog
+        after = None
+        while True:
+            page = repo.list_page(after, 37)
+            assert page == reference.list_page(after, 37)
+            if not page:
+                break
+            after = page[-1].id
+        for descending in (False, True):
+            after = None
+            while True:
+                args = (10.0, 40.0, descending, after, 23)
+                page = repo.list_by_price(*args)
+                assert page == reference.list_by_price(*args)
+                if not page:
+                    break
+                after = (page[-1].price, page[-1].id)
+
+    def test_writes_are_rejected(self, catalog):
+        """Test that the mapped catalog is read-only"""
+        repo, _ = catalog
+        with pytest.raises(ValueError):
+            repo.save(Product(1, 1, "Vaso", "Vaso", 1.0))
+        with pytest.raises(ValueError):
+            repo.delete(1)
+
+    def test_invalid_files(self, tmp_path):
+        """Test that foreign files and unknown format versions are refused"""
+        path = tmp_path / "catalog.snap"
+        path.write_bytes(b"nada" * 40)
+        with pytest.raises(ValueError):
+            MappedProductRepository(str(path))
+        write_catalog_snapshot(str(path), make_catalog(3))
+        data = bytearray(path.read_bytes())
+        struct.pack_into("<I", data, 4, 99)
+        path.write_bytes(bytes(data))
+        with pytest.raises(ValueError):
+            MappedProductRepository(str(path))
+
+    def test_empty_catalog(self, tmp_path):
+        """Test that a snapshot without products opens and answers empty"""
+        path = str(tmp_path / "empty.snap")
+        assert write_catalog_snapshot(path, []) == 0
+        repo = MappedProductRepository(path)
+        assert repo.list_page(None, 10) == []
+        assert repo.get_by_id(1) is None
+        assert repo.list_by_price(0, 10, True, None, 10) == []
+        repo.close()
+
+
+class TestMappedCatalogApi:
+    def test_app_serves_mapped_catalog(self, tmp_path):
+        """Test the mmap backend through the API, including a rejected write"""
+        path = str(tmp_path / "catalog.snap")
+        write_catalog_snapshot(
+            path, [Product(1, 1, "Vaso de Cerâmica", "Vaso", 50.0), Product(2, 1, "Cesto", "Cesto", 30.0)]
+        )
+        client = create_app(
+            {"REPOSITORY_BACKEND": "mmap", "CATALOG_SNAPSHOT_PATH": path}
+        ).test_client()
+        response = client.get("/products?sort=price_asc")
+        assert [p["id"] for p in json.loads(response.data)] == [2, 1]
+        assert json.loads(client.get("/products/search?q=ceramica").data)[0]["id"] == 1
+        response = client.post(
+            "/products",
+            json={"id": 3, "artisan_id": 1, "name": "X", "description": "X", "price": 1.0},
+        )
+        assert response.status_code == 400
+        assert json.loads(response.data) == {"error": "O catálogo é somente leitura."}
+
+    def test_bulk_import_is_rejected(self, tmp_path):
+        """Test that POST /products/bulk on the read-only catalog is a 400 in both adapters"""
+        path = str(tmp_path / "catalog.snap")
+        write_catalog_snapshot(path, [Product(1, 1, "Vaso", "Vaso", 50.0)])
+        config = {"REPOSITORY_BACKEND": "mmap", "CATALOG_SNAPSHOT_PATH": path}
+        body = json.dumps(
+            [{"id": 2, "artisan_id": 1, "name": "Cesto", "description": "C", "price": 1.0}]
+        ).encode()
+
+        response = create_app(config).test_client().post(
+            "/products/bulk", data=body, content_type="application/json"
+        )
+        assert response.status_code == 400
+        assert json.loads(response.data) == {"error": "O catálogo é somente leitura."}
+
+        status, _, data = asgi(
+            create_asgi_app(config),
+            "POST",
+            "/products/bulk",
+            body=body,
+            headers={"Content-Type": "application/json"},
+        )
+        assert status == 400
+        assert json.loads(data) == {"error": "O catálogo é somente leitura."}
+
+    def test_cold_start_does_not_scan_catalog(self, tmp_path, monkeypatch):
+        """Test that create_app with the mmap backend defers the catalog scan to the first search"""
+        path = str(tmp_path / "catalog.snap")
+        write_catalog_snapshot(path, make_catalog(count=3000))
+        pages = []
+        list_page = MappedProductRepository.list_page
+
+        def counting_list_page(self, *args, **kwargs):
+            pages.append(args)
+            return list_page(self, *args, **kwargs)
+
+        monkeypatch.setattr(MappedProductRepository, "list_page", counting_list_page)
+        client = create_app(
+            {"REPOSITORY_BACKEND": "mmap", "CATALOG_SNAPSHOT_PATH": path}
+        ).test_client()
+        assert pages == []
+        response = client.get("/products/search?q=produto")
+        assert response.status_code == 200
+        assert json.loads(response.data)
+        assert pages
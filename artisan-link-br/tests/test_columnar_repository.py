@@ -0,0 +1,84 @@
+import math
+import pytest
+from core.entities import Product
+from adapters.outbound.columnar_repository import ProductStore
+
+
+@pytest.fixture
+def store():
+    return ProductStore()
+
+
+class TestProductStore:
+    def test_save_and_lookups(self, store):
+        """Test that products are rebuilt from the columns on read"""
+        product1 = Product(id=1, artisan_id=1, name="Vaso", description="Vaso", price=50.0)
+        product2 = Product(id=2, artisan_id=2, name="Prato", description="Prato", price=30.0)
+        store.save(product1)
+        store.save(product2)
+
+        assert store.list_all() == [product1, product2]
+        assert store.get_by_id(2) == product2
+        assert store.get_by_id(3) is None
+        assert store.get_many([2, 3, 1]) == [product2, product1]
+        assert store.list_by_artisan(1) == [product1]
+
+    def test_strings_are_interned(self, store):
+        """Test that repeated descriptions share one string object"""
+        description = "".join(["Feito ", "à mão"])
+        store.save(Product(id=1, artisan_id=1, name="A", description=description, price=1.0))
+        store.save(Product(id=2, artisan_id=1, name="B", description="Feito à mão", price=1.0))
+
+        assert store.get_by_id(1).description is store.get_by_id(2).description
+
+    def test_update_and_delete_reuse_rows(self, store):
+        """Test update, delete and reuse of freed rows"""
+        for product_id in range(1, 4):
+            store.save(Product(id=product_id, artisan_id=1, name="P", description="P", price=1.0))
+
+        assert store.update(Product(id=2, artisan_id=2, name="Q", description="Q", price=9.5))
+        assert store.list_by_artisan(2)[0].price == 9.5
+        assert store.delete(1) is True
+        assert store.delete(1) is False
+        store.save(Product(id=10, artisan_id=3, name="R", description="R", price=2.0))
+
+        assert [p.id for p in store.list_page(None, 10)] == [2, 3, 10]
+        assert [p.id for p in store.list_page(3, 10)] == [10]
+        assert store.get_by_id(10).name == "R"
+
+    def test_save_many(self, store):
+        """Test the bulk path keeps the id order"""
+        store.save_many(
+            Product(id=i, artisan_id=1, name="P", description="P", price=float(i))
+            for i in [5, 3, 1, 3]
+        )
+
+        assert [p.id for p in store.list_page(None, 10)] == [1, 3, 5]
+        assert len(store.list_by_artisan(1)) == 3
+
+    def test_list_by_price(self, store):
+        """Test the price index across update, delete, reuse and bulk saves"""
+        for product_id, price in [(1, 30.0), (2, 10.0), (3, 20.0)]:
+            store.save(Product(id=product_id, artisan_id=1, name="P", description="P", price=price))
+        store.update(Product(id=2, artisan_id=1, name="P", description="P", price=40.0))
+        store.delete(3)
+        store.save_many(
+            Product(id=product_id, artisan_id=1, name="P", description="P", price=price)
+            for product_id, price in [(4, 5.0), (1, 35.0), (4, 25.0)]
+        )
+
+        def ids(*args):
+            return [p.id for p in store.list_by_price(*args)]
+
+        assert ids(-math.inf, math.inf, False, None, 10) == [4, 1, 2]
+        assert ids(-math.inf, 36.0, True, None, 10) == [1, 4]
+        assert ids(-math.inf, math.inf, False, (25.0, 4), 1) == [1]
+
+    def test_version(self, store):
+        """Test that writes bump the store version"""
+        store.save(Product(id=1, artisan_id=1, name="P", description="P", price=1.0))
+        version = store.version()
+
+        store.delete(1)
+
+        assert store.version() > version > 0
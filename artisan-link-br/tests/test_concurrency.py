@@ -0,0 +1,297 @@
+import math
+import random
+import threading
+from array import array
+import pytest
+import json
+from core.entities import Order, Product
+from core.services import ArtisanService, OrderService
+from adapters.inbound.api import create_app
+from adapters.outbound.concurrency import IdSequence, SortedIndex, StripedLock, merge_sorted
+from adapters.outbound.repository import (
+    ArtisanRepository,
+    OrderRepository,
+    ProductRepository,
+)
+from adapters.outbound.sqlite_repository import (
+    SQLiteArtisanRepository,
+    SQLiteDatabase,
+    SQLiteOrderRepository,
+)
+
+
+AUTH_TOKEN = "Bearer meu-token-secreto"
+THREADS = 8
+WRITES_PER_THREAD = 50
+
+
+def run_threads(target, count=THREADS):
+    errors = []
+
+    def worker(index):
+        try:
+            target(index)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return ArtisanRepository(), OrderRepository()
+    database = SQLiteDatabase(str(tmp_path / "test.db"))
+    return SQLiteArtisanRepository(database), SQLiteOrderRepository(database)
+
+
+class TestPrimitives:
+    def test_id_sequence_observe(self):
+        """Test that explicit ids push the sequence forward and never back"""
+        sequence = IdSequence()
+        assert sequence.next() == 1
+        sequence.observe(10)
+        sequence.observe(3)
+        assert sequence.next() == 11
+        assert sequence.current() == 11
+
+    def test_striped_lock_holds_many_keys(self):
+        """Test that overlapping key sets can be held without deadlock"""
+        locks = StripedLock(stripes=4)
+        counter = []
+
+        def worker(index):
+            for i in range(200):
+                keys = [index, i, -i] if index % 2 else [-i, i, index]
+                with locks.hold(*keys):
+                    counter.append(i)
+
+        run_threads(worker)
+        assert len(counter) == THREADS * 200
+
+    def test_sorted_index_scan_matches_brute_force(self):
+        """Test ranged, cursor and descending scans with tombstones"""
+        rng = random.Random(7)
+        index = SortedIndex()
+        live = set()
+        index.add_many(range(0, 200, 2))
+        live.update(range(0, 200, 2))
+        for _ in range(300):
+            key = rng.randrange(200)
+            if key in live and rng.random() < 0.5:
+                index.discard(key)
+                live.discard(key)
+            else:
+                index.add(key)
+                live.add(key)
+        assert len(index) == len(live)
+        expected = sorted(live)
+        for _ in range(100):
+            low, high = sorted(rng.sample(range(-5, 205), 2))
+            after = rng.choice([None, rng.randrange(200)])
+            limit = rng.randint(1, 30)
+            window = [k for k in expected if low <= k <= high]
+            ascending = [k for k in window if after is None or k > after]
+            descending = [k for k in reversed(window) if after is None or k < after]
+            assert index.scan(lambda k: True, limit, low, high, after) == ascending[:limit]
+            assert (
+                index.scan(lambda k: True, limit, low, high, after, descending=True)
+                == descending[:limit]
+            )
+
+
+    def test_sorted_index_add_many_merges_batches(self):
+        """Test that batches merge into the index, reviving tombstones and skipping duplicates"""
+        rng = random.Random(11)
+        index = SortedIndex()
+        live = set()
+        for _ in range(50):
+            batch = [rng.randrange(500) for _ in range(rng.randint(0, 40))]
+            index.add_many(batch)
+            live.update(batch)
+            for key in rng.sample(sorted(live), min(len(live), 5)):
+                index.discard(key)
+                live.discard(key)
+            assert len(index) == len(live)
+            assert index.scan(lambda k: True, 1000) == sorted(live)
+
+    def test_merge_sorted_keeps_sequence_type(self):
+        """Test merging a sorted batch into a list and into an array with a key"""
+        assert merge_sorted([1, 4, 9], [0, 5, 10]) == [0, 1, 4, 5, 9, 10]
+        prices = {0: 3.0, 1: 1.0, 2: 2.0, 3: 5.0}
+        merged = merge_sorted(array("q", [1, 0]), [2, 3], key=prices.get)
+        assert merged == array("q", [1, 2, 0, 3])
+
+class TestConcurrentWrites:
+    def test_concurrent_creates_get_unique_ids(self, backend):
+        """Test that concurrent creates never share an id or lose a write"""
+        artisan_repo, order_repo = backend
+        artisans = ArtisanService(artisan_repo)
+        orders = OrderService(order_repo, ProductRepository())
+
+        def worker(index):
+            for i in range(WRITES_PER_THREAD):
+                artisans.create_artisan(f"A{index}-{i}", f"a{index}-{i}@email.com")
+                orders.create_order(
+                    Order(id=orders.next_order_id(), customer_id=index, lines=[], total=1.0)
+                )
+
+        run_threads(worker)
+        total = THREADS * WRITES_PER_THREAD
+        assert artisan_repo.count() == total
+        assert order_repo.count() == total
+        assert [a.id for a in artisan_repo.list_page(None, total + 1)] == list(
+            range(1, total + 1)
+        )
+        assert [o.id for o in order_repo.list_page(None, total + 1)] == list(
+            range(1, total + 1)
+        )
+
+    def test_delete_then_create_does_not_clobber(self, backend):
+        """Test that ids freed by a delete are never handed out again"""
+        artisan_repo, order_repo = backend
+        artisans = ArtisanService(artisan_repo)
+        orders = OrderService(order_repo, ProductRepository())
+        first = artisans.create_artisan("João", "joao@email.com")
+        second = artisans.create_artisan("Maria", "maria@email.com")
+        assert artisans.delete_artisan(first.id)
+        third = artisans.create_artisan("Ana", "ana@email.com")
+
+        assert third.id == 3
+        assert artisan_repo.get_by_id(second.id) == second
+
+        for _ in range(3):
+            orders.create_order(
+                Order(id=orders.next_order_id(), customer_id=1, lines=[], total=1.0)
+            )
+        assert orders.delete_order(2)
+        assert orders.next_order_id() == 4
+
+    def test_concurrent_duplicate_email_has_single_winner(self, backend):
+        """Test that racing creates with the same email keep exactly one artisan"""
+        artisan_repo, _ = backend
+        artisans = ArtisanService(artisan_repo)
+        failures = []
+
+        def worker(index):
+            try:
+                artisans.create_artisan(f"A{index}", "mesmo@email.com")
+            except ValueError:
+                failures.append(index)
+
+        run_threads(worker)
+        assert len(failures) == THREADS - 1
+        assert artisan_repo.count() == 1
+
+    def test_id_blocks_are_contiguous_and_disjoint(self, backend):
+        """Test that batch id blocks never interleave with concurrent single ids"""
+        _, order_repo = backend
+        blocks = []
+
+        def worker(index):
+            for _ in range(10):
+                if index % 2:
+                    ids = order_repo.next_ids(5)
+                else:
+                    ids = [order_repo.next_id()]
+                blocks.append(list(ids))
+                order_repo.save_many(
+                    Order(id=order_id, customer_id=index, lines=[], total=1.0)
+                    for order_id in ids
+                )
+
+        run_threads(worker)
+        ids = sorted(order_id for block in blocks for order_id in block)
+        assert ids == list(range(1, len(ids) + 1))
+        assert all(block == list(range(block[0], block[0] + len(block))) for block in blocks)
+        assert order_repo.count() == len(ids)
+
+
+class TestLockFreeReads:
+    def test_readers_see_consistent_pages_during_writes(self):
+        """Test that keyset and price scans stay ordered and valid under writes"""
+        repo = ProductRepository()
+        repo.save_many(
+            Product(id=i, artisan_id=i % 5, name="P", description="P", price=float(i % 50))
+            for i in range(1, 1001)
+        )
+        stop = threading.Event()
+        reader_errors = []
+
+        def writer(index):
+            rng = random.Random(index)
+            for _ in range(500):
+                product_id = rng.randint(1, 1200)
+                if rng.random() < 0.3:
+                    repo.delete(product_id)
+                else:
+                    repo.save(
+                        Product(
+                            id=product_id,
+                            artisan_id=rng.randrange(5),
+                            name="P",
+                            description="P",
+                            price=float(rng.randrange(50)),
+                        )
+                    )
+
+        def reader(index):
+            try:
+                while not stop.is_set():
+                    ids = [p.id for p in repo.list_page(None, 2000)]
+                    assert ids == sorted(set(ids))
+                    page = repo.list_by_price(10.0, 20.0, index % 2 == 1, None, 100)
+                    keys = [(p.price, p.id) for p in page]
+                    assert keys == sorted(keys, reverse=index % 2 == 1)
+                    assert all(10.0 <= price <= 20.0 for price, _ in keys)
+            except AssertionError as e:
+                reader_errors.append(e)
+
+        readers = [threading.Thread(target=reader, args=(i,)) for i in range(2)]
+        for thread in readers:
+            thread.start()
+        try:
+            run_threads(writer, count=4)
+        finally:
+            stop.set()
+            for thread in readers:
+                thread.join()
+        assert reader_errors == []
+
+        products = sorted(repo.list_all(), key=lambda p: p.id)
+        assert repo.list_page(None, 2000) == products
+        by_price = sorted(products, key=lambda p: (p.price, p.id))
+        assert repo.list_by_price(-math.inf, math.inf, False, None, 2000) == by_price
+        for artisan_id in range(5):
+            assert sorted(repo.list_by_artisan(artisan_id), key=lambda p: p.id) == [
+                p for p in products if p.artisan_id == artisan_id
+            ]
+
+
+class TestConcurrentAPI:
+    def test_concurrent_posts_do_not_overwrite(self):
+        """Test that parallel POST /artisans requests all persist with distinct ids"""
+        app = create_app()
+        app.config["TESTING"] = True
+
+        def worker(index):
+            client = app.test_client()
+            for i in range(10):
+                response = client.post(
+                    "/artisans",
+                    data=json.dumps({"name": "A", "email": f"a{index}-{i}@email.com"}),
+                    content_type="application/json",
+                    headers={"Authorization": AUTH_TOKEN},
+                )
+                assert response.status_code == 201
+
+        run_threads(worker)
+        client = app.test_client()
+        response = client.get("/artisans?limit=100")
+        ids = [artisan["id"] for artisan in json.loads(response.data)["items"]]
+        assert ids == list(range(1, THREADS * 10 + 1))
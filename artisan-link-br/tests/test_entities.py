@@ -1,5 +1,5 @@
 import pytest
-from core.entities import Artisan, Product, Order, Review
+from core.entities import Artisan, Product, Order, OrderLine, Review
 
 
 class TestArtisan:
@@ -41,21 +41,37 @@ class TestProduct:
         with pytest.raises(ValueError):
             Product(id=1, artisan_id=1, name="Test", description="Test", price=-10.0)
 
+    def test_product_is_slotted(self):
+        """Test that products carry no per-instance __dict__"""
+        product = Product(id=1, artisan_id=1, name="Vaso", description="Vaso", price=50.0)
+
+        assert not hasattr(product, "__dict__")
+        with pytest.raises(AttributeError):
+            product.color = "azul"
+
 
 class TestOrder:
     def test_order_creation(self):
         """Test that an Order can be created with valid data"""
-        products = [
-            Product(id=1, artisan_id=1, name="Vaso", description="Vaso", price=50.0),
-            Product(id=2, artisan_id=1, name="Prato", description="Prato", price=30.0),
+        lines = [
+            OrderLine(product_id=1, quantity=1, unit_price=50.0),
+            OrderLine(product_id=2, quantity=1, unit_price=30.0),
         ]
-        order = Order(id=1, customer_id=1, products=products, total=80.0)
+        order = Order(id=1, customer_id=1, lines=lines, total=80.0)
 
         assert order.id == 1
         assert order.customer_id == 1
-        assert len(order.products) == 2
+        assert len(order.lines) == 2
         assert order.total == 80.0
 
+    def test_order_line_validation(self):
+        """Test that order lines refuse empty quantities and negative prices"""
+        assert OrderLine(product_id=1).quantity == 1
+        with pytest.raises(ValueError):
+            OrderLine(product_id=1, quantity=0, unit_price=10.0)
+        with pytest.raises(ValueError):
+            OrderLine(product_id=1, quantity=1, unit_price=-1.0)
+
 
 class TestReview:
     def test_review_creation(self):
@@ -70,6 +86,13 @@ class TestReview:
         assert review.rating == 5
         assert review.comment == "Produto excelente!"
 
+    def test_review_rating_must_be_integer(self):
+        """Test that fractional or boolean ratings are rejected"""
+        with pytest.raises(ValueError):
+            Review(id=1, product_id=1, customer_id=1, rating=4.5, comment="Test")
+        with pytest.raises(ValueError):
+            Review(id=1, product_id=1, customer_id=1, rating=True, comment="Test")
+
     def test_review_rating_range(self):
         """Test that review rating should be between 1 and 5"""
         with pytest.raises(ValueError):
@@ -0,0 +1,289 @@
+import os
+import threading
+import pytest
+from core.entities import Order, OrderLine, Product, Review
+from core.services import ArtisanService, OrderService, ProductService, ReviewService
+from adapters.inbound.api import create_app
+from adapters.outbound.journal import (
+    KIND_ORDER,
+    KIND_PRODUCT,
+    OP_SAVE_MANY,
+    JournaledStore,
+    decode_record,
+    encode_delete,
+    encode_save,
+    encode_save_many,
+)
+from adapters.outbound.repository import (
+    ArtisanRepository,
+    OrderRepository,
+    ProductRepository,
+    ReviewRepository,
+)
+
+
+AUTH_TOKEN = "Bearer meu-token-secreto"
+
+
+def open_store(directory, **kwargs):
+    return JournaledStore(
+        str(directory),
+        ProductRepository(),
+        ArtisanRepository(),
+        OrderRepository(),
+        ReviewRepository(),
+        **kwargs,
+    )
+
+
+def state(store):
+    return (
+        sorted(store.products.list_all(), key=lambda p: p.id),
+        sorted(store.artisans.list_all(), key=lambda a: a.id),
+        store.orders.list_page(None, 1000),
+        store.reviews.list_page(None, 1000),
+    )
+
+
+def segment_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".log"))
+
+
+def populate(store):
+    products = ProductService(store.products)
+    artisans = ArtisanService(store.artisans)
+    orders = OrderService(store.orders, store.products)
+    reviews = ReviewService(store.reviews)
+    ana = artisans.create_artisan("Ana", "ana@email.com")
+    bia = artisans.create_artisan("Bia", "bia@email.com")
+    artisans.update_artisan(ana.id, email="ana.silva@email.com")
+    artisans.delete_artisan(bia.id)
+    products.add_product(Product(1, ana.id, "Vaso", "Vaso de barro", 50))
+    products.add_products([Product(i, ana.id, f"P{i}", "", float(i)) for i in range(2, 6)])
+    products.update_product(Product(2, ana.id, "P2", "novo", 99.5))
+    products.delete_product(3)
+    orders.place_order(7, [(1, 2), (2, 1)])
+    orders.create_order(Order(orders.next_order_id(), 8, [OrderLine(4, 1, 4.0)], 10.0))
+    orders.delete_order(2)
+    reviews.add_review(Review(reviews.next_review_id(), 1, 7, 5, "Ótimo \ud800"))
+    reviews.update_review(Review(1, 1, 7, 4, "Bom"))
+
+
+class TestRecordCodec:
+    def test_round_trip_keeps_values_and_types(self):
+        """Test that decoded entities are identical to the encoded ones, types included"""
+        order = Order(
+            id=3,
+            customer_id=1 << 70,
+            lines=[OrderLine(1, 2, 3), OrderLine(1 << 70, 1, 1.5)],
+            total={"raro": [1, True]},
+        )
+        op, kind, decoded = decode_record(encode_save(KIND_ORDER, order))
+        assert kind == KIND_ORDER
+        assert decoded == order
+        assert type(decoded.lines[0]) is OrderLine
+        assert type(decoded.lines[0].unit_price) is int
+        product = Product(None, 0, "", "", 0)
+        _, _, decoded = decode_record(encode_save(KIND_PRODUCT, product))
+        assert decoded == product
+        assert type(decoded.price) is int
+        _, _, deleted_id = decode_record(encode_delete(KIND_PRODUCT, 42))
+        assert deleted_id == 42
+
+
+class TestOrderBatches:
+    def test_batch_is_one_record(self, tmp_path):
+        """Test that save_many writes a single record that restores every order"""
+        store = open_store(tmp_path)
+        orders = [
+            Order(id=i, customer_id=i, lines=[OrderLine(1, i, 2.5)], total=2.5 * i)
+            for i in store.orders.next_ids(3)
+        ]
+        store.orders.save_many(orders)
+        store.close()
+
+        op, kind, decoded = decode_record(encode_save_many(KIND_ORDER, orders))
+        assert (op, kind, decoded) == (OP_SAVE_MANY, KIND_ORDER, orders)
+        recovered = open_store(tmp_path)
+        assert recovered.orders.list_page(None, 10) == orders
+        assert recovered.orders.next_id() == 4
+        recovered.close()
+
+    def test_torn_batch_is_dropped_whole(self, tmp_path):
+        """Test that a batch cut by a crash comes back with none of its orders"""
+        store = open_store(tmp_path)
+        store.orders.save(Order(id=store.orders.next_id(), customer_id=1, lines=[], total=0.0))
+        store.orders.save_many(
+            Order(id=i, customer_id=i, lines=[OrderLine(1, 1, 1.0)], total=1.0)
+            for i in store.orders.next_ids(50)
+        )
+        store.close()
+        path = tmp_path / segment_files(tmp_path)[-1]
+        os.truncate(path, path.stat().st_size - 10)
+
+        recovered = open_store(tmp_path)
+        assert [order.id for order in recovered.orders.list_page(None, 100)] == [1]
+        recovered.close()
+
+
+class TestRecovery:
+    def test_restart_restores_every_collection(self, tmp_path):
+        """Test that a store reopened without closing sees every confirmed write"""
+        store = open_store(tmp_path)
+        populate(store)
+        expected = state(store)
+
+        recovered = open_store(tmp_path)
+        assert state(recovered) == expected
+        assert recovered.artisans.get_by_email("ANA.SILVA@email.com").id == 1
+        by_price = recovered.products.list_by_price(0, 100, False, None, 10)
+        assert [p.id for p in by_price] == [4, 5, 1, 2]
+        # Ids removidos antes da queda não são reaproveitados
+        assert recovered.artisans.next_id() == 3
+        assert recovered.orders.next_id() == 3
+        store.close()
+        recovered.close()
+
+    def test_snapshot_replays_only_the_tail(self, tmp_path):
+        """Test that a snapshot replaces the covered segments and the tail is replayed on top"""
+        store = open_store(tmp_path)
+        populate(store)
+        first_segment = segment_files(tmp_path)[0]
+        lsn = store.snapshot()
+        assert lsn > 0
+        assert first_segment not in segment_files(tmp_path)
+        ArtisanService(store.artisans).create_artisan("Caio", "caio@email.com")
+        ProductService(store.products).delete_product(1)
+        expected = state(store)
+        store.close()
+
+        recovered = open_store(tmp_path)
+        assert state(recovered) == expected
+        # A sequência vem do snapshot mesmo com o maior id já removido
+        assert recovered.orders.next_id() == 3
+        recovered.close()
+
+    def test_periodic_snapshot(self, tmp_path):
+        """Test that snapshots are taken in the background every N records"""
+        store = open_store(tmp_path, snapshot_every=10)
+        service = ProductService(store.products)
+        for i in range(1, 40):
+            service.add_product(Product(i, 1, f"P{i}", "", 1.0))
+        store.close()
+        assert any(name.endswith(".snap") for name in os.listdir(tmp_path))
+        recovered = open_store(tmp_path)
+        assert [p.id for p in recovered.products.list_page(None, 100)] == list(range(1, 40))
+        recovered.close()
+
+    def test_torn_tail_is_discarded(self, tmp_path):
+        """Test that a partially written last record is truncated and writes continue"""
+        store = open_store(tmp_path)
+        ProductService(store.products).add_product(Product(1, 1, "Vaso", "", 1.0))
+        store.close()
+        path = tmp_path / segment_files(tmp_path)[-1]
+        size = path.stat().st_size
+        with open(path, "ab") as f:
+            f.write(b"\x30\x00\x00\x00\x01\x02")
+
+        recovered = open_store(tmp_path)
+        assert path.stat().st_size == size
+        ProductService(recovered.products).add_product(Product(2, 1, "Cesto", "", 2.0))
+        recovered.close()
+        again = open_store(tmp_path)
+        assert [p.id for p in again.products.list_all()] == [1, 2]
+        again.close()
+
+    @pytest.mark.parametrize("durability", ["fsync", "write", "async"])
+    def test_durability_levels(self, tmp_path, durability):
+        """Test that every durability level persists writes once the store is closed"""
+        store = open_store(tmp_path, durability=durability)
+        populate(store)
+        expected = state(store)
+        store.close()
+        recovered = open_store(tmp_path)
+        assert state(recovered) == expected
+        recovered.close()
+
+    def test_unknown_durability(self, tmp_path):
+        """Test that an unknown durability level is rejected"""
+        with pytest.raises(ValueError):
+            open_store(tmp_path, durability="talvez")
+
+    def test_concurrent_writes_keep_last_state_per_key(self, tmp_path):
+        """Test that journal order matches apply order when threads race on the same ids"""
+        store = open_store(tmp_path)
+        service = ProductService(store.products)
+
+        def writer(index):
+            for i in range(200):
+                service.add_product(Product(i % 10, 1, f"T{index}", "", float(i)))
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        expected = state(store)
+        store.close()
+        recovered = open_store(tmp_path)
+        assert state(recovered) == expected
+        recovered.close()
+
+
+class TestJournalFailure:
+    def test_failed_journal_write_is_rolled_back(self, tmp_path, monkeypatch):
+        """Test that writes the journal could not persist are undone in memory"""
+        store = open_store(tmp_path)
+        populate(store)
+        expected = state(store)
+
+        def broken_write(batch):
+            raise OSError("disco cheio")
+
+        monkeypatch.setattr(store._journal, "_write", broken_write)
+        products = ProductService(store.products)
+        writes = [
+            lambda: products.add_product(Product(9, 1, "Novo", "", 1.0)),
+            lambda: products.update_product(Product(1, 1, "Vaso", "outro", 70.0)),
+            lambda: products.delete_product(4),
+            lambda: products.add_products([Product(5, 1, "P5", "x", 1.0), Product(6, 1, "P6", "", 2.0)]),
+            lambda: ArtisanService(store.artisans).update_artisan(1, name="Ana Silva"),
+            lambda: OrderService(store.orders, store.products).place_order(7, [(1, 1)]),
+        ]
+        for write in writes:
+            with pytest.raises(OSError):
+                write()
+            assert state(store) == expected
+        store.close()
+        recovered = open_store(tmp_path)
+        assert state(recovered) == expected
+        recovered.close()
+
+
+class TestJournaledApi:
+    def test_api_state_survives_restart(self, tmp_path):
+        """Test that an app started on the same journal directory serves the same data"""
+        config = {"JOURNAL_DIR": str(tmp_path / "journal")}
+        client = create_app(config).test_client()
+        headers = {"Authorization": AUTH_TOKEN}
+        client.post("/artisans", json={"name": "Ana", "email": "ana@email.com"}, headers=headers)
+        client.post(
+            "/products",
+            json={"id": 1, "artisan_id": 1, "name": "Vaso", "description": "Vaso", "price": 50},
+        )
+        client.post("/reviews", json={"product_id": 1, "customer_id": 2, "rating": 5, "comment": "Ok"}, headers=headers)
+
+        restarted = create_app(config).test_client()
+        for path in ("/artisans", "/products", "/products/1/rating"):
+            assert restarted.get(path).data == client.get(path).data
+
+    def test_journal_rejected_for_sqlite(self, tmp_path):
+        """Test that the journal cannot be combined with the SQLite backend"""
+        with pytest.raises(ValueError):
+            create_app(
+                {
+                    "REPOSITORY_BACKEND": "sqlite",
+                    "SQLITE_PATH": str(tmp_path / "x.db"),
+                    "JOURNAL_DIR": str(tmp_path / "journal"),
+                }
+            )
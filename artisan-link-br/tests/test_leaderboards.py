@@ -0,0 +1,147 @@
+import pytest
+import json
+from core.entities import Order, OrderLine, Product, Review
+from core.events import EventBus
+from core.leaderboards import PRIOR_MEAN, PRIOR_WEIGHT, Leaderboard
+from core.services import OrderService, ProductService, RankingService, ReviewService
+from adapters.inbound.api import create_app
+from adapters.outbound.repository import (
+    OrderRepository,
+    ProductRepository,
+    ReviewRepository,
+)
+
+
+AUTH_TOKEN = "Bearer meu-token-secreto"
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def product(id, artisan_id=1):
+    return Product(id=id, artisan_id=artisan_id, name=f"P{id}", description="P", price=10.0)
+
+
+def review(id, product_id, rating):
+    return Review(id=id, product_id=product_id, customer_id=1, rating=rating, comment="")
+
+
+class TestLeaderboard:
+    def test_ranks_only_catalog_products_with_scores(self):
+        """Test ordering, ties by id, per-artisan views and removals"""
+        board = Leaderboard()
+        board.set_product(1, 1)
+        board.set_product(2, 2)
+        board.set_product(3, 1)
+        board.set_score(1, 2.0)
+        board.set_score(2, 5.0)
+        board.set_score(3, 2.0)
+        board.set_score(4, 9.0)  # fora do catálogo
+
+        assert board.top(10) == [(2, 5.0), (1, 2.0), (3, 2.0)]
+        assert board.top(10, artisan_id=1) == [(1, 2.0), (3, 2.0)]
+
+        board.set_product(3, 2)
+        board.set_score(1, None)
+        board.remove_product(2)
+
+        assert board.top(10) == [(3, 2.0)]
+        assert board.top(10, artisan_id=2) == [(3, 2.0)]
+        assert board.top(10, artisan_id=1) == []
+
+
+class TestRankingService:
+    def _services(self, product_repo=None, order_repo=None, review_repo=None):
+        events = EventBus()
+        product_repo = product_repo or ProductRepository()
+        order_repo = order_repo or OrderRepository()
+        products = ProductService(product_repo, events)
+        orders = OrderService(order_repo, product_repo, events)
+        reviews = ReviewService(review_repo or ReviewRepository(), events)
+        rankings = RankingService(product_repo, order_repo, reviews.ratings, events)
+        return products, orders, reviews, rankings
+
+    def test_bayesian_rating_damps_few_reviews(self):
+        """Test that one 5-star review ranks below many 4-star reviews"""
+        products, _, reviews, rankings = self._services()
+        products.add_products([product(1), product(2)])
+        reviews.add_review(review(1, 1, 5))
+        for review_id in range(2, 22):
+            reviews.add_review(review(review_id, 2, 4))
+
+        top = rankings.top_products(by="rating")
+
+        assert [p.id for p, _ in top] == [2, 1]
+        assert top[1][1] == pytest.approx((PRIOR_WEIGHT * PRIOR_MEAN + 5) / (PRIOR_WEIGHT + 1))
+
+    def test_sales_follow_order_writes(self):
+        """Test that creating, updating and deleting orders moves the sales board"""
+        products, orders, _, rankings = self._services()
+        products.add_products([product(1), product(2, artisan_id=2)])
+        orders.create_order(Order(id=1, customer_id=1, lines=[OrderLine(1, 2, 10.0)], total=20.0))
+        orders.create_order(Order(id=2, customer_id=1, lines=[OrderLine(2, 1, 10.0)], total=10.0))
+
+        assert [(p.id, s) for p, s in rankings.top_products(by="sales")] == [(1, 2.0), (2, 1.0)]
+        assert [p.id for p, _ in rankings.top_products(by="sales", artisan_id=2)] == [2]
+
+        orders.update_order(Order(id=1, customer_id=1, lines=[OrderLine(2, 1, 10.0)], total=10.0))
+        orders.delete_order(2)
+
+        assert [(p.id, s) for p, s in rankings.top_products(by="sales")] == [(2, 1.0)]
+
+    def test_rebuilds_from_repositories(self):
+        """Test that existing products, reviews and orders are ranked at startup"""
+        product_repo, order_repo, review_repo = ProductRepository(), OrderRepository(), ReviewRepository()
+        product_repo.save(product(1))
+        order_repo.save(Order(id=1, customer_id=1, lines=[OrderLine(1, 1, 10.0)], total=10.0))
+        review_repo.save(review(1, 1, 4))
+
+        _, _, _, rankings = self._services(product_repo, order_repo, review_repo)
+
+        assert [p.id for p, _ in rankings.top_products(by="sales")] == [1]
+        assert [p.id for p, _ in rankings.top_products(by="rating")] == [1]
+
+    def test_invalid_arguments(self):
+        """Test unknown rankings and bad limits"""
+        _, _, _, rankings = self._services()
+
+        with pytest.raises(ValueError):
+            rankings.top_products(by="price")
+        with pytest.raises(ValueError):
+            rankings.top_products(limit=0)
+
+
+class TestTopProductsAPI:
+    def test_top_by_rating_refreshes_after_review(self, client):
+        """Test GET /products/top?by=rating before and after a review"""
+        for product_id in (1, 2):
+            client.post(
+                "/products",
+                data=json.dumps({"id": product_id, "artisan_id": product_id, "name": "P", "description": "P", "price": 5.0}),
+                content_type="application/json",
+            )
+        assert json.loads(client.get("/products/top?by=rating").data) == []
+
+        client.post(
+            "/reviews",
+            data=json.dumps({"product_id": 2, "customer_id": 1, "rating": 5, "comment": "ok"}),
+            content_type="application/json",
+            headers={"Authorization": AUTH_TOKEN},
+        )
+
+        data = json.loads(client.get("/products/top?by=rating&limit=5").data)
+        assert [item["id"] for item in data] == [2]
+        assert data[0]["rating"] == {"count": 1, "mean": 5.0}
+        assert json.loads(client.get("/products/top?artisan_id=1").data) == []
+
+    def test_top_invalid_params(self, client):
+        """Test that bad by, limit and artisan_id values return 400"""
+        for query in ["by=preco", "limit=abc", "limit=0", "artisan_id=x"]:
+            response = client.get(f"/products/top?{query}")
+
+            assert response.status_code == 400
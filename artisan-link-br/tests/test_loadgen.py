@@ -0,0 +1,75 @@
+import random
+import threading
+from collections import Counter
+import pytest
+from werkzeug.serving import make_server
+from adapters.inbound.api import create_app
+from benchmarks.datagen import DataSpec, Zipf, load, ranked_ids
+from benchmarks.loadtest import parse_mix, replay
+
+
+@pytest.fixture
+def loaded_app():
+    app = create_app()
+    spec = DataSpec.for_size(400, seed=7)
+    load(app.extensions["artisan_link"], spec, log=lambda line: None)
+    return app, spec
+
+
+class TestDatagen:
+    def test_counts_are_loaded_through_the_services(self, loaded_app):
+        """Test that every generated entity is visible through the services"""
+        app, spec = loaded_app
+        services = app.extensions["artisan_link"]
+        assert len(services.products.list_products()) == spec.products
+        assert len(services.artisans.list_artisans()) == spec.artisans
+        assert services.orders.next_order_id() == spec.orders + 1
+        assert services.reviews.next_review_id() == spec.reviews + 1
+        product = services.products.get_product(1)
+        assert product.price > 0
+        assert services.artisans.get_artisan(product.artisan_id) is not None
+
+    def test_zipf_popularity_is_skewed_and_reproducible(self):
+        """Test that the top-ranked ids dominate and rankings depend only on the seed"""
+        ids = ranked_ids(1000, 7, "products")
+        assert ids == ranked_ids(1000, 7, "products")
+        assert ids != ranked_ids(1000, 7, "customers")
+        counts = Counter(Zipf(ids, 1.1, random.Random(1)).sample(20_000))
+        top_ten = sum(counts[i] for i in ids[:10])
+        assert top_ten > 20_000 * 0.3
+        assert counts[ids[0]] > counts[ids[100]]
+
+
+class TestLoadtest:
+    def test_replay_against_running_instance(self, loaded_app):
+        """Test that the default mix runs against a live server without errors"""
+        app, spec = loaded_app
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            result = replay(
+                f"http://127.0.0.1:{server.port}",
+                spec,
+                parse_mix("product=5,search=1,order=2,review=1,order_read=1"),
+                workers=3,
+                requests=60,
+            )
+        finally:
+            server.shutdown()
+            thread.join()
+        assert result["total"]["requests"] == 60
+        assert result["total"]["errors"] == 0
+        assert set(result["total"]["statuses"]) <= {"200", "201"}
+        assert sum(op["requests"] for op in result["operations"].values()) == 60
+        assert result["operations"]["product"]["p99_ms"] >= result["operations"]["product"]["p50_ms"]
+
+    def test_parse_mix(self):
+        """Test that unknown operations and empty mixes are refused"""
+        assert parse_mix("product=3, order=1") == {"product": 3.0, "order": 1.0}
+        with pytest.raises(ValueError):
+            parse_mix("nada=1")
+        with pytest.raises(ValueError):
+            parse_mix("product=x")
+        with pytest.raises(ValueError):
+            parse_mix("product=0")
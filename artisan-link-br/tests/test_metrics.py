@@ -0,0 +1,143 @@
+import threading
+import pytest
+import json
+from adapters.inbound.api import create_app
+from adapters.inbound.asgi import create_asgi_app
+from adapters.inbound.metrics import MetricsRegistry
+from tests.test_asgi import AUTH, asgi
+
+
+def samples(text):
+    """Parse Prometheus text into {series: value}, skipping comments"""
+    result = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            series, _, value = line.rpartition(" ")
+            result[series] = float(value)
+    return result
+
+
+def get(client, path):
+    """GET with buffered=True, so the test client closes the body like a WSGI server"""
+    return client.open(path, buffered=True)
+
+
+class TestMetricsRegistry:
+    def test_counter_gauge_and_histogram_text(self):
+        """Test the exposition format of each metric type"""
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs.", ("kind",))
+        counter.labels("a").inc()
+        counter.labels("a").inc(2)
+        counter.labels('b"\\').inc()
+        gauge = registry.gauge("queue_depth", "Depth.").labels()
+        gauge.inc(5)
+        gauge.dec(2)
+        histogram = registry.histogram("wait_seconds", "Wait.", ("kind",), (0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.labels("a").observe(value)
+
+        text = registry.render()
+        assert "# TYPE jobs_total counter" in text
+        assert "# TYPE wait_seconds histogram" in text
+        values = samples(text)
+        assert values['jobs_total{kind="a"}'] == 3
+        assert values['jobs_total{kind="b\\"\\\\"}'] == 1
+        assert values["queue_depth"] == 3
+        assert values['wait_seconds_bucket{kind="a",le="0.1"}'] == 2
+        assert values['wait_seconds_bucket{kind="a",le="1"}'] == 3
+        assert values['wait_seconds_bucket{kind="a",le="+Inf"}'] == 4
+        assert values['wait_seconds_count{kind="a"}'] == 4
+        assert values['wait_seconds_sum{kind="a"}'] == pytest.approx(3.65)
+
+    def test_counts_survive_finished_threads(self):
+        """Test that increments from many short-lived threads are all counted"""
+        registry = MetricsRegistry()
+        counter = registry.counter("hits_total", "Hits.").labels()
+        histogram = registry.histogram("latency_seconds", "Latency.").labels()
+
+        def work():
+            for _ in range(1000):
+                counter.inc()
+                histogram.observe(0.002)
+
+        for _ in range(3):
+            threads = [threading.Thread(target=work) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        values = samples(registry.render())
+        assert values["hits_total"] == 24_000
+        assert values["latency_seconds_count"] == 24_000
+
+    def test_label_count_is_checked(self):
+        """Test that a child with the wrong number of labels is refused"""
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs.", ("kind",))
+        with pytest.raises(ValueError):
+            counter.labels("a", "b")
+        with pytest.raises(ValueError):
+            registry.gauge("jobs_total", "Jobs.")
+
+
+class TestMetricsEndpoint:
+    def test_flask_request_and_repository_metrics(self):
+        """Test per-route, per-status and per-repository series after a few requests"""
+        client = create_app().test_client()
+        product = {"id": 1, "artisan_id": 1, "name": "Vaso", "description": "Vaso", "price": 50.0}
+        assert client.post("/products", json=product, buffered=True).status_code == 201
+        assert get(client, "/products/1").status_code == 200
+        assert get(client, "/products/2").status_code == 404
+        assert get(client, "/products").status_code == 200
+        assert get(client, "/nada").status_code == 404
+
+        response = get(client, "/metrics")
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain; version=0.0.4")
+        values = samples(response.get_data(as_text=True))
+        route = 'method="GET",route="/products/<int:product_id>"'
+        assert values[f'http_requests_total{{{route},status="200"}}'] == 1
+        assert values[f'http_requests_total{{{route},status="404"}}'] == 1
+        assert values['http_requests_total{method="GET",route="/products",status="200"}'] == 1
+        assert values['http_requests_total{method="GET",route="<unmatched>",status="404"}'] == 1
+        assert values[f'http_request_duration_seconds_count{{{route},status="200"}}'] == 1
+        # The /metrics request itself is still in flight
+        assert values["http_requests_in_flight"] == 1
+        assert values['repository_operation_duration_seconds_count{repository="products",operation="save"}'] == 1
+        assert values['repository_operation_duration_seconds_count{repository="products",operation="get_by_id"}'] >= 2
+
+    def test_flask_server_errors_are_counted(self):
+        """Test that unhandled exceptions count as 5xx errors"""
+        app = create_app()
+
+        @app.route("/boom")
+        def boom():
+            raise RuntimeError("boom")
+
+        client = app.test_client()
+        assert client.get("/boom", buffered=True).status_code == 500
+        values = samples(get(client, "/metrics").get_data(as_text=True))
+        assert values['http_request_errors_total{method="GET",route="/boom",status="500"}'] == 1
+        assert "http_request_errors_total" not in "".join(
+            series for series in values if "/metrics" in series
+        )
+
+    def test_asgi_metrics(self):
+        """Test that the ASGI adapter records the same route labels"""
+        app = create_asgi_app()
+        assert asgi(app, "GET", "/artisans")[0] == 200
+        assert asgi(app, "PUT", "/artisans/7", body=b"{}", headers={**AUTH, "Content-Type": "application/json"})[0] == 404
+        status, headers, body = asgi(app, "GET", "/metrics")
+        assert status == 200
+        assert headers["content-type"].startswith("text/plain; version=0.0.4")
+        values = samples(body.decode())
+        assert values['http_requests_total{method="GET",route="/artisans",status="200"}'] == 1
+        assert values['http_requests_total{method="PUT",route="/artisans/<int:artisan_id>",status="404"}'] == 1
+        assert values['repository_operation_duration_seconds_count{repository="artisans",operation="get_by_id"}'] == 1
+
+    def test_metrics_can_be_disabled(self):
+        """Test that METRICS_ENABLED=False removes the endpoint"""
+        client = create_app({"METRICS_ENABLED": False}).test_client()
+        assert get(client, "/metrics").status_code == 404
+        assert json.loads(get(client, "/products").data) == []
@@ -14,52 +14,108 @@ def client():
 AUTH_TOKEN = "Bearer meu-token-secreto"
 
 
+def create_product(client, product_id, price):
+    product_data = {
+        "id": product_id,
+        "artisan_id": 1,
+        "name": f"Produto {product_id}",
+        "description": "Peça de barro",
+        "price": price,
+    }
+    response = client.post(
+        "/products",
+        data=json.dumps(product_data),
+        content_type="application/json",
+        headers={"Authorization": AUTH_TOKEN},
+    )
+    assert response.status_code == 201
+
+
+def create_order(client, order_data):
+    return client.post(
+        "/orders",
+        data=json.dumps(order_data),
+        content_type="application/json",
+        headers={"Authorization": AUTH_TOKEN},
+    )
+
+
 class TestOrderAPI:
     def test_create_order(self, client):
-        """Test creating a new order"""
+        """Test creating a new order priced from the catalog"""
+        create_product(client, 1, 50.0)
         order_data = {
             "customer_id": 1,
             "products": [{"id": 1, "quantity": 2}],
-            "total": 100.0,
+            "total": 1.0,
         }
-        response = client.post(
-            "/orders",
-            data=json.dumps(order_data),
-            content_type="application/json",
-            headers={"Authorization": AUTH_TOKEN},
-        )
+        response = create_order(client, order_data)
         assert response.status_code == 201
         data = json.loads(response.data)
         assert data["customer_id"] == 1
+        # O total enviado pelo cliente é ignorado
         assert data["total"] == 100.0
 
     def test_create_order_missing_data(self, client):
         """Test creating an order with missing data"""
         order_data = {"customer_id": 1}
-        response = client.post(
-            "/orders",
-            data=json.dumps(order_data),
+        response = create_order(client, order_data)
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert "error" in data
+
+    def test_create_order_unknown_product(self, client):
+        """Test that an order for a product not in the catalog is refused"""
+        create_product(client, 1, 50.0)
+        order_data = {"customer_id": 1, "products": [{"id": 1}, {"id": 99}]}
+        response = create_order(client, order_data)
+        assert response.status_code == 400
+        assert "99" in json.loads(response.data)["error"]
+
+        order_data = {"customer_id": 1, "products": [{"id": 1, "quantity": 0}]}
+        assert create_order(client, order_data).status_code == 400
+
+    def test_create_order_rejects_non_integer_customer(self, client):
+        """Test that a non-integer customer_id is refused before anything is saved"""
+        create_product(client, 1, 50.0)
+        for customer_id in ({"a": 1}, [2], "7", 1.5):
+            order_data = {"customer_id": customer_id, "products": [{"id": 1}]}
+            response = create_order(client, order_data)
+            assert response.status_code == 400
+            assert "customer_id" in json.loads(response.data)["error"]
+
+        response = client.get(
+            "/analytics/orders/average-value", headers={"Authorization": AUTH_TOKEN}
+        )
+        assert json.loads(response.data)["orders"] == 0
+
+    def test_update_order_rejects_non_integer_customer(self, client):
+        """Test that PUT refuses a non-integer customer_id and keeps the order as it was"""
+        create_product(client, 1, 50.0)
+        create_order(client, {"customer_id": 1, "products": [{"id": 1}]})
+
+        response = client.put(
+            "/orders/1",
+            data=json.dumps({"customer_id": {"a": 1}}),
             content_type="application/json",
             headers={"Authorization": AUTH_TOKEN},
         )
         assert response.status_code == 400
-        data = json.loads(response.data)
-        assert "error" in data
+        response = client.get("/orders/1", headers={"Authorization": AUTH_TOKEN})
+        assert json.loads(response.data)["customer_id"] == 1
+        response = client.get(
+            "/analytics/orders/average-value", headers={"Authorization": AUTH_TOKEN}
+        )
+        assert json.loads(response.data)["orders"] == 1
 
     def test_get_order(self, client):
-        """Test getting an order by ID"""
-        # First create an order
+        """Test getting an order by ID with its lines hydrated from the catalog"""
+        create_product(client, 1, 50.0)
         order_data = {
             "customer_id": 1,
             "products": [{"id": 1, "quantity": 2}],
-            "total": 100.0,
         }
-        response = client.post(
-            "/orders",
-            data=json.dumps(order_data),
-            content_type="application/json",
-            headers={"Authorization": AUTH_TOKEN},
-        )
+        response = create_order(client, order_data)
         assert response.status_code == 201
         data = json.loads(response.data)
         order_id = data["id"]
@@ -72,27 +128,23 @@ class TestOrderAPI:
         data = json.loads(response.data)
         assert data["customer_id"] == 1
         assert data["total"] == 100.0
+        assert data["lines"][0]["product"]["name"] == "Produto 1"
 
     def test_update_order(self, client):
-        """Test updating an existing order"""
-        # First create an order
+        """Test updating the items of an existing order"""
+        create_product(client, 1, 50.0)
+        create_product(client, 2, 30.0)
         order_data = {
             "customer_id": 1,
             "products": [{"id": 1, "quantity": 2}],
-            "total": 100.0,
         }
-        response = client.post(
-            "/orders",
-            data=json.dumps(order_data),
-            content_type="application/json",
-            headers={"Authorization": AUTH_TOKEN},
-        )
+        response = create_order(client, order_data)
         assert response.status_code == 201
         data = json.loads(response.data)
         order_id = data["id"]
 
         # Then update the order
-        update_data = {"total": 120.0}
+        update_data = {"products": [{"id": 1}, {"id": 2, "quantity": 2}]}
         response = client.put(
             f"/orders/{order_id}",
             data=json.dumps(update_data),
@@ -101,22 +153,23 @@ class TestOrderAPI:
         )
         assert response.status_code == 200
         data = json.loads(response.data)
-        assert data["total"] == 120.0
+        assert data["total"] == 110.0
+
+        response = client.get(
+            f"/orders/{order_id}", headers={"Authorization": AUTH_TOKEN}
+        )
+        lines = json.loads(response.data)["lines"]
+        assert [(line["product_id"], line["quantity"]) for line in lines] == [(1, 1), (2, 2)]
+        assert lines[1]["unit_price"] == 30.0
 
     def test_delete_order(self, client):
         """Test deleting an existing order"""
-        # First create an order
+        create_product(client, 1, 50.0)
         order_data = {
             "customer_id": 1,
             "products": [{"id": 1, "quantity": 2}],
-            "total": 100.0,
         }
-        response = client.post(
-            "/orders",
-            data=json.dumps(order_data),
-            content_type="application/json",
-            headers={"Authorization": AUTH_TOKEN},
-        )
+        response = create_order(client, order_data)
         assert response.status_code == 201
         data = json.loads(response.data)
         order_id = data["id"]
@@ -130,6 +183,87 @@ class TestOrderAPI:
         assert "message" in data
 
 
+def create_batch(client, orders, headers=None):
+    return client.post(
+        "/orders/batch",
+        data=json.dumps({"orders": orders}),
+        content_type="application/json",
+        headers={"Authorization": AUTH_TOKEN} if headers is None else headers,
+    )
+
+
+class TestOrderBatchAPI:
+    def test_create_batch(self, client):
+        """Test that a batch gets a contiguous block of ids and server-side totals"""
+        create_product(client, 1, 50.0)
+        create_product(client, 2, 30.0)
+        create_order(client, {"customer_id": 1, "products": [{"id": 1}]})
+        orders = [
+            {"customer_id": 2, "products": [{"id": 1, "quantity": 2}]},
+            {"customer_id": 3, "products": [{"id": 2}, {"id": 1}], "total": 1.0},
+            {"customer_id": 4, "products": [{"id": 2, "quantity": 3}]},
+        ]
+        response = create_batch(client, orders)
+        assert response.status_code == 201
+        data = json.loads(response.data)
+        assert data["created"] == 3
+        assert [(o["id"], o["customer_id"], o["total"]) for o in data["orders"]] == [
+            (2, 2, 100.0),
+            (3, 3, 80.0),
+            (4, 4, 90.0),
+        ]
+
+        response = client.get("/orders/3", headers={"Authorization": AUTH_TOKEN})
+        assert [line["product_id"] for line in json.loads(response.data)["lines"]] == [2, 1]
+
+    def test_invalid_order_rejects_whole_batch(self, client):
+        """Test that one bad order reports per-order errors and creates nothing"""
+        create_product(client, 1, 50.0)
+        orders = [
+            {"customer_id": 1, "products": [{"id": 1}]},
+            {"customer_id": 2, "products": [{"id": 99}]},
+            {"customer_id": 3, "products": [{"id": 1}]},
+        ]
+        response = create_batch(client, orders)
+        assert response.status_code == 400
+        errors = json.loads(response.data)["errors"]
+        assert [error["index"] for error in errors] == [1]
+        assert "99" in errors[0]["error"]
+
+        response = create_batch(client, [{"customer_id": 1}, "pedido", orders[0]])
+        assert response.status_code == 400
+        assert [e["index"] for e in json.loads(response.data)["errors"]] == [0, 1]
+
+        for order_id in (1, 2, 3):
+            response = client.get(f"/orders/{order_id}", headers={"Authorization": AUTH_TOKEN})
+            assert response.status_code == 404
+
+    def test_malformed_customer_rejects_whole_batch(self, client):
+        """Test that a non-integer customer_id fails the batch with 400 and creates nothing"""
+        create_product(client, 1, 50.0)
+        orders = [
+            {"customer_id": 1, "products": [{"id": 1}]},
+            {"customer_id": [2], "products": [{"id": 1}]},
+            {"customer_id": 3, "products": [{"id": 1}]},
+        ]
+        response = create_batch(client, orders)
+        assert response.status_code == 400
+        assert [e["index"] for e in json.loads(response.data)["errors"]] == [1]
+        response = client.get(
+            "/analytics/orders/average-value", headers={"Authorization": AUTH_TOKEN}
+        )
+        assert json.loads(response.data)["orders"] == 0
+
+    def test_batch_limits_and_auth(self, client):
+        """Test empty, oversized and unauthenticated batches"""
+        create_product(client, 1, 50.0)
+        order = {"customer_id": 1, "products": [{"id": 1}]}
+        assert create_batch(client, []).status_code == 400
+        assert create_batch(client, [order] * 1001).status_code == 400
+        assert create_batch(client, [order], headers={}).status_code == 401
+        assert create_batch(client, [order] * 1000).status_code == 201
+
+
 class TestReviewAPI:
     def test_create_review(self, client):
         """Test creating a new review"""
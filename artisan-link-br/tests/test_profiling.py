@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+import pytest
+from adapters.inbound.api import create_app
+from adapters.inbound.profiling import (
+    PROFILE_HEADER,
+    SamplingProfiler,
+    sign_profile_request,
+    verify_profile_request,
+)
+
+SECRET = "segredo-de-teste"
+
+
+def profiled_app(tmp_path, **config):
+    app = create_app(
+        {
+            "PROFILER_ENABLED": True,
+            "PROFILER_DIR": str(tmp_path),
+            "PROFILER_INTERVAL": 0.001,
+            "PROFILER_SAMPLE_EVERY": 0,
+            "PROFILER_SECRET": SECRET,
+            **config,
+        }
+    )
+
+    @app.route("/slow/<int:ms>")
+    def slow(ms):
+        deadline = time.perf_counter() + ms / 1000
+        while time.perf_counter() < deadline:
+            pass
+        return {"ok": True}
+
+    return app
+
+
+def get(client, path, headers=None):
+    """GET with buffered=True, so the test client closes the body like a WSGI server"""
+    return client.open(path, headers=headers, buffered=True)
+
+
+def profile_files(tmp_path):
+    return sorted(name for name in os.listdir(tmp_path))
+
+
+class TestSignedHeader:
+    def test_signature_and_expiry(self):
+        """Test that only unexpired values signed with the secret are accepted"""
+        value = sign_profile_request(SECRET, 2000)
+        assert verify_profile_request(SECRET, value, now=1999)
+        assert not verify_profile_request(SECRET, value, now=2001)
+        assert not verify_profile_request("outro", value, now=1999)
+        assert not verify_profile_request(SECRET, "2000.abc", now=1999)
+        assert not verify_profile_request(SECRET, "lixo", now=1999)
+
+
+class TestProfilingMiddleware:
+    def test_sampled_request_writes_collapsed_stacks(self, tmp_path):
+        """Test that 1-in-N sampling writes stacks under the route rule"""
+        client = profiled_app(tmp_path, PROFILER_SAMPLE_EVERY=2).test_client()
+        assert get(client, "/slow/60").status_code == 200
+        assert profile_files(tmp_path) == []
+        assert get(client, "/slow/60").status_code == 200
+        assert profile_files(tmp_path) == ["GET_slow_int_ms.collapsed"]
+
+        lines = (tmp_path / "GET_slow_int_ms.collapsed").read_text().splitlines()
+        assert lines
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+        assert any("slow (" in line and "test_profiling.py:" in line for line in lines)
+        # A busy thread yields the GIL every sys.getswitchinterval() (5 ms)
+        assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) >= 2
+
+    def test_signed_header_forces_profile(self, tmp_path):
+        """Test that only a valid signed header profiles when sampling is off"""
+        client = profiled_app(tmp_path).test_client()
+        get(client, "/slow/20")
+        get(client, "/slow/20", {PROFILE_HEADER: sign_profile_request("outro", 2**40)})
+        get(client, "/slow/20", {PROFILE_HEADER: sign_profile_request(SECRET, 1)})
+        assert profile_files(tmp_path) == []
+        get(client, "/slow/20", {PROFILE_HEADER: sign_profile_request(SECRET, 2**40)})
+        assert profile_files(tmp_path) == ["GET_slow_int_ms.collapsed"]
+
+    def test_disabled_by_default(self, tmp_path):
+        """Test that the default config does not profile"""
+        app = create_app({"PROFILER_DIR": str(tmp_path)})
+        client = app.test_client()
+        get(client, "/products", {PROFILE_HEADER: sign_profile_request(SECRET, 2**40)})
+        assert profile_files(tmp_path) == []
+
+
+class TestRotation:
+    def test_files_rotate_and_are_capped(self, tmp_path):
+        """Test that route files rotate past the size cap and old ones are dropped"""
+        profiler = SamplingProfiler(str(tmp_path), max_file_bytes=100, max_files=2)
+        for i in range(6):
+            session = profiler.start()
+            session.samples[f"a;b;c{i};" * 8] += 1
+            profiler.stop(session, "GET", "/products")
+        profiler.close()
+        assert profile_files(tmp_path) == [
+            "GET_products.collapsed",
+            "GET_products.collapsed.1",
+            "GET_products.collapsed.2",
+        ]
+        assert "c5" in (tmp_path / "GET_products.collapsed").read_text()
+        assert "c4" in (tmp_path / "GET_products.collapsed.1").read_text()
+
+    def test_sampler_does_not_count_after_stop(self, tmp_path, monkeypatch):
+        """Test that a sample taken while stop() runs is not added to the stopped session"""
+        profiler = SamplingProfiler(str(tmp_path), interval=0.001)
+        collapsing, stopped = threading.Event(), threading.Event()
+
+        def slow_collapse(frame):
+            collapsing.set()
+            stopped.wait(5)
+            return "a;b"
+
+        monkeypatch.setattr(profiler, "_collapse", slow_collapse)
+        session = profiler.start()
+        assert collapsing.wait(5)
+        profiler.stop(session, "GET", "/products")
+        stopped.set()
+        profiler.close()
+        assert not session.samples
+        assert profile_files(tmp_path) == []
+
+    def test_invalid_interval(self, tmp_path):
+        """Test that a non-positive sampling interval is refused"""
+        with pytest.raises(ValueError):
+            SamplingProfiler(str(tmp_path), interval=0)
@@ -0,0 +1,168 @@
+import pytest
+import json
+from core.entities import Review
+from core.ratings import RatingAggregates
+from core.services import ReviewService
+from adapters.inbound.api import create_app
+from adapters.outbound.repository import ReviewRepository
+
+
+AUTH_TOKEN = "Bearer meu-token-secreto"
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def review(id, product_id, rating):
+    return Review(id=id, product_id=product_id, customer_id=1, rating=rating, comment="")
+
+
+class TestRatingAggregates:
+    def test_saved_updated_and_deleted(self):
+        """Test count, sum, mean and histogram across review writes"""
+        ratings = RatingAggregates()
+        ratings.saved(review(1, 1, 5))
+        ratings.saved(review(2, 1, 3))
+        ratings.saved(review(2, 1, 4), previous=review(2, 1, 3))
+
+        summary = ratings.get(1)
+        assert (summary.count, summary.total, summary.mean) == (2, 9, 4.5)
+        assert summary.histogram == [0, 0, 0, 1, 1]
+
+        ratings.deleted(review(1, 1, 5))
+        ratings.deleted(review(2, 1, 4))
+        summary = ratings.get(1)
+        assert (summary.count, summary.total, summary.mean) == (0, 0, None)
+        assert summary.histogram == [0, 0, 0, 0, 0]
+
+    def test_review_moved_between_products(self):
+        """Test that an update changing product_id moves the rating"""
+        ratings = RatingAggregates()
+        ratings.saved(review(1, 1, 2))
+        ratings.saved(review(1, 2, 2), previous=review(1, 1, 2))
+
+        assert ratings.get(1).count == 0
+        assert ratings.get(2).count == 1
+
+    def test_failed_update_leaves_aggregate_unchanged(self):
+        """Test that a rating that cannot be applied does not touch the aggregate"""
+        ratings = RatingAggregates()
+        ratings.saved(review(1, 1, 3))
+        broken = review(1, 1, 3)
+        broken.rating = 4.5
+
+        with pytest.raises(TypeError):
+            ratings.saved(broken, previous=review(1, 1, 3))
+
+        summary = ratings.get(1)
+        assert (summary.count, summary.total) == (1, 3)
+        assert summary.histogram == [0, 0, 1, 0, 0]
+
+
+class TestReviewServiceRatings:
+    def test_service_keeps_aggregates(self, review_repository):
+        """Test that the service rebuilds from the repository and follows writes"""
+        review_repository.save(review(1, 7, 1))
+        service = ReviewService(review_repository)
+        service.add_review(review(2, 7, 5))
+        service.update_review(review(1, 7, 3))
+
+        summary = service.get_product_rating(7)
+        assert (summary.count, summary.mean) == (2, 4.0)
+
+        version = service.ratings_version()
+        service.delete_review(2)
+        assert service.get_product_rating(7).histogram == [0, 0, 1, 0, 0]
+        assert service.ratings_version() > version
+
+
+class TestRatingAPI:
+    def _seed(self, client):
+        product_data = {
+            "id": 1,
+            "artisan_id": 1,
+            "name": "Vaso",
+            "description": "Feito à mão",
+            "price": 10.0,
+        }
+        client.post("/products", data=json.dumps(product_data), content_type="application/json")
+
+    def _review(self, client, rating):
+        return client.post(
+            "/reviews",
+            data=json.dumps({"product_id": 1, "customer_id": 1, "rating": rating, "comment": "ok"}),
+            content_type="application/json",
+            headers={"Authorization": AUTH_TOKEN},
+        )
+
+    def test_get_product_rating(self, client):
+        """Test GET /products/<id>/rating after creating and updating reviews"""
+        self._seed(client)
+        self._review(client, 4)
+        review_id = json.loads(self._review(client, 2).data)["id"]
+        client.put(
+            f"/reviews/{review_id}",
+            data=json.dumps({"rating": 5}),
+            content_type="application/json",
+            headers={"Authorization": AUTH_TOKEN},
+        )
+
+        response = client.get("/products/1/rating")
+
+        assert response.status_code == 200
+        assert json.loads(response.data) == {
+            "product_id": 1,
+            "count": 2,
+            "sum": 9,
+            "mean": 4.5,
+            "histogram": {"1": 0, "2": 0, "3": 0, "4": 1, "5": 1},
+        }
+
+    def test_fractional_rating_is_rejected(self, client):
+        """Test that a 4.5 rating returns 400 and leaves the rating untouched"""
+        self._seed(client)
+        review_id = json.loads(self._review(client, 4).data)["id"]
+        client.get("/products/1/rating")
+
+        response = self._review(client, 4.5)
+        assert response.status_code == 400
+        response = client.put(
+            f"/reviews/{review_id}",
+            data=json.dumps({"rating": 4.5}),
+            content_type="application/json",
+            headers={"Authorization": AUTH_TOKEN},
+        )
+        assert response.status_code == 400
+
+        data = json.loads(client.get("/products/1/rating").data)
+        assert (data["count"], data["sum"]) == (1, 4)
+        response = client.delete(
+            f"/reviews/{review_id}", headers={"Authorization": AUTH_TOKEN}
+        )
+        assert response.status_code == 200
+
+    def test_rating_missing_product(self, client):
+        """Test GET /products/<id>/rating for an unknown product"""
+        response = client.get("/products/99/rating")
+
+        assert response.status_code == 404
+
+    def test_listings_embed_rating_and_refresh(self, client):
+        """Test that cached listings pick up review writes"""
+        self._seed(client)
+        data = json.loads(client.get("/products").data)
+        assert data[0]["rating"] == {"count": 0, "mean": None}
+        etag = client.get("/products").headers["ETag"]
+
+        self._review(client, 3)
+
+        response = client.get("/products", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert json.loads(response.data)[0]["rating"] == {"count": 1, "mean": 3.0}
+        data = json.loads(client.get("/artisans/1/products").data)
+        assert data[0]["rating"] == {"count": 1, "mean": 3.0}
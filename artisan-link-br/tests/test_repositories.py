@@ -1,6 +1,7 @@
+import math
 import pytest
-from core.entities import Product, Order, Review
-from adapters.outbound.repository import ProductRepository, OrderRepository, ReviewRepository
+from core.entities import Artisan, Product, Order, OrderLine, Review
+from adapters.outbound.repository import ArtisanRepository, ProductRepository, OrderRepository, ReviewRepository
 
 class TestProductRepository:
     def test_save_product(self, product_repository):
@@ -37,17 +38,212 @@ class TestProductRepository:
         assert product1 in products
         assert product2 in products
 
+    def test_get_by_id(self, product_repository):
+        """Test fetching a product through the id index"""
+        product = Product(id=7, artisan_id=1, name="Vaso", description="Vaso", price=50.0)
+        product_repository.save(product)
+
+        assert product_repository.get_by_id(7) == product
+        assert product_repository.get_by_id(99) is None
+
+    def test_get_many_skips_missing_ids(self, product_repository):
+        """Test batched lookup keeps the requested order and ignores unknown ids"""
+        product1 = Product(id=1, artisan_id=1, name="Vaso", description="Vaso", price=50.0)
+        product2 = Product(id=2, artisan_id=1, name="Prato", description="Prato", price=30.0)
+        product_repository.save(product1)
+        product_repository.save(product2)
+
+        assert product_repository.get_many([2, 99, 1]) == [product2, product1]
+
+    def test_list_by_artisan(self, product_repository):
+        """Test listing products through the artisan index"""
+        product1 = Product(id=1, artisan_id=1, name="Vaso", description="Vaso", price=50.0)
+        product2 = Product(id=2, artisan_id=2, name="Prato", description="Prato", price=30.0)
+        product_repository.save(product1)
+        product_repository.save(product2)
+
+        assert product_repository.list_by_artisan(1) == [product1]
+        assert product_repository.list_by_artisan(3) == []
+
+    def test_update_moves_product_between_artisans(self, product_repository):
+        """Test that updating artisan_id keeps the artisan index consistent"""
+        product_repository.save(Product(id=1, artisan_id=1, name="Vaso", description="Vaso", price=50.0))
+        moved = Product(id=1, artisan_id=2, name="Vaso", description="Vaso", price=55.0)
+
+        assert product_repository.update(moved) is True
+        assert product_repository.list_by_artisan(1) == []
+        assert product_repository.list_by_artisan(2) == [moved]
+        assert product_repository.get_by_id(1).price == 55.0
+
+    def test_update_missing_product(self, product_repository):
+        """Test updating a product that does not exist"""
+        product = Product(id=1, artisan_id=1, name="Vaso", description="Vaso", price=50.0)
+        assert product_repository.update(product) is False
+
+    def test_delete_product(self, product_repository):
+        """Test deleting a product removes it from every index"""
+        product_repository.save(Product(id=1, artisan_id=1, name="Vaso", description="Vaso", price=50.0))
+
+        assert product_repository.delete(1) is True
+        assert product_repository.get_by_id(1) is None
+        assert product_repository.list_by_artisan(1) == []
+        assert product_repository.delete(1) is False
+
+    def test_list_page_orders_by_id(self, product_repository):
+        """Test keyset pages come back in id order regardless of insertion order"""
+        for product_id in [5, 1, 3, 2]:
+            product_repository.save(
+                Product(id=product_id, artisan_id=1, name="P", description="P", price=1.0)
+            )
+        product_repository.delete(3)
+
+        assert [p.id for p in product_repository.list_page(None, 2)] == [1, 2]
+        assert [p.id for p in product_repository.list_page(2, 2)] == [5]
+        assert product_repository.list_page(5, 2) == []
+
+    def test_save_many(self, product_repository):
+        """Test bulk saving keeps every index consistent, including repeated ids"""
+        product_repository.save(Product(id=2, artisan_id=1, name="Antigo", description="P", price=1.0))
+
+        product_repository.save_many(
+            [
+                Product(id=3, artisan_id=1, name="P3", description="P", price=1.0),
+                Product(id=1, artisan_id=2, name="P1", description="P", price=1.0),
+                Product(id=2, artisan_id=2, name="Novo", description="P", price=1.0),
+                Product(id=3, artisan_id=2, name="P3b", description="P", price=1.0),
+            ]
+        )
+
+        assert [p.id for p in product_repository.list_page(None, 10)] == [1, 2, 3]
+        assert product_repository.list_by_artisan(1) == []
+        assert sorted(p.id for p in product_repository.list_by_artisan(2)) == [1, 2, 3]
+        assert product_repository.get_by_id(3).name == "P3b"
+        product_repository.delete(3)
+        assert [p.id for p in product_repository.list_page(None, 10)] == [1, 2]
+
+    def test_failed_save_leaves_indexes_consistent(self, product_repository):
+        """Test that a product the indexes cannot sort is not stored"""
+        product_repository.save(Product(id=1, artisan_id=1, name="P1", description="P", price=1.0))
+
+        with pytest.raises(TypeError):
+            product_repository.save(Product(id="2", artisan_id=1, name="P2", description="P", price=2.0))
+
+        assert product_repository.get_by_id("2") is None
+        assert [p.id for p in product_repository.list_by_artisan(1)] == [1]
+        assert [p.id for p in product_repository.list_page(None, 10)] == [1]
+        assert [p.id for p in product_repository.list_by_price(0.0, 10.0, False, None, 10)] == [1]
+
+    def test_failed_save_many_leaves_products_unchanged(self, product_repository):
+        """Test that a batch the indexes cannot sort is not stored"""
+        product_repository.save(Product(id=1, artisan_id=1, name="P1", description="P", price=1.0))
+
+        with pytest.raises(TypeError):
+            product_repository.save_many(
+                [
+                    Product(id=2, artisan_id=1, name="P2", description="P", price=2.0),
+                    Product(id="3", artisan_id=1, name="P3", description="P", price=3.0),
+                ]
+            )
+
+        assert product_repository.get_by_id(2) is None
+        assert [p.id for p in product_repository.list_all()] == [1]
+        assert [p.id for p in product_repository.list_by_artisan(1)] == [1]
+        assert [p.id for p in product_repository.list_page(None, 10)] == [1]
+
+    def test_list_by_price(self, product_repository):
+        """Test price range, both directions and the (price, id) cursor"""
+        for product_id, price in [(1, 30.0), (2, 10.0), (3, 20.0), (4, 20.0), (5, 50.0)]:
+            product_repository.save(
+                Product(id=product_id, artisan_id=1, name="P", description="P", price=price)
+            )
+        product_repository.update(Product(id=5, artisan_id=1, name="P", description="P", price=15.0))
+        product_repository.delete(1)
+
+        def ids(*args):
+            return [p.id for p in product_repository.list_by_price(*args)]
+
+        assert ids(-math.inf, math.inf, False, None, 10) == [2, 5, 3, 4]
+        assert ids(15.0, 20.0, False, None, 10) == [5, 3, 4]
+        assert ids(15.0, 20.0, False, (20.0, 3), 10) == [4]
+        assert ids(-math.inf, math.inf, True, None, 2) == [4, 3]
+        assert ids(-math.inf, math.inf, True, (20.0, 3), 10) == [5, 2]
+        assert ids(100.0, math.inf, False, None, 10) == []
+
+    def test_version_bumps_on_every_write(self, product_repository):
+        """Test that the collection version only grows on writes"""
+        product = Product(id=1, artisan_id=1, name="Vaso", description="Vaso", price=50.0)
+        versions = [product_repository.version()]
+
+        product_repository.save(product)
+        versions.append(product_repository.version())
+        product_repository.get_by_id(1)
+        product_repository.list_all()
+        assert product_repository.version() == versions[-1]
+
+        product_repository.update(product)
+        versions.append(product_repository.version())
+        product_repository.save_many([product])
+        versions.append(product_repository.version())
+        product_repository.delete(1)
+        versions.append(product_repository.version())
+
+        assert versions == sorted(set(versions))
+
+class TestArtisanRepository:
+    def test_get_by_email_is_case_insensitive(self, artisan_repository):
+        """Test lookups through the normalized email index"""
+        artisan = Artisan(id=1, name="João", email="Joao@Email.com")
+        artisan_repository.save(artisan)
+
+        assert artisan_repository.get_by_email("joao@email.com") == artisan
+        assert artisan_repository.get_by_email(" JOAO@EMAIL.COM ") == artisan
+        assert artisan_repository.get_by_email("maria@email.com") is None
+
+    def test_save_duplicate_email(self, artisan_repository):
+        """Test that the unique index rejects an email owned by another artisan"""
+        artisan_repository.save(Artisan(id=1, name="João", email="joao@email.com"))
+
+        with pytest.raises(ValueError):
+            artisan_repository.save(Artisan(id=2, name="Outro", email="JOAO@email.com"))
+        assert artisan_repository.count() == 1
+
+    def test_update_email_releases_old_email(self, artisan_repository):
+        """Test that changing an email frees the previous index entry"""
+        artisan_repository.save(Artisan(id=1, name="João", email="joao@email.com"))
+
+        assert artisan_repository.update(Artisan(id=1, name="João", email="novo@email.com"))
+        assert artisan_repository.get_by_email("joao@email.com") is None
+
+        artisan_repository.save(Artisan(id=2, name="Maria", email="joao@email.com"))
+        assert artisan_repository.get_by_email("joao@email.com").id == 2
+
+    def test_delete_releases_email(self, artisan_repository):
+        """Test that deleting an artisan frees its email"""
+        artisan_repository.save(Artisan(id=1, name="João", email="joao@email.com"))
+
+        assert artisan_repository.delete(1) is True
+        assert artisan_repository.get_by_email("joao@email.com") is None
+        assert artisan_repository.delete(1) is False
+
 class TestOrderRepository:
     def test_save_order(self, order_repository):
         """Test saving an order to repository"""
-        products = [
-            Product(id=1, artisan_id=1, name="Vaso", description="Vaso", price=50.0)
-        ]
-        order = Order(id=1, customer_id=1, products=products, total=50.0)
+        lines = [OrderLine(product_id=1, quantity=1, unit_price=50.0)]
+        order = Order(id=1, customer_id=1, lines=lines, total=50.0)
         
         order_repository.save(order)
-        # Vamos implementar list_all para orders depois - TDD approach
-        assert True  # Placeholder
+        assert order_repository.get_by_id(1) == order
+
+    def test_save_many_and_id_blocks(self, order_repository):
+        """Test reserving a block of ids and saving a batch of orders"""
+        assert order_repository.next_id() == 1
+        ids = order_repository.next_ids(3)
+        assert list(ids) == [2, 3, 4]
+        orders = [Order(id=i, customer_id=i, lines=[], total=0.0) for i in ids]
+
+        order_repository.save_many(orders)
+        assert order_repository.list_page(None, 10) == orders
+        assert order_repository.next_id() == 5
 
 class TestReviewRepository:
     def test_save_review(self, review_repository):
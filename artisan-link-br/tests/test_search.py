@@ -0,0 +1,184 @@
+import pytest
+import json
+from core.entities import Product
+from core.search import ProductSearchIndex, analyze
+from core.services import ProductService
+from adapters.inbound.api import create_app
+from adapters.outbound.repository import ProductRepository
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def product(id, name, description="", artisan_id=1):
+    return Product(
+        id=id, artisan_id=artisan_id, name=name, description=description, price=10.0
+    )
+
+
+class TestAnalyzer:
+    def test_accents_case_and_stopwords(self):
+        """Test that accents and case are folded and stopwords dropped"""
+        assert analyze("Vaso de CERÂMICA") == analyze("vaso ceramica")
+        assert "de" not in analyze("Vaso de cerâmica")
+
+    def test_plural_and_gender_share_a_stem(self):
+        """Test that the light stemmer joins common Portuguese inflections"""
+        assert analyze("corações") == analyze("coração")
+        assert analyze("colares") == analyze("colar")
+        assert analyze("bonecas") == analyze("boneco")
+        assert analyze("cestinha") == analyze("cesta")
+
+
+class TestProductSearchIndex:
+    def test_ranks_name_matches_first(self):
+        """Test that a term in the name outweighs the same term in the description"""
+        index = ProductSearchIndex()
+        index.add(product(1, "Cesto de palha", "Combina com vasos"))
+        index.add(product(2, "Vaso de cerâmica", "Feito à mão"))
+        index.add(product(3, "Rede de algodão", "Tingida"))
+
+        hits = index.search("vaso", 10)
+
+        assert [pid for pid, _ in hits] == [2, 1]
+
+    def test_top_k_limit(self):
+        """Test that only the best k hits are returned"""
+        index = ProductSearchIndex()
+        for i in range(1, 21):
+            index.add(product(i, "Colar", "sementes " * (i % 5 + 1)))
+
+        assert len(index.search("colar sementes", 5)) == 5
+
+    def test_update_and_remove_are_incremental(self):
+        """Test that re-adding replaces old terms and removal drops postings"""
+        index = ProductSearchIndex()
+        index.add(product(1, "Vaso azul"))
+        index.add(product(1, "Prato verde"))
+
+        assert index.search("vaso", 10) == []
+        assert [pid for pid, _ in index.search("prato", 10)] == [1]
+
+        index.remove(1)
+        assert index.search("prato", 10) == []
+        assert len(index) == 0
+
+    def test_catalog_with_only_stopwords(self):
+        """Test that a catalog without indexed terms returns no hits instead of failing"""
+        index = ProductSearchIndex()
+        index.add(product(1, "de"))
+
+        assert index.search("vaso", 10) == []
+        assert index.search("de", 10) == []
+
+    def test_compaction_keeps_rankings(self):
+        """Test that results survive the compaction triggered by many removals"""
+        products = [
+            product(i, "Vaso" if i % 3 else "Prato", "sementes " * (i % 4 + 1))
+            for i in range(1, 3001)
+        ]
+        index = ProductSearchIndex()
+        for p in products:
+            index.add(p)
+        for i in range(1, 2001):
+            index.remove(i)
+        index.add(product(1, "Prato azul"))
+        fresh = ProductSearchIndex()
+        for p in [product(1, "Prato azul")] + products[2000:]:
+            fresh.add(p)
+
+        hits = index.search("prato sementes", 50)
+
+        assert len(index) == 1001
+        assert [pid for pid, _ in hits] == [pid for pid, _ in fresh.search("prato sementes", 50)]
+        assert {pid for pid, _ in index.search("prato", 1000)} == {1} | {
+            i for i in range(2001, 3001) if i % 3 == 0
+        }
+
+
+class TestSearchService:
+    def test_index_follows_service_writes(self):
+        """Test that the index tracks add, update and delete through events"""
+        service = ProductService(ProductRepository())
+        service.add_product(product(1, "Vaso de cerâmica"))
+        service.add_products([product(2, "Cesto de palha"), product(3, "Vaso de barro")])
+
+        assert {p.id for p, _ in service.search_products("vasos")} == {1, 3}
+
+        service.update_product(product(3, "Prato de barro"))
+        service.delete_product(1)
+
+        assert service.search_products("vaso") == []
+        assert [p.id for p, _ in service.search_products("pratos")] == [3]
+
+    def test_builds_from_existing_catalog(self):
+        """Test that products already in the repository are searchable"""
+        repo = ProductRepository()
+        repo.save(product(1, "Rede de algodão"))
+
+        service = ProductService(repo)
+
+        assert [p.id for p, _ in service.search_products("redes")] == [1]
+
+    def test_empty_query_is_rejected(self):
+        """Test that a blank query raises ValueError"""
+        service = ProductService(ProductRepository())
+
+        with pytest.raises(ValueError):
+            service.search_products("   ")
+
+
+class TestSearchAPI:
+    def test_search_products(self, client):
+        """Test GET /products/search returns ranked products with scores"""
+        for data in [
+            {"id": 1, "name": "Vaso de Cerâmica", "description": "Feito à mão"},
+            {"id": 2, "name": "Cesto", "description": "Ótimo para vasos"},
+            {"id": 3, "name": "Rede", "description": "Algodão"},
+        ]:
+            client.post(
+                "/products",
+                data=json.dumps({**data, "artisan_id": 1, "price": 20.0}),
+                content_type="application/json",
+            )
+
+        response = client.get("/products/search?q=vasos%20ceramica")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [item["id"] for item in data] == [1, 2]
+        assert data[0]["name"] == "Vaso de Cerâmica"
+        assert data[0]["score"] > data[1]["score"]
+
+    def test_search_catalog_with_only_stopwords(self, client):
+        """Test GET /products/search on a catalog whose names are all stopwords returns 200"""
+        client.post(
+            "/products",
+            data=json.dumps(
+                {"id": 1, "artisan_id": 1, "name": "de", "description": "", "price": 20.0}
+            ),
+            content_type="application/json",
+        )
+
+        response = client.get("/products/search?q=vaso")
+
+        assert response.status_code == 200
+        assert json.loads(response.data) == []
+
+    def test_search_requires_query(self, client):
+        """Test GET /products/search without q returns 400"""
+        response = client.get("/products/search")
+
+        assert response.status_code == 400
+        assert json.loads(response.data)["error"] == "O parâmetro q é obrigatório."
+
+    def test_search_invalid_limit(self, client):
+        """Test GET /products/search with an out-of-range limit returns 400"""
+        response = client.get("/products/search?q=vaso&limit=0")
+
+        assert response.status_code == 400
@@ -0,0 +1,78 @@
+import pytest
+import json
+from core.entities import Artisan, Product, Order, OrderLine, Review
+from adapters.inbound.api import create_app
+from adapters.inbound.serialization import (
+    FastJSONProvider,
+    artisan_to_dict,
+    dumps_bytes,
+    order_summary_to_dict,
+    order_to_dict,
+    product_to_dict,
+    review_to_dict,
+)
+
+
+class TestEntityEncoders:
+    def test_product_to_dict(self):
+        """Test the precompiled product encoder"""
+        product = Product(id=1, artisan_id=2, name="Vaso", description="Vaso", price=50.0)
+
+        assert product_to_dict(product) == {
+            "id": 1,
+            "artisan_id": 2,
+            "name": "Vaso",
+            "description": "Vaso",
+            "price": 50.0,
+        }
+
+    def test_order_to_dict(self):
+        """Test that order lines embed the current product, or None if it is gone"""
+        product = Product(id=1, artisan_id=2, name="Vaso", description="Vaso", price=60.0)
+        lines = [OrderLine(1, 2, 50.0), OrderLine(9, 1, 10.0)]
+        order = Order(id=3, customer_id=4, lines=lines, total=110.0)
+
+        assert order_to_dict(order, {1: product}) == {
+            "id": 3,
+            "customer_id": 4,
+            "lines": [
+                {"product_id": 1, "quantity": 2, "unit_price": 50.0, "product": product_to_dict(product)},
+                {"product_id": 9, "quantity": 1, "unit_price": 10.0, "product": None},
+            ],
+            "total": 110.0,
+        }
+        assert order_summary_to_dict(order) == {"id": 3, "customer_id": 4, "total": 110.0}
+
+    def test_artisan_and_review_to_dict(self):
+        """Test the artisan and review encoders"""
+        artisan = Artisan(id=1, name="João", email="joao@email.com")
+        review = Review(id=1, product_id=2, customer_id=3, rating=5, comment="Ótimo")
+
+        assert artisan_to_dict(artisan) == {"id": 1, "name": "João", "email": "joao@email.com"}
+        assert review_to_dict(review)["rating"] == 5
+
+    def test_dumps_bytes_keeps_unicode(self):
+        """Test that the active backend emits UTF-8 JSON"""
+        encoded = dumps_bytes({"name": "Cerâmica", "price": 10.5})
+
+        assert isinstance(encoded, bytes)
+        assert json.loads(encoded) == {"name": "Cerâmica", "price": 10.5}
+
+
+class TestFastJSONProvider:
+    def test_app_uses_fast_provider(self):
+        """Test that create_app installs the provider for jsonify and request.json"""
+        app = create_app()
+        client = app.test_client()
+
+        assert isinstance(app.json, FastJSONProvider)
+        response = client.post(
+            "/products",
+            data=json.dumps(
+                {"id": 1, "artisan_id": 1, "name": "Vaso", "description": "V", "price": 5.0}
+            ),
+            content_type="application/json",
+        )
+        assert response.status_code == 201
+        assert response.mimetype == "application/json"
+        assert json.loads(client.get("/products/1").data)["name"] == "Vaso"
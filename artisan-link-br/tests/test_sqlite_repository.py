@@ -0,0 +1,215 @@
+import math
+import pytest
+import json
+import threading
+from core.entities import Artisan, Product, Order, OrderLine, Review
+from adapters.inbound.api import create_app
+from adapters.outbound.sqlite_repository import (
+    SQLiteArtisanRepository,
+    SQLiteDatabase,
+    SQLiteOrderRepository,
+    SQLiteProductRepository,
+    SQLiteReviewRepository,
+)
+
+
+@pytest.fixture
+def database(tmp_path):
+    return SQLiteDatabase(str(tmp_path / "test.db"))
+
+
+class TestSQLiteProductRepository:
+    def test_save_and_lookups(self, database):
+        """Test id, artisan and batched lookups against SQLite"""
+        repo = SQLiteProductRepository(database)
+        product1 = Product(id=1, artisan_id=1, name="Vaso", description="Vaso", price=50.0)
+        product2 = Product(id=2, artisan_id=2, name="Prato", description="Prato", price=30.0)
+        repo.save(product1)
+        repo.save(product2)
+
+        assert repo.list_all() == [product1, product2]
+        assert repo.get_by_id(2) == product2
+        assert repo.get_by_id(3) is None
+        assert repo.get_many([2, 3, 1]) == [product2, product1]
+        assert repo.list_by_artisan(1) == [product1]
+
+    def test_update_delete_and_pages(self, database):
+        """Test update, delete and keyset pages"""
+        repo = SQLiteProductRepository(database)
+        for product_id in range(1, 5):
+            repo.save(Product(id=product_id, artisan_id=1, name="P", description="P", price=1.0))
+
+        assert repo.update(Product(id=2, artisan_id=3, name="P", description="P", price=9.0))
+        assert not repo.update(Product(id=9, artisan_id=3, name="P", description="P", price=9.0))
+        assert repo.delete(3) is True
+        assert repo.delete(3) is False
+
+        assert [p.id for p in repo.list_page(None, 2)] == [1, 2]
+        assert [p.id for p in repo.list_page(2, 2)] == [4]
+        assert repo.list_by_artisan(3)[0].price == 9.0
+
+    def test_save_many(self, database):
+        """Test the executemany bulk path"""
+        repo = SQLiteProductRepository(database)
+        repo.save_many(
+            Product(id=i, artisan_id=1, name="P", description="P", price=1.0)
+            for i in range(1, 101)
+        )
+
+        assert len(repo.list_by_artisan(1)) == 100
+
+    def test_list_by_price(self, database):
+        """Test range and keyset queries over the (price, id) index"""
+        repo = SQLiteProductRepository(database)
+        for product_id, price in [(1, 30.0), (2, 10.0), (3, 20.0), (4, 20.0)]:
+            repo.save(Product(id=product_id, artisan_id=1, name="P", description="P", price=price))
+
+        def ids(*args):
+            return [p.id for p in repo.list_by_price(*args)]
+
+        assert ids(-math.inf, math.inf, False, None, 10) == [2, 3, 4, 1]
+        assert ids(15.0, 30.0, False, (20.0, 3), 10) == [4, 1]
+        assert ids(-math.inf, 25.0, True, None, 10) == [4, 3, 2]
+        assert ids(-math.inf, math.inf, True, (20.0, 4), 1) == [3]
+
+    def test_version_tracks_writes(self, database):
+        """Test that triggers bump the products version on each write"""
+        repo = SQLiteProductRepository(database)
+        start = repo.version()
+
+        repo.save(Product(id=1, artisan_id=1, name="P", description="P", price=1.0))
+        after_insert = repo.version()
+        repo.get_by_id(1)
+        assert repo.version() == after_insert
+        repo.delete(1)
+
+        assert start < after_insert < repo.version()
+        assert SQLiteArtisanRepository(database).version() == 0
+
+    def test_data_survives_reopening(self, tmp_path):
+        """Test that a new database object sees previously written data"""
+        path = str(tmp_path / "persist.db")
+        SQLiteProductRepository(SQLiteDatabase(path)).save(
+            Product(id=1, artisan_id=1, name="Vaso", description="Vaso", price=50.0)
+        )
+
+        repo = SQLiteProductRepository(SQLiteDatabase(path))
+        assert repo.get_by_id(1).name == "Vaso"
+
+    def test_connection_per_thread(self, database):
+        """Test that writes from several threads land in the same database"""
+        repo = SQLiteProductRepository(database)
+
+        def worker(start):
+            for product_id in range(start, start + 10):
+                repo.save(Product(id=product_id, artisan_id=1, name="P", description="P", price=1.0))
+
+        threads = [threading.Thread(target=worker, args=(i * 10,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(repo.list_all()) == 40
+
+
+class TestSQLiteArtisanRepository:
+    def test_unique_email(self, database):
+        """Test the case-insensitive unique email constraint"""
+        repo = SQLiteArtisanRepository(database)
+        repo.save(Artisan(id=1, name="João", email="joao@email.com"))
+
+        with pytest.raises(ValueError):
+            repo.save(Artisan(id=2, name="Outro", email="JOAO@email.com"))
+        assert repo.get_by_email("Joao@Email.com").id == 1
+        assert repo.count() == 1
+
+    def test_update_and_delete(self, database):
+        """Test that email changes and deletes free the old email"""
+        repo = SQLiteArtisanRepository(database)
+        repo.save(Artisan(id=1, name="João", email="joao@email.com"))
+        repo.save(Artisan(id=2, name="Maria", email="maria@email.com"))
+
+        with pytest.raises(ValueError):
+            repo.update(Artisan(id=2, name="Maria", email="joao@email.com"))
+        assert repo.update(Artisan(id=1, name="João", email="novo@email.com"))
+        assert repo.get_by_email("joao@email.com") is None
+        assert repo.delete(2) is True
+        assert [a.id for a in repo.list_page(None, 10)] == [1]
+
+
+class TestSQLiteOrderAndReviewRepositories:
+    def test_order_roundtrip(self, database):
+        """Test that orders keep their product lines"""
+        repo = SQLiteOrderRepository(database)
+        lines = [OrderLine(1, 2, 50.0), OrderLine(2, 1, 30.0)]
+        order = Order(id=1, customer_id=7, lines=lines, total=130.0)
+        repo.save(order)
+
+        assert repo.get_by_id(1) == order
+        order.lines = lines[:1]
+        assert repo.update(order)
+        assert repo.get_by_id(1).lines == [OrderLine(1, 2, 50.0)]
+        assert repo.count() == 1
+        repo.save(Order(id=2, customer_id=8, lines=lines[::-1], total=130.0))
+        assert repo.list_page(None, 10) == [repo.get_by_id(1), repo.get_by_id(2)]
+        assert [o.id for o in repo.list_page(1, 10)] == [2]
+        assert repo.delete(1) is True
+        assert repo.get_by_id(1) is None
+
+    def test_save_many_is_all_or_nothing(self, database):
+        """Test that a batch is written in one transaction and rolled back as a whole"""
+        repo = SQLiteOrderRepository(database)
+        ids = repo.next_ids(3)
+        assert list(ids) == [1, 2, 3]
+        assert repo.next_id() == 4
+        orders = [Order(id=i, customer_id=i, lines=[OrderLine(1, i, 10.0)], total=10.0 * i) for i in ids]
+        repo.save_many(orders)
+        assert repo.list_page(None, 10) == orders
+
+        broken = Order(id=6, customer_id=1, lines=[OrderLine(object(), 1, 1.0)], total=1.0)
+        with pytest.raises(Exception):
+            repo.save_many([Order(id=5, customer_id=1, lines=[], total=0.0), broken])
+        assert repo.get_by_id(5) is None
+        assert repo.count() == 3
+
+    def test_review_roundtrip(self, database):
+        """Test saving, updating and deleting reviews"""
+        repo = SQLiteReviewRepository(database)
+        review = Review(id=1, product_id=1, customer_id=1, rating=5, comment="Ótimo")
+        repo.save(review)
+
+        assert repo.get_by_id(1) == review
+        assert repo.update(Review(id=1, product_id=1, customer_id=1, rating=3, comment="Ok"))
+        assert repo.get_by_id(1).rating == 3
+        repo.save(Review(id=2, product_id=1, customer_id=2, rating=4, comment="Bom"))
+        assert [r.id for r in repo.list_page(None, 10)] == [1, 2]
+        assert [r.id for r in repo.list_page(1, 10)] == [2]
+        assert repo.delete(1) is True
+        assert repo.count() == 1
+
+
+class TestSQLiteBackendAPI:
+    def test_create_app_with_sqlite_backend(self, tmp_path):
+        """Test that create_app selects the SQLite backend through config"""
+        config = {"REPOSITORY_BACKEND": "sqlite", "SQLITE_PATH": str(tmp_path / "api.db")}
+        product_data = {
+            "id": 1,
+            "artisan_id": 1,
+            "name": "Vaso de Cerâmica",
+            "description": "Vaso artesanal feito à mão",
+            "price": 50.0,
+        }
+        create_app(config).test_client().post(
+            "/products", data=json.dumps(product_data), content_type="application/json"
+        )
+
+        # Um novo app sobre o mesmo arquivo enxerga os dados gravados
+        response = create_app(config).test_client().get("/products/1")
+        assert response.status_code == 200
+        assert json.loads(response.data)["name"] == "Vaso de Cerâmica"
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend name is rejected"""
+        with pytest.raises(ValueError):
+            create_app({"REPOSITORY_BACKEND": "mongo"})